@@ -0,0 +1,56 @@
+"""
+Measures per-request lookup overhead of the gateway `GatewayProxyRepo`
+with many registered services.
+
+Usage:
+    python scripts/benchmark_gateway_repo.py --services 10000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from dstack._internal.proxy.gateway.repo.repo import GatewayProxyRepo
+from dstack._internal.proxy.lib.testing.common import make_project, make_service
+
+
+async def benchmark(services: int, projects: int, lookups: int) -> None:
+    repo = GatewayProxyRepo()
+    for i in range(projects):
+        await repo.set_project(make_project(f"proj-{i}"))
+    start = time.perf_counter()
+    for i in range(services):
+        await repo.set_service(
+            make_service(f"proj-{i % projects}", f"run-{i}", domain=f"run-{i}.gtw.test")
+        )
+    duration = time.perf_counter() - start
+    print(f"Registered {services} services: {duration / services * 1e6:.1f}us per service")
+
+    domains = [f"run-{random.randrange(services)}.gtw.test" for _ in range(lookups)]
+    start = time.perf_counter()
+    for domain in domains:
+        await repo.get_service_by_domain(domain)
+    duration = time.perf_counter() - start
+    print(f"get_service_by_domain(): {duration / lookups * 1e6:.2f}us")
+
+    run_ids = [random.randrange(services) for _ in range(lookups)]
+    start = time.perf_counter()
+    for i in run_ids:
+        await repo.get_project(f"proj-{i % projects}")
+        await repo.get_service(f"proj-{i % projects}", f"run-{i}")
+    duration = time.perf_counter() - start
+    print(f"get_project() + get_service(): {duration / lookups * 1e6:.2f}us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--services", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.services, args.projects, args.lookups))
+
+
+if __name__ == "__main__":
+    main()
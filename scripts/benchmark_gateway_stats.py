@@ -0,0 +1,61 @@
+"""
+Replays a synthetic Nginx access log through the gateway `StatsCollector`
+and reports parsing throughput and the cost of steady-state `collect()` calls.
+
+Usage:
+    python scripts/benchmark_gateway_stats.py --lines 5000000 --hosts 50
+"""
+
+import argparse
+import asyncio
+import datetime
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from dstack._internal.proxy.gateway.services.stats import TTL, StatsCollector
+
+
+def write_access_log(path: Path, lines: int, hosts: int) -> None:
+    now = datetime.datetime.now(tz=datetime.timezone.utc).replace(microsecond=0)
+    start = now - datetime.timedelta(seconds=TTL)
+    host_names = [f"srv-{i}.gtw.test" for i in range(hosts)]
+    with open(path, "w") as f:
+        for i in range(lines):
+            timestamp = start + datetime.timedelta(seconds=i * TTL // lines)
+            status, is_replica_hit = random.choice([("200", "1"), ("200", "1"), ("404", "0")])
+            f.write(
+                f"{timestamp.isoformat()} {random.choice(host_names)} {status}"
+                f" {random.random():.3f} {is_replica_hit}\n"
+            )
+
+
+async def benchmark(lines: int, hosts: int, collects: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "dstack.access.log"
+        print(f"Writing {lines} lines for {hosts} hosts...")
+        write_access_log(path, lines, hosts)
+        collector = StatsCollector(path)
+        start = time.perf_counter()
+        await collector.collect()
+        duration = time.perf_counter() - start
+        print(f"Replayed access log in {duration:.2f}s ({lines / duration:,.0f} lines/s)")
+        start = time.perf_counter()
+        for _ in range(collects):
+            await collector.collect()
+        duration = time.perf_counter() - start
+        print(f"Steady-state collect() without new lines: {duration / collects * 1000:.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=3_000_000)
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--collects", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.lines, args.hosts, args.collects))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from functools import lru_cache
 from pathlib import Path
-from typing import Callable, ClassVar, Dict, List, Optional, Union
+from typing import Callable, ClassVar, Dict, Hashable, List, Optional, Union
 
 import git
 import requests
@@ -20,7 +20,13 @@ from gpuhunt import CPUArchitecture
 
 from dstack._internal import settings
 from dstack._internal.core.backends.base.models import JobConfiguration
-from dstack._internal.core.backends.base.offers import OfferModifier, filter_offers_by_requirements
+from dstack._internal.core.backends.base.offers import (
+    OfferModifier,
+    OffersTable,
+    filter_offers_by_requirements,
+    requirements_to_query_filter,
+)
+from dstack._internal.core.backends.base.offers_cache import get_offers_cache
 from dstack._internal.core.consts import (
     DSTACK_RUNNER_HTTP_PORT,
     DSTACK_RUNNER_SSH_PORT,
@@ -202,14 +208,25 @@ class ComputeWithAllOffersCached(ABC):
     the `unallocated_resources` value. Doubles the amount of cached data.
     """
 
+    offers_modifiers_change_resources: ClassVar[bool] = False
+    """
+    Set to `True` if modifiers returned by `get_offers_modifiers()` change offer resources
+    other than disk. Otherwise, cached offers are pre-filtered by requirements before
+    modifiers are applied, so that modifiers only process potentially matching offers.
+    """
+
     def __init__(self) -> None:
         super().__init__()
-        self._offers_cache_lock = threading.Lock()
-        self._offers_cache_execution_lock = threading.Lock()
-        self._offers_cache = TTLCache(
-            maxsize=(2 if self.unallocated_resources_argument_has_effect else 1),
-            ttl=180,
-        )
+        # Not shared with other instances unless set with `set_offers_cache_key()`
+        self._offers_cache_key: Hashable = object()
+
+    def set_offers_cache_key(self, key: Hashable) -> None:
+        """
+        Makes instances with the same `key` share cached offers, e.g. backends of different
+        projects configured with the same credentials. `key` must identify everything that
+        `get_all_offers_with_availability()` depends on.
+        """
+        self._offers_cache_key = key
 
     @abstractmethod
     def get_all_offers_with_availability(
@@ -246,33 +263,38 @@ class ComputeWithAllOffersCached(ABC):
     def get_offers(
         self, requirements: Requirements, full_offers: bool, unallocated_resources: bool
     ) -> Iterator[InstanceOfferWithAvailability]:
-        with self._offers_cache_execution_lock:
-            # Cache lock does not prevent concurrent execution.
-            # We use a separate lock to avoid requesting offers in parallel, re-doing the work and hitting rate limits.
-            cached_offers = self._get_all_offers_with_availability_cached(unallocated_resources)
-        offers = self.__apply_modifiers(
-            cached_offers, self.get_offers_modifiers(requirements, full_offers)
-        )
-        offers = filter_offers_by_requirements(offers, requirements)
+        offers_table = self._get_all_offers_with_availability_cached(unallocated_resources)
+        modifiers = list(self.get_offers_modifiers(requirements, full_offers))
+        offers: Iterable[InstanceOfferWithAvailability]
+        if not modifiers:
+            offers = offers_table.filter(requirements_to_query_filter(requirements))
+        else:
+            offers = offers_table.offers
+            if not self.offers_modifiers_change_resources:
+                # Modifiers may change disk size, so it's checked after they are applied
+                offers = offers_table.filter(
+                    requirements_to_query_filter(requirements), check_disk_size=False
+                )
+            offers = self.__apply_modifiers(offers, modifiers)
+            offers = filter_offers_by_requirements(offers, requirements)
         post_filter = self.get_offers_post_filter(requirements)
         if post_filter is not None:
             offers = (o for o in offers if post_filter(o))
         return offers
 
-    def _get_all_offers_with_availability_cached_key(self, unallocated_resources: bool) -> int:
-        if self.unallocated_resources_argument_has_effect:
-            return hash(unallocated_resources)
-        return hash(None)
-
-    @cachedmethod(
-        cache=lambda self: self._offers_cache,
-        key=_get_all_offers_with_availability_cached_key,
-        lock=lambda self: self._offers_cache_lock,
-    )
     def _get_all_offers_with_availability_cached(
         self, unallocated_resources: bool
-    ) -> List[InstanceOfferWithAvailability]:
-        return self.get_all_offers_with_availability(unallocated_resources)
+    ) -> OffersTable[InstanceOfferWithAvailability]:
+        key = (
+            type(self),
+            self._offers_cache_key,
+            unallocated_resources if self.unallocated_resources_argument_has_effect else None,
+        )
+        # Concurrent fetches are coalesced to avoid re-doing the work and hitting rate limits
+        return get_offers_cache().get(
+            key,
+            lambda: OffersTable(self.get_all_offers_with_availability(unallocated_resources)),
+        )
 
     @staticmethod
     def __apply_modifiers(
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Iterator
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import asdict
+from functools import lru_cache
 from typing import Callable, Generic, List, Literal, Optional, TypeVar
 from uuid import UUID
 
@@ -213,6 +215,170 @@ def filter_offers_by_requirements(
             yield offer
 
 
+class OffersTable(Generic[InstanceOfferT]):
+    """
+    Offers stored column by column for filtering by requirements without converting
+    every offer to `gpuhunt.CatalogItem`. Each constraint of the query filter is checked
+    in one pass over a column, and GPU name and vendor constraints only scan offers
+    with matching GPUs. Matches are the same as with `filter_offers_by_requirements()`,
+    and offers are returned in their original order.
+    """
+
+    def __init__(self, offers: Iterable[InstanceOfferT]) -> None:
+        self.offers = list(offers)
+        self._provider: list[str] = []
+        self._price = array("d")
+        self._spot: list[bool] = []
+        self._cpu_arch: list[gpuhunt.CPUArchitecture] = []
+        self._cpu = array("q")
+        self._memory = array("d")
+        self._gpu_count = array("q")
+        self._gpu_vendor: list[Optional[gpuhunt.AcceleratorVendor]] = []
+        self._gpu_name: list[Optional[str]] = []
+        self._gpu_memory = array("d")
+        self._total_gpu_memory = array("d")
+        self._disk_size: list[Optional[float]] = []
+        self._rows_without_gpus: list[int] = []
+        self._rows_by_gpu_name: dict[str, list[int]] = {}
+        self._rows_by_gpu_vendor: dict[gpuhunt.AcceleratorVendor, list[int]] = {}
+        for row, offer in enumerate(self.offers):
+            # Same values as in `offer_to_catalog_item()`
+            resources = offer.instance.resources
+            self._provider.append(offer.backend.value.lower())
+            self._price.append(offer.price)
+            self._spot.append(resources.spot)
+            self._cpu_arch.append(resources.cpu_arch or gpuhunt.CPUArchitecture.X86)
+            self._cpu.append(resources.cpus)
+            self._memory.append(resources.memory_mib / 1024)
+            gpu_count = len(resources.gpus)
+            self._gpu_count.append(gpu_count)
+            if gpu_count > 0:
+                gpu = resources.gpus[0]
+                self._gpu_vendor.append(gpu.vendor)
+                self._gpu_name.append(gpu.name)
+                self._gpu_memory.append(gpu.memory_mib / 1024)
+                self._total_gpu_memory.append(gpu_count * (gpu.memory_mib / 1024))
+                self._rows_by_gpu_name.setdefault(gpu.name.lower(), []).append(row)
+                self._rows_by_gpu_vendor.setdefault(gpu.vendor, []).append(row)
+            else:
+                self._gpu_vendor.append(None)
+                self._gpu_name.append(None)
+                self._gpu_memory.append(0)
+                self._total_gpu_memory.append(0)
+                self._rows_without_gpus.append(row)
+            disk_size_mib = resources.disk.size_mib
+            self._disk_size.append(disk_size_mib / 1024 if disk_size_mib != 0 else None)
+
+    def __len__(self) -> int:
+        return len(self.offers)
+
+    def filter(self, q: gpuhunt.QueryFilter, check_disk_size: bool = True) -> List[InstanceOfferT]:
+        """
+        Returns offers matching `q` like `gpuhunt.matches()`.
+
+        Args:
+            check_disk_size: if `False`, disk size constraints are not checked,
+                e.g. because the disk size is going to be changed by offer modifiers.
+        """
+        # GPU constraints do not apply to offers without GPUs if GPUs are optional
+        gpus_optional = q.min_gpu_count == 0
+        rows = self._get_gpu_candidate_rows(q)
+        rows = self._filter_by_gpus(q, rows)
+        if gpus_optional:
+            rows = sorted(rows + self._rows_without_gpus)
+        if q.provider is not None:
+            providers = {p.lower() for p in q.provider}
+            rows = [i for i in rows if self._provider[i] in providers]
+        rows = _filter_rows_between(rows, self._price, q.min_price, q.max_price)
+        if q.spot is not None:
+            rows = [i for i in rows if self._spot[i] == q.spot]
+        if q.cpu_arch:
+            rows = [i for i in rows if self._cpu_arch[i] == q.cpu_arch]
+        rows = _filter_rows_between(rows, self._cpu, q.min_cpu, q.max_cpu)
+        rows = _filter_rows_between(rows, self._memory, q.min_memory, q.max_memory)
+        if check_disk_size and (q.min_disk_size is not None or q.max_disk_size is not None):
+            rows = [
+                i
+                for i in rows
+                if (disk_size := self._disk_size[i]) is None
+                or (
+                    (q.min_disk_size is None or disk_size >= q.min_disk_size)
+                    and (q.max_disk_size is None or disk_size <= q.max_disk_size)
+                )
+            ]
+        # Offers have no gpuhunt flags, so `q.allowed_flags` always matches
+        return [self.offers[i] for i in rows]
+
+    def _get_gpu_candidate_rows(self, q: gpuhunt.QueryFilter) -> list[int]:
+        """
+        Returns rows of offers with GPUs that may match the GPU name or vendor constraint.
+        """
+        if q.gpu_name is not None:
+            gpu_names = {name.lower() for name in q.gpu_name}
+            return sorted(
+                row for name in gpu_names for row in self._rows_by_gpu_name.get(name, [])
+            )
+        if q.gpu_vendor:
+            return list(self._rows_by_gpu_vendor.get(q.gpu_vendor, []))
+        if q.min_gpu_count == 0:
+            return [i for i in range(len(self.offers)) if self._gpu_count[i] > 0]
+        return list(range(len(self.offers)))
+
+    def _filter_by_gpus(self, q: gpuhunt.QueryFilter, rows: list[int]) -> list[int]:
+        if q.gpu_vendor:
+            rows = [i for i in rows if self._gpu_vendor[i] == q.gpu_vendor]
+        rows = _filter_rows_between(rows, self._gpu_count, q.min_gpu_count, q.max_gpu_count)
+        if q.min_compute_capability is not None or q.max_compute_capability is not None:
+            rows = [
+                i
+                for i in rows
+                if self._gpu_vendor[i] == gpuhunt.AcceleratorVendor.NVIDIA
+                and (gpu_name := self._gpu_name[i])
+                and (compute_capability := _get_compute_capability(gpu_name)) is not None
+                and (
+                    q.min_compute_capability is None
+                    or compute_capability >= q.min_compute_capability
+                )
+                and (
+                    q.max_compute_capability is None
+                    or compute_capability <= q.max_compute_capability
+                )
+            ]
+        rows = _filter_rows_between(rows, self._gpu_memory, q.min_gpu_memory, q.max_gpu_memory)
+        rows = _filter_rows_between(
+            rows, self._total_gpu_memory, q.min_total_gpu_memory, q.max_total_gpu_memory
+        )
+        return rows
+
+
+def _filter_rows_between(
+    rows: list[int],
+    column: Sequence[float],
+    min_value: Optional[float],
+    max_value: Optional[float],
+) -> list[int]:
+    if min_value is not None and max_value is not None:
+        return [i for i in rows if min_value <= column[i] <= max_value]
+    if min_value is not None:
+        return [i for i in rows if column[i] >= min_value]
+    if max_value is not None:
+        return [i for i in rows if column[i] <= max_value]
+    return rows
+
+
+@lru_cache
+def _get_compute_capability(gpu_name: str) -> Optional[tuple[int, int]]:
+    # Same lookup as in `gpuhunt.matches()`
+    accelerators = gpuhunt.find_accelerators(
+        names=[gpu_name], vendors=[gpuhunt.AcceleratorVendor.NVIDIA]
+    )
+    if not accelerators:
+        return None
+    gpu_info = accelerators[0]
+    assert isinstance(gpu_info, gpuhunt.NvidiaGPUInfo)
+    return gpu_info.compute_capability
+
+
 def choose_disk_size_mib(
     catalog_item_disk_size_gib: Optional[float],
     requirements_disk_size: Optional[Range[Memory]],
@@ -0,0 +1,125 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+OFFERS_CACHE_TTL = 180
+OFFERS_CACHE_REFRESH_AFTER = 120
+OFFERS_CACHE_MAXSIZE = 1000
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "future")
+
+    def __init__(self) -> None:
+        self.value: Any = None
+        self.fetched_at: Optional[float] = None
+        # Set while the value is being fetched
+        self.future: Optional[Future] = None
+
+
+class OffersCache:
+    """
+    A process-wide cache of backend offers that lets `Compute` instances with the same cache key
+    share offers, e.g. backends of different projects configured with the same credentials.
+
+    Concurrent fetches of the same key are coalesced into one. A value older than
+    `refresh_after` seconds is still returned but is refreshed in the background,
+    so callers only wait for a fetch if the key was not requested for `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: float = OFFERS_CACHE_TTL,
+        refresh_after: float = OFFERS_CACHE_REFRESH_AFTER,
+        maxsize: int = OFFERS_CACHE_MAXSIZE,
+    ) -> None:
+        self._ttl = ttl
+        self._refresh_after = refresh_after
+        self._maxsize = maxsize
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, fetch: Callable[[], T]) -> T:
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if entry is not None and entry.fetched_at is not None:
+                age = now - entry.fetched_at
+                if age < self._ttl:
+                    if age >= self._refresh_after and entry.future is None:
+                        entry.future = Future()
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(key, entry, entry.future, fetch),
+                            daemon=True,
+                        ).start()
+                    return entry.value
+            if entry is None:
+                self._remove_expired(now)
+                entry = _Entry()
+                self._entries[key] = entry
+            future = entry.future
+            is_fetching = future is not None
+            if future is None:
+                future = Future()
+                entry.future = future
+        if not is_fetching:
+            self._fetch(key, entry, future, fetch)
+        return future.result()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _fetch(self, key: Hashable, entry: _Entry, future: Future, fetch: Callable[[], T]) -> None:
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                entry.future = None
+                if entry.fetched_at is None and self._entries.get(key) is entry:
+                    del self._entries[key]
+            future.set_exception(e)
+            return
+        with self._lock:
+            entry.value = value
+            entry.fetched_at = time.monotonic()
+            entry.future = None
+        future.set_result(value)
+
+    def _refresh(
+        self, key: Hashable, entry: _Entry, future: Future, fetch: Callable[[], T]
+    ) -> None:
+        self._fetch(key, entry, future, fetch)
+        exc = future.exception()
+        if exc is not None:
+            # Keep serving the cached value until it expires
+            logger.warning("Failed to refresh cached offers: %r", exc)
+
+    def _remove_expired(self, now: float) -> None:
+        if len(self._entries) < self._maxsize:
+            return
+        for key, entry in list(self._entries.items()):
+            if entry.future is None and (
+                entry.fetched_at is None or now - entry.fetched_at >= self._ttl
+            ):
+                del self._entries[key]
+        if len(self._entries) >= self._maxsize:
+            fetched = [(k, e.fetched_at) for k, e in self._entries.items() if e.future is None]
+            fetched.sort(key=lambda item: item[1])
+            for key, _ in fetched[: len(self._entries) - self._maxsize + 1]:
+                del self._entries[key]
+
+
+_offers_cache = OffersCache()
+
+
+def get_offers_cache() -> OffersCache:
+    return _offers_cache
@@ -1,4 +1,5 @@
 import concurrent.futures
+import hashlib
 import random
 import shlex
 import subprocess
@@ -36,6 +37,11 @@ from dstack._internal.core.backends.base.offers import (
     gpu_matches_gpu_spec,
 )
 from dstack._internal.core.backends.kubernetes.api_client import API_CLIENT_EXCEPTIONS
+from dstack._internal.core.backends.kubernetes.informer import (
+    ClusterInformer,
+    PodState,
+    get_cluster_informer,
+)
 from dstack._internal.core.backends.kubernetes.models import KubernetesConfig
 from dstack._internal.core.backends.kubernetes.resources import (
     AMD_GPU_DEVICE_ID_LABEL_PREFIX,
@@ -140,11 +146,16 @@ class KubernetesCompute(
     Compute,
 ):
     unallocated_resources_argument_has_effect = True
+    # The offer modifier sets requested resources instead of node allocatable resources
+    offers_modifiers_change_resources = True
 
     def __init__(self, config: KubernetesConfig):
         super().__init__()
         self.region_cluster_map = {c.region: c for c in get_clusters_from_backend_config(config)}
         self.skip_offer_cache = RegionalSkipOfferCache(ttl=60)
+        # Backends are re-created periodically, so informers are shared by kubeconfig
+        # and context to keep watching the same cluster
+        self._kubeconfig_hash = hashlib.sha256(config.kubeconfig.data.encode()).hexdigest()
 
     def get_all_offers_with_availability(
         self, unallocated_resources: bool
@@ -156,7 +167,13 @@ class KubernetesCompute(
             ] = {}
             for region, cluster in self.region_cluster_map.items():
                 api = client.CoreV1Api(cluster.api_client)
-                future = executor.submit(get_instance_offers, api, region, unallocated_resources)
+                future = executor.submit(
+                    get_instance_offers,
+                    api,
+                    region,
+                    unallocated_resources,
+                    self._get_cluster_informer(cluster),
+                )
                 future_cluster_map[future] = cluster
             for future in concurrent.futures.as_completed(future_cluster_map):
                 try:
@@ -172,6 +189,13 @@ class KubernetesCompute(
                 offers.extend(cluster_offers)
         return offers
 
+    def _get_cluster_informer(self, cluster: Cluster) -> ClusterInformer:
+        return get_cluster_informer(
+            key=(self._kubeconfig_hash, cluster.context_name),
+            api_client=cluster.api_client,
+            name=str(cluster),
+        )
+
     def get_offers_modifiers(
         self, requirements: Requirements, full_offers: bool
     ) -> list[OfferModifier]:
@@ -277,6 +301,7 @@ class KubernetesCompute(
             )
             is_pod_scheduled_or_finished, pod_phase = _wait_for_pod_scheduled_or_finished(
                 api=api,
+                informer=self._get_cluster_informer(cluster),
                 namespace=namespace,
                 pod_name=pod_name,
                 timeout_seconds=JOB_POD_SCHEDULING_TIMEOUT,
@@ -1284,6 +1309,7 @@ def _create_job_pod(
 
 def _wait_for_pod_scheduled_or_finished(
     api: client.CoreV1Api,
+    informer: ClusterInformer,
     namespace: str,
     pod_name: str,
     timeout_seconds: int,
@@ -1293,6 +1319,16 @@ def _wait_for_pod_scheduled_or_finished(
     # has accepted the bound pod and started creating containers, so it implies both that
     # the scheduler confirmed capacity and that the assigned node is actually Ready and
     # working on the pod.
+    result = informer.wait_for_pod(
+        namespace=namespace,
+        name=pod_name,
+        predicate=_is_pod_scheduled_or_finished,
+        timeout=timeout_seconds,
+    )
+    if result is not None:
+        is_pod_scheduled_or_finished, pod_state = result
+        return is_pod_scheduled_or_finished, None if pod_state is None else pod_state.phase
+    # The informer cannot watch pods, e.g. if listing pods in all namespaces is forbidden
     pod_phase: Optional[PodPhase] = None
     # Ensure that API's timeoutSeconds fires earlier than the network timeout, which defaults to
     # our custom ApiClient's constructor parameter, see DEFAULT_REQUEST_TIMEOUT
@@ -1319,6 +1355,12 @@ def _wait_for_pod_scheduled_or_finished(
     return False, pod_phase
 
 
+def _is_pod_scheduled_or_finished(pod_state: PodState) -> bool:
+    if pod_state.has_container_statuses:
+        return True
+    return pod_state.phase is not None and pod_state.phase is not PodPhase.PENDING
+
+
 def _get_unscheduled_pod_reason_message(
     api: client.CoreV1Api,
     namespace: str,
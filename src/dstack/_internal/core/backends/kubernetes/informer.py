@@ -0,0 +1,357 @@
+"""
+In-memory cache of cluster nodes and pods kept up to date with list+watch.
+
+Listing all nodes and pods on every offers refresh is slow on large clusters and puts load
+on the API server. Instead, each cluster gets a long-lived `ClusterInformer` that lists
+the objects once and then watches for changes, resuming watches from the last seen
+resourceVersion and re-listing only if the API server no longer has it (410 Gone).
+Resources allocated by pods are summed per node incrementally as pod events arrive.
+
+Informers are shared by `KubernetesCompute` instances of the same cluster and stop
+watching if not used for `INFORMER_IDLE_TIMEOUT` seconds. Readers get `None` if the cache
+is not synced, e.g. if the watch is forbidden, and are expected to fall back to the API.
+"""
+
+import dataclasses
+import random
+import threading
+import time
+from collections.abc import Callable, Hashable
+from enum import Enum
+from typing import Any, Generic, Optional, TypeVar
+
+from kubernetes.client import CoreV1Api, V1Node, V1Pod
+from kubernetes.client.exceptions import ApiException
+from kubernetes.watch import Watch
+from typing_extensions import Self
+
+from dstack._internal.core.backends.kubernetes.api_client import API_CLIENT_EXCEPTIONS, ApiClient
+from dstack._internal.core.backends.kubernetes.resources import (
+    KubernetesResources,
+    PodPhase,
+    get_node_name,
+    get_pod_requests,
+)
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+INFORMER_IDLE_TIMEOUT = 600
+INFORMER_SYNC_TIMEOUT = 30
+INFORMER_WATCH_TIMEOUT = 300
+INFORMER_MAX_RETRY_INTERVAL = 60
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+
+@dataclasses.dataclass(frozen=True)
+class PodState:
+    """
+    The part of a pod that is cached. Full pods are not kept to save memory on large clusters.
+    """
+
+    node_name: Optional[str]
+    phase: Optional[PodPhase]
+    # `True` once the kubelet has accepted the pod and started creating containers
+    has_container_statuses: bool
+    requests: KubernetesResources
+
+    @classmethod
+    def from_pod(cls, pod: V1Pod) -> Self:
+        node_name = None
+        if pod.spec is not None:
+            node_name = pod.spec.node_name
+        phase = None
+        has_container_statuses = False
+        if pod.status is not None:
+            if pod.status.phase is not None:
+                phase = PodPhase(pod.status.phase)
+            has_container_statuses = pod.status.container_statuses is not None
+        return cls(
+            node_name=node_name,
+            phase=phase,
+            has_container_statuses=has_container_statuses,
+            requests=get_pod_requests(pod),
+        )
+
+    def get_allocation(self) -> Optional[tuple[str, KubernetesResources]]:
+        """
+        Returns the node and the resources that the pod takes on it, if any.
+        """
+        if self.node_name is None or self.phase is None or self.phase.is_finished():
+            return None
+        return self.node_name, self.requests
+
+
+class _SyncState(str, Enum):
+    SYNCING = "syncing"
+    SYNCED = "synced"
+    FAILED = "failed"
+
+
+class _Reflector(Generic[K, T]):
+    """
+    Mirrors one resource type into `items` in a background thread.
+    All state is guarded by the informer's condition.
+    """
+
+    def __init__(
+        self,
+        informer: "ClusterInformer",
+        description: str,
+        list_method: Callable,
+        get_key: Callable[[Any], Optional[K]],
+        to_item: Callable[[Any], T],
+    ) -> None:
+        self._informer = informer
+        self._description = description
+        self._list_method = list_method
+        self._get_key = get_key
+        self._to_item = to_item
+        self.items: dict[K, T] = {}
+        self.state = _SyncState.SYNCING
+        self._thread: Optional[threading.Thread] = None
+
+    def ensure_started(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"k8s-informer-{self._description}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        resource_version: Optional[str] = None
+        retry_interval = 1.0
+        while not self._informer.stop_if_idle():
+            try:
+                if resource_version is None:
+                    resource_version = self._list()
+                resource_version = self._watch(resource_version)
+                retry_interval = 1.0
+            except ApiException as e:
+                if e.status == 410:
+                    logger.debug(
+                        "%s %s watch expired, re-listing", self._informer, self._description
+                    )
+                    resource_version = None
+                    continue
+                self._on_error(e, retry_interval)
+                retry_interval = min(retry_interval * 2, INFORMER_MAX_RETRY_INTERVAL)
+            except API_CLIENT_EXCEPTIONS as e:
+                self._on_error(e, retry_interval)
+                retry_interval = min(retry_interval * 2, INFORMER_MAX_RETRY_INTERVAL)
+        with self._informer.condition:
+            self.items = {}
+            self.state = _SyncState.SYNCING
+            self._informer.on_reset(self)
+
+    def _list(self) -> str:
+        object_list = self._list_method()
+        items: dict[K, T] = {}
+        for obj in object_list.items:
+            key = self._get_key(obj)
+            if key is not None:
+                items[key] = self._to_item(obj)
+        with self._informer.condition:
+            self.items = items
+            self.state = _SyncState.SYNCED
+            self._informer.on_reset(self)
+            self._informer.condition.notify_all()
+        return object_list.metadata.resource_version
+
+    def _watch(self, resource_version: str) -> str:
+        watch = Watch()
+        try:
+            for event in watch.stream(
+                self._list_method,
+                resource_version=resource_version,
+                allow_watch_bookmarks=True,
+                timeout_seconds=INFORMER_WATCH_TIMEOUT,
+                # Ensure that API's timeoutSeconds fires earlier than the network timeout
+                _request_timeout=INFORMER_WATCH_TIMEOUT + 30,
+            ):
+                if event is None or event["type"] not in ("ADDED", "MODIFIED", "DELETED"):
+                    continue
+                obj = event["object"]
+                key = self._get_key(obj)
+                if key is None:
+                    continue
+                new_item = None
+                if event["type"] != "DELETED":
+                    new_item = self._to_item(obj)
+                with self._informer.condition:
+                    old_item = self.items.pop(key, None)
+                    if new_item is not None:
+                        self.items[key] = new_item
+                    self._informer.on_change(self, old_item, new_item)
+                    self._informer.condition.notify_all()
+                if self._informer.stop_if_idle():
+                    break
+        finally:
+            watch.stop()
+        # Watch.stream() tracks the version of the last event or bookmark
+        return watch.resource_version or resource_version
+
+    def _on_error(self, e: Exception, retry_interval: float) -> None:
+        logger.warning(
+            "%s: failed to list or watch %s: %s: %s",
+            self._informer,
+            self._description,
+            e.__class__.__name__,
+            e,
+        )
+        with self._informer.condition:
+            if self.state is _SyncState.SYNCING:
+                self.state = _SyncState.FAILED
+                self._informer.condition.notify_all()
+        time.sleep(retry_interval * random.uniform(1, 1.5))
+
+
+class ClusterInformer:
+    def __init__(self, api_client: ApiClient, name: str) -> None:
+        self.name = name
+        self.condition = threading.Condition()
+        self._last_used_at = time.monotonic()
+        self._stopped = False
+        api = CoreV1Api(api_client)
+        self._nodes = _Reflector[str, V1Node](
+            informer=self,
+            description="nodes",
+            list_method=api.list_node,
+            get_key=get_node_name,
+            to_item=lambda node: node,
+        )
+        self._pods = _Reflector[tuple[str, str], PodState](
+            informer=self,
+            description="pods",
+            list_method=api.list_pod_for_all_namespaces,
+            get_key=_get_pod_key,
+            to_item=PodState.from_pod,
+        )
+        self._nodes_allocated_resources: dict[str, KubernetesResources] = {}
+
+    def __str__(self) -> str:
+        return f"informer {self.name}"
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def get_nodes(self) -> Optional[list[V1Node]]:
+        """
+        Returns cached nodes or `None` if the cache is not synced.
+        """
+        with self.condition:
+            if not self._wait_synced(self._nodes):
+                return None
+            return list(self._nodes.items.values())
+
+    def get_nodes_allocated_resources(self) -> Optional[dict[str, KubernetesResources]]:
+        """
+        Returns resources requested by unfinished pods per node or `None` if the cache
+        is not synced.
+        """
+        with self.condition:
+            if not self._wait_synced(self._pods):
+                return None
+            return dict(self._nodes_allocated_resources)
+
+    def wait_for_pod(
+        self,
+        namespace: str,
+        name: str,
+        predicate: Callable[[PodState], bool],
+        timeout: float,
+    ) -> Optional[tuple[bool, Optional[PodState]]]:
+        """
+        Waits until the cached pod satisfies `predicate`.
+
+        Returns:
+            `None` if the cache is not synced, otherwise whether the pod satisfied `predicate`
+            before the timeout and the last known pod state.
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            if not self._wait_synced(self._pods):
+                return None
+            while True:
+                pod = self._pods.items.get((namespace, name))
+                if pod is not None and predicate(pod):
+                    return True, pod
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._pods.state is not _SyncState.SYNCED:
+                    return False, pod
+                self.condition.wait(remaining)
+
+    def stop_if_idle(self) -> bool:
+        with self.condition:
+            if not self._stopped and time.monotonic() - self._last_used_at > INFORMER_IDLE_TIMEOUT:
+                logger.debug("%s: stopping, not used for %ds", self, INFORMER_IDLE_TIMEOUT)
+                self._stopped = True
+            return self._stopped
+
+    def on_reset(self, reflector: _Reflector) -> None:
+        if reflector is self._pods:
+            self._nodes_allocated_resources = {}
+            for pod in self._pods.items.values():
+                self._update_allocated_resources(None, pod)
+
+    def on_change(self, reflector: _Reflector, old_item: Any, new_item: Any) -> None:
+        if reflector is self._pods:
+            self._update_allocated_resources(old_item, new_item)
+
+    def _wait_synced(self, reflector: _Reflector) -> bool:
+        # Must be called with the condition acquired
+        self._last_used_at = time.monotonic()
+        if self._stopped:
+            return False
+        reflector.ensure_started()
+        self.condition.wait_for(
+            lambda: reflector.state is not _SyncState.SYNCING, timeout=INFORMER_SYNC_TIMEOUT
+        )
+        return reflector.state is _SyncState.SYNCED
+
+    def _update_allocated_resources(
+        self, old_pod: Optional[PodState], new_pod: Optional[PodState]
+    ) -> None:
+        old_allocation = None if old_pod is None else old_pod.get_allocation()
+        new_allocation = None if new_pod is None else new_pod.get_allocation()
+        if old_allocation == new_allocation:
+            return
+        if old_allocation is not None:
+            node_name, requests = old_allocation
+            allocated = self._nodes_allocated_resources[node_name] - requests
+            if allocated == KubernetesResources():
+                del self._nodes_allocated_resources[node_name]
+            else:
+                self._nodes_allocated_resources[node_name] = allocated
+        if new_allocation is not None:
+            node_name, requests = new_allocation
+            self._nodes_allocated_resources[node_name] = (
+                self._nodes_allocated_resources.get(node_name, KubernetesResources()) + requests
+            )
+
+
+_informers: dict[Hashable, ClusterInformer] = {}
+_informers_lock = threading.Lock()
+
+
+def get_cluster_informer(key: Hashable, api_client: ApiClient, name: str) -> ClusterInformer:
+    """
+    Returns a process-wide informer for the cluster identified by `key`.
+    """
+    with _informers_lock:
+        informer = _informers.get(key)
+        if informer is None or informer.stopped:
+            informer = ClusterInformer(api_client=api_client, name=name)
+            _informers[key] = informer
+        return informer
+
+
+def _get_pod_key(pod: V1Pod) -> Optional[tuple[str, str]]:
+    if pod.metadata is None or pod.metadata.namespace is None or pod.metadata.name is None:
+        return None
+    return pod.metadata.namespace, pod.metadata.name
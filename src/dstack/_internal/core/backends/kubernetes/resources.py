@@ -5,14 +5,14 @@ import re
 from collections.abc import Mapping
 from decimal import Decimal
 from enum import Enum
-from typing import Callable, Literal, Optional, Union, cast, get_args
+from typing import TYPE_CHECKING, Callable, Literal, Optional, Union, cast, get_args
 
 import gpuhunt
 from gpuhunt import KNOWN_AMD_GPUS, KNOWN_NVIDIA_GPUS, AcceleratorVendor
 
 # XXX: kubernetes.utils is missing in the stubs package
 from kubernetes import utils as _kubernetes_utils  # pyright: ignore[reportAttributeAccessIssue]
-from kubernetes.client import CoreV1Api, V1Node, V1Taint
+from kubernetes.client import CoreV1Api, V1Node, V1Pod, V1Taint
 from typing_extensions import Self
 
 from dstack._internal.core.backends.base.compute import normalize_arch
@@ -31,6 +31,9 @@ from dstack._internal.utils import docker as docker_utils
 from dstack._internal.utils.common import get_or_error
 from dstack._internal.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from dstack._internal.core.backends.kubernetes.informer import ClusterInformer
+
 logger = get_logger(__name__)
 
 # https://kubernetes.io/docs/concepts/overview/working-with-objects/names/#names
@@ -383,13 +386,28 @@ def is_taint_tolerated(taint: V1Taint) -> bool:
 
 
 def get_instance_offers(
-    api: CoreV1Api, region: str, unallocated_resources: bool
+    api: CoreV1Api,
+    region: str,
+    unallocated_resources: bool,
+    informer: Optional["ClusterInformer"] = None,
 ) -> list[InstanceOfferWithAvailability]:
+    """
+    Returns offers for cluster nodes. Nodes and pods are read from `informer` if it's synced,
+    otherwise they are listed via `api`.
+    """
     nodes_allocated_resources: Optional[dict[str, KubernetesResources]] = None
     if unallocated_resources:
-        nodes_allocated_resources = _get_nodes_allocated_resources(api)
+        if informer is not None:
+            nodes_allocated_resources = informer.get_nodes_allocated_resources()
+        if nodes_allocated_resources is None:
+            nodes_allocated_resources = _get_nodes_allocated_resources(api)
+    nodes: Optional[list[V1Node]] = None
+    if informer is not None:
+        nodes = informer.get_nodes()
+    if nodes is None:
+        nodes = api.list_node().items
     offers: list[InstanceOfferWithAvailability] = []
-    for node in api.list_node().items:
+    for node in nodes:
         if (node_name := get_node_name(node)) is None:
             continue
         offer = _get_instance_offer_from_node(
@@ -539,6 +557,17 @@ def _get_gpus_from_node(
     return []
 
 
+def get_pod_requests(pod: V1Pod) -> KubernetesResources:
+    pod_requests = KubernetesResources()
+    if pod.spec is None:
+        return pod_requests
+    # TODO: Should we also check PodSpec.resources? As of 2026-01-21, it's in alpha
+    for container in pod.spec.containers:
+        if container.resources is not None and container.resources.requests:
+            pod_requests += KubernetesResources.from_kubernetes_map(container.resources.requests)
+    return pod_requests
+
+
 def _get_nodes_allocated_resources(api: CoreV1Api) -> dict[str, KubernetesResources]:
     nodes_allocated_resources: dict[str, KubernetesResources] = {}
     for pod in api.list_pod_for_all_namespaces().items:
@@ -550,13 +579,7 @@ def _get_nodes_allocated_resources(api: CoreV1Api) -> dict[str, KubernetesResour
         node_name = pod_spec.node_name
         if node_name is None:
             continue
-        pod_requests = KubernetesResources()
-        # TODO: Should we also check PodSpec.resources? As of 2026-01-21, it's in alpha
-        for container in pod_spec.containers:
-            if container.resources is not None and container.resources.requests:
-                pod_requests += KubernetesResources.from_kubernetes_map(
-                    container.resources.requests
-                )
+        pod_requests = get_pod_requests(pod)
         try:
             nodes_allocated_resources[node_name] += pod_requests
         except KeyError:
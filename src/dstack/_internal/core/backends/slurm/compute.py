@@ -82,6 +82,8 @@ class SlurmCompute(
 ):
     # TODO: support allocated resource accounting and change to True
     unallocated_resources_argument_has_effect = False
+    # The offer modifier sets requested resources instead of node resources
+    offers_modifiers_change_resources = True
 
     def __init__(self, config: SlurmConfig):
         super().__init__()
@@ -241,10 +241,17 @@ class RepoSpec(CoreModel):
 
 class ScalingSpec(CoreModel):
     metric: Annotated[
-        Literal["rps"],
+        Literal["rps", "ttft", "tokens_per_second"],
         Field(
-            description="The target metric to track. Currently, the only supported value is `rps` "
-            "(meaning requests per second)"
+            description=(
+                "The target metric to track. Supported values:"
+                " `rps` (requests per second, the target is per replica),"
+                " `ttft` (average time to first token of streamed model responses, in seconds),"
+                " `tokens_per_second` (output tokens per second of the model,"
+                " the target is per replica)."
+                " `ttft` and `tokens_per_second` are measured on model requests"
+                " made via the gateway's OpenAI-compatible endpoint"
+            )
         ),
     ]
     target: Annotated[
@@ -260,7 +267,7 @@ class ScalingSpec(CoreModel):
         Optional[Duration],
         Field(
             description=(
-                "The time window used to calculate requests per second."
+                "The time window used to calculate the metric."
                 f" Allowed values: {ALLOWED_SCALING_WINDOWS_DESCRIPTION}."
                 f" Defaults to `{DEFAULT_SCALING_WINDOW}s`"
             ),
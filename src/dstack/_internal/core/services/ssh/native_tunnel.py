@@ -0,0 +1,564 @@
+"""
+In-process SSH tunnels built on paramiko, an alternative to `SSHTunnel`, which forks
+an `ssh` process per tunnel and another one per check and close.
+
+Tunnels to the same destination with the same keys and proxies share one SSH connection.
+Forwarded sockets are served by an asyncio event loop running in a background thread,
+and each accepted connection is multiplexed over the shared connection as
+a `direct-tcpip` channel. Dead connections are detected with OpenSSH-style keepalive
+requests (`ServerAliveInterval`, `ServerAliveCountMax`). Blocking paramiko calls run
+in a dedicated thread pool so that they neither wait for nor occupy the default executor.
+"""
+
+import asyncio
+import contextvars
+import os
+import socket
+import stat
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Literal, Optional, TypeVar, Union
+
+import paramiko
+
+from dstack._internal.core.errors import (
+    SSHConnectionRefusedError,
+    SSHError,
+    SSHKeyError,
+    SSHPortInUseError,
+    SSHTimeoutError,
+)
+from dstack._internal.core.models.instances import SSHConnectionParams
+from dstack._internal.core.services.ssh.tunnel import (
+    SSH_DEFAULT_OPTIONS,
+    SSH_TIMEOUT,
+    IPSocket,
+    SocketPair,
+    UnixSocket,
+)
+from dstack._internal.utils.logging import get_logger
+from dstack._internal.utils.path import FilePath, FilePathOrContent, PathLike
+from dstack._internal.utils.ssh import pkey_from_str
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_BUFFER_SIZE = 64 * 1024
+_DEFAULT_SERVER_ALIVE_COUNT_MAX = 3
+_EXECUTOR_MAX_WORKERS = 32
+
+
+class SSHTransportType(str, Enum):
+    OPENSSH = "openssh"
+    NATIVE = "native"
+
+
+class NativeSSHTunnel:
+    """
+    An in-process replacement for `SSHTunnel` with the same interface.
+
+    Supports local forwarding to Unix and TCP sockets, proxies, and the `ConnectTimeout`,
+    `ServerAliveInterval`, `ServerAliveCountMax`, and `StreamLocalBindMask` options.
+    Other options are ignored. Host keys are not checked, same as with `SSH_DEFAULT_OPTIONS`.
+    """
+
+    def __init__(
+        self,
+        destination: str,
+        identity: FilePathOrContent,
+        forwarded_sockets: Iterable[SocketPair] = (),
+        reverse_forwarded_sockets: Iterable[SocketPair] = (),
+        control_sock_path: Optional[PathLike] = None,
+        options: Dict[str, str] = SSH_DEFAULT_OPTIONS,
+        ssh_config_path: Union[PathLike, Literal["none"]] = "none",
+        port: Optional[int] = None,
+        ssh_proxies: Iterable[tuple[SSHConnectionParams, Optional[FilePathOrContent]]] = (),
+        batch_mode: bool = False,
+    ):
+        """
+        `control_sock_path` and `batch_mode` are accepted for compatibility with `SSHTunnel`
+        and ignored: there is no control socket, and there are no prompts.
+        """
+        if list(reverse_forwarded_sockets):
+            raise SSHError("Reverse port forwarding is not supported by the native SSH transport")
+        if ssh_config_path != "none":
+            raise SSHError("SSH config files are not supported by the native SSH transport")
+        self.destination = destination
+        self.forwarded_sockets = list(forwarded_sockets)
+        self.options = {k.lower(): v for k, v in options.items()}
+        username, _, hostname = destination.rpartition("@")
+        if not username:
+            raise SSHError(f"SSH destination must include the username: {destination}")
+        pkey = _load_pkey(identity)
+        hops: list[_Hop] = []
+        for proxy_params, proxy_identity in ssh_proxies:
+            proxy_pkey = pkey if proxy_identity is None else _load_pkey(proxy_identity)
+            hops.append(
+                _Hop(proxy_params.username, proxy_params.hostname, proxy_params.port, proxy_pkey)
+            )
+        hops.append(_Hop(username, hostname, port or 22, pkey))
+        self._hops = tuple(hops)
+        self._connection: Optional[_Connection] = None
+        self._servers: list[asyncio.AbstractServer] = []
+
+    def open(self) -> None:
+        _run_in_loop(self._open())
+
+    async def aopen(self) -> None:
+        await _arun_in_loop(self._open())
+
+    def close(self) -> None:
+        _run_in_loop(self._close())
+
+    async def aclose(self) -> None:
+        await _arun_in_loop(self._close())
+
+    def check(self) -> bool:
+        return (
+            self._connection is not None
+            and self._connection.is_active()
+            and len(self._servers) == len(self.forwarded_sockets)
+            and all(server.is_serving() for server in self._servers)
+        )
+
+    async def acheck(self) -> bool:
+        return self.check()
+
+    async def aexec(self, command: str) -> str:
+        if self._connection is None:
+            raise SSHError("SSH tunnel is not open")
+        return await _run_blocking(self._connection.exec, command)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def __aenter__(self):
+        await self.aopen()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def _open(self) -> None:
+        # Must run in the tunnels loop
+        await self._close()
+        connection = _acquire_connection(self._hops)
+        self._connection = connection
+        try:
+            await asyncio.wait_for(
+                _run_blocking(
+                    connection.ensure_connected,
+                    connect_timeout=float(self.options.get("connecttimeout", SSH_TIMEOUT)),
+                    keepalive_interval=int(self.options.get("serveraliveinterval", 0)),
+                    keepalive_count_max=int(
+                        self.options.get("serveralivecountmax", _DEFAULT_SERVER_ALIVE_COUNT_MAX)
+                    ),
+                ),
+                SSH_TIMEOUT,
+            )
+            for socket_pair in self.forwarded_sockets:
+                self._servers.append(await self._start_server(socket_pair))
+        except asyncio.TimeoutError as e:
+            await self._close()
+            msg = f"SSH tunnel to {self.destination} did not open in {SSH_TIMEOUT} seconds"
+            logger.debug(msg)
+            raise SSHTimeoutError(msg) from e
+        except BaseException:
+            await self._close()
+            raise
+
+    async def _close(self) -> None:
+        # Must run in the tunnels loop
+        servers, self._servers = self._servers, []
+        for server in servers:
+            server.close()
+        for socket_pair in self.forwarded_sockets:
+            if isinstance(socket_pair.local, UnixSocket):
+                _remove_socket_file(socket_pair.local.path)
+        if self._connection is not None:
+            _release_connection(self._connection)
+            self._connection = None
+
+    async def _start_server(self, socket_pair: SocketPair) -> asyncio.AbstractServer:
+        connection = self._connection
+        assert connection is not None
+        remote = socket_pair.remote
+        if not isinstance(remote, IPSocket):
+            raise SSHError("Only TCP remote sockets are supported by the native SSH transport")
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await _forward(connection, (remote.host, remote.port), reader, writer)
+
+        local = socket_pair.local
+        try:
+            if isinstance(local, UnixSocket):
+                _remove_socket_file(local.path)
+                server = await asyncio.start_unix_server(handle, path=str(local.path))
+                if (mask := self.options.get("streamlocalbindmask")) is not None:
+                    os.chmod(local.path, 0o777 & ~int(mask, 8))
+                return server
+            if isinstance(local, IPSocket):
+                return await asyncio.start_server(handle, host=local.host, port=local.port)
+        except OSError as e:
+            raise SSHPortInUseError(f"Failed to listen on {local.render()}: {e}") from e
+        raise SSHError(f"Unsupported local socket: {local}")
+
+
+class _Hop:
+    __slots__ = ("username", "hostname", "port", "pkey")
+
+    def __init__(self, username: str, hostname: str, port: int, pkey: paramiko.PKey) -> None:
+        self.username = username
+        self.hostname = hostname
+        self.port = port
+        self.pkey = pkey
+
+    def key(self) -> tuple:
+        return (self.username, self.hostname, self.port, self.pkey.fingerprint)
+
+
+class _Connection:
+    """
+    An SSH connection, possibly through proxies, shared by tunnels with the same hops.
+    Reconnects on `ensure_connected()` if the connection is dead.
+    """
+
+    def __init__(self, hops: tuple[_Hop, ...]) -> None:
+        self.hops = hops
+        self.refs = 0
+        # Set once all tunnels have released the connection
+        self.released = False
+        self._lock = threading.Lock()
+        # From the outermost proxy to the destination
+        self._transports: list[paramiko.Transport] = []
+
+    def __str__(self) -> str:
+        return " -> ".join(f"{hop.username}@{hop.hostname}:{hop.port}" for hop in self.hops)
+
+    def is_active(self) -> bool:
+        transports = self._transports
+        return len(transports) > 0 and transports[-1].is_active()
+
+    def ensure_connected(
+        self, connect_timeout: float, keepalive_interval: int, keepalive_count_max: int
+    ) -> None:
+        with self._lock:
+            if self.is_active():
+                return
+            self.close()
+            try:
+                self._connect(connect_timeout)
+            except BaseException:
+                self.close()
+                raise
+            if self.released:
+                # The tunnel gave up waiting for the connection
+                self.close()
+                raise SSHError(f"SSH connection {self} was released while connecting")
+            if keepalive_interval > 0:
+                transport = self._transports[-1]
+                _get_loop().call_soon_threadsafe(
+                    _start_keepalive, self, transport, keepalive_interval, keepalive_count_max
+                )
+
+    def open_channel(self, dest_addr: tuple[str, int], timeout: float) -> paramiko.Channel:
+        transports = self._transports
+        if not transports:
+            raise SSHError(f"SSH connection {self} is closed")
+        return transports[-1].open_channel("direct-tcpip", dest_addr, ("", 0), timeout=timeout)
+
+    def exec(self, command: str) -> str:
+        transports = self._transports
+        if not transports:
+            raise SSHError(f"SSH connection {self} is closed")
+        try:
+            channel = transports[-1].open_session(timeout=SSH_TIMEOUT)
+            with channel:
+                channel.exec_command(command)
+                stdout = channel.makefile("rb").read()
+                stderr = channel.makefile_stderr("rb").read()
+                exit_status = channel.recv_exit_status()
+        except (paramiko.SSHException, OSError) as e:
+            raise SSHError(f"Failed to execute command over {self}: {e}") from e
+        if exit_status != 0:
+            raise SSHError(stderr.decode())
+        return stdout.decode()
+
+    def close(self) -> None:
+        transports, self._transports = self._transports, []
+        for transport in reversed(transports):
+            transport.close()
+
+    def _connect(self, timeout: float) -> None:
+        sock: Optional[Union[socket.socket, paramiko.Channel]] = None
+        for hop, next_hop in zip(self.hops, [*self.hops[1:], None]):
+            address = f"{hop.username}@{hop.hostname}:{hop.port}"
+            try:
+                if sock is None:
+                    sock = socket.create_connection((hop.hostname, hop.port), timeout=timeout)
+                transport = paramiko.Transport(sock)
+                self._transports.append(transport)
+                transport.banner_timeout = timeout
+                transport.auth_timeout = timeout
+                transport.start_client(timeout=timeout)
+                # Host keys are not verified, same as StrictHostKeyChecking=no
+                transport.auth_publickey(hop.username, hop.pkey)
+            except paramiko.AuthenticationException as e:
+                raise SSHKeyError(f"{address}: Permission denied (publickey)") from e
+            except (socket.timeout, TimeoutError) as e:
+                raise SSHTimeoutError(f"{address}: Operation timed out") from e
+            except ConnectionRefusedError as e:
+                raise SSHConnectionRefusedError(f"{address}: Connection refused") from e
+            except (paramiko.SSHException, OSError, EOFError) as e:
+                raise SSHError(f"{address}: {e}") from e
+            sock = None
+            if next_hop is not None:
+                try:
+                    sock = transport.open_channel(
+                        "direct-tcpip",
+                        (next_hop.hostname, next_hop.port),
+                        ("", 0),
+                        timeout=timeout,
+                    )
+                except (paramiko.SSHException, OSError) as e:
+                    raise SSHError(f"{address}: proxy channel failed: {e}") from e
+
+
+_connections: dict[tuple, _Connection] = {}
+_connections_lock = threading.Lock()
+
+
+def _acquire_connection(hops: tuple[_Hop, ...]) -> _Connection:
+    key = tuple(hop.key() for hop in hops)
+    with _connections_lock:
+        connection = _connections.get(key)
+        if connection is None:
+            connection = _Connection(hops)
+            _connections[key] = connection
+        connection.refs += 1
+        return connection
+
+
+def _release_connection(connection: _Connection) -> None:
+    key = tuple(hop.key() for hop in connection.hops)
+    with _connections_lock:
+        connection.refs -= 1
+        if connection.refs > 0:
+            return
+        if _connections.get(key) is connection:
+            del _connections[key]
+        connection.released = True
+    connection.close()
+
+
+def _start_keepalive(
+    connection: _Connection, transport: paramiko.Transport, interval: int, count_max: int
+) -> None:
+    asyncio.get_running_loop().create_task(_keepalive(connection, transport, interval, count_max))
+
+
+async def _keepalive(
+    connection: _Connection, transport: paramiko.Transport, interval: float, count_max: int
+) -> None:
+    loop = asyncio.get_running_loop()
+    while transport.is_active():
+        await asyncio.sleep(interval)
+        if not transport.is_active():
+            return
+        sent = asyncio.Event()
+
+        def send_keepalive() -> None:
+            loop.call_soon_threadsafe(sent.set)
+            # Any reply, including a failure, means the server is alive
+            transport.global_request("keepalive@openssh.com", wait=True)
+
+        reply = asyncio.ensure_future(_run_blocking(send_keepalive))
+        sent_waiter = asyncio.ensure_future(sent.wait())
+        try:
+            # Time the reply from when the request is sent, not from when it is queued
+            # in the executor, so that a busy executor does not close live connections
+            await asyncio.wait([reply, sent_waiter], return_when=asyncio.FIRST_COMPLETED)
+            await asyncio.wait_for(reply, interval * count_max)
+        except asyncio.TimeoutError:
+            logger.debug("SSH connection %s: no keepalive reply, closing", connection)
+            # Unblocks the pending request as well
+            transport.close()
+            return
+        finally:
+            sent_waiter.cancel()
+
+
+async def _forward(
+    connection: _Connection,
+    dest_addr: tuple[str, int],
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    try:
+        channel = await _run_blocking(connection.open_channel, dest_addr, SSH_TIMEOUT)
+    except (paramiko.SSHException, SSHError, OSError) as e:
+        logger.debug(
+            "SSH connection %s: failed to open channel to %s: %s", connection, dest_addr, e
+        )
+        writer.close()
+        return
+    channel.settimeout(0.0)
+    to_channel = asyncio.create_task(_copy_to_channel(reader, channel))
+    try:
+        await _copy_from_channel(channel, writer)
+    except OSError as e:
+        logger.debug("SSH connection %s: channel to %s failed: %s", connection, dest_addr, e)
+    finally:
+        # The remote end closed the channel, no need to wait for the local end
+        to_channel.cancel()
+        channel.close()
+        writer.close()
+
+
+class _NotifyingCondition(threading.Condition):
+    """
+    A condition that also calls `on_notify` from the notifying thread.
+    """
+
+    def __init__(self, lock: threading.Lock, on_notify: Callable[[], None]) -> None:
+        super().__init__(lock)
+        self._on_notify = on_notify
+
+    def notify_all(self) -> None:
+        super().notify_all()
+        try:
+            self._on_notify()
+        except RuntimeError:
+            # The event loop is closed
+            pass
+
+
+async def _copy_to_channel(reader: asyncio.StreamReader, channel: paramiko.Channel) -> None:
+    loop = asyncio.get_running_loop()
+    send_ready = asyncio.Event()
+    # The transport thread notifies `out_buffer_cv` when the remote window is adjusted
+    # or the channel is closed. The channel is non-blocking, so no thread waits on it.
+    channel.out_buffer_cv = _NotifyingCondition(
+        channel.lock, partial(loop.call_soon_threadsafe, send_ready.set)
+    )
+    try:
+        while data := await reader.read(_BUFFER_SIZE):
+            while data:
+                send_ready.clear()
+                if not channel.send_ready():
+                    if channel.closed:
+                        return
+                    # The remote window is exhausted
+                    await send_ready.wait()
+                    continue
+                try:
+                    sent = channel.send(data)
+                except socket.timeout:
+                    continue
+                data = data[sent:]
+        channel.shutdown_write()
+    except OSError:
+        channel.close()
+
+
+async def _copy_from_channel(channel: paramiko.Channel, writer: asyncio.StreamWriter) -> None:
+    loop = asyncio.get_running_loop()
+    readable = asyncio.Event()
+    # The channel's fileno() is a pipe that is readable while the channel has buffered data
+    # or is closed
+    fd = channel.fileno()
+    loop.add_reader(fd, readable.set)
+    try:
+        while True:
+            await readable.wait()
+            readable.clear()
+            try:
+                data = channel.recv(_BUFFER_SIZE)
+            except socket.timeout:
+                continue
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+    finally:
+        loop.remove_reader(fd)
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the event loop that serves all native tunnels, running in a daemon thread.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="ssh-tunnels-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool that runs blocking paramiko calls of all native tunnels.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_EXECUTOR_MAX_WORKERS, thread_name_prefix="ssh-tunnels"
+            )
+        return _executor
+
+
+async def _run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # Same as `run_async()` but runs `func` in the tunnels executor
+    ctx = contextvars.copy_context()
+    func_with_args = partial(ctx.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), func_with_args)
+
+
+def _run_in_loop(coro: Coroutine[Any, Any, T]) -> T:
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+async def _arun_in_loop(coro: Coroutine[Any, Any, T]) -> T:
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _get_loop()))
+
+
+def _load_pkey(identity: FilePathOrContent) -> paramiko.PKey:
+    if isinstance(identity, FilePath):
+        with open(identity.path) as f:
+            content = f.read()
+    else:
+        content = identity.content
+    try:
+        return pkey_from_str(content)
+    except ValueError as e:
+        raise SSHKeyError(f"Failed to load SSH private key: {e}") from e
+
+
+def _remove_socket_file(path: PathLike) -> None:
+    # Same as StreamLocalBindUnlink=yes
+    try:
+        if stat.S_ISSOCK(os.lstat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -1,5 +1,6 @@
 """FastAPI app running on a gateway."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
@@ -29,6 +30,9 @@ from dstack._internal.proxy.gateway.services.registry import ACCESS_LOG_PATH, ap
 from dstack._internal.proxy.gateway.services.server_client import HTTPMultiClient
 from dstack._internal.proxy.gateway.services.stats import StatsCollector
 from dstack._internal.proxy.lib.routers.model_proxy import router as model_proxy_router
+from dstack._internal.proxy.lib.services.service_connection import (
+    check_connections_periodically,
+)
 from dstack._internal.utils.common import run_async
 from dstack.version import __version__
 
@@ -43,12 +47,17 @@ async def lifespan(app: FastAPI):
     repo = await get_gateway_proxy_repo(await injector.get_repo().__anext__())
     nginx = injector.get_nginx()
     service_conn_pool = await injector.get_service_connection_pool()
-    await run_async(nginx.write_global_conf)
+    await nginx.write_global_conf()
     await apply_all(repo, nginx, service_conn_pool)
+    connections_checker = asyncio.create_task(
+        check_connections_periodically(service_conn_pool.check)
+    )
 
     yield
 
+    connections_checker.cancel()
     await service_conn_pool.remove_all()
+    await run_async(repo.close)
 
 
 def make_app(repo: Optional[GatewayProxyRepo] = None, nginx: Optional[Nginx] = None) -> FastAPI:
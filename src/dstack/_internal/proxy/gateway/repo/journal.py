@@ -0,0 +1,189 @@
+"""
+Append-only journal of GatewayProxyRepo mutations. The repo state on disk is
+the last snapshot plus the journal records appended after it.
+
+Records are applied to a shallow copy of the current state. They replace the
+containers they change instead of mutating them, so that the previous state
+can still be used by readers.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Literal, Optional, TextIO, Union
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from dstack._internal.proxy.gateway.models import GlobalProxyConfig, ModelEntrypoint
+from dstack._internal.proxy.lib.models import ChatModel, Project, Service
+from dstack._internal.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from dstack._internal.proxy.gateway.repo.repo import State
+
+logger = get_logger(__name__)
+
+
+class SetServiceRecord(BaseModel):
+    op: Literal["set_service"] = "set_service"
+    service: Service
+
+    def apply(self, state: "State") -> None:
+        project_name = self.service.project_name
+        project_services = dict(state.services.get(project_name, {}))
+        project_services[self.service.run_name] = self.service
+        state.services = {**state.services, project_name: project_services}
+
+
+class DeleteServiceRecord(BaseModel):
+    op: Literal["delete_service"] = "delete_service"
+    project_name: str
+    run_name: str
+
+    def apply(self, state: "State") -> None:
+        if self.run_name not in state.services.get(self.project_name, {}):
+            return
+        project_services = dict(state.services[self.project_name])
+        del project_services[self.run_name]
+        services = dict(state.services)
+        if project_services:
+            services[self.project_name] = project_services
+        else:
+            del services[self.project_name]
+        state.services = services
+
+
+class SetModelRecord(BaseModel):
+    op: Literal["set_model"] = "set_model"
+    model: ChatModel
+
+    def apply(self, state: "State") -> None:
+        project_name = self.model.project_name
+        project_models = dict(state.models.get(project_name, {}))
+        project_models[self.model.name] = self.model
+        state.models = {**state.models, project_name: project_models}
+
+
+class DeleteModelsByRunRecord(BaseModel):
+    op: Literal["delete_models_by_run"] = "delete_models_by_run"
+    project_name: str
+    run_name: str
+
+    def apply(self, state: "State") -> None:
+        project_models = state.models.get(self.project_name, {})
+        models_to_keep = {
+            name: model
+            for name, model in project_models.items()
+            if model.run_name != self.run_name
+        }
+        if len(models_to_keep) == len(project_models):
+            return
+        models = dict(state.models)
+        if models_to_keep:
+            models[self.project_name] = models_to_keep
+        else:
+            del models[self.project_name]
+        state.models = models
+
+
+class SetEntrypointRecord(BaseModel):
+    op: Literal["set_entrypoint"] = "set_entrypoint"
+    entrypoint: ModelEntrypoint
+
+    def apply(self, state: "State") -> None:
+        state.entrypoints = {**state.entrypoints, self.entrypoint.project_name: self.entrypoint}
+
+
+class SetProjectRecord(BaseModel):
+    op: Literal["set_project"] = "set_project"
+    project: Project
+
+    def apply(self, state: "State") -> None:
+        state.projects = {**state.projects, self.project.name: self.project}
+
+
+class SetConfigRecord(BaseModel):
+    op: Literal["set_config"] = "set_config"
+    config: GlobalProxyConfig
+
+    def apply(self, state: "State") -> None:
+        state.config = self.config
+
+
+AnyJournalRecord = Annotated[
+    Union[
+        SetServiceRecord,
+        DeleteServiceRecord,
+        SetModelRecord,
+        DeleteModelsByRunRecord,
+        SetEntrypointRecord,
+        SetProjectRecord,
+        SetConfigRecord,
+    ],
+    Field(discriminator="op"),
+]
+_RECORD_ADAPTER: TypeAdapter[AnyJournalRecord] = TypeAdapter(AnyJournalRecord)
+
+
+class Journal:
+    """
+    A file with one JSON record per line. Records are appended without waiting for fsync,
+    which is done in a thread so that it does not delay the mutation.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._file: Optional[TextIO] = None
+        self._sync_pending = False
+        self.size = path.stat().st_size if path.exists() else 0
+        """Size of the journal file in bytes"""
+
+    def read(self) -> list[AnyJournalRecord]:
+        if not self._path.exists():
+            return []
+        records = []
+        with open(self._path, "r") as f:
+            for line_num, line in enumerate(f, start=1):
+                try:
+                    records.append(_RECORD_ADAPTER.validate_json(line))
+                except ValidationError:
+                    # Normally only happens to the last line if the gateway stopped mid-write
+                    logger.warning(
+                        "Skipping invalid record at %s:%d: %r", self._path, line_num, line
+                    )
+        return records
+
+    def append(self, record: AnyJournalRecord) -> None:
+        if self._file is None:
+            self._file = open(self._path, "a")
+        line = record.model_dump_json() + "\n"
+        self._file.write(line)
+        self._file.flush()
+        self.size += len(line.encode())
+        if not self._sync_pending:
+            self._sync_pending = True
+            asyncio.get_running_loop().run_in_executor(None, self._sync_in_background)
+
+    def sync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def truncate(self) -> None:
+        self.close()
+        self._path.unlink(missing_ok=True)
+        self.size = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _sync_in_background(self) -> None:
+        # Records appended after this point will schedule another sync
+        self._sync_pending = False
+        try:
+            self.sync()
+        except (OSError, ValueError) as e:
+            # The file may be closed by truncate() or close() meanwhile,
+            # in which case the records are already in a synced snapshot or not needed
+            logger.debug("Failed to sync %s: %r", self._path, e)
@@ -1,16 +1,32 @@
-from contextlib import asynccontextmanager
+import asyncio
+import os
 from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Optional, TypeVar
 
-from aiorwlock import RWLock
 from pydantic import BaseModel
 
 from dstack._internal.proxy.gateway.models import GlobalProxyConfig, ModelEntrypoint
+from dstack._internal.proxy.gateway.repo.journal import (
+    AnyJournalRecord,
+    DeleteModelsByRunRecord,
+    DeleteServiceRecord,
+    Journal,
+    SetConfigRecord,
+    SetEntrypointRecord,
+    SetModelRecord,
+    SetProjectRecord,
+    SetServiceRecord,
+)
 from dstack._internal.proxy.lib.models import ChatModel, Project, Service
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
 from dstack._internal.utils.common import run_async
 
+V = TypeVar("V")
+
+# Journals smaller than this are not compacted even if larger than the snapshot
+JOURNAL_COMPACTION_MIN_SIZE = 1024 * 1024
+
 
 class State(BaseModel):
     services: dict[str, dict[str, Service]] = {}
@@ -20,110 +36,269 @@ class State(BaseModel):
     config: GlobalProxyConfig = GlobalProxyConfig()
 
 
+class _Snapshot:
+    """
+    An immutable version of the repo state with secondary indexes.
+    Built by writers and swapped atomically, so that readers never wait.
+    """
+
+    __slots__ = ("state", "services_by_domain", "models_by_run")
+
+    def __init__(self, state: State, previous: Optional["_Snapshot"] = None) -> None:
+        self.state = state
+        self.services_by_domain: dict[str, Service] = _update_index(
+            index=previous.services_by_domain if previous is not None else None,
+            groups=state.services,
+            previous_groups=previous.state.services if previous is not None else None,
+            get_keys=lambda service: [service.domain] if service.domain is not None else [],
+        )
+        self.models_by_run: dict[str, dict[str, list[ChatModel]]] = _update_groups_index(
+            index=previous.models_by_run if previous is not None else None,
+            groups=state.models,
+            previous_groups=previous.state.models if previous is not None else None,
+            get_key=lambda model: model.run_name,
+        )
+
+
 class GatewayProxyRepo(BaseProxyRepo):
     """
     Repo implementation used on gateways. Stores state in memory and maintains a copy on disk.
+
+    The copy on disk is a snapshot of the state plus a journal of mutations made after the
+    snapshot, so that mutations only append a record instead of rewriting the whole state.
+    Once the journal grows larger than the snapshot, it is compacted into a new snapshot.
+
+    In memory, the state is an immutable `_Snapshot` that is replaced on every mutation.
+    Reads don't take locks and don't observe partially applied mutations.
     """
 
-    def __init__(self, state: Optional[State] = None, file: Optional[Path] = None) -> None:
-        self._state = state or State()
+    def __init__(
+        self,
+        state: Optional[State] = None,
+        file: Optional[Path] = None,
+        journal_compaction_min_size: int = JOURNAL_COMPACTION_MIN_SIZE,
+    ) -> None:
+        self._snapshot = _Snapshot(state or State())
         self._file = file
-        self._lock = RWLock()
+        self._journal: Optional[Journal] = None
+        self._snapshot_size = 0
+        if file is not None:
+            self._journal = Journal(_get_journal_path(file))
+            if file.exists():
+                self._snapshot_size = file.stat().st_size
+        self._journal_compaction_min_size = journal_compaction_min_size
+        self._write_lock = asyncio.Lock()
 
     async def list_services(self) -> list[Service]:
-        async with self.reader():
-            services_by_project = (
-                project_services.values() for project_services in self._state.services.values()
-            )
-            return list(chain(*services_by_project))
+        services_by_project = (
+            project_services.values()
+            for project_services in self._snapshot.state.services.values()
+        )
+        return list(chain(*services_by_project))
 
     async def get_service(self, project_name: str, run_name: str) -> Optional[Service]:
-        async with self.reader():
-            return self._state.services.get(project_name, {}).get(run_name)
+        return self._snapshot.state.services.get(project_name, {}).get(run_name)
 
     async def get_service_by_domain(self, domain: str) -> Optional[Service]:
-        async with self.reader():
-            for project_services in self._state.services.values():
-                for service in project_services.values():
-                    if service.domain == domain:
-                        return service
-            return None
+        return self._snapshot.services_by_domain.get(domain)
 
     async def set_service(self, service: Service) -> None:
-        async with self.writer():
-            self._state.services.setdefault(service.project_name, {})[service.run_name] = service
+        await self._apply(SetServiceRecord(service=service))
 
     async def delete_service(self, project_name: str, run_name: str) -> None:
-        async with self.writer():
-            project_services = self._state.services.get(project_name, {})
-            project_services.pop(run_name, None)
-            if not project_services:
-                self._state.services.pop(project_name, None)
+        await self._apply(DeleteServiceRecord(project_name=project_name, run_name=run_name))
 
     async def list_models(self, project_name: str) -> list[ChatModel]:
-        async with self.reader():
-            return list(self._state.models.get(project_name, {}).values())
+        return list(self._snapshot.state.models.get(project_name, {}).values())
+
+    async def list_models_by_run(self, project_name: str, run_name: str) -> list[ChatModel]:
+        return list(self._snapshot.models_by_run.get(project_name, {}).get(run_name, []))
 
     async def get_model(self, project_name: str, name: str) -> Optional[ChatModel]:
-        async with self.reader():
-            return self._state.models.get(project_name, {}).get(name)
+        return self._snapshot.state.models.get(project_name, {}).get(name)
 
     async def set_model(self, model: ChatModel) -> None:
-        async with self.writer():
-            self._state.models.setdefault(model.project_name, {})[model.name] = model
+        await self._apply(SetModelRecord(model=model))
 
     async def delete_models_by_run(self, project_name: str, run_name: str) -> None:
-        async with self.writer():
-            project_models = self._state.models.get(project_name, {})
-            models_to_delete = [m for m in project_models.values() if m.run_name == run_name]
-            for model in models_to_delete:
-                project_models.pop(model.name, None)
-            if not project_models:
-                self._state.models.pop(project_name, None)
+        await self._apply(DeleteModelsByRunRecord(project_name=project_name, run_name=run_name))
 
     async def list_entrypoints(self) -> list[ModelEntrypoint]:
-        async with self.reader():
-            return list(self._state.entrypoints.values())
+        return list(self._snapshot.state.entrypoints.values())
 
     async def set_entrypoint(self, entrypoint: ModelEntrypoint) -> None:
-        async with self.writer():
-            self._state.entrypoints[entrypoint.project_name] = entrypoint
+        await self._apply(SetEntrypointRecord(entrypoint=entrypoint))
 
     async def get_project(self, name: str) -> Optional[Project]:
-        async with self.reader():
-            return self._state.projects.get(name)
+        return self._snapshot.state.projects.get(name)
 
     async def set_project(self, project: Project) -> None:
-        async with self.writer():
-            self._state.projects[project.name] = project
+        await self._apply(SetProjectRecord(project=project))
 
     async def get_config(self) -> GlobalProxyConfig:
-        async with self.reader():
-            return self._state.config
+        return self._snapshot.state.config
 
     async def set_config(self, config: GlobalProxyConfig) -> None:
-        async with self.writer():
-            self._state.config = config
-
-    @asynccontextmanager
-    async def reader(self):
-        async with self._lock.reader:
-            yield
-
-    @asynccontextmanager
-    async def writer(self):
-        async with self._lock.writer:
-            yield
+        await self._apply(SetConfigRecord(config=config))
+
+    async def compact(self) -> None:
+        """
+        Saves a new snapshot and truncates the journal if the journal is large enough.
+        Only blocks writers, readers can proceed.
+        """
+        async with self._write_lock:
+            if not self._needs_compaction():
+                return
             await run_async(self.save)
 
+    def close(self) -> None:
+        """
+        Syncs the journal to disk and closes it.
+        """
+        if self._journal is not None:
+            self._journal.sync()
+            self._journal.close()
+
     @staticmethod
-    def load(state_file: Path) -> "GatewayProxyRepo":
+    def load(
+        state_file: Path, journal_compaction_min_size: int = JOURNAL_COMPACTION_MIN_SIZE
+    ) -> "GatewayProxyRepo":
         if state_file.exists():
             state = State.model_validate_json(state_file.read_text())
         else:
             state = None
-        return GatewayProxyRepo(state=state, file=state_file)
+        repo = GatewayProxyRepo(
+            state=state,
+            file=state_file,
+            journal_compaction_min_size=journal_compaction_min_size,
+        )
+        if repo._journal is not None:
+            records = repo._journal.read()
+            if records:
+                state = repo._snapshot.state.model_copy()
+                for record in records:
+                    record.apply(state)
+                repo._snapshot = _Snapshot(state)
+                repo.save()
+        return repo
 
     def save(self) -> None:
-        if self._file is not None:
-            self._file.write_text(self._state.model_dump_json())
+        """
+        Atomically replaces the snapshot with the current state and truncates the journal.
+        """
+        if self._file is None:
+            return
+        data = self._snapshot.state.model_dump_json()
+        tmp_file = self._file.with_name(self._file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self._file)
+        _fsync_dir(self._file.parent)
+        self._snapshot_size = len(data.encode())
+        if self._journal is not None:
+            self._journal.truncate()
+
+    async def _apply(self, record: AnyJournalRecord) -> None:
+        async with self._write_lock:
+            state = self._snapshot.state.model_copy()
+            record.apply(state)
+            if self._journal is not None:
+                self._journal.append(record)
+            self._snapshot = _Snapshot(state, previous=self._snapshot)
+        if self._needs_compaction():
+            await self.compact()
+
+    def _needs_compaction(self) -> bool:
+        if self._journal is None:
+            return False
+        return self._journal.size >= max(self._snapshot_size, self._journal_compaction_min_size)
+
+
+def _update_index(
+    index: Optional[dict[str, V]],
+    groups: dict[str, dict[str, V]],
+    previous_groups: Optional[dict[str, dict[str, V]]],
+    get_keys: Callable[[V], list[str]],
+) -> dict[str, V]:
+    """
+    Returns an index of values from `groups` by keys from `get_keys`. If `index` is the
+    index of `previous_groups`, only re-indexes values that were replaced since then.
+    """
+    if index is None or previous_groups is None:
+        index = {}
+        for group in groups.values():
+            for value in group.values():
+                for key in get_keys(value):
+                    index.setdefault(key, value)
+        return index
+    if groups is previous_groups:
+        return index
+    index = dict(index)
+    for group_key in _get_changed_groups(groups, previous_groups):
+        group = groups.get(group_key, {})
+        previous_group = previous_groups.get(group_key, {})
+        for value_key in chain(group, previous_group):
+            value = group.get(value_key)
+            previous_value = previous_group.get(value_key)
+            if value is previous_value:
+                continue
+            if previous_value is not None:
+                for key in get_keys(previous_value):
+                    if index.get(key) is previous_value:
+                        del index[key]
+            if value is not None:
+                for key in get_keys(value):
+                    index.setdefault(key, value)
+    return index
+
+
+def _update_groups_index(
+    index: Optional[dict[str, dict[str, list[V]]]],
+    groups: dict[str, dict[str, V]],
+    previous_groups: Optional[dict[str, dict[str, V]]],
+    get_key: Callable[[V], str],
+) -> dict[str, dict[str, list[V]]]:
+    """
+    Returns an index of values from each group of `groups` by keys from `get_key`.
+    If `index` is the index of `previous_groups`, only re-indexes groups that were
+    replaced since then.
+    """
+    if index is not None and groups is previous_groups:
+        return index
+    changed_groups = _get_changed_groups(groups, previous_groups if index is not None else None)
+    index = dict(index) if index is not None and previous_groups is not None else {}
+    for group_key in changed_groups:
+        group_index: dict[str, list[V]] = {}
+        for value in groups.get(group_key, {}).values():
+            group_index.setdefault(get_key(value), []).append(value)
+        if group_index:
+            index[group_key] = group_index
+        else:
+            index.pop(group_key, None)
+    return index
+
+
+def _get_changed_groups(
+    groups: dict[str, dict[str, V]], previous_groups: Optional[dict[str, dict[str, V]]]
+) -> Iterable[str]:
+    if previous_groups is None:
+        return groups.keys()
+    return {
+        group_key
+        for group_key in chain(groups, previous_groups)
+        if groups.get(group_key) is not previous_groups.get(group_key)
+    }
+
+
+def _get_journal_path(state_file: Path) -> Path:
+    return state_file.with_name(state_file.name + ".journal")
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
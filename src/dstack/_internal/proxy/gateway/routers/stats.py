@@ -2,17 +2,33 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends
 
-from dstack._internal.proxy.gateway.deps import get_gateway_proxy_repo, get_stats_collector
+from dstack._internal.proxy.gateway.deps import (
+    get_gateway_proxy_repo,
+    get_nginx,
+    get_stats_collector,
+)
 from dstack._internal.proxy.gateway.repo.repo import GatewayProxyRepo
-from dstack._internal.proxy.gateway.schemas.stats import ServiceStats
+from dstack._internal.proxy.gateway.schemas.stats import NginxReloadStats, ServiceStats
+from dstack._internal.proxy.gateway.services.nginx import Nginx
 from dstack._internal.proxy.gateway.services.stats import StatsCollector, get_service_stats
+from dstack._internal.proxy.lib.deps import get_model_proxy_stats
+from dstack._internal.proxy.lib.services.model_proxy.stats import ModelProxyStats
 
 router = APIRouter()
 
 
-@router.get("/collect")
+# Token-level fields are omitted for services without model proxy requests
+@router.get("/collect", response_model_exclude_defaults=True)
 async def collect_stats(
     repo: Annotated[GatewayProxyRepo, Depends(get_gateway_proxy_repo)],
     collector: Annotated[StatsCollector, Depends(get_stats_collector)],
+    model_stats: Annotated[ModelProxyStats, Depends(get_model_proxy_stats)],
 ) -> list[ServiceStats]:
-    return await get_service_stats(repo, collector)
+    return await get_service_stats(repo, collector, model_stats)
+
+
+@router.get("/nginx")
+async def get_nginx_stats(
+    nginx: Annotated[Nginx, Depends(get_nginx)],
+) -> NginxReloadStats:
+    return nginx.reload_stats
@@ -1,9 +1,21 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class Stat(BaseModel):
     requests: int
     request_time: float
+    # Token-level metrics measured by the model proxy, defaults for older gateways
+    streamed_requests: int = 0
+    """Number of streamed model requests, for which token latencies are measured"""
+    ttft: Optional[float] = None
+    """Average time to first token, seconds"""
+    inter_token_latency: Optional[float] = None
+    """Average time between output tokens, seconds"""
+    output_tokens_per_second: float = 0.0
+    queue_depth: float = 0.0
+    """Average number of in-flight model requests per replica"""
 
 
 PerWindowStats = dict[int, Stat]  # keys - length of time window in seconds
@@ -13,3 +25,12 @@ class ServiceStats(BaseModel):
     project_name: str
     run_name: str
     stats: PerWindowStats
+
+
+class NginxReloadStats(BaseModel):
+    reloads: int = 0
+    failed_reloads: int = 0
+    rejected_confs: int = 0
+    """Number of config files rolled back because `nginx -t` failed on them"""
+    last_reload_duration: Optional[float] = None
+    total_reload_duration: float = 0.0
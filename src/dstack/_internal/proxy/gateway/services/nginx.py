@@ -1,10 +1,13 @@
+import asyncio
 import importlib.resources
 import socket
 import subprocess
 import tempfile
+import time
 from asyncio import Lock
+from functools import partial
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Generator, Iterable, Optional
 from urllib.parse import urlparse
 
 import jinja2
@@ -14,6 +17,7 @@ from typing_extensions import Literal
 from dstack._internal.core.models.routers import AnyServiceRouterConfig, RouterType
 from dstack._internal.proxy.gateway.const import PROXY_PORT_ON_GATEWAY
 from dstack._internal.proxy.gateway.models import ACMESettings
+from dstack._internal.proxy.gateway.schemas.stats import NginxReloadStats
 from dstack._internal.proxy.gateway.services.model_routers import (
     Router,
     RouterContext,
@@ -27,6 +31,8 @@ from dstack._internal.utils.logging import get_logger
 CERTBOT_TIMEOUT = 40
 CERTBOT_2ND_TIMEOUT = 5
 CONFIGS_DIR = Path("/etc/nginx/sites-enabled")
+# Config changes made within this window are validated and applied with one nginx reload
+CONFIG_BATCH_WINDOW = 0.05
 logger = get_logger(__name__)
 
 
@@ -85,12 +91,59 @@ class ModelEntrypointConfig(SiteConfig):
     project_name: str
 
 
-class Nginx:
-    """Updates nginx config and issues SSL certificates."""
+class _ConfigBatch:
+    def __init__(self) -> None:
+        # conf path -> new content or `None` to delete the conf
+        self.changes: Dict[Path, Optional[str]] = {}
+        self.done: asyncio.Future[Dict[Path, Exception]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self.flush_task: Optional[asyncio.Task] = None
+
+
+class PendingConfigChange:
+    """
+    Config changes added to a batch. Await to wait until the batch is applied.
+    Raises if any of the changes was rejected.
+    """
+
+    def __init__(self, batch: Optional[_ConfigBatch], paths: Iterable[Path]) -> None:
+        self._batch = batch
+        self._paths = list(paths)
+
+    def __await__(self) -> Generator[Any, None, None]:
+        return self._wait().__await__()
+
+    async def _wait(self) -> None:
+        if self._batch is None:
+            return
+        errors = await asyncio.shield(self._batch.done)
+        for path in self._paths:
+            if path in errors:
+                raise errors[path]
 
-    def __init__(self, conf_dir: Path = Path("/etc/nginx/sites-enabled")) -> None:
+
+class Nginx:
+    """
+    Updates nginx config and issues SSL certificates.
+
+    Config changes are applied in batches. Changes made concurrently within a short
+    window or while the previous batch is being applied are validated with one
+    `nginx -t` and applied with one nginx reload. Invalid files are rolled back
+    without affecting the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        conf_dir: Path = Path("/etc/nginx/sites-enabled"),
+        batch_window: float = CONFIG_BATCH_WINDOW,
+    ) -> None:
         self._conf_dir = conf_dir
         self._lock: Lock = Lock()
+        self._batch_window = batch_window
+        self._pending_batch: Optional[_ConfigBatch] = None
+        self._batch_lock: Lock = Lock()
+        self.reload_stats = NginxReloadStats()
         # 1:1 service-to-router mapping
         self._router_port_to_domain: Dict[int, str] = {}
         self._domain_to_router: Dict[str, Router] = {}
@@ -105,6 +158,14 @@ class Nginx:
         self._next_worker_port: int = self._WORKER_PORT_MIN
 
     async def register(self, conf: SiteConfig, acme: ACMESettings) -> None:
+        await (await self.submit_register(conf, acme))
+        logger.info("Registered %s domain %s", conf.type, conf.domain)
+
+    async def submit_register(self, conf: SiteConfig, acme: ACMESettings) -> PendingConfigChange:
+        """
+        Same as `register()` but returns once the config is added to a batch
+        instead of waiting for the batch to be applied.
+        """
         logger.debug("Registering %s domain %s", conf.type, conf.domain)
         conf_name = self.get_config_name(conf.domain)
         async with self._lock:
@@ -168,11 +229,7 @@ class Nginx:
                             f"http://{router.context.host}:{port}" for port in allocated_ports
                         ]
                         if conf.replicas:
-                            await run_async(
-                                self.write_router_workers_conf,
-                                conf,
-                                allocated_ports,
-                            )
+                            await self.write_router_workers_conf(conf, allocated_ports)
                         if conf.domain in self._domain_to_worker_urls:
                             self._discard_ports(self._domain_to_worker_urls[conf.domain])
                         self._domain_to_worker_urls[conf.domain] = replica_urls
@@ -187,19 +244,24 @@ class Nginx:
                         )
                         raise
 
-            await run_async(self.write_conf, conf.render(), conf_name)
-
-        logger.info("Registered %s domain %s", conf.type, conf.domain)
+        return self._add_changes({self._conf_dir / conf_name: conf.render()})
 
     async def unregister(self, service: models.Service) -> None:
+        await (await self.submit_unregister(service))
+        logger.info("Unregistered domain %s", service.domain_safe)
+
+    async def submit_unregister(self, service: models.Service) -> PendingConfigChange:
+        """
+        Same as `unregister()` but returns once the config removal is added to a batch
+        instead of waiting for the batch to be applied.
+        """
         domain = service.domain_safe
         logger.debug("Unregistering domain %s", domain)
         conf_path = self._conf_dir / self.get_config_name(domain)
         if not conf_path.exists():
-            return
+            return PendingConfigChange(None, ())
+        changes: Dict[Path, Optional[str]] = {conf_path: None}
         async with self._lock:
-            await run_async(sudo_rm, conf_path)
-
             if domain in self._domain_to_router:
                 router = self._domain_to_router[domain]
                 # Remove all workers for this domain
@@ -224,10 +286,9 @@ class Nginx:
                 # Remove workers config file
                 workers_conf_path = self._conf_dir / f"router-workers.{domain}.conf"
                 if workers_conf_path.exists():
-                    await run_async(sudo_rm, workers_conf_path)
+                    changes[workers_conf_path] = None
 
-            await run_async(self.reload)
-        logger.info("Unregistered domain %s", domain)
+        return self._add_changes(changes)
 
     @staticmethod
     def reload() -> None:
@@ -236,22 +297,93 @@ class Nginx:
         if r.returncode != 0:
             raise UnexpectedProxyError("Failed to reload nginx")
 
-    def write_conf(self, conf: str, conf_name: str) -> None:
+    @staticmethod
+    def validate() -> Optional[str]:
+        """Returns `nginx -t` output if the config is invalid."""
+        cmd = ["sudo", "nginx", "-t"]
+        r = subprocess.run(cmd, capture_output=True, timeout=10)
+        if r.returncode != 0:
+            return r.stderr.decode(errors="replace").strip()
+        return None
+
+    async def write_conf(self, conf: str, conf_name: str) -> None:
         """Update config and reload nginx. Rollback changes on error."""
-        conf_path = self._conf_dir / conf_name
-        old_conf = conf_path.read_text() if conf_path.exists() else None
-        if conf == old_conf:
-            return
-        sudo_write(conf_path, conf)
+        await self._apply_changes({self._conf_dir / conf_name: conf})
+
+    async def _apply_changes(self, changes: Dict[Path, Optional[str]]) -> None:
+        await self._add_changes(changes)
+
+    def _add_changes(self, changes: Dict[Path, Optional[str]]) -> PendingConfigChange:
+        if self._pending_batch is None:
+            self._pending_batch = _ConfigBatch()
+            flush_task = asyncio.create_task(self._flush_batch(self._pending_batch))
+            flush_task.add_done_callback(partial(self._on_flush_done, self._pending_batch))
+            self._pending_batch.flush_task = flush_task
+        batch = self._pending_batch
+        batch.changes.update(changes)
+        return PendingConfigChange(batch, changes)
+
+    async def _flush_batch(self, batch: _ConfigBatch) -> None:
+        async with self._batch_lock:
+            await asyncio.sleep(self._batch_window)
+            # Changes made from now on will be applied in the next batch
+            if self._pending_batch is batch:
+                self._pending_batch = None
+            try:
+                errors = await run_async(self._apply_batch, batch.changes)
+            except Exception as e:
+                batch.done.set_exception(e)
+            else:
+                batch.done.set_result(errors)
+
+    def _on_flush_done(self, batch: _ConfigBatch, flush_task: asyncio.Task) -> None:
+        # The flush may be cancelled, e.g. on shutdown. Don't leave the waiters hanging.
+        if self._pending_batch is batch:
+            self._pending_batch = None
+        if not batch.done.done():
+            batch.done.set_exception(UnexpectedProxyError("Nginx config changes were not applied"))
+
+    def _apply_batch(self, changes: Dict[Path, Optional[str]]) -> Dict[Path, Exception]:
+        old_confs: Dict[Path, Optional[str]] = {}
+        for path, conf in changes.items():
+            old_conf = path.read_text() if path.exists() else None
+            if conf == old_conf:
+                continue
+            old_confs[path] = old_conf
+            if conf is not None:
+                sudo_write(path, conf)
+            else:
+                sudo_rm(path)
+        if not old_confs:
+            return {}
+
+        errors: Dict[Path, Exception] = {}
+        while old_confs and (output := self.validate()) is not None:
+            # nginx reports the file and line of the first error. If it is not among
+            # the changed files, the error can't be attributed and all changes are rejected.
+            invalid = [path for path in old_confs if str(path) in output] or list(old_confs)
+            for path in invalid:
+                logger.warning("Rolling back invalid nginx config %s: %s", path, output)
+                _rollback_conf(path, old_confs.pop(path))
+                errors[path] = UnexpectedProxyError(f"Invalid nginx config {path.name}: {output}")
+                self.reload_stats.rejected_confs += 1
+        if not old_confs:
+            return errors
+
+        start = time.monotonic()
         try:
             self.reload()
-        except UnexpectedProxyError:
-            # rollback changes
-            if old_conf is not None:
-                sudo_write(conf_path, old_conf)
-            else:
-                sudo_rm(conf_path)
-            raise
+        except UnexpectedProxyError as e:
+            self.reload_stats.failed_reloads += 1
+            for path, old_conf in old_confs.items():
+                _rollback_conf(path, old_conf)
+                errors[path] = e
+        else:
+            self.reload_stats.reloads += 1
+        duration = time.monotonic() - start
+        self.reload_stats.last_reload_duration = duration
+        self.reload_stats.total_reload_duration += duration
+        return errors
 
     @classmethod
     def run_certbot(cls, domain: str, acme: ACMESettings) -> None:
@@ -425,16 +557,18 @@ class Nginx:
             if parsed.port is not None and parsed.port in self._allocated_worker_ports:
                 self._allocated_worker_ports.discard(parsed.port)
 
-    def write_global_conf(self) -> None:
+    async def write_global_conf(self) -> None:
         conf = read_package_resource("00-log-format.conf")
-        self.write_conf(conf, "00-log-format.conf")
+        await self.write_conf(conf, "00-log-format.conf")
 
-    def write_router_workers_conf(self, conf: ServiceConfig, allocated_ports: list[int]) -> None:
+    async def write_router_workers_conf(
+        self, conf: ServiceConfig, allocated_ports: list[int]
+    ) -> None:
         """Write router workers configuration file (generic)."""
         # Pass ports to template
         workers_config = generate_router_workers_config(conf, allocated_ports)
         workers_conf_name = f"router-workers.{conf.domain}.conf"
-        self.write_conf(workers_config, workers_conf_name)
+        await self.write_conf(workers_config, workers_conf_name)
 
 
 def generate_router_workers_config(conf: ServiceConfig, allocated_ports: list[int]) -> str:
@@ -456,6 +590,13 @@ def read_package_resource(file: str) -> str:
     )
 
 
+def _rollback_conf(path: Path, old_conf: Optional[str]) -> None:
+    if old_conf is not None:
+        sudo_write(path, old_conf)
+    else:
+        sudo_rm(path)
+
+
 def sudo_write(path: Path, content: str) -> None:
     with tempfile.NamedTemporaryFile("w") as temp:
         temp.write(content)
@@ -16,6 +16,7 @@ from dstack._internal.proxy.gateway.services.nginx import (
     LocationConfig,
     ModelEntrypointConfig,
     Nginx,
+    PendingConfigChange,
     ReplicaConfig,
     ServiceConfig,
 )
@@ -83,7 +84,7 @@ async def register_service(
 
         logger.debug("Registering service %s", service.fmt())
 
-        await apply_service(
+        _, nginx_change = await submit_service(
             service=service,
             old_service=None,
             repo=repo,
@@ -103,6 +104,16 @@ async def register_service(
                 ),
             )
 
+    # Wait for nginx outside of the lock so that concurrent changes share one reload
+    try:
+        await nginx_change
+    except BaseException:
+        async with lock:
+            if await repo.get_service(project_name, run_name) == service:
+                await repo.delete_models_by_run(project_name, run_name)
+                await repo.delete_service(project_name, run_name)
+        raise
+
     logger.info("Service %s is registered now", service.fmt())
 
 
@@ -126,10 +137,14 @@ async def unregister_service(
             ids=(r.id for r in service.replicas),
             service_conn_pool=service_conn_pool,
         )
-        await nginx.unregister(service)
+        nginx_change = await nginx.submit_unregister(service)
+        if service.domain is not None:
+            await service_conn_pool.remove_domain_client(service.domain)
         await repo.delete_models_by_run(project_name, run_name)
         await repo.delete_service(project_name, run_name)
 
+    await nginx_change
+
     logger.info("Service %s is unregistered now", service.fmt())
 
 
@@ -180,6 +195,10 @@ async def register_replica(
         internal_ip=internal_ip,
     )
 
+    # Open the connection before taking the lock so that concurrent registrations
+    # don't wait for each other's SSH handshakes and their nginx changes share a batch
+    await _open_replica_connection(project_name, run_name, replica, repo, service_conn_pool)
+
     async with lock:
         old_service = await repo.get_service(project_name, run_name)
         if old_service is None:
@@ -195,19 +214,28 @@ async def register_replica(
         service = old_service.with_replicas(old_service.replicas + (replica,))
 
         logger.debug("Registering replica %s in service %s", replica.id, service.fmt())
-        failures = await apply_service(
+        failures, nginx_change = await submit_service(
             service=service,
             old_service=old_service,
             repo=repo,
             nginx=nginx,
             service_conn_pool=service_conn_pool,
         )
-        if replica in failures:
-            raise ProxyError(
-                f"Cannot register replica {replica.id}"
-                f" in service {service.fmt()}: {failures[replica]}"
-            )
-        await repo.set_service(service)
+        if replica not in failures:
+            await repo.set_service(service)
+
+    # Wait for nginx outside of the lock so that concurrent changes share one reload
+    try:
+        await nginx_change
+    except BaseException:
+        if replica not in failures:
+            async with lock:
+                await _remove_replica_from_repo(project_name, run_name, replica, repo)
+        raise
+    if replica in failures:
+        raise ProxyError(
+            f"Cannot register replica {replica.id} in service {service.fmt()}: {failures[replica]}"
+        )
 
     logger.info("Replica %s in service %s is registered now", replica.id, service.fmt())
 
@@ -238,7 +266,7 @@ async def unregister_replica(
 
         logger.debug("Unregistering replica %s in service %s", replica.id, service.fmt())
 
-        await apply_service(
+        _, nginx_change = await submit_service(
             service=service,
             old_service=old_service,
             repo=repo,
@@ -247,6 +275,8 @@ async def unregister_replica(
         )
         await repo.set_service(service)
 
+    await nginx_change
+
     logger.info("Replica %s in service %s is unregistered now", replica_id, service.fmt())
 
 
@@ -273,6 +303,37 @@ def _uses_pd_disaggregation(service: models.Service) -> bool:
     return service.router is not None and service.router.pd_disaggregation
 
 
+async def _open_replica_connection(
+    project_name: str,
+    run_name: str,
+    replica: models.Replica,
+    repo: GatewayProxyRepo,
+    service_conn_pool: ServiceConnectionPool,
+) -> None:
+    service = await repo.get_service(project_name, run_name)
+    project = await repo.get_project(project_name)
+    if service is None or project is None or _uses_pd_disaggregation(service):
+        return
+    try:
+        await service_conn_pool.get_or_add(
+            project, service.with_replicas(service.replicas + (replica,)), replica
+        )
+    except Exception as e:
+        raise ProxyError(
+            f"Cannot register replica {replica.id} in service {service.fmt()}: {e}"
+        ) from e
+
+
+async def _remove_replica_from_repo(
+    project_name: str, run_name: str, replica: models.Replica, repo: GatewayProxyRepo
+) -> None:
+    service = await repo.get_service(project_name, run_name)
+    if service is not None and service.find_replica(replica.id) == replica:
+        await repo.set_service(
+            service.with_replicas(tuple(r for r in service.replicas if r != replica))
+        )
+
+
 async def apply_service(
     service: models.Service,
     old_service: Optional[models.Service],
@@ -280,6 +341,28 @@ async def apply_service(
     nginx: Nginx,
     service_conn_pool: ServiceConnectionPool,
 ) -> dict[models.Replica, BaseException]:
+    replica_failures, nginx_change = await submit_service(
+        service=service,
+        old_service=old_service,
+        repo=repo,
+        nginx=nginx,
+        service_conn_pool=service_conn_pool,
+    )
+    await nginx_change
+    return replica_failures
+
+
+async def submit_service(
+    service: models.Service,
+    old_service: Optional[models.Service],
+    repo: GatewayProxyRepo,
+    nginx: Nginx,
+    service_conn_pool: ServiceConnectionPool,
+) -> tuple[dict[models.Replica, BaseException], PendingConfigChange]:
+    """
+    Same as `apply_service()` but returns once the nginx config is added to a batch.
+    Await the returned `PendingConfigChange` to wait for nginx to be reloaded.
+    """
     if old_service is not None:
         if service.domain != old_service.domain:
             raise UnexpectedProxyError(
@@ -318,8 +401,10 @@ async def apply_service(
             for replica, conn in replica_conns.items()
         ]
     service_config = await get_nginx_service_config(service, replica_configs)
-    await nginx.register(service_config, (await repo.get_config()).acme_settings)
-    return replica_failures
+    nginx_change = await nginx.submit_register(
+        service_config, (await repo.get_config()).acme_settings
+    )
+    return replica_failures, nginx_change
 
 
 async def get_or_add_replica_connections(
@@ -454,10 +539,8 @@ async def _migrate_cors_enabled(repo: GatewayProxyRepo) -> None:
     services = await repo.list_services()
     openai_run_names: set[tuple[str, str]] = set()
     for service in services:
-        for model in await repo.list_models(service.project_name):
-            if model.run_name == service.run_name and isinstance(
-                model.format_spec, models.OpenAIChatModelFormat
-            ):
+        for model in await repo.list_models_by_run(service.project_name, service.run_name):
+            if isinstance(model.format_spec, models.OpenAIChatModelFormat):
                 openai_run_names.add((service.project_name, service.run_name))
     for service in services:
         if (
@@ -1,18 +1,20 @@
 import asyncio
+import dataclasses
 import datetime
 import logging
+import math
 import os
-from collections import deque
-from collections.abc import Reversible
 from pathlib import Path
 from typing import Iterable, Optional, TextIO
 
-from pydantic import BaseModel
-
 from dstack._internal.proxy.gateway.const import SERVICE_SCALING_WINDOWS
 from dstack._internal.proxy.gateway.repo.repo import GatewayProxyRepo
 from dstack._internal.proxy.gateway.schemas.stats import PerWindowStats, ServiceStats, Stat
 from dstack._internal.proxy.lib.errors import UnexpectedProxyError
+from dstack._internal.proxy.lib.services.model_proxy.stats import (
+    ModelProxyStats,
+    PerWindowTokenStats,
+)
 from dstack._internal.utils.common import run_async
 
 logger = logging.getLogger(__name__)
@@ -20,22 +22,97 @@ TTL = max(SERVICE_SCALING_WINDOWS)
 EMPTY_STATS = {window: Stat(requests=0, request_time=0.0) for window in SERVICE_SCALING_WINDOWS}
 
 
-class StatFrame(BaseModel):
-    """Service metrics aggregated over a 1s frame"""
+class HostStats:
+    """
+    Service metrics of a host in 1s frames over the last `TTL` seconds, stored in a ring buffer.
+    Totals for each of `SERVICE_SCALING_WINDOWS` are updated incrementally as frames
+    are added and as windows slide, so reading them does not rescan frames.
+    """
+
+    __slots__ = (
+        "latest_timestamp",
+        "_frame_timestamps",
+        "_frame_requests",
+        "_frame_request_time_ms",
+        "_window_starts",
+        "_window_requests",
+        "_window_request_time_ms",
+    )
 
-    timestamp: int
-    requests: int
-    requests_time_total: float
+    def __init__(self) -> None:
+        self.latest_timestamp = -1
+        self._frame_timestamps = [-1] * TTL
+        self._frame_requests = [0] * TTL
+        # Nginx logs request time in milliseconds. Summing integers keeps incremental
+        # window totals exact, unlike adding and subtracting floats.
+        self._frame_request_time_ms = [0] * TTL
+        # Frames before the start of a window are not included in its totals
+        self._window_starts = [0] * len(SERVICE_SCALING_WINDOWS)
+        self._window_requests = [0] * len(SERVICE_SCALING_WINDOWS)
+        self._window_request_time_ms = [0] * len(SERVICE_SCALING_WINDOWS)
 
+    def add(self, timestamp: int, request_time_ms: int) -> None:
+        slot = timestamp % TTL
+        frame_timestamp = self._frame_timestamps[slot]
+        if frame_timestamp != timestamp:
+            if frame_timestamp > timestamp:
+                return  # the frame was already reused for a later second
+            self._discard_frame(slot)
+            self._frame_timestamps[slot] = timestamp
+        self._frame_requests[slot] += 1
+        self._frame_request_time_ms[slot] += request_time_ms
+        for i, window_start in enumerate(self._window_starts):
+            if timestamp >= window_start:
+                self._window_requests[i] += 1
+                self._window_request_time_ms[i] += request_time_ms
+        if timestamp > self.latest_timestamp:
+            self.latest_timestamp = timestamp
 
-class LogEntry(BaseModel):
-    """A line from the access log"""
+    def get(self, now: float) -> PerWindowStats:
+        """
+        :return: stats aggregated over `SERVICE_SCALING_WINDOWS` before `now`
+        """
+        result = {}
+        for i, window in enumerate(SERVICE_SCALING_WINDOWS):
+            self._slide_window(i, math.ceil(now - window))
+            requests = self._window_requests[i]
+            if requests > 0:
+                result[window] = Stat(
+                    requests=requests,
+                    request_time=round(self._window_request_time_ms[i] / requests / 1000, 3),
+                )
+            else:
+                result[window] = Stat(requests=0, request_time=0.0)
+        return result
 
-    timestamp: datetime.datetime
-    host: str
-    status: int
-    request_time: float
-    is_replica_hit: bool
+    def _slide_window(self, i: int, start: int) -> None:
+        prev_start = self._window_starts[i]
+        if start <= prev_start:
+            return
+        self._window_starts[i] = start
+        if start - prev_start >= TTL:
+            # All frames are either in the window or expired, recalculate from scratch
+            self._window_requests[i] = 0
+            self._window_request_time_ms[i] = 0
+            for slot, frame_timestamp in enumerate(self._frame_timestamps):
+                if frame_timestamp >= start:
+                    self._window_requests[i] += self._frame_requests[slot]
+                    self._window_request_time_ms[i] += self._frame_request_time_ms[slot]
+            return
+        for timestamp in range(prev_start, start):
+            slot = timestamp % TTL
+            if self._frame_timestamps[slot] == timestamp:
+                self._window_requests[i] -= self._frame_requests[slot]
+                self._window_request_time_ms[i] -= self._frame_request_time_ms[slot]
+
+    def _discard_frame(self, slot: int) -> None:
+        frame_timestamp = self._frame_timestamps[slot]
+        for i, window_start in enumerate(self._window_starts):
+            if frame_timestamp >= window_start:
+                self._window_requests[i] -= self._frame_requests[slot]
+                self._window_request_time_ms[i] -= self._frame_request_time_ms[slot]
+        self._frame_requests[slot] = 0
+        self._frame_request_time_ms[slot] = 0
 
 
 class StatsCollector:
@@ -46,109 +123,115 @@ class StatsCollector:
     def __init__(self, access_log: Path) -> None:
         self._path = access_log
         self._file: Optional[TextIO] = None
-        self._stats: dict[str, deque[StatFrame]] = {}
+        # The beginning of a line that was not completely written yet
+        self._partial_line = ""
+        self._stats: dict[str, HostStats] = {}
+        self._timestamp_parser = _TimestampParser()
         self._lock = asyncio.Lock()
 
     async def collect(self) -> dict[str, PerWindowStats]:
         """
         :return: stats per host aggregated by 30s, 1m, 5m
         """
-        result = {}
         async with self._lock:
             await run_async(self._collect)
-            now = datetime.datetime.now(tz=datetime.timezone.utc)
-            for host, frames in self._stats.items():
-                result[host] = self._aggregate(frames, now)
-        return result
-
-    @staticmethod
-    def _aggregate(frames: Reversible[StatFrame], now: datetime.datetime) -> PerWindowStats:
-        """
-        Aggregate 1s `frames` into windows 30s, 1m, 5m before `now`
-        """
-        result = {}
-        for window in SERVICE_SCALING_WINDOWS:
-            req_count = 0
-            req_time_total = 0.0
-            for frame in reversed(frames):
-                if now.timestamp() - frame.timestamp > window:
-                    break
-                req_time_total += frame.requests_time_total
-                req_count += frame.requests
-            if req_count > 0:
-                result[window] = Stat(
-                    requests=req_count,
-                    request_time=round(req_time_total / req_count, 3),
-                )
-            else:
-                result[window] = Stat(requests=0, request_time=0.0)
-        return result
+            now = _now()
+            return {host: stats.get(now) for host, stats in self._stats.items()}
 
     def _collect(self) -> None:
-        now = datetime.datetime.now(tz=datetime.timezone.utc)
-
-        for entry in self._read_access_log(now - datetime.timedelta(seconds=TTL)):
-            # only include requests that hit or should hit a service replica
-            if not entry.is_replica_hit:
-                continue
-
-            frame_timestamp = int(entry.timestamp.timestamp())
-            frames = self._stats.setdefault(entry.host, deque(maxlen=TTL))
-
-            # presume that log entries are sorted by timestamp
-            if not frames or frames[-1].timestamp != frame_timestamp:
-                latest_frame = StatFrame(
-                    timestamp=frame_timestamp, requests=1, requests_time_total=entry.request_time
-                )
-                frames.append(latest_frame)
+        now = _now()
+        after = now - TTL
+        parse_timestamp = self._timestamp_parser.parse
+        stats = self._stats
+        for line in self._read_access_log():
+            cells = line.split()
+            if len(cells) == 5:
+                is_replica_hit = cells[4]
+                # only include requests that hit or should hit a service replica
+                if is_replica_hit == "0":
+                    continue
+                if is_replica_hit != "1":
+                    _parse_nginx_bool(is_replica_hit)
+            elif len(cells) == 4:  # compatibility with pre-0.19.11 logs
+                if cells[2] == "403" or cells[2] == "404":
+                    continue
             else:
-                latest_frame = frames[-1]
-                latest_frame.requests += 1
-                latest_frame.requests_time_total += entry.request_time
+                logger.warning("Skipping malformed access log line: %r", line)
+                continue
+            timestamp = parse_timestamp(cells[0])
+            if timestamp < after:
+                continue
+            host_stats = stats.get(cells[1])
+            if host_stats is None:
+                host_stats = HostStats()
+                stats[cells[1]] = host_stats
+            host_stats.add(timestamp, round(float(cells[3]) * 1000))
 
-        for host in list(self._stats.keys()):
-            if self._stats[host][-1].timestamp < now.timestamp() - TTL:
-                del self._stats[host]
+        for host in list(stats.keys()):
+            if stats[host].latest_timestamp < after:
+                del stats[host]
 
-    def _read_access_log(self, after: datetime.datetime) -> Iterable[LogEntry]:
+    def _read_access_log(self) -> Iterable[str]:
         try:
             st_ino = os.stat(self._path).st_ino
         except FileNotFoundError:
             st_ino = None
 
         if self._file is not None:
-            while True:
-                line = self._file.readline()
-                if not line:
+            for line in self._file:
+                if not line.endswith("\n"):
+                    self._partial_line += line
                     break
-                cells = line.split()
-                if len(cells) == 4:  # compatibility with pre-0.19.11 logs
-                    cells.append("0" if cells[2] in ["403", "404"] else "1")
-                timestamp_str, host, status, request_time, dstack_replica_hit = cells
-                timestamp = datetime.datetime.fromisoformat(timestamp_str)
-                if timestamp < after:
-                    continue
-                yield LogEntry(
-                    timestamp=timestamp,
-                    host=host,
-                    status=int(status),
-                    request_time=float(request_time),
-                    is_replica_hit=_parse_nginx_bool(dstack_replica_hit),
-                )
+                if self._partial_line:
+                    line = self._partial_line + line
+                    self._partial_line = ""
+                yield line
             if os.fstat(self._file.fileno()).st_ino != st_ino:
                 # file was rotated
                 self._file.close()
                 self._file = None
+                if self._partial_line:
+                    yield self._partial_line
+                    self._partial_line = ""
 
         if self._file is None and st_ino is not None:
             logger.info("Opening access log file: %s", self._path)
             self._file = open(self._path, "r")
             # normally, recursion will not exceed depth of 2
-            yield from self._read_access_log(after)
+            yield from self._read_access_log()
+
+
+class _TimestampParser:
+    """
+    Parses nginx `$time_iso8601` timestamps to Unix time.
+    Full parsing only happens once a minute, otherwise seconds are read from
+    the string and added to the cached start of the minute.
+    """
+
+    def __init__(self) -> None:
+        # Timestamp without seconds, e.g. ("2024-12-06T12:08:", "+00:00")
+        self._minute: tuple[str, str] = ("", "")
+        self._minute_timestamp = 0
+
+    def parse(self, value: str) -> int:
+        if (
+            len(value) >= 19
+            and value.startswith(self._minute[0])
+            and value.endswith(self._minute[1])
+            and len(value) == len(self._minute[0]) + 2 + len(self._minute[1])
+        ):
+            seconds = value[17:19]
+            if seconds.isdigit():
+                return self._minute_timestamp + int(seconds)
+        timestamp = datetime.datetime.fromisoformat(value)
+        if value[16:17] == ":" and value[17:19].isdigit():
+            self._minute = (value[:17], value[19:])
+            self._minute_timestamp = int(timestamp.timestamp()) - timestamp.second
+        return int(timestamp.timestamp())
 
 
 async def get_service_stats(
-    repo: GatewayProxyRepo, collector: StatsCollector
+    repo: GatewayProxyRepo, collector: StatsCollector, model_stats: ModelProxyStats
 ) -> list[ServiceStats]:
     stats_per_host = await collector.collect()
     services = await repo.list_services()
@@ -156,15 +239,33 @@ async def get_service_stats(
         ServiceStats(
             project_name=service.project_name,
             run_name=service.run_name,
-            stats=stats_per_host.get(service.domain_safe, EMPTY_STATS),
+            stats=_with_token_stats(
+                stats_per_host.get(service.domain_safe, EMPTY_STATS),
+                model_stats.get(service.project_name, service.run_name),
+            ),
         )
         for service in services
     ]
 
 
+def _with_token_stats(
+    stats: PerWindowStats, token_stats: Optional[PerWindowTokenStats]
+) -> PerWindowStats:
+    if token_stats is None:
+        return stats
+    return {
+        window: stat.model_copy(update=dataclasses.asdict(token_stats[window]))
+        for window, stat in stats.items()
+    }
+
+
 def _parse_nginx_bool(v: str) -> bool:
     if v == "0":
         return False
     if v == "1":
         return True
     raise UnexpectedProxyError(f"Cannot parse boolean value: expected '0' or '1', got {v!r}")
+
+
+def _now() -> float:
+    return datetime.datetime.now(tz=datetime.timezone.utc).timestamp()
@@ -8,6 +8,7 @@ AnyMock = Union[MagicMock, AsyncMock]
 @dataclass
 class Mocks:
     reload_nginx: AnyMock
+    validate_nginx: AnyMock
     run_certbot: AnyMock
     open_conn: AnyMock
     close_conn: AnyMock
@@ -8,6 +8,7 @@ from typing_extensions import Annotated
 from dstack._internal.proxy.lib.auth import BaseProxyAuthProvider
 from dstack._internal.proxy.lib.errors import ProxyError, UnexpectedProxyError
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
+from dstack._internal.proxy.lib.services.model_proxy.stats import ModelProxyStats
 from dstack._internal.proxy.lib.services.service_connection import ServiceConnectionPool
 
 
@@ -20,6 +21,7 @@ class ProxyDependencyInjector(ABC):
 
     def __init__(self) -> None:
         self._service_conn_pool = ServiceConnectionPool()
+        self._model_proxy_stats = ModelProxyStats()
 
     # Abstract AsyncGenerator does not need async def since
     # type checkers infer a different type without yield in body.
@@ -36,6 +38,9 @@ class ProxyDependencyInjector(ABC):
     async def get_service_connection_pool(self) -> ServiceConnectionPool:
         return self._service_conn_pool
 
+    def get_model_proxy_stats(self) -> ModelProxyStats:
+        return self._model_proxy_stats
+
 
 def get_injector_from_app(app: FastAPI) -> ProxyDependencyInjector:
     injector = app.state.proxy_dependency_injector
@@ -68,6 +73,12 @@ async def get_service_connection_pool(
     return await injector.get_service_connection_pool()
 
 
+async def get_model_proxy_stats(
+    injector: Annotated[ProxyDependencyInjector, Depends(get_injector)],
+) -> ModelProxyStats:
+    return injector.get_model_proxy_stats()
+
+
 class ProxyAuthContext:
     def __init__(self, project_name: str, token: Optional[str], provider: BaseProxyAuthProvider):
         self._project_name = project_name
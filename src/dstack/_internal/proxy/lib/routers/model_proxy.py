@@ -1,20 +1,25 @@
 from typing import AsyncIterator, Optional
 
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from typing_extensions import Annotated
 
-from dstack._internal.proxy.lib.deps import ProxyAuth, get_proxy_repo, get_service_connection_pool
+from dstack._internal.proxy.lib.deps import (
+    ProxyAuth,
+    get_model_proxy_stats,
+    get_proxy_repo,
+    get_service_connection_pool,
+)
 from dstack._internal.proxy.lib.errors import ProxyError, UnexpectedProxyError
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
 from dstack._internal.proxy.lib.schemas.model_proxy import (
-    ChatCompletionsChunk,
     ChatCompletionsRequest,
     ChatCompletionsResponse,
     Model,
     ModelsResponse,
 )
 from dstack._internal.proxy.lib.services.model_proxy.model_proxy import get_chat_client
+from dstack._internal.proxy.lib.services.model_proxy.stats import ModelProxyStats
 from dstack._internal.proxy.lib.services.service_connection import (
     ServiceConnectionPool,
     get_service_replica_client,
@@ -41,6 +46,7 @@ async def post_chat_completions(
     body: ChatCompletionsRequest,
     repo: Annotated[BaseProxyRepo, Depends(get_proxy_repo)],
     service_conn_pool: Annotated[ServiceConnectionPool, Depends(get_service_connection_pool)],
+    model_stats: Annotated[ModelProxyStats, Depends(get_model_proxy_stats)],
 ):
     model = await repo.get_model(project_name, body.model)
     if model is None:
@@ -55,11 +61,17 @@ async def post_chat_completions(
         )
     http_client = await get_service_replica_client(service, repo, service_conn_pool)
     client = get_chat_client(model, http_client)
+    tracker = model_stats.track(project_name, model.run_name, len(service.replicas))
     if not body.stream:
-        return await client.generate(body)
+        content = None
+        try:
+            content = await client.generate_raw(body)
+        finally:
+            tracker.finish_response(content)
+        return Response(content=content, media_type="application/json")
     else:
         return StreamingResponse(
-            await StreamingAdaptor(client.stream(body)).get_stream(),
+            await StreamingAdaptor(tracker.observe_stream(client.stream_raw(body))).get_stream(),
             media_type="text/event-stream",
             headers={"X-Accel-Buffering": "no"},
         )
@@ -67,12 +79,11 @@ async def post_chat_completions(
 
 class StreamingAdaptor:
     """
-    Converts a stream of ChatCompletionsChunk to an SSE stream.
-    Also pre-fetches the first chunk **before** starting streaming to downstream,
+    Pre-fetches the first chunk of an SSE stream **before** starting streaming to downstream,
     so that upstream request errors can propagate to the downstream client.
     """
 
-    def __init__(self, stream: AsyncIterator[ChatCompletionsChunk]) -> None:
+    def __init__(self, stream: AsyncIterator[bytes]) -> None:
         self._stream = stream
 
     async def get_stream(self) -> AsyncIterator[bytes]:
@@ -82,21 +93,14 @@ class StreamingAdaptor:
             first_chunk = None
         return self._adaptor(first_chunk)
 
-    async def _adaptor(self, first_chunk: Optional[ChatCompletionsChunk]) -> AsyncIterator[bytes]:
-        if first_chunk is not None:
-            yield self._encode_chunk(first_chunk)
-
-            try:
-                async for chunk in self._stream:
-                    yield self._encode_chunk(chunk)
-            except ProxyError as e:
-                # No standard way to report errors while streaming,
-                # but we'll at least send them as comments
-                yield f": {e.detail!r}\n\n".encode()  # !r to avoid line breaks
-                return
-
-        yield "data: [DONE]\n\n".encode()
-
-    @staticmethod
-    def _encode_chunk(chunk: ChatCompletionsChunk) -> bytes:
-        return f"data:{chunk.model_dump_json()}\n\n".encode()
+    async def _adaptor(self, first_chunk: Optional[bytes]) -> AsyncIterator[bytes]:
+        if first_chunk is None:
+            return
+        yield first_chunk
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except ProxyError as e:
+            # No standard way to report errors while streaming,
+            # but we'll at least send them as comments
+            yield f"\n: {e.detail!r}\n\n".encode()  # !r to avoid line breaks
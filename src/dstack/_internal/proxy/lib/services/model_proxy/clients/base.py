@@ -16,3 +16,28 @@ class ChatCompletionsClient(ABC):
     @abstractmethod
     async def stream(self, request: ChatCompletionsRequest) -> AsyncIterator[ChatCompletionsChunk]:
         yield
+
+    async def generate_raw(self, request: ChatCompletionsRequest) -> bytes:
+        """
+        Returns the OpenAI-compatible JSON response body. Clients of upstreams that
+        already speak the OpenAI format can override it to return the body as is.
+        """
+        response = await self.generate(request)
+        return response.model_dump_json().encode()
+
+    async def stream_raw(self, request: ChatCompletionsRequest) -> AsyncIterator[bytes]:
+        """
+        Returns the OpenAI-compatible SSE stream, including the final `[DONE]` event.
+        Clients of upstreams that already speak the OpenAI format can override it
+        to forward the upstream stream as is.
+        """
+        async for chunk in self.stream(request):
+            yield encode_sse_chunk(chunk)
+        yield SSE_DONE
+
+
+SSE_DONE = b"data: [DONE]\n\n"
+
+
+def encode_sse_chunk(chunk: ChatCompletionsChunk) -> bytes:
+    return f"data:{chunk.model_dump_json()}\n\n".encode()
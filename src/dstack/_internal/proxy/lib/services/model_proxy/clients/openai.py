@@ -33,6 +33,32 @@ class OpenAIChatCompletions(ChatCompletionsClient):
         except ValidationError as e:
             raise ProxyError(f"Invalid response from model: {e}", status.HTTP_502_BAD_GATEWAY)
 
+    async def generate_raw(self, request: ChatCompletionsRequest) -> bytes:
+        # The upstream speaks the same format, so the response is passed through as is
+        try:
+            resp = await self._http.post(
+                f"{self._prefix}/chat/completions", json=request.model_dump(exclude_unset=True)
+            )
+            await self._propagate_error(resp)
+        except httpx.RequestError as e:
+            raise ProxyError(f"Error requesting model: {e!r}", status.HTTP_502_BAD_GATEWAY)
+        return resp.content
+
+    async def stream_raw(self, request: ChatCompletionsRequest) -> AsyncIterator[bytes]:
+        # The upstream speaks the same format, so the stream is forwarded without
+        # parsing the chunks, including the upstream's final `[DONE]` event
+        try:
+            async with self._http.stream(
+                "POST",
+                f"{self._prefix}/chat/completions",
+                json=request.model_dump(exclude_unset=True),
+            ) as resp:
+                await self._propagate_error(resp)
+                async for data in resp.aiter_bytes():
+                    yield data
+        except httpx.RequestError as e:
+            raise ProxyError(f"Error requesting model: {e!r}", status.HTTP_502_BAD_GATEWAY)
+
     async def stream(self, request: ChatCompletionsRequest) -> AsyncIterator[ChatCompletionsChunk]:
         try:
             async with self._http.stream(
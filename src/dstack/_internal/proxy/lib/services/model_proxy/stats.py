@@ -0,0 +1,269 @@
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from dstack._internal.proxy.gateway.const import SERVICE_SCALING_WINDOWS
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+TTL = max(SERVICE_SCALING_WINDOWS)
+
+
+@dataclass
+class TokenStat:
+    streamed_requests: int
+    """Number of streamed requests, for which token latencies are measured"""
+    ttft: Optional[float]
+    """Average time to first token, seconds"""
+    inter_token_latency: Optional[float]
+    """Average time between output tokens, seconds"""
+    output_tokens_per_second: float
+    queue_depth: float
+    """Average number of in-flight requests per replica"""
+
+
+PerWindowTokenStats = Dict[int, TokenStat]  # keys - length of time window in seconds
+
+
+class ServiceTokenStats:
+    """
+    Token-level metrics of a service's model in 1s frames over the last `TTL` seconds,
+    stored in a ring buffer.
+    """
+
+    __slots__ = (
+        "replicas",
+        "in_flight",
+        "_in_flight_changed_at",
+        "_frame_timestamps",
+        "_frame_streamed_requests",
+        "_frame_ttft",
+        "_frame_itl",
+        "_frame_itl_requests",
+        "_frame_output_tokens",
+        "_frame_in_flight_time",
+    )
+
+    def __init__(self) -> None:
+        self.replicas = 1
+        self.in_flight = 0
+        self._in_flight_changed_at = 0.0
+        self._frame_timestamps = [-1] * TTL
+        self._frame_streamed_requests = [0] * TTL
+        self._frame_ttft = [0.0] * TTL
+        self._frame_itl = [0.0] * TTL
+        self._frame_itl_requests = [0] * TTL
+        self._frame_output_tokens = [0] * TTL
+        # Sum of in-flight requests over time, request-seconds
+        self._frame_in_flight_time = [0.0] * TTL
+
+    def start_request(self, now: float) -> None:
+        self._account_in_flight(now)
+        self.in_flight += 1
+
+    def finish_request(
+        self,
+        now: float,
+        output_tokens: int,
+        ttft: Optional[float] = None,
+        inter_token_latency: Optional[float] = None,
+    ) -> None:
+        self._account_in_flight(now)
+        self.in_flight -= 1
+        slot = self._get_slot(int(now))
+        self._frame_output_tokens[slot] += output_tokens
+        if ttft is not None:
+            self._frame_streamed_requests[slot] += 1
+            self._frame_ttft[slot] += ttft
+        if inter_token_latency is not None:
+            self._frame_itl_requests[slot] += 1
+            self._frame_itl[slot] += inter_token_latency
+
+    def get(self, now: float) -> PerWindowTokenStats:
+        """
+        :return: stats aggregated over `SERVICE_SCALING_WINDOWS` before `now`
+        """
+        self._account_in_flight(now)
+        result = {}
+        for window in SERVICE_SCALING_WINDOWS:
+            start = math.ceil(now - window)
+            streamed_requests = itl_requests = output_tokens = 0
+            ttft = itl = in_flight_time = 0.0
+            for slot, timestamp in enumerate(self._frame_timestamps):
+                if timestamp >= start:
+                    streamed_requests += self._frame_streamed_requests[slot]
+                    ttft += self._frame_ttft[slot]
+                    itl_requests += self._frame_itl_requests[slot]
+                    itl += self._frame_itl[slot]
+                    output_tokens += self._frame_output_tokens[slot]
+                    in_flight_time += self._frame_in_flight_time[slot]
+            result[window] = TokenStat(
+                streamed_requests=streamed_requests,
+                ttft=round(ttft / streamed_requests, 3) if streamed_requests else None,
+                inter_token_latency=round(itl / itl_requests, 4) if itl_requests else None,
+                output_tokens_per_second=round(output_tokens / window, 3),
+                queue_depth=round(in_flight_time / window / max(self.replicas, 1), 3),
+            )
+        return result
+
+    def is_idle(self, now: float) -> bool:
+        return self.in_flight == 0 and max(self._frame_timestamps) < now - TTL
+
+    def _account_in_flight(self, now: float) -> None:
+        changed_at = self._in_flight_changed_at
+        self._in_flight_changed_at = now
+        if self.in_flight == 0 or now <= changed_at:
+            return
+        changed_at = max(changed_at, now - TTL)
+        # Split the time since the last change between the 1s frames it spans
+        while changed_at < now:
+            frame_end = min(math.floor(changed_at) + 1, now)
+            slot = self._get_slot(math.floor(changed_at))
+            self._frame_in_flight_time[slot] += self.in_flight * (frame_end - changed_at)
+            changed_at = frame_end
+
+    def _get_slot(self, timestamp: int) -> int:
+        slot = timestamp % TTL
+        if self._frame_timestamps[slot] != timestamp:
+            self._frame_timestamps[slot] = timestamp
+            self._frame_streamed_requests[slot] = 0
+            self._frame_ttft[slot] = 0.0
+            self._frame_itl[slot] = 0.0
+            self._frame_itl_requests[slot] = 0
+            self._frame_output_tokens[slot] = 0
+            self._frame_in_flight_time[slot] = 0.0
+        return slot
+
+
+class ModelProxyStats:
+    """
+    Collects time to first token, inter-token latency, output throughput, and queue depth
+    of model proxy requests per service.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[Tuple[str, str], ServiceTokenStats] = {}
+        self._pruned_at = _now()
+
+    def track(self, project_name: str, run_name: str, replicas: int) -> "RequestTracker":
+        # Stats may never be read, e.g. in the in-server proxy, so idle services
+        # are also pruned here
+        self._prune_idle()
+        key = (project_name, run_name)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = ServiceTokenStats()
+            self._stats[key] = stats
+        stats.replicas = replicas
+        return RequestTracker(stats)
+
+    def get(self, project_name: str, run_name: str) -> Optional[PerWindowTokenStats]:
+        stats = self._stats.get((project_name, run_name))
+        if stats is None:
+            return None
+        now = _now()
+        if stats.is_idle(now):
+            del self._stats[(project_name, run_name)]
+            return None
+        return stats.get(now)
+
+    def _prune_idle(self) -> None:
+        now = _now()
+        if now - self._pruned_at < TTL:
+            return
+        self._pruned_at = now
+        for key, stats in list(self._stats.items()):
+            if stats.is_idle(now):
+                del self._stats[key]
+
+
+class RequestTracker:
+    """
+    Measures a model proxy request. Streamed responses are observed as raw SSE bytes:
+    events are counted as output tokens and only an event carrying `usage` is parsed.
+    """
+
+    def __init__(self, stats: ServiceTokenStats) -> None:
+        self._stats = stats
+        self._started_at = _now()
+        self._first_token_at: Optional[float] = None
+        self._last_token_at: Optional[float] = None
+        self._events = 0
+        self._usage_tokens: Optional[int] = None
+        self._partial_line = b""
+        self._finished = False
+        stats.start_request(self._started_at)
+
+    async def observe_stream(self, stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        try:
+            async for data in stream:
+                self._observe_data(data)
+                yield data
+        finally:
+            self._finish_stream()
+
+    def finish_response(self, body: Optional[bytes]) -> None:
+        output_tokens = 0
+        if body is not None:
+            output_tokens = _get_completion_tokens(body) or 0
+        self._finish(output_tokens)
+
+    def _observe_data(self, data: bytes) -> None:
+        if self._partial_line:
+            data = self._partial_line + data
+        lines_end = data.rfind(b"\n") + 1
+        self._partial_line = data[lines_end:]
+        if lines_end == 0:
+            return
+        complete = data[:lines_end]
+        # Count only field names at line starts, not `data:` inside JSON payloads
+        events = 0
+        for line in complete.split(b"\n"):
+            if line.startswith(b"data:") and line[len(b"data:") :].strip() != b"[DONE]":
+                events += 1
+        if events <= 0:
+            return
+        now = _now()
+        if self._first_token_at is None:
+            self._first_token_at = now
+        self._last_token_at = now
+        self._events += events
+        if b'"usage"' in complete:
+            for line in complete.split(b"\n"):
+                if line.startswith(b"data:") and b'"usage"' in line:
+                    tokens = _get_completion_tokens(line[len(b"data:") :])
+                    if tokens is not None:
+                        self._usage_tokens = tokens
+
+    def _finish_stream(self) -> None:
+        output_tokens = self._usage_tokens if self._usage_tokens is not None else self._events
+        ttft = itl = None
+        if self._first_token_at is not None:
+            ttft = self._first_token_at - self._started_at
+            if output_tokens > 1 and self._last_token_at is not None:
+                itl = (self._last_token_at - self._first_token_at) / (output_tokens - 1)
+        self._finish(output_tokens, ttft, itl)
+
+    def _finish(
+        self, output_tokens: int, ttft: Optional[float] = None, itl: Optional[float] = None
+    ) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        self._stats.finish_request(_now(), output_tokens, ttft, itl)
+
+
+def _get_completion_tokens(data: bytes) -> Optional[int]:
+    try:
+        usage = json.loads(data).get("usage")
+        if isinstance(usage, dict) and isinstance(usage.get("completion_tokens"), int):
+            return usage["completion_tokens"]
+    except (ValueError, AttributeError):
+        logger.debug("Could not parse usage from model response: %r", data[:100])
+    return None
+
+
+def _now() -> float:
+    return time.time()
@@ -0,0 +1,196 @@
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Optional, Sequence
+
+from dstack._internal.proxy.lib.models import Replica
+from dstack._internal.utils.env import environ
+
+# Weight of the latest sample in the latency moving average
+EWMA_ALPHA = 0.3
+# Transport errors and these upstream status codes count as replica failures.
+# Other 5xx codes are usually returned by the app for specific requests.
+FAILURE_STATUS_CODES = (502, 503, 504)
+REPLICA_MAX_FAILURES = environ.get_int("DSTACK_SERVICE_REPLICA_MAX_FAILURES", default=3)
+REPLICA_EJECTION_TIME = environ.get_int("DSTACK_SERVICE_REPLICA_EJECTION_TIME", default=10)
+
+
+class ReplicaBalancerType(str, Enum):
+    RANDOM = "random"
+    LEAST_REQUESTS = "least_requests"
+    POWER_OF_TWO = "power_of_two"
+    EWMA_LATENCY = "ewma_latency"
+
+
+REPLICA_BALANCER = environ.get_enum(
+    "DSTACK_SERVICE_REPLICA_BALANCER",
+    ReplicaBalancerType,
+    default=ReplicaBalancerType.POWER_OF_TWO,
+)
+
+
+@dataclass
+class ReplicaStats:
+    in_flight: int = 0
+    ewma_latency: Optional[float] = None
+    """Moving average of seconds to response headers"""
+    consecutive_failures: int = 0
+    ejected_until: float = 0
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+
+class ReplicaBalancer(ABC):
+    """
+    Chooses a service replica for each request based on replica stats
+    recorded around upstream requests. Replicas that repeatedly fail are ejected
+    from balancing for `ejection_time` seconds, unless all replicas are ejected.
+    """
+
+    def __init__(
+        self,
+        max_failures: int = REPLICA_MAX_FAILURES,
+        ejection_time: float = REPLICA_EJECTION_TIME,
+    ) -> None:
+        self._max_failures = max_failures
+        self._ejection_time = ejection_time
+        self._stats: Dict[str, ReplicaStats] = {}
+
+    def choose(self, replicas: Sequence[Replica]) -> Replica:
+        """
+        `replicas` must not be empty
+        """
+        now = time.monotonic()
+        candidates = [r for r in replicas if not self.get_stats(r.id).is_ejected(now)]
+        if not candidates:
+            candidates = list(replicas)
+        if len(candidates) == 1:
+            return candidates[0]
+        return self._choose(candidates)
+
+    @abstractmethod
+    def _choose(self, replicas: Sequence[Replica]) -> Replica:
+        pass
+
+    def get_stats(self, replica_id: str) -> ReplicaStats:
+        stats = self._stats.get(replica_id)
+        if stats is None:
+            stats = ReplicaStats()
+            self._stats[replica_id] = stats
+        return stats
+
+    def remove(self, replica_id: str) -> None:
+        self._stats.pop(replica_id, None)
+
+    def on_request_start(self, replica_id: str) -> None:
+        self.get_stats(replica_id).in_flight += 1
+
+    def on_request_end(self, replica_id: str) -> None:
+        stats = self.get_stats(replica_id)
+        stats.in_flight = max(stats.in_flight - 1, 0)
+
+    def on_response(self, replica_id: str, latency: float) -> None:
+        stats = self.get_stats(replica_id)
+        stats.consecutive_failures = 0
+        if stats.ewma_latency is None:
+            stats.ewma_latency = latency
+        else:
+            stats.ewma_latency = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * stats.ewma_latency
+
+    def on_failure(self, replica_id: str) -> None:
+        stats = self.get_stats(replica_id)
+        stats.consecutive_failures += 1
+        if stats.consecutive_failures >= self._max_failures:
+            stats.consecutive_failures = 0
+            stats.ejected_until = time.monotonic() + self._ejection_time
+
+
+class ReplicaRequest:
+    """
+    Records an upstream request to a replica in the balancer's stats.
+    The request is in flight from creation until `end()`, which is safe to call many times.
+    """
+
+    def __init__(self, balancer: ReplicaBalancer, replica_id: str) -> None:
+        self._balancer = balancer
+        self._replica_id = replica_id
+        self._start_time = time.monotonic()
+        self._ended = False
+        balancer.on_request_start(replica_id)
+
+    def on_response(self, status_code: int) -> None:
+        if status_code in FAILURE_STATUS_CODES:
+            self._balancer.on_failure(self._replica_id)
+        else:
+            self._balancer.on_response(self._replica_id, time.monotonic() - self._start_time)
+
+    def on_failure(self) -> None:
+        self._balancer.on_failure(self._replica_id)
+
+    def end(self) -> None:
+        if not self._ended:
+            self._ended = True
+            self._balancer.on_request_end(self._replica_id)
+
+
+class RandomReplicaBalancer(ReplicaBalancer):
+    def _choose(self, replicas: Sequence[Replica]) -> Replica:
+        return random.choice(replicas)
+
+
+class LeastRequestsReplicaBalancer(ReplicaBalancer):
+    """Chooses the replica with the fewest in-flight requests, breaking ties randomly."""
+
+    def _choose(self, replicas: Sequence[Replica]) -> Replica:
+        min_in_flight = min(self.get_stats(r.id).in_flight for r in replicas)
+        return random.choice(
+            [r for r in replicas if self.get_stats(r.id).in_flight == min_in_flight]
+        )
+
+
+class PowerOfTwoReplicaBalancer(ReplicaBalancer):
+    """
+    Chooses the replica with fewer in-flight requests out of two random replicas.
+    Close to `least_requests` in load distribution, but avoids herding requests to
+    the same replica when stats are stale.
+    """
+
+    def _choose(self, replicas: Sequence[Replica]) -> Replica:
+        first, second = random.sample(replicas, 2)
+        if self.get_stats(second.id).in_flight < self.get_stats(first.id).in_flight:
+            return second
+        return first
+
+
+class EWMALatencyReplicaBalancer(ReplicaBalancer):
+    """
+    Chooses the replica with the lowest expected latency, estimated as the moving
+    average of response latency multiplied by the number of in-flight requests.
+    Replicas without latency samples are tried first.
+    """
+
+    def _choose(self, replicas: Sequence[Replica]) -> Replica:
+        not_sampled = [r for r in replicas if self.get_stats(r.id).ewma_latency is None]
+        if not_sampled:
+            return random.choice(not_sampled)
+        return min(replicas, key=self._get_cost)
+
+    def _get_cost(self, replica: Replica) -> float:
+        stats = self.get_stats(replica.id)
+        assert stats.ewma_latency is not None
+        return stats.ewma_latency * (stats.in_flight + 1)
+
+
+_BALANCER_CLASSES: Dict[ReplicaBalancerType, type[ReplicaBalancer]] = {
+    ReplicaBalancerType.RANDOM: RandomReplicaBalancer,
+    ReplicaBalancerType.LEAST_REQUESTS: LeastRequestsReplicaBalancer,
+    ReplicaBalancerType.POWER_OF_TWO: PowerOfTwoReplicaBalancer,
+    ReplicaBalancerType.EWMA_LATENCY: EWMALatencyReplicaBalancer,
+}
+
+
+def get_replica_balancer(balancer_type: ReplicaBalancerType = REPLICA_BALANCER) -> ReplicaBalancer:
+    return _BALANCER_CLASSES[balancer_type]()
@@ -1,13 +1,14 @@
 import asyncio
 import os
-import random
+import time
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Dict, Optional
+from typing import Awaitable, Callable, Collection, Dict, Optional, Protocol, TypeVar
 
 import httpx
 from httpx import AsyncHTTPTransport
 
+from dstack._internal.core.services.ssh.native_tunnel import NativeSSHTunnel, SSHTransportType
 from dstack._internal.core.services.ssh.tunnel import (
     SSH_DEFAULT_OPTIONS,
     IPSocket,
@@ -18,15 +19,46 @@ from dstack._internal.core.services.ssh.tunnel import (
 from dstack._internal.proxy.lib.errors import UnexpectedProxyError
 from dstack._internal.proxy.lib.models import Project, Replica, Service
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
+from dstack._internal.proxy.lib.services.replica_balancer import (
+    ReplicaBalancer,
+    get_replica_balancer,
+)
 from dstack._internal.utils.common import get_or_error
 from dstack._internal.utils.env import environ
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.path import FileContent
 
 logger = get_logger(__name__)
+T = TypeVar("T")
 OPEN_TUNNEL_TIMEOUT = 10
 HTTP_TIMEOUT = environ.get_int("DSTACK_SERVICE_CLIENT_TIMEOUT", default=60)
 # Same as default Nginx proxy timeout; override via DSTACK_SERVICE_CLIENT_TIMEOUT
+HTTP_LIMITS = httpx.Limits(
+    # No limit by default so that long streaming responses do not delay other requests
+    max_connections=environ.get_int("DSTACK_SERVICE_CLIENT_MAX_CONNECTIONS"),
+    max_keepalive_connections=environ.get_int(
+        "DSTACK_SERVICE_CLIENT_MAX_KEEPALIVE_CONNECTIONS", default=100
+    ),
+    # Below Nginx's default keepalive_timeout (75s) so that idle connections
+    # are not reused just as Nginx closes them
+    keepalive_expiry=environ.get_int("DSTACK_SERVICE_CLIENT_KEEPALIVE_EXPIRY", default=60),
+)
+
+
+CONNECTIONS_CHECK_INTERVAL = environ.get_int(
+    "DSTACK_SERVICE_CONNECTIONS_CHECK_INTERVAL", default=30
+)
+# Limits background tunnel opens, reopens, and checks so that many replicas
+# do not start as many ssh processes at once
+CONNECTIONS_CHECK_CONCURRENCY = environ.get_int(
+    "DSTACK_SERVICE_CONNECTIONS_CHECK_CONCURRENCY", default=16
+)
+# Replicas that failed to connect in the background are retried with exponential backoff
+CONNECTION_RETRY_MIN_INTERVAL = CONNECTIONS_CHECK_INTERVAL
+CONNECTION_RETRY_MAX_INTERVAL = 600
+SSH_TRANSPORT = environ.get_enum(
+    "DSTACK_SERVICE_SSH_TRANSPORT", SSHTransportType, default=SSHTransportType.OPENSSH
+)
 
 
 class ServiceClient(httpx.AsyncClient):
@@ -57,7 +89,8 @@ class ServiceConnection:
                 ssh_proxies.append((replica.ssh_proxy, FileContent(replica.ssh_proxy_private_key)))
             else:
                 ssh_proxies.append((replica.ssh_proxy, None))
-        self._tunnel = SSHTunnel(
+        tunnel_class = NativeSSHTunnel if SSH_TRANSPORT == SSHTransportType.NATIVE else SSHTunnel
+        self._tunnel = tunnel_class(
             destination=replica.ssh_destination,
             port=replica.ssh_port,
             ssh_proxies=ssh_proxies,
@@ -76,31 +109,73 @@ class ServiceConnection:
             # logs and in the Host header. The actual destination is the Unix socket.
             base_url=f"http://{replica.id}-{service.run_name}/",
             timeout=HTTP_TIMEOUT,
+            limits=HTTP_LIMITS,
         )
         self._is_open = asyncio.locks.Event()
+        self._is_opening = False
 
     @property
     def app_socket_path(self) -> Path:
         return self._app_socket_path
 
     async def open(self) -> None:
-        await self._tunnel.aopen()
+        self._is_opening = True
+        try:
+            await self._tunnel.aopen()
+        finally:
+            self._is_opening = False
         self._is_open.set()
 
+    async def reopen(self) -> None:
+        """
+        Restarts the tunnel, keeping the same app socket path and client.
+        """
+        self._is_open.clear()
+        await self._tunnel.aclose()
+        await self.open()
+
     async def close(self) -> None:
         self._is_open.clear()
         await self._client.aclose()
         await self._tunnel.aclose()
 
+    async def is_alive(self) -> bool:
+        """
+        Returns `False` if the tunnel is down. Tunnels being opened are considered alive.
+        """
+        if self._is_opening:
+            return True
+        return self._is_open.is_set() and await self._tunnel.acheck()
+
     async def client(self) -> ServiceClient:
         await asyncio.wait_for(self._is_open.wait(), timeout=OPEN_TUNNEL_TIMEOUT)
         return self._client
 
 
-class ServiceConnectionPool:
+class ServiceConnectionPoolMetrics(Protocol):
+    def log_connection_open(self, duration_seconds: float, failed: bool) -> None: ...
+
+    def set_connections(self, count: int) -> None: ...
+
+
+class _OpenFailures:
+    __slots__ = ("count", "retry_at")
+
     def __init__(self) -> None:
-        # TODO(#2238): remove connections to stopped replicas in-server
+        self.count = 0
+        self.retry_at = 0.0
+
+
+class ServiceConnectionPool:
+    def __init__(self, metrics: Optional[ServiceConnectionPoolMetrics] = None) -> None:
         self.connections: Dict[str, ServiceConnection] = {}
+        self._metrics = metrics
+        self._check_semaphore = asyncio.Semaphore(CONNECTIONS_CHECK_CONCURRENCY)
+        # Replicas that failed to connect in the background, by replica id
+        self._open_failures: Dict[str, _OpenFailures] = {}
+        # Clients forwarding to Nginx, by service domain
+        self.domain_clients: Dict[str, ServiceClient] = {}
+        self.balancer: ReplicaBalancer = get_replica_balancer()
 
     async def get(self, replica_id: str) -> Optional[ServiceConnection]:
         return self.connections.get(replica_id)
@@ -113,18 +188,165 @@ class ServiceConnectionPool:
             return connection
         connection = ServiceConnection(project, service, replica)
         self.connections[replica.id] = connection
+        self._set_connections_metric()
+        start_time = time.monotonic()
         try:
             await connection.open()
         except BaseException:
+            self._log_connection_open(start_time, failed=True)
             self.connections.pop(replica.id, None)
+            self._set_connections_metric()
             raise
+        self._log_connection_open(start_time, failed=False)
         return connection
 
     async def remove(self, replica_id: str) -> None:
+        self.balancer.remove(replica_id)
+        self._open_failures.pop(replica_id, None)
         connection = self.connections.pop(replica_id, None)
+        self._set_connections_metric()
         if connection is not None:
             await connection.close()
 
+    async def prewarm(self, project: Project, service: Service) -> None:
+        """
+        Opens connections to all replicas of `service` that are not connected yet
+        so that first requests to new replicas do not wait for the SSH handshake.
+        Replicas that failed to connect are retried with backoff.
+        """
+        now = time.monotonic()
+        new_replicas = [
+            r
+            for r in service.replicas
+            if r.id not in self.connections and self._can_retry_open(r.id, now)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._run_bounded(self.get_or_add(project, service, replica))
+                for replica in new_replicas
+            ),
+            return_exceptions=True,
+        )
+        for replica, exc in zip(new_replicas, results):
+            if isinstance(exc, Exception):
+                retry_in = self._log_open_failure(replica.id)
+                logger.warning(
+                    "Failed to pre-warm connection to replica %s in service %s,"
+                    " retrying in %ds: %r",
+                    replica.id,
+                    service.fmt(),
+                    retry_in,
+                    exc,
+                )
+            else:
+                self._open_failures.pop(replica.id, None)
+
+    async def check(self, live_replica_ids: Optional[Collection[str]] = None) -> None:
+        """
+        Removes connections to replicas not in `live_replica_ids`, if specified,
+        and reopens tunnels that died, e.g. because the SSH process was killed.
+        """
+        if live_replica_ids is not None:
+            stale_replica_ids = [r for r in self.connections if r not in live_replica_ids]
+            for replica_id in stale_replica_ids:
+                logger.debug("Removing connection to stale replica %s", replica_id)
+                try:
+                    await self.remove(replica_id)
+                except Exception as e:
+                    logger.error(
+                        "Error removing connection to service replica %s: %s", replica_id, e
+                    )
+            for replica_id in list(self._open_failures):
+                if replica_id not in live_replica_ids:
+                    del self._open_failures[replica_id]
+        connections = list(self.connections.items())
+        results = await asyncio.gather(
+            *(self._run_bounded(connection.is_alive()) for _, connection in connections),
+            return_exceptions=True,
+        )
+        now = time.monotonic()
+        dead_connections = [
+            (replica_id, connection)
+            for (replica_id, connection), alive in zip(connections, results)
+            if alive is not True
+            and self.connections.get(replica_id) is connection
+            and self._can_retry_open(replica_id, now)
+        ]
+        await asyncio.gather(
+            *(
+                self._run_bounded(self._reopen(replica_id, connection))
+                for replica_id, connection in dead_connections
+            )
+        )
+
+    async def _reopen(self, replica_id: str, connection: ServiceConnection) -> None:
+        logger.info("Connection to replica %s is dead, reopening", replica_id)
+        start_time = time.monotonic()
+        try:
+            await connection.reopen()
+        except Exception as e:
+            self._log_connection_open(start_time, failed=True)
+            retry_in = self._log_open_failure(replica_id)
+            logger.warning(
+                "Failed to reopen connection to replica %s, retrying in %ds: %r",
+                replica_id,
+                retry_in,
+                e,
+            )
+        else:
+            self._log_connection_open(start_time, failed=False)
+            self._open_failures.pop(replica_id, None)
+
+    async def _run_bounded(self, coro: Awaitable[T]) -> T:
+        async with self._check_semaphore:
+            return await coro
+
+    def _can_retry_open(self, replica_id: str, now: float) -> bool:
+        failures = self._open_failures.get(replica_id)
+        return failures is None or failures.retry_at <= now
+
+    def _log_open_failure(self, replica_id: str) -> float:
+        """
+        Returns the number of seconds after which the open can be retried.
+        """
+        failures = self._open_failures.setdefault(replica_id, _OpenFailures())
+        failures.count += 1
+        retry_in = min(
+            CONNECTION_RETRY_MIN_INTERVAL * 2 ** (failures.count - 1),
+            CONNECTION_RETRY_MAX_INTERVAL,
+        )
+        failures.retry_at = time.monotonic() + retry_in
+        return retry_in
+
+    def _log_connection_open(self, start_time: float, failed: bool) -> None:
+        if self._metrics is not None:
+            self._metrics.log_connection_open(time.monotonic() - start_time, failed=failed)
+
+    def _set_connections_metric(self) -> None:
+        if self._metrics is not None:
+            self._metrics.set_connections(len(self.connections))
+
+    def get_or_add_domain_client(self, domain: str) -> ServiceClient:
+        """
+        Returns a long-lived client that forwards requests to the service
+        at `domain` via Nginx, reusing keep-alive connections.
+        """
+        client = self.domain_clients.get(domain)
+        if client is None:
+            client = ServiceClient(
+                base_url="http://127.0.0.1",
+                headers={"Host": domain},
+                timeout=HTTP_TIMEOUT,
+                limits=HTTP_LIMITS,
+            )
+            self.domain_clients[domain] = client
+        return client
+
+    async def remove_domain_client(self, domain: str) -> None:
+        client = self.domain_clients.pop(domain, None)
+        if client is not None:
+            await client.aclose()
+
     async def remove_all(self) -> None:
         replica_ids = list(self.connections)
         results = await asyncio.gather(
@@ -135,23 +357,45 @@ class ServiceConnectionPool:
                 logger.error(
                     "Error removing connection to service replica %s: %s", replica_ids[i], exc
                 )
+        domains = list(self.domain_clients)
+        results = await asyncio.gather(
+            *(self.remove_domain_client(domain) for domain in domains), return_exceptions=True
+        )
+        for i, exc in enumerate(results):
+            if isinstance(exc, Exception):
+                logger.error("Error closing client for service %s: %s", domains[i], exc)
+
+
+async def check_connections_periodically(
+    check: Callable[[], Awaitable[None]], interval: float = CONNECTIONS_CHECK_INTERVAL
+) -> None:
+    """
+    Runs `check`, e.g. `ServiceConnectionPool.check`, every `interval` seconds until cancelled.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await check()
+        except Exception:
+            logger.exception("Failed to check service connections")
 
 
 async def get_service_replica_client(
-    service: Service, repo: BaseProxyRepo, service_conn_pool: ServiceConnectionPool
+    service: Service,
+    repo: BaseProxyRepo,
+    service_conn_pool: ServiceConnectionPool,
+    replica: Optional[Replica] = None,
 ) -> httpx.AsyncClient:
     """
-    `service` must have at least one replica
+    `service` must have at least one replica.
+    If `replica` is not specified, it is chosen by `service_conn_pool.balancer`.
     """
     if service.domain is not None:
         # Forward to Nginx so that requests are visible to StatsCollector in the access log
-        return httpx.AsyncClient(
-            base_url="http://127.0.0.1",
-            headers={"Host": service.domain},
-            timeout=HTTP_TIMEOUT,
-        )
+        return service_conn_pool.get_or_add_domain_client(service.domain)
     # Nginx not available, forward directly to the tunnel
-    replica = random.choice(service.replicas)
+    if replica is None:
+        replica = service_conn_pool.balancer.choose(service.replicas)
     connection = await service_conn_pool.get(replica.id)
     if connection is None:
         project = await repo.get_project(service.project_name)
@@ -2,8 +2,8 @@ import asyncio
 import importlib.resources
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
 from typing import Annotated, Awaitable, Callable, List, Optional
 
@@ -19,8 +19,14 @@ from dstack._internal.core.errors import ForbiddenError, ServerClientError
 from dstack._internal.core.services.configs import update_default_project
 from dstack._internal.proxy.lib.deps import get_injector_from_app
 from dstack._internal.proxy.lib.routers import model_proxy
+from dstack._internal.proxy.lib.services.service_connection import (
+    check_connections_periodically,
+)
 from dstack._internal.server import settings
-from dstack._internal.server.background.pipeline_tasks import start_pipeline_tasks
+from dstack._internal.server.background.pipeline_tasks import (
+    start_pipeline_hinter,
+    start_pipeline_tasks,
+)
 from dstack._internal.server.background.scheduled_tasks import start_scheduled_tasks
 from dstack._internal.server.background.scheduled_tasks.probes import PROBES_SCHEDULER
 from dstack._internal.server.db import get_db, get_session_ctx, migrate
@@ -51,12 +57,24 @@ from dstack._internal.server.routers import (
 )
 from dstack._internal.server.services import prometheus as prometheus_service
 from dstack._internal.server.services.config import ServerConfigManager
+from dstack._internal.server.services.executors import (
+    ExecutorPool,
+    get_executor,
+    run_async_in,
+    shutdown_executors,
+)
 from dstack._internal.server.services.gateways import gateway_connections_pool
 from dstack._internal.server.services.jobs.server_connection import job_server_connections_pool
 from dstack._internal.server.services.locking import advisory_lock_ctx
+from dstack._internal.server.services.logs import (
+    start_log_write_buffer,
+    stop_log_write_buffer,
+)
 from dstack._internal.server.services.projects import get_or_create_default_project
+from dstack._internal.server.services.proxy.connections import check_service_connections
 from dstack._internal.server.services.proxy.deps import ServerProxyDependencyInjector
 from dstack._internal.server.services.proxy.routers import service_proxy
+from dstack._internal.server.services.runner.client import async_http_client_pool
 from dstack._internal.server.services.runner.pool import instance_connection_pool
 from dstack._internal.server.services.storage import init_default_storage
 from dstack._internal.server.services.users import get_or_create_admin_user
@@ -78,7 +96,6 @@ from dstack._internal.server.utils.routers import (
     get_client_version,
     get_server_client_error_details,
 )
-from dstack._internal.utils.common import run_async
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.ssh import check_required_ssh_version
 
@@ -116,8 +133,7 @@ async def lifespan(app: FastAPI):
             profiles_sample_rate=settings.SENTRY_PROFILES_SAMPLE_RATE,
             before_send=sentry_utils.AsyncioCancelledErrorFilterEventProcessor(),
         )
-    server_executor = ThreadPoolExecutor(max_workers=settings.SERVER_EXECUTOR_MAX_WORKERS)
-    asyncio.get_running_loop().set_default_executor(server_executor)
+    asyncio.get_running_loop().set_default_executor(get_executor(ExecutorPool.DEFAULT))
     init_server_data_dir()
     await migrate()
     _print_dstack_logo()
@@ -168,18 +184,26 @@ async def lifespan(app: FastAPI):
     if settings.SERVER_S3_BUCKET is not None or settings.SERVER_GCS_BUCKET is not None:
         init_default_storage()
     if settings.SERVER_SSH_POOL_ENABLED:
-        await run_async(instance_connection_pool.startup_cleanup)
+        await run_async_in(ExecutorPool.RUNNER, instance_connection_pool.startup_cleanup)
     else:
         logger.info("Server SSH pool is disabled")
     scheduler = None
     pipeline_manager = None
+    pipeline_notifier = None
     if settings.SERVER_BACKGROUND_PROCESSING_ENABLED:
+        start_log_write_buffer()
         scheduler = start_scheduled_tasks()
         pipeline_manager = start_pipeline_tasks()
         app.state.pipeline_manager = pipeline_manager
+        app.state.pipeline_hinter = pipeline_manager.hinter
     else:
         logger.info("Background processing is disabled")
+        app.state.pipeline_hinter, pipeline_notifier = start_pipeline_hinter()
     PROBES_SCHEDULER.start()
+    service_conn_pool = await get_injector_from_app(app).get_service_connection_pool()
+    service_connections_checker = asyncio.create_task(
+        check_connections_periodically(partial(check_service_connections, service_conn_pool))
+    )
     dstack_version = (
         core_settings.DSTACK_VERSION if core_settings.DSTACK_VERSION else "(no version)"
     )
@@ -210,15 +234,22 @@ async def lifespan(app: FastAPI):
         scheduler.shutdown()
     if pipeline_manager is not None:
         await pipeline_manager.drain()
+    # Flush logs after pipelines have stopped writing them
+    await stop_log_write_buffer()
+    if pipeline_notifier is not None:
+        pipeline_notifier.shutdown()
+        await pipeline_notifier.drain()
     await gateway_connections_pool.remove_all()
     await job_server_connections_pool.remove_all()
-    service_conn_pool = await get_injector_from_app(app).get_service_connection_pool()
+    service_connections_checker.cancel()
     await service_conn_pool.remove_all()
+    await async_http_client_pool.close_all()
     if settings.SERVER_SSH_POOL_ENABLED:
-        await run_async(instance_connection_pool.close_all)
+        await run_async_in(ExecutorPool.RUNNER, instance_connection_pool.close_all)
     await get_db().engine.dispose()
     # Let checked-out DB connections close as dispose() only closes checked-in connections
     await asyncio.sleep(3)
+    shutdown_executors()
 
 
 _ON_STARTUP_HOOKS = []
@@ -1,6 +1,11 @@
 import asyncio
+from typing import Optional
 
-from dstack._internal.server.background.pipeline_tasks.base import Pipeline
+from dstack._internal.server.background.pipeline_tasks.base import (
+    HeartbeatService,
+    Pipeline,
+    PipelineStatsInfo,
+)
 from dstack._internal.server.background.pipeline_tasks.compute_groups import ComputeGroupPipeline
 from dstack._internal.server.background.pipeline_tasks.fleets import FleetPipeline
 from dstack._internal.server.background.pipeline_tasks.gateway_replicas import (
@@ -15,6 +20,11 @@ from dstack._internal.server.background.pipeline_tasks.jobs_submitted import (
 from dstack._internal.server.background.pipeline_tasks.jobs_terminating import (
     JobTerminatingPipeline,
 )
+from dstack._internal.server.background.pipeline_tasks.notifiers import (
+    LocalPipelineNotifier,
+    PipelineNotifier,
+    get_pipeline_notifier,
+)
 from dstack._internal.server.background.pipeline_tasks.placement_groups import (
     PlacementGroupPipeline,
 )
@@ -31,7 +41,10 @@ logger = get_logger(__name__)
 class PipelineManager:
     def __init__(self) -> None:
         self._pipelines: list[Pipeline] = []
-        self._hinter = PipelineHinter()
+        self._notifier = get_pipeline_notifier()
+        self._hinter = PipelineHinter(notifier=self._notifier)
+        self._heartbeat_service = HeartbeatService()
+        self._heartbeat_service_task: Optional[asyncio.Task] = None
         for builtin_pipeline in [
             ComputeGroupPipeline(pipeline_hinter=self._hinter),
             FleetPipeline(pipeline_hinter=self._hinter),
@@ -51,19 +64,32 @@ class PipelineManager:
     def register_pipeline(self, pipeline: Pipeline):
         self._pipelines.append(pipeline)
         self._hinter.register_pipeline(pipeline)
+        pipeline.use_heartbeat_service(self._heartbeat_service)
+        if self._notifier.cross_replica:
+            pipeline.use_cross_replica_hints()
 
     def start(self):
+        self._notifier.start()
+        if self._heartbeat_service_task is None:
+            self._heartbeat_service_task = asyncio.create_task(self._heartbeat_service.start())
         for pipeline in self._pipelines:
             pipeline.start()
 
     def shutdown(self):
         for pipeline in self._pipelines:
             pipeline.shutdown()
+        self._heartbeat_service.stop()
+        if self._heartbeat_service_task is not None:
+            self._heartbeat_service_task.cancel()
+        self._notifier.shutdown()
 
     async def drain(self):
         results = await asyncio.gather(
             *[p.drain() for p in self._pipelines], return_exceptions=True
         )
+        if self._heartbeat_service_task is not None:
+            await asyncio.gather(self._heartbeat_service_task, return_exceptions=True)
+        await self._notifier.drain()
         for pipeline, result in zip(self._pipelines, results):
             if isinstance(result, BaseException):
                 logger.error(
@@ -72,22 +98,40 @@ class PipelineManager:
                     exc_info=(type(result), result, result.__traceback__),
                 )
 
+    def get_stats(self) -> list[PipelineStatsInfo]:
+        return [pipeline.get_stats() for pipeline in self._pipelines]
+
     @property
     def hinter(self):
         return self._hinter
 
 
 class PipelineHinter:
-    def __init__(self) -> None:
+    """
+    Hints the replica's pipelines and, if the notifier supports it,
+    the pipelines of other replicas to fetch new items.
+    """
+
+    def __init__(self, notifier: Optional[PipelineNotifier] = None) -> None:
         self._hint_fetch_map: dict[str, list[Pipeline]] = {}
+        if notifier is None:
+            notifier = LocalPipelineNotifier()
+        self._notifier = notifier
+        self._notifier.set_hint_handler(self.hint_fetch_local)
 
     def register_pipeline(self, pipeline: Pipeline):
         self._hint_fetch_map.setdefault(pipeline.hint_fetch_model_name, []).append(pipeline)
 
     def hint_fetch(self, model_name: str):
+        self._notifier.notify(model_name)
+        self.hint_fetch_local(model_name)
+
+    def hint_fetch_local(self, model_name: str):
         pipelines = self._hint_fetch_map.get(model_name)
         if pipelines is None:
-            logger.warning("Model %s not registered for fetch hints", model_name)
+            # Replicas without background processing only send hints to other replicas.
+            if len(self._hint_fetch_map) > 0:
+                logger.warning("Model %s not registered for fetch hints", model_name)
             return
         for pipeline in pipelines:
             pipeline.hint_fetch()
@@ -103,6 +147,15 @@ def get_pipeline_manager() -> PipelineManager:
     return _pipeline_manager
 
 
+def start_pipeline_hinter() -> tuple[PipelineHinter, PipelineNotifier]:
+    """
+    Start sending hints to other replicas' pipelines from a replica without background processing.
+    """
+    notifier = get_pipeline_notifier(listen=False)
+    notifier.start()
+    return PipelineHinter(notifier=notifier), notifier
+
+
 def start_pipeline_tasks() -> PipelineManager:
     """
     Start tasks processed by fetch-workers pipelines based on db + in-memory queues.
@@ -5,6 +5,7 @@ import random
 import time
 import uuid
 from abc import ABC, abstractmethod
+from collections import deque
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -20,12 +21,14 @@ from typing import (
     Union,
 )
 
-from sqlalchemy import and_, or_, update
+from sqlalchemy import tuple_, update
 from sqlalchemy.orm import Mapped
 
-from dstack._internal.server.db import get_session_ctx
+from dstack._internal.server import settings
+from dstack._internal.server.db import get_session_ctx, is_db_sqlite
 from dstack._internal.server.services.pipelines import PipelineHinterProtocol
-from dstack._internal.utils.common import get_current_datetime
+from dstack._internal.server.services.prometheus.client_metrics import pipeline_metrics
+from dstack._internal.utils.common import batched, get_current_datetime
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -64,6 +67,87 @@ class PipelineError(Exception):
     pass
 
 
+@dataclass
+class PipelineStatsInfo:
+    pipeline: str
+    active_workers: int
+    busy_workers: int
+    queue_size: int
+    fetched_items_total: int
+    processed_items_total: int
+    processing_errors_total: int
+    items_per_second: float
+    fetch_batch_size: Optional[float]
+    fetch_time: Optional[float]
+    queue_wait_time: Optional[float]
+    processing_time: Optional[float]
+    heartbeat_expired_total: int
+    heartbeat_lock_token_changed_total: int
+
+
+class PipelineStats:
+    """
+    Collects pipeline throughput and latency stats.
+    All observations are exported as Prometheus metrics.
+    Moving averages and totals are also kept in memory for the scaling logic and debugging.
+    """
+
+    def __init__(self, pipeline_name: str, throughput_window: float = 60.0) -> None:
+        self.pipeline_name = pipeline_name
+        self._throughput_window = throughput_window
+        self._enqueued_at: dict[tuple[uuid.UUID, uuid.UUID], float] = {}
+        self._processed_at: deque[float] = deque()
+        self.fetched_items_total = 0
+        self.processed_items_total = 0
+        self.processing_errors_total = 0
+        self.fetch_batch_size: Optional[float] = None
+        self.fetch_time: Optional[float] = None
+        self.queue_wait_time: Optional[float] = None
+        self.processing_time: Optional[float] = None
+
+    def log_fetch(self, items: Sequence[PipelineItem], duration: float):
+        pipeline_metrics.log_fetch(
+            pipeline=self.pipeline_name, duration_seconds=duration, batch_size=len(items)
+        )
+        if len(items) == 0:
+            return
+        now = time.monotonic()
+        for item in items:
+            self._enqueued_at[(item.id, item.lock_token)] = now
+        self.fetched_items_total += len(items)
+        self.fetch_batch_size = _update_moving_average(self.fetch_batch_size, len(items))
+        self.fetch_time = _update_moving_average(self.fetch_time, duration)
+
+    def log_dequeued(self, item: PipelineItem):
+        enqueued_at = self._enqueued_at.pop((item.id, item.lock_token), None)
+        if enqueued_at is None:
+            return
+        wait_time = time.monotonic() - enqueued_at
+        pipeline_metrics.log_queue_wait(pipeline=self.pipeline_name, duration_seconds=wait_time)
+        self.queue_wait_time = _update_moving_average(self.queue_wait_time, wait_time)
+
+    def log_processed(self, duration: float, failed: bool):
+        pipeline_metrics.log_processing(
+            pipeline=self.pipeline_name, duration_seconds=duration, failed=failed
+        )
+        self.processed_items_total += 1
+        if failed:
+            self.processing_errors_total += 1
+        self.processing_time = _update_moving_average(self.processing_time, duration)
+        now = time.monotonic()
+        self._processed_at.append(now)
+        self._trim_processed_at(now)
+
+    def get_items_per_second(self) -> float:
+        now = time.monotonic()
+        self._trim_processed_at(now)
+        return len(self._processed_at) / self._throughput_window
+
+    def _trim_processed_at(self, now: float):
+        while self._processed_at and self._processed_at[0] < now - self._throughput_window:
+            self._processed_at.popleft()
+
+
 class Pipeline(Generic[ItemT], ABC):
     def __init__(
         self,
@@ -73,20 +157,59 @@ class Pipeline(Generic[ItemT], ABC):
         min_processing_interval: timedelta,
         lock_timeout: timedelta,
         heartbeat_trigger: timedelta,
+        min_workers_num: Optional[int] = None,
+        max_workers_num: Optional[int] = None,
+        workers_scale_interval: float = 1.0,
     ) -> None:
+        """
+        The pipeline starts with `workers_num` workers and scales them
+        between `min_workers_num` and `max_workers_num` based on the queue backlog.
+        If not set, the bounds are derived from `workers_num` and the server settings.
+        """
+        if min_workers_num is None:
+            min_workers_num = math.floor(workers_num * settings.SERVER_PIPELINE_MIN_WORKERS_FACTOR)
+        if max_workers_num is None:
+            max_workers_num = math.ceil(workers_num * settings.SERVER_PIPELINE_MAX_WORKERS_FACTOR)
         self._workers_num = workers_num
+        self._min_workers_num = min(max(min_workers_num, 1), workers_num)
+        self._max_workers_num = max(max_workers_num, workers_num)
+        self._workers_scale_interval = workers_scale_interval
         self._queue_lower_limit_factor = queue_lower_limit_factor
         self._queue_upper_limit_factor = queue_upper_limit_factor
         self._queue_desired_minsize = math.ceil(workers_num * queue_lower_limit_factor)
-        self._queue_maxsize = math.ceil(workers_num * queue_upper_limit_factor)
         self._min_processing_interval = min_processing_interval
         self._lock_timeout = lock_timeout
         self._heartbeat_trigger = heartbeat_trigger
-        self._queue = asyncio.Queue[ItemT](maxsize=self._queue_maxsize)
+        # The queue is allocated for the max number of workers.
+        # The fetcher limits the actual queue size according to the number of active workers.
+        self._queue = asyncio.Queue[ItemT](
+            maxsize=math.ceil(self._max_workers_num * queue_upper_limit_factor)
+        )
         self._tasks: list[asyncio.Task] = []
+        self._worker_tasks: dict[int, asyncio.Task] = {}
+        self._scale_down_checks = 0
+        self._stats = PipelineStats(pipeline_name=type(self).__name__)
+        self._heartbeat_service: Optional[HeartbeatService] = None
         self._running = False
         self._shutdown = False
 
+    def use_cross_replica_hints(self):
+        """
+        Makes the fetcher back off longer on empty fetches
+        since new items are hinted by other replicas.
+        """
+        self._fetcher.set_fetch_delays(self._fetcher.CROSS_REPLICA_HINTS_FETCH_DELAYS)
+
+    def use_heartbeat_service(self, heartbeat_service: "HeartbeatService"):
+        """
+        Makes the pipeline renew locks via a shared `heartbeat_service`
+        instead of running its own heartbeater loop. Must be called before `start()`.
+        """
+        if self._running:
+            raise PipelineError("Cannot change heartbeat service of running pipeline.")
+        heartbeat_service.register_heartbeater(self._heartbeater)
+        self._heartbeat_service = heartbeat_service
+
     def start(self):
         """
         Starts all pipeline tasks.
@@ -96,10 +219,14 @@ class Pipeline(Generic[ItemT], ABC):
         if self._shutdown:
             raise PipelineError("Cannot start pipeline after shutdown.")
         self._running = True
-        self._tasks.append(asyncio.create_task(self._heartbeater.start()))
+        self._fetcher.set_stats(self._stats)
         for worker in self._workers:
-            self._tasks.append(asyncio.create_task(worker.start()))
+            worker.set_stats(self._stats)
+        if self._heartbeat_service is None:
+            self._tasks.append(asyncio.create_task(self._heartbeater.start()))
+        self._set_active_workers_num(self._workers_num)
         self._tasks.append(asyncio.create_task(self._fetcher.start()))
+        self._tasks.append(asyncio.create_task(self._manage_workers()))
 
     def shutdown(self):
         """
@@ -113,7 +240,7 @@ class Pipeline(Generic[ItemT], ABC):
         for worker in self._workers:
             worker.stop()
         self._heartbeater.stop()
-        for task in self._tasks:
+        for task in [*self._tasks, *self._worker_tasks.values()]:
             if not task.done():
                 task.cancel()
 
@@ -123,8 +250,9 @@ class Pipeline(Generic[ItemT], ABC):
         """
         if not self._shutdown:
             raise PipelineError("Cannot drain running pipeline. Call `shutdown()` first.")
-        results = await asyncio.gather(*self._tasks, return_exceptions=True)
-        for task, result in zip(self._tasks, results):
+        tasks = [*self._tasks, *self._worker_tasks.values()]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for task, result in zip(tasks, results):
             if (
                 isinstance(result, BaseException)
                 and not isinstance(result, asyncio.CancelledError)
@@ -142,6 +270,110 @@ class Pipeline(Generic[ItemT], ABC):
     def hint_fetch(self):
         self._fetcher.hint()
 
+    @property
+    def active_workers_num(self) -> int:
+        return len(self._worker_tasks)
+
+    def get_stats(self) -> PipelineStatsInfo:
+        return PipelineStatsInfo(
+            pipeline=self._stats.pipeline_name,
+            active_workers=self.active_workers_num,
+            busy_workers=sum(1 for i in self._worker_tasks if self._workers[i].busy),
+            queue_size=self._queue.qsize(),
+            fetched_items_total=self._stats.fetched_items_total,
+            processed_items_total=self._stats.processed_items_total,
+            processing_errors_total=self._stats.processing_errors_total,
+            items_per_second=self._stats.get_items_per_second(),
+            fetch_batch_size=self._stats.fetch_batch_size,
+            fetch_time=self._stats.fetch_time,
+            queue_wait_time=self._stats.queue_wait_time,
+            processing_time=self._stats.processing_time,
+            heartbeat_expired_total=self._heartbeater.expired_total,
+            heartbeat_lock_token_changed_total=self._heartbeater.lock_token_changed_total,
+        )
+
+    async def _manage_workers(self):
+        while self._running:
+            await asyncio.sleep(self._workers_scale_interval)
+            try:
+                self._manage_workers_once()
+            except Exception:
+                logger.exception("Unexpected exception when scaling pipeline workers")
+
+    def _manage_workers_once(self):
+        # Exported even if workers scaling is disabled
+        pipeline_metrics.set_workers_state(
+            pipeline=self._stats.pipeline_name,
+            active_workers=self.active_workers_num,
+            queue_size=self._queue.qsize(),
+        )
+        if self._min_workers_num < self._max_workers_num:
+            self._autoscale_workers_once()
+
+    def _autoscale_workers_once(self):
+        active_workers = [self._workers[i] for i in self._worker_tasks]
+        desired_workers_num = get_desired_workers_num(
+            active_workers_num=len(active_workers),
+            busy_workers_num=sum(1 for w in active_workers if w.busy),
+            queue_size=self._queue.qsize(),
+            processing_time=self._stats.processing_time,
+            min_workers_num=self._min_workers_num,
+            max_workers_num=self._max_workers_num,
+            target_drain_time=self._workers_scale_interval,
+        )
+        if desired_workers_num < len(active_workers):
+            # Scale down only if the workers stay underutilized for some time
+            # to avoid flapping on short pauses between fetches.
+            self._scale_down_checks += 1
+            if self._scale_down_checks < _WORKERS_SCALE_DOWN_CHECKS:
+                return
+        self._scale_down_checks = 0
+        if desired_workers_num != len(active_workers):
+            logger.debug(
+                "Scaling %s workers from %d to %d",
+                self.hint_fetch_model_name,
+                len(active_workers),
+                desired_workers_num,
+            )
+            self._set_active_workers_num(desired_workers_num)
+
+    def _set_active_workers_num(self, workers_num: int):
+        for i, task in list(self._worker_tasks.items()):
+            if task.done():
+                del self._worker_tasks[i]
+        if workers_num > len(self._worker_tasks):
+            for i, worker in enumerate(self._workers):
+                if len(self._worker_tasks) >= workers_num:
+                    break
+                if i not in self._worker_tasks:
+                    self._worker_tasks[i] = asyncio.create_task(worker.start())
+        else:
+            # Only idle workers are stopped so that no item processing is interrupted.
+            # Busy workers are stopped on the next iterations if the pipeline is still underutilized.
+            for i in list(self._worker_tasks):
+                if len(self._worker_tasks) <= workers_num:
+                    break
+                if not self._workers[i].busy:
+                    self._worker_tasks.pop(i).cancel()
+        active_workers_num = len(self._worker_tasks)
+        queue_limit = min(
+            math.ceil(active_workers_num * self._queue_upper_limit_factor),
+            self._queue.maxsize,
+        )
+        queue_desired_minsize = math.ceil(active_workers_num * self._queue_lower_limit_factor)
+        fetch_time = self._stats.fetch_time
+        processing_time = self._stats.processing_time
+        if fetch_time is not None and processing_time is not None:
+            # Keep enough items in the queue for workers not to wait for slow fetches.
+            queue_desired_minsize = max(
+                queue_desired_minsize,
+                math.ceil(active_workers_num * fetch_time / max(processing_time, 1e-3)),
+            )
+        self._fetcher.set_queue_limits(
+            queue_desired_minsize=min(queue_desired_minsize, queue_limit),
+            queue_limit=queue_limit,
+        )
+
     @property
     @abstractmethod
     def hint_fetch_model_name(self) -> str:
@@ -163,6 +395,46 @@ class Pipeline(Generic[ItemT], ABC):
         pass
 
 
+_WORKERS_SCALE_DOWN_CHECKS = 10
+"""The number of consecutive scaling checks that must find workers underutilized to scale down."""
+
+
+def get_desired_workers_num(
+    active_workers_num: int,
+    busy_workers_num: int,
+    queue_size: int,
+    processing_time: Optional[float],
+    min_workers_num: int,
+    max_workers_num: int,
+    target_drain_time: float,
+) -> int:
+    """
+    Returns the number of workers needed to process the queued and in-progress items
+    within `target_drain_time` given the average item `processing_time`.
+    """
+    saturated = queue_size > 0 and busy_workers_num >= active_workers_num
+    if processing_time is not None:
+        backlog = queue_size + busy_workers_num
+        desired_workers_num = math.ceil(backlog * processing_time / target_drain_time)
+    elif saturated:
+        desired_workers_num = active_workers_num * 2
+    elif queue_size == 0:
+        desired_workers_num = busy_workers_num
+    else:
+        desired_workers_num = active_workers_num
+    if saturated:
+        # All workers are busy and items are waiting, so grow at least by one worker.
+        desired_workers_num = max(desired_workers_num, active_workers_num + 1)
+    elif desired_workers_num < active_workers_num:
+        # Scale down gradually since the load may resume soon.
+        desired_workers_num = max(
+            desired_workers_num,
+            busy_workers_num,
+            active_workers_num - math.ceil((active_workers_num - desired_workers_num) / 2),
+        )
+    return min(max(desired_workers_num, min_workers_num), max_workers_num)
+
+
 class Heartbeater(Generic[ItemT]):
     def __init__(
         self,
@@ -178,6 +450,8 @@ class Heartbeater(Generic[ItemT]):
         self._untrack_lock = asyncio.Lock()
         self._heartbeat_delay = heartbeat_delay
         self._running = False
+        self.expired_total = 0
+        self.lock_token_changed_total = 0
 
     async def start(self):
         self._running = True
@@ -201,9 +475,32 @@ class Heartbeater(Generic[ItemT]):
             if tracked is not None and tracked.lock_token == item.lock_token:
                 del self._items[item.id]
 
+    @property
+    def model_type(self) -> type[PipelineModel]:
+        return self._model_type
+
+    @property
+    def lock_timeout(self) -> timedelta:
+        return self._lock_timeout
+
     async def heartbeat(self):
-        items_to_update: list[ItemT] = []
         now = get_current_datetime()
+        items_to_update = await self.get_items_to_renew(now)
+        if len(items_to_update) == 0:
+            return
+        lock_expires_at = now + self._lock_timeout
+        renewed = await renew_item_locks(
+            model_type=self._model_type,
+            items=items_to_update,
+            lock_expires_at=lock_expires_at,
+        )
+        await self.apply_renewal(items_to_update, renewed, lock_expires_at)
+
+    async def get_items_to_renew(self, now: datetime) -> list[ItemT]:
+        """
+        Untracks items with expired locks and returns items whose locks expire soon.
+        """
+        items_to_update: list[ItemT] = []
         items = list(self._items.values())
         failed_to_heartbeat_count = 0
         for item in items:
@@ -213,39 +510,43 @@ class Heartbeater(Generic[ItemT]):
             elif item.lock_expires_at < now + self._hearbeat_margin:
                 items_to_update.append(item)
         if failed_to_heartbeat_count > 0:
+            self.expired_total += failed_to_heartbeat_count
+            pipeline_metrics.increment_lock_renewal_failures(
+                table=self._model_type.__tablename__,
+                reason="expired",
+                count=failed_to_heartbeat_count,
+            )
             logger.warning(
                 "Failed to heartbeat %d %s items in time."
                 " The items are expected to be processed on another fetch iteration.",
                 failed_to_heartbeat_count,
                 self._model_type.__tablename__,
             )
-        if len(items_to_update) == 0:
-            return
-        logger.debug(
-            "Updating lock_expires_at for items: %s", [str(r.id) for r in items_to_update]
-        )
-        async with get_session_ctx() as session:
-            per_item_filters = [
-                and_(
-                    self._model_type.id == item.id, self._model_type.lock_token == item.lock_token
-                )
-                for item in items_to_update
-            ]
-            res = await session.execute(
-                update(self._model_type)
-                .where(or_(*per_item_filters))
-                .values(lock_expires_at=now + self._lock_timeout)
-                .returning(self._model_type.id)
-            )
-            updated_ids = set(res.scalars().all())
+        return items_to_update
+
+    async def apply_renewal(
+        self,
+        items: Sequence[ItemT],
+        renewed: set[tuple[uuid.UUID, uuid.UUID]],
+        lock_expires_at: datetime,
+    ):
+        """
+        Updates tracked items after `renew_item_locks()` and untracks items that were not renewed.
+        """
         failed_to_update_count = 0
-        for item in items_to_update:
-            if item.id in updated_ids:
-                item.lock_expires_at = now + self._lock_timeout
+        for item in items:
+            if (item.id, item.lock_token) in renewed:
+                item.lock_expires_at = lock_expires_at
             else:
                 failed_to_update_count += 1
                 await self.untrack(item)
         if failed_to_update_count > 0:
+            self.lock_token_changed_total += failed_to_update_count
+            pipeline_metrics.increment_lock_renewal_failures(
+                table=self._model_type.__tablename__,
+                reason="lock_token_changed",
+                count=failed_to_update_count,
+            )
             logger.warning(
                 "Failed to update %s lock_expires_at of %d items: lock_token changed."
                 " The items are expected to be processed and updated on another fetch iteration.",
@@ -254,9 +555,134 @@ class Heartbeater(Generic[ItemT]):
             )
 
 
+@dataclass
+class _LockRenewalBatch:
+    model_type: type[PipelineModel]
+    lock_expires_at: datetime
+    heartbeater_items: list[tuple[Heartbeater, list[PipelineItem]]]
+
+
+class HeartbeatService:
+    """
+    Renews locks of items tracked by heartbeaters of multiple pipelines in a single loop.
+    Items of the same table are renewed with one bulk update per iteration
+    instead of one update per pipeline.
+    """
+
+    def __init__(self, heartbeat_delay: float = 1.0) -> None:
+        self._heartbeaters: list[Heartbeater] = []
+        self._heartbeat_delay = heartbeat_delay
+        self._running = False
+
+    def register_heartbeater(self, heartbeater: Heartbeater):
+        self._heartbeaters.append(heartbeater)
+
+    async def start(self):
+        self._running = True
+        while self._running:
+            try:
+                await self.heartbeat()
+            except Exception:
+                logger.exception("Unexpected exception when running heartbeat")
+            await asyncio.sleep(self._heartbeat_delay)
+
+    def stop(self):
+        self._running = False
+
+    async def heartbeat(self):
+        now = get_current_datetime()
+        batches: dict[tuple[str, datetime], _LockRenewalBatch] = {}
+        for heartbeater in self._heartbeaters:
+            items = await heartbeater.get_items_to_renew(now)
+            if len(items) == 0:
+                continue
+            lock_expires_at = now + heartbeater.lock_timeout
+            batch = batches.setdefault(
+                (heartbeater.model_type.__tablename__, lock_expires_at),
+                _LockRenewalBatch(
+                    model_type=heartbeater.model_type,
+                    lock_expires_at=lock_expires_at,
+                    heartbeater_items=[],
+                ),
+            )
+            batch.heartbeater_items.append((heartbeater, items))
+        for batch in batches.values():
+            try:
+                renewed = await renew_item_locks(
+                    model_type=batch.model_type,
+                    items=[item for _, items in batch.heartbeater_items for item in items],
+                    lock_expires_at=batch.lock_expires_at,
+                )
+            except Exception:
+                logger.exception(
+                    "Unexpected exception when renewing %s locks", batch.model_type.__tablename__
+                )
+                continue
+            for heartbeater, items in batch.heartbeater_items:
+                await heartbeater.apply_renewal(items, renewed, batch.lock_expires_at)
+
+
+_SQLITE_LOCK_RENEWAL_CHUNK_SIZE = 400
+"""
+Each renewed item takes two bound parameters,
+and older SQLite versions limit the number of parameters per statement to 999.
+"""
+_POSTGRES_LOCK_RENEWAL_CHUNK_SIZE = 5000
+
+
+async def renew_item_locks(
+    model_type: type[PipelineModel],
+    items: Sequence[PipelineItem],
+    lock_expires_at: datetime,
+) -> set[tuple[uuid.UUID, uuid.UUID]]:
+    """
+    Sets `lock_expires_at` for `items` whose `lock_token` has not changed in the DB.
+    Issues a `(id, lock_token) IN (...)` bulk update per chunk of items.
+    Returns `(id, lock_token)` pairs of items with renewed locks.
+    """
+    table = model_type.__tablename__
+    chunk_size = _POSTGRES_LOCK_RENEWAL_CHUNK_SIZE
+    if is_db_sqlite():
+        chunk_size = _SQLITE_LOCK_RENEWAL_CHUNK_SIZE
+    logger.debug("Updating %s lock_expires_at for items: %s", table, [str(i.id) for i in items])
+    renewed: set[tuple[uuid.UUID, uuid.UUID]] = set()
+    start_time = time.monotonic()
+    try:
+        async with get_session_ctx() as session:
+            for chunk in batched(items, chunk_size):
+                res = await session.execute(
+                    update(model_type)
+                    .where(
+                        tuple_(model_type.id, model_type.lock_token).in_(
+                            [(item.id, item.lock_token) for item in chunk]
+                        )
+                    )
+                    .values(lock_expires_at=lock_expires_at)
+                    .returning(model_type.id, model_type.lock_token)
+                    .execution_options(synchronize_session=False)
+                )
+                renewed.update((row[0], row[1]) for row in res.all())
+    except Exception:
+        pipeline_metrics.increment_lock_renewal_failures(
+            table=table, reason="error", count=len(items)
+        )
+        raise
+    pipeline_metrics.log_lock_renewal(
+        table=table,
+        duration_seconds=time.monotonic() - start_time,
+        renewed=len(renewed),
+    )
+    return renewed
+
+
 class Fetcher(Generic[ItemT], ABC):
     _DEFAULT_FETCH_DELAYS = [0.5, 1, 2, 5]
     """Increasing fetch delays on empty fetches to avoid frequent selects on low-activity/low-resource servers."""
+    CROSS_REPLICA_HINTS_FETCH_DELAYS = [2, 5]
+    """
+    Fetch delays used when new items are hinted by all replicas.
+    Empty fetches are still needed to pick up items that become due for processing over time.
+    """
 
     def __init__(
         self,
@@ -277,9 +703,25 @@ class Fetcher(Generic[ItemT], ABC):
         if fetch_delays is None:
             fetch_delays = self._DEFAULT_FETCH_DELAYS
         self._fetch_delays = fetch_delays
+        self._queue_limit = queue.maxsize
+        self._stats = PipelineStats(pipeline_name=type(self).__name__)
         self._running = False
         self._fetch_event = asyncio.Event()
 
+    def set_stats(self, stats: PipelineStats):
+        self._stats = stats
+
+    def set_fetch_delays(self, fetch_delays: list[float]):
+        self._fetch_delays = fetch_delays
+
+    def set_queue_limits(self, queue_desired_minsize: int, queue_limit: int):
+        """
+        Adjusts queue limits to the number of active workers.
+        `queue_limit` cannot exceed the queue's `maxsize`.
+        """
+        self._queue_desired_minsize = queue_desired_minsize
+        self._queue_limit = min(queue_limit, self._queue.maxsize)
+
     async def start(self):
         self._running = True
         empty_fetch_count = 0
@@ -287,12 +729,17 @@ class Fetcher(Generic[ItemT], ABC):
             if self._queue.qsize() >= self._queue_desired_minsize:
                 await asyncio.sleep(self._queue_check_delay)
                 continue
-            fetch_limit = self._queue.maxsize - self._queue.qsize()
+            fetch_limit = self._queue_limit - self._queue.qsize()
+            if fetch_limit <= 0:
+                await asyncio.sleep(self._queue_check_delay)
+                continue
+            start_time = time.monotonic()
             try:
                 items = await self.fetch(limit=fetch_limit)
             except Exception:
                 logger.exception("Unexpected exception when fetching new items")
                 items = []
+            self._stats.log_fetch(items, time.monotonic() - start_time)
             if len(items) == 0:
                 try:
                     await asyncio.wait_for(
@@ -347,26 +794,43 @@ class Worker(Generic[ItemT], ABC):
         self._queue = queue
         self._heartbeater = heartbeater
         self._pipeline_hinter = pipeline_hinter
+        self._stats = PipelineStats(pipeline_name=type(self).__name__)
+        self._busy = False
         self._running = False
 
+    @property
+    def busy(self) -> bool:
+        return self._busy
+
+    def set_stats(self, stats: PipelineStats):
+        self._stats = stats
+
     async def start(self):
         self._running = True
         while self._running:
+            self._busy = False
             item = await self._queue.get()
+            self._busy = True
+            self._stats.log_dequeued(item)
             start_time = time.time()
             logger.debug("Processing %s item %s", item.__tablename__, item.id)
+            failed = False
             try:
                 await self.process(item)
             except Exception:
+                failed = True
                 logger.exception("Unexpected exception when processing item")
             finally:
                 await self._heartbeater.untrack(item)
+            processing_time = time.time() - start_time
+            self._stats.log_processed(processing_time, failed=failed)
             logger.debug(
                 "Processed %s item %s in %.3f",
                 item.__tablename__,
                 item.id,
-                time.time() - start_time,
+                processing_time,
             )
+        self._busy = False
 
     def stop(self):
         self._running = False
@@ -376,6 +840,15 @@ class Worker(Generic[ItemT], ABC):
         pass
 
 
+_MOVING_AVERAGE_WEIGHT = 0.2
+
+
+def _update_moving_average(average: Optional[float], value: float) -> float:
+    if average is None:
+        return value
+    return average + _MOVING_AVERAGE_WEIGHT * (value - average)
+
+
 class _NowPlaceholder:
     pass
 
@@ -451,6 +924,7 @@ def log_lock_token_mismatch(
     item: PipelineItem,
     action: str = "process",
 ) -> None:
+    pipeline_metrics.increment_lock_token_mismatches(table=item.__tablename__, stage="processing")
     logger.warning(
         "Failed to %s %s item %s: lock_token mismatch."
         " The item is expected to be processed and updated on another fetch iteration.",
@@ -466,6 +940,9 @@ def log_lock_token_changed_after_processing(
     action: str = "update",
     expected_outcome: str = "updated",
 ) -> None:
+    pipeline_metrics.increment_lock_token_mismatches(
+        table=item.__tablename__, stage="after_processing"
+    )
     logger.warning(
         "Failed to %s %s item %s after processing: lock_token changed."
         " The item is expected to be processed and %s on another fetch iteration.",
@@ -30,11 +30,12 @@ from dstack._internal.server.db import get_db, get_session_ctx
 from dstack._internal.server.models import ComputeGroupModel, InstanceModel, ProjectModel
 from dstack._internal.server.services import backends as backends_services
 from dstack._internal.server.services.compute_groups import compute_group_model_to_compute_group
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.instances import emit_instance_status_change_event
 from dstack._internal.server.services.locking import get_locker
 from dstack._internal.server.services.pipelines import PipelineHinterProtocol
 from dstack._internal.server.utils import tracing
-from dstack._internal.utils.common import get_current_datetime, run_async
+from dstack._internal.utils.common import get_current_datetime
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -81,7 +82,7 @@ class ComputeGroupPipeline(Pipeline[PipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -305,7 +306,8 @@ async def _terminate_compute_group(compute_group_model: ComputeGroupModel) -> _T
     compute = backend.compute()
     assert isinstance(compute, ComputeWithGroupProvisioningSupport)
     try:
-        await run_async(
+        await run_async_in(
+            ExecutorPool.CLOUD,
             compute.terminate_compute_group,
             compute_group,
         )
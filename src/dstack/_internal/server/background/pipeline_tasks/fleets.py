@@ -102,7 +102,7 @@ class FleetPipeline(Pipeline[PipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -48,6 +48,7 @@ from dstack._internal.server.models import (
 from dstack._internal.server.services import backends as backends_services
 from dstack._internal.server.services import events
 from dstack._internal.server.services import gateways as gateways_services
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.gateways import (
     get_gateway_configuration,
     get_gateway_lb_configuration,
@@ -67,7 +68,7 @@ from dstack._internal.server.services.services import (
     should_configure_service_https_on_gateway,
 )
 from dstack._internal.server.utils import tracing
-from dstack._internal.utils.common import get_current_datetime, get_or_error, run_async
+from dstack._internal.utils.common import get_current_datetime, get_or_error
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -116,7 +117,7 @@ class GatewayReplicaPipeline(Pipeline[GatewayReplicaPipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -477,7 +478,9 @@ async def _provision_gateway_replica(
         replica_model.replica_num,
     )
     try:
-        gpd = await run_async(compute.create_gateway_replica, replica_configuration)
+        gpd = await run_async_in(
+            ExecutorPool.CLOUD, compute.create_gateway_replica, replica_configuration
+        )
     except BackendError as e:
         status_message = f"Backend error: {repr(e)}"
         if len(e.args) > 0:
@@ -622,7 +625,8 @@ async def _register_replica_with_load_balancer(
         return "Backend does not support load balancer operations"
     lb_configuration = get_gateway_lb_configuration(gateway_model)
     try:
-        await run_async(
+        await run_async_in(
+            ExecutorPool.CLOUD,
             compute.register_gateway_replica_with_load_balancer,
             replica_model.instance_id,
             lb_configuration,
@@ -1597,7 +1601,8 @@ async def _process_terminating_item(item: GatewayReplicaPipelineItem):
         replica_model.replica_num,
     )
     try:
-        await run_async(
+        await run_async_in(
+            ExecutorPool.CLOUD,
             compute.terminate_gateway_replica,
             replica_model.instance_id,
             replica_configuration,
@@ -1652,7 +1657,8 @@ async def _deregister_gateway_replica_from_load_balancer(
         replica_model.replica_num,
     )
     try:
-        await run_async(
+        await run_async_in(
+            ExecutorPool.CLOUD,
             compute.deregister_gateway_replica_from_load_balancer,
             replica_model.instance_id,
             get_gateway_lb_configuration(gateway_model),
@@ -41,6 +41,7 @@ from dstack._internal.server.models import (
 from dstack._internal.server.services import backends as backends_services
 from dstack._internal.server.services import events
 from dstack._internal.server.services import gateways as gateways_services
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.gateways import (
     emit_gateway_status_change_event,
     get_gateway_lb_configuration,
@@ -50,7 +51,7 @@ from dstack._internal.server.services.locking import get_locker
 from dstack._internal.server.services.logging import fmt
 from dstack._internal.server.services.pipelines import PipelineHinterProtocol
 from dstack._internal.server.utils import tracing
-from dstack._internal.utils.common import get_current_datetime, get_lowest_unused_nums, run_async
+from dstack._internal.utils.common import get_current_datetime, get_lowest_unused_nums
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -100,7 +101,7 @@ class GatewayPipeline(Pipeline[GatewayPipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -378,7 +379,9 @@ async def _process_submitted_gateway(gateway_model: GatewayModel) -> _SubmittedR
         lb_configuration = get_gateway_lb_configuration(gateway_model)
         logger.info("%s: creating gateway load balancer...", fmt(gateway_model))
         try:
-            backend_data = await run_async(compute.create_gateway_load_balancer, lb_configuration)
+            backend_data = await run_async_in(
+                ExecutorPool.CLOUD, compute.create_gateway_load_balancer, lb_configuration
+            )
         except BackendError as e:
             status_message = f"Backend error: {repr(e)}"
             if len(e.args) > 0:
@@ -697,8 +700,11 @@ async def _terminate_gateway_load_balancer(gateway_model: GatewayModel) -> bool:
     lb_configuration = get_gateway_lb_configuration(gateway_model)
     logger.info("%s: terminating gateway load balancer...", fmt(gateway_model))
     try:
-        await run_async(
-            compute.terminate_gateway_load_balancer, lb_configuration, gateway_model.backend_data
+        await run_async_in(
+            ExecutorPool.CLOUD,
+            compute.terminate_gateway_load_balancer,
+            lb_configuration,
+            gateway_model.backend_data,
         )
     except Exception:
         logger.exception("%s: error when terminating gateway load balancer", fmt(gateway_model))
@@ -113,7 +113,7 @@ class InstancePipeline(Pipeline[InstancePipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -5,7 +5,7 @@ from datetime import timedelta
 from typing import Optional
 
 import gpuhunt
-import requests
+import httpx
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
@@ -50,6 +50,7 @@ from dstack._internal.server.schemas.runner import (
     InstanceHealthResponse,
 )
 from dstack._internal.server.services import backends as backends_services
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.instances import (
     get_instance_provisioning_data,
     get_instance_ssh_private_keys,
@@ -58,8 +59,8 @@ from dstack._internal.server.services.instances import (
 )
 from dstack._internal.server.services.logging import fmt
 from dstack._internal.server.services.runner import client as runner_client
-from dstack._internal.server.services.runner.ssh import runner_ssh_tunnel
-from dstack._internal.utils.common import get_current_datetime, get_or_error, run_async
+from dstack._internal.server.services.runner.ssh import async_runner_ssh_tunnel
+from dstack._internal.utils.common import get_current_datetime, get_or_error
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -264,8 +265,7 @@ async def _run_instance_check(
     check_instance_info: bool,
 ) -> InstanceCheck:
     ssh_private_keys = get_instance_ssh_private_keys(instance_model)
-    instance_check = await run_async(
-        _check_instance_inner,
+    instance_check = await _check_instance_inner(
         ssh_private_keys,
         job_provisioning_data,
         None,
@@ -351,7 +351,8 @@ async def _process_wait_for_instance_provisioning_data(
         return result
 
     try:
-        await run_async(
+        await run_async_in(
+            ExecutorPool.CLOUD,
             backend.compute().update_provisioning_data,
             job_provisioning_data,
             instance_model.project.ssh_public_key,
@@ -400,8 +401,8 @@ async def _get_backend_for_provisioning_wait(
     )
 
 
-@runner_ssh_tunnel
-def _check_instance_inner(
+@async_runner_ssh_tunnel
+async def _check_instance_inner(
     addresses: Mapping[int, runner_client.LocalAddress],
     *,
     instance: InstanceModel,
@@ -409,14 +410,14 @@ def _check_instance_inner(
     check_instance_info: bool = False,
 ) -> InstanceCheck:
     instance_health_response: Optional[InstanceHealthResponse] = None
-    shim_client = runner_client.ShimClient.from_address(addresses[DSTACK_SHIM_HTTP_PORT])
+    shim_client = runner_client.AsyncShimClient.from_address(addresses[DSTACK_SHIM_HTTP_PORT])
     method = shim_client.healthcheck
     try:
-        healthcheck_response = method(unmask_exceptions=True)
+        healthcheck_response = await method(unmask_exceptions=True)
         if check_instance_health:
             method = shim_client.get_instance_health
-            instance_health_response = method()
-    except requests.RequestException as exc:
+            instance_health_response = await method()
+    except httpx.HTTPError as exc:
         template = "shim.%s(): request error: %s"
         args = (method.__func__.__name__, exc)
         logger.debug(template, *args)
@@ -427,15 +428,15 @@ def _check_instance_inner(
         logger.exception(template, *args)
         return InstanceCheck(reachable=False, message=template % args)
 
-    gpu_driver = _get_gpu_driver(instance, shim_client) if check_instance_info else None
+    gpu_driver = await _get_gpu_driver(instance, shim_client) if check_instance_info else None
 
     try:
-        remove_dangling_tasks_from_instance(shim_client, instance)
+        await remove_dangling_tasks_from_instance(shim_client, instance)
     except Exception as exc:
         logger.warning("%s: error removing dangling tasks: %s", fmt(instance), exc)
 
     # There should be no shim API calls after this function call since it can request shim restart.
-    _maybe_install_components(instance, shim_client)
+    await _maybe_install_components(instance, shim_client)
     return runner_client.healthcheck_response_to_instance_check(
         healthcheck_response,
         instance_health_response,
@@ -443,17 +444,17 @@ def _check_instance_inner(
     )
 
 
-def _get_gpu_driver(
+async def _get_gpu_driver(
     instance_model: InstanceModel,
-    shim_client: runner_client.ShimClient,
+    shim_client: runner_client.AsyncShimClient,
 ) -> Optional[GpuDriverInfo]:
     """
     Returns the host GPU driver reported by shim, or `None` if it cannot be retrieved.
     The driver is optional metadata, so errors are not propagated to the instance check.
     """
     try:
-        instance_info = shim_client.get_instance_info()
-    except requests.RequestException as exc:
+        instance_info = await shim_client.get_instance_info()
+    except httpx.HTTPError as exc:
         logger.warning(
             "Instance %s: shim.get_instance_info(): request error: %s", instance_model.name, exc
         )
@@ -465,13 +466,13 @@ def _get_gpu_driver(
         return None
 
 
-def _maybe_install_components(
+async def _maybe_install_components(
     instance_model: InstanceModel,
-    shim_client: runner_client.ShimClient,
+    shim_client: runner_client.AsyncShimClient,
 ) -> None:
     try:
-        components = shim_client.get_components()
-    except requests.RequestException as exc:
+        components = await shim_client.get_components()
+    except httpx.HTTPError as exc:
         logger.warning(
             "Instance %s: shim.get_components(): request error: %s", instance_model.name, exc
         )
@@ -484,14 +485,16 @@ def _maybe_install_components(
     installation_requested = False
 
     if (runner_info := components.runner) is not None:
-        installation_requested |= _maybe_install_runner(instance_model, shim_client, runner_info)
+        installation_requested |= await _maybe_install_runner(
+            instance_model, shim_client, runner_info
+        )
     else:
         logger.debug("Instance %s: no runner info", instance_model.name)
 
     if (shim_info := components.shim) is not None:
         if shim_info.status == ComponentStatus.INSTALLED:
             installed_shim_version = shim_info.version
-        installation_requested |= _maybe_install_shim(instance_model, shim_client, shim_info)
+        installation_requested |= await _maybe_install_shim(instance_model, shim_client, shim_info)
     else:
         logger.debug("Instance %s: no shim info", instance_model.name)
 
@@ -500,17 +503,17 @@ def _maybe_install_components(
     # or we just requested installation of at least one component
     # or at least one component is already being installed
     # or at least one shim task won't survive restart
-    running_shim_version = shim_client.get_version_string()
+    running_shim_version = await shim_client.get_version_string()
     if (
         installed_shim_version is None
         or installed_shim_version == running_shim_version
         or installation_requested
         or any(component.status == ComponentStatus.INSTALLING for component in components)
-        or not shim_client.is_safe_to_restart()
+        or not await shim_client.is_safe_to_restart()
     ):
         return
 
-    if shim_client.shutdown(force=False):
+    if await shim_client.shutdown(force=False):
         logger.debug(
             "Instance %s: restarting shim %s -> %s",
             instance_model.name,
@@ -521,9 +524,9 @@ def _maybe_install_components(
         logger.debug("Instance %s: cannot restart shim", instance_model.name)
 
 
-def _maybe_install_runner(
+async def _maybe_install_runner(
     instance_model: InstanceModel,
-    shim_client: runner_client.ShimClient,
+    shim_client: runner_client.AsyncShimClient,
     runner_info: ComponentInfo,
 ) -> bool:
     # For developers:
@@ -560,16 +563,16 @@ def _maybe_install_runner(
         url,
     )
     try:
-        shim_client.install_runner(url)
+        await shim_client.install_runner(url)
         return True
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         logger.warning("Instance %s: shim.install_runner(): %s", instance_model.name, exc)
     return False
 
 
-def _maybe_install_shim(
+async def _maybe_install_shim(
     instance_model: InstanceModel,
-    shim_client: runner_client.ShimClient,
+    shim_client: runner_client.AsyncShimClient,
     shim_info: ComponentInfo,
 ) -> bool:
     # For developers:
@@ -586,7 +589,7 @@ def _maybe_install_shim(
         instance_model.name,
         shim_info.status.value,
         installed_version or "(no version)",
-        shim_client.get_version_string(),
+        await shim_client.get_version_string(),
     )
     if shim_info.status == ComponentStatus.INSTALLING:
         logger.debug("Instance %s: shim is already being installed", instance_model.name)
@@ -607,9 +610,9 @@ def _maybe_install_shim(
         url,
     )
     try:
-        shim_client.install_shim(url)
+        await shim_client.install_shim(url)
         return True
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         logger.warning("Instance %s: shim.install_shim(): %s", instance_model.name, exc)
     return False
 
@@ -37,6 +37,7 @@ from dstack._internal.server.background.pipeline_tasks.instances.common import (
 )
 from dstack._internal.server.db import get_session_ctx
 from dstack._internal.server.models import FleetModel, InstanceModel, PlacementGroupModel
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.fleets import get_fleet_offers, is_cloud_cluster
 from dstack._internal.server.services.instances import (
     get_instance_configuration,
@@ -51,7 +52,7 @@ from dstack._internal.server.services.placement import (
     placement_group_model_to_placement_group,
     placement_group_model_to_placement_group_optional,
 )
-from dstack._internal.utils.common import get_or_error, run_async
+from dstack._internal.utils.common import get_or_error
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -169,7 +170,8 @@ async def create_cloud_instance(instance_model: InstanceModel) -> ProcessResult:
         )
         offers_tried += 1
         try:
-            job_provisioning_data = await run_async(
+            job_provisioning_data = await run_async_in(
+                ExecutorPool.CLOUD,
                 compute.create_instance,
                 instance_offer,
                 instance_configuration,
@@ -412,7 +414,8 @@ async def _find_or_create_suitable_placement_group_model(
         placement_group.configuration.region,
     )
     try:
-        provisioning_data = await run_async(
+        provisioning_data = await run_async_in(
+            ExecutorPool.CLOUD,
             compute.create_placement_group,
             placement_group,
             instance_offer,
@@ -37,6 +37,7 @@ from dstack._internal.server.background.pipeline_tasks.instances.common import (
 from dstack._internal.server.models import InstanceModel
 from dstack._internal.server.schemas.instances import InstanceCheck
 from dstack._internal.server.schemas.runner import HealthcheckResponse
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.instances import get_instance_remote_connection_info
 from dstack._internal.server.services.logging import fmt
 from dstack._internal.server.services.offers import is_divisible_into_blocks
@@ -54,7 +55,7 @@ from dstack._internal.server.services.ssh_fleets.provisioning import (
     run_shim_as_systemd_service,
     upload_envs,
 )
-from dstack._internal.utils.common import get_current_datetime, get_or_error, run_async
+from dstack._internal.utils.common import get_current_datetime, get_or_error
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.network import get_ip_from_network, is_ip_among_addresses
 
@@ -102,7 +103,8 @@ async def add_ssh_instance(instance_model: InstanceModel) -> ProcessResult:
     authorized_keys.append(instance_model.project.ssh_public_key.strip())
 
     try:
-        future = run_async(
+        future = run_async_in(
+            ExecutorPool.RUNNER,
             _deploy_instance,
             remote_details,
             pkeys,
@@ -10,11 +10,12 @@ from dstack._internal.server.background.pipeline_tasks.instances.common import (
 )
 from dstack._internal.server.models import InstanceModel
 from dstack._internal.server.services import backends as backends_services
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.instances import get_instance_provisioning_data
 from dstack._internal.server.services.runner.pool import (
     instance_connection_pool,
 )
-from dstack._internal.utils.common import get_current_datetime, run_async
+from dstack._internal.utils.common import get_current_datetime
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -44,7 +45,8 @@ async def terminate_instance(instance_model: InstanceModel) -> ProcessResult:
         else:
             logger.debug("Terminating runner instance %s", job_provisioning_data.hostname)
             try:
-                await run_async(
+                await run_async_in(
+                    ExecutorPool.CLOUD,
                     backend.compute().terminate_instance,
                     job_provisioning_data.instance_id,
                     job_provisioning_data.region,
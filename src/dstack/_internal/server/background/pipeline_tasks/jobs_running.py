@@ -80,6 +80,7 @@ from dstack._internal.server.services.backends.provisioning import (
     get_instance_specific_mounts,
     resolve_provisioning_image,
 )
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.gateways import (
     get_gateway_replica_models,
     skip_gateway_replicas_min_processing_interval,
@@ -105,13 +106,14 @@ from dstack._internal.server.services.locking import get_locker
 from dstack._internal.server.services.logging import fmt
 from dstack._internal.server.services.metrics import get_job_metrics
 from dstack._internal.server.services.pipelines import PipelineHinterProtocol
+from dstack._internal.server.services.proxy.routing import invalidate_service_route_on_commit
 from dstack._internal.server.services.repos import (
     get_code_model,
     get_repo_creds,
     repo_model_to_repo_head_with_creds,
 )
 from dstack._internal.server.services.runner import client
-from dstack._internal.server.services.runner.ssh import runner_ssh_tunnel
+from dstack._internal.server.services.runner.ssh import async_runner_ssh_tunnel
 from dstack._internal.server.services.runs import is_job_ready, run_model_to_run
 from dstack._internal.server.services.runs.replicas import (
     RouterEnvStatus,
@@ -122,7 +124,7 @@ from dstack._internal.server.services.runs.spec import run_spec_has_replica_ip_r
 from dstack._internal.server.services.secrets import get_project_secrets_mapping
 from dstack._internal.server.services.storage import get_default_storage
 from dstack._internal.server.utils import tracing
-from dstack._internal.utils.common import get_current_datetime, get_or_error, run_async
+from dstack._internal.utils.common import get_current_datetime, get_or_error
 from dstack._internal.utils.interpolator import InterpolatorError
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.nodes_interpolator import (
@@ -190,7 +192,7 @@ class JobRunningPipeline(Pipeline[JobRunningPipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -402,7 +404,7 @@ class _StartupContext:
     repo_creds: Optional[RemoteRepoCreds]
     router_env: Optional[Dict[str, str]] = None
     """Dynamo-specific env (e.g. DSTACK_ROUTER_INTERNAL_IP) computed from the
-    router replica's state. Passed through to RunnerClient.submit_job, which
+    router replica's state. Passed through to AsyncRunnerClient.submit_job, which
     merges it into a deep-copied job_spec.env so the shared job_spec is not
     mutated. None for SGLang services, non-router runs, and the router
     replica itself."""
@@ -597,7 +599,7 @@ async def _prepare_startup_context(
         )
         return None
     # Past the enum branches, router_env_outcome is either None or a Dict.
-    # We don't mutate job_spec.env here — RunnerClient.submit_job merges it
+    # We don't mutate job_spec.env here — AsyncRunnerClient.submit_job merges it
     # into a deep-copied spec, mirroring how instance_env is handled.
     router_env: Optional[Dict[str, str]] = (
         router_env_outcome if isinstance(router_env_outcome, dict) else None
@@ -824,8 +826,7 @@ async def _process_provisioning_status(
             assert context.run.run_spec.ssh_key_pub is not None
             user_ssh_key = context.run.run_spec.ssh_key_pub.strip()
             public_keys.append(user_ssh_key)
-        success = await run_async(
-            _process_provisioning_with_shim,
+        success = await _process_provisioning_with_shim(
             server_ssh_private_keys,
             job_provisioning_data,
             None,
@@ -849,8 +850,7 @@ async def _process_provisioning_status(
             fmt(context.job_model),
             context.job_submission.age,
         )
-        runner_availability = await run_async(
-            _get_runner_availability,
+        runner_availability = await _get_runner_availability(
             server_ssh_private_keys,
             job_provisioning_data,
             None,
@@ -867,8 +867,7 @@ async def _process_provisioning_status(
                 repo=context.repo_model,
                 code_hash=_get_repo_code_hash(context.run, context.job),
             )
-            submit_result = await run_async(
-                _submit_job_to_runner,
+            submit_result = await _submit_job_to_runner(
                 server_ssh_private_keys,
                 job_provisioning_data,
                 None,
@@ -922,8 +921,7 @@ async def _process_pulling_status(
         fmt(context.job_model),
         context.job_submission.age,
     )
-    shim_state = await run_async(
-        _sync_shim_pulling_state,
+    shim_state = await _sync_shim_pulling_state(
         server_ssh_private_keys,
         job_provisioning_data,
         None,
@@ -960,8 +958,7 @@ async def _process_pulling_status(
 
         # _ShimPullingState.READY
         job_runtime_data = _get_result_job_runtime_data(context.job_model, result)
-        runner_availability = await run_async(
-            _get_runner_availability,
+        runner_availability = await _get_runner_availability(
             server_ssh_private_keys,
             job_provisioning_data,
             job_runtime_data,
@@ -982,8 +979,7 @@ async def _process_pulling_status(
                 repo=context.repo_model,
                 code_hash=_get_repo_code_hash(context.run, context.job),
             )
-            submit_result = await run_async(
-                _submit_job_to_runner,
+            submit_result = await _submit_job_to_runner(
                 server_ssh_private_keys,
                 job_provisioning_data,
                 job_runtime_data,
@@ -1025,8 +1021,7 @@ async def _process_running_status(
         fmt(context.job_model),
         context.job_submission.age,
     )
-    process_running_result = await run_async(
-        _process_running,
+    process_running_result = await _process_running(
         server_ssh_private_keys,
         job_provisioning_data,
         context.job_submission.job_runtime_data,
@@ -1114,6 +1109,8 @@ async def _apply_process_result(
 
         if run_model.gateway_id is not None and result.job_update_map.get("registered"):
             await skip_gateway_replicas_min_processing_interval(session, run_model.gateway_id)
+        if run_model.gateway_id is None and "registered" in result.job_update_map:
+            invalidate_service_route_on_commit(session, job_model.run_id)
 
         _emit_result_events(session=session, job_model=job_model, result=result)
 
@@ -1273,7 +1270,10 @@ async def _check_gpu_utilization(
 
     after = get_current_datetime() - timedelta(seconds=policy.time_window)
     async with get_session_ctx() as session:
-        job_metrics = await get_job_metrics(session, context.job_model, after=after)
+        # Per-minute maximums are below the minimum only if all samples are
+        job_metrics = await get_job_metrics(
+            session, context.job_model, after=after, step=60, aggregation="max"
+        )
     gpus_util_metrics: list[Metric] = []
     for metric in job_metrics.metrics:
         if metric.name.startswith("gpu_util_percent_gpu"):
@@ -1383,8 +1383,8 @@ def _should_wait_for_other_nodes(run: Run, job: Job, job_model: JobModel) -> boo
     return False
 
 
-@runner_ssh_tunnel
-def _process_provisioning_with_shim(
+@async_runner_ssh_tunnel
+async def _process_provisioning_with_shim(
     addresses: Mapping[int, client.LocalAddress],
     run: Run,
     job_model: JobModel,
@@ -1397,9 +1397,9 @@ def _process_provisioning_with_shim(
     ssh_key: Optional[str],
 ) -> bool:
     job_spec = get_job_spec(job_model)
-    shim_client = client.ShimClient.from_address(addresses[DSTACK_SHIM_HTTP_PORT])
+    shim_client = client.AsyncShimClient.from_address(addresses[DSTACK_SHIM_HTTP_PORT])
 
-    resp = shim_client.healthcheck()
+    resp = await shim_client.healthcheck()
     if resp is None:
         logger.debug("%s: shim is not available yet", fmt(job_model))
         return False
@@ -1439,8 +1439,8 @@ def _process_provisioning_with_shim(
         cpu = None
         memory = None
         network_mode = NetworkMode.HOST
-    if shim_client.is_api_v2_supported():
-        shim_client.submit_task(
+    if await shim_client.is_api_v2_supported():
+        await shim_client.submit_task(
             task_id=job_model.id,
             name=job_model.job_name,
             registry_username=registry_username,
@@ -1463,7 +1463,7 @@ def _process_provisioning_with_shim(
             instance_id=jpd.instance_id,
         )
     else:
-        submitted = shim_client.submit(
+        submitted = await shim_client.submit(
             username=registry_username,
             password=registry_password,
             image_name=image_name,
@@ -1484,7 +1484,7 @@ def _process_provisioning_with_shim(
                 "%s: failed to submit, shim is already running a job, stopping it now, retry later",
                 fmt(job_model),
             )
-            shim_client.stop(force=True)
+            await shim_client.stop(force=True)
             return False
 
     return True
@@ -1510,24 +1510,26 @@ class _SyncShimPullingStateResult:
     image_pull_progress: Optional[ImagePullProgress] = None
 
 
-@runner_ssh_tunnel
-def _get_runner_availability(addresses: Mapping[int, client.LocalAddress]) -> _RunnerAvailability:
-    runner_client = client.RunnerClient.from_address(addresses[DSTACK_RUNNER_HTTP_PORT])
-    if runner_client.healthcheck() is None:
+@async_runner_ssh_tunnel
+async def _get_runner_availability(
+    addresses: Mapping[int, client.LocalAddress],
+) -> _RunnerAvailability:
+    runner_client = client.AsyncRunnerClient.from_address(addresses[DSTACK_RUNNER_HTTP_PORT])
+    if await runner_client.healthcheck() is None:
         return _RunnerAvailability.UNAVAILABLE
     return _RunnerAvailability.AVAILABLE
 
 
-@runner_ssh_tunnel
-def _sync_shim_pulling_state(
+@async_runner_ssh_tunnel
+async def _sync_shim_pulling_state(
     addresses: Mapping[int, client.LocalAddress],
     job_model: JobModel,
     jrd: Optional[JobRuntimeData] = None,
 ) -> Union[_SyncShimPullingStateResult, Literal[False]]:
-    shim_client = client.ShimClient.from_address(addresses[DSTACK_SHIM_HTTP_PORT])
+    shim_client = client.AsyncShimClient.from_address(addresses[DSTACK_SHIM_HTTP_PORT])
     image_pull_progress: Optional[ImagePullProgress] = None
-    if shim_client.is_api_v2_supported():
-        task = shim_client.get_task(job_model.id)
+    if await shim_client.is_api_v2_supported():
+        task = await shim_client.get_task(job_model.id)
         if task.image_pull_progress is not None:
             image_pull_progress = task.image_pull_progress
 
@@ -1560,7 +1562,7 @@ def _sync_shim_pulling_state(
                 )
             jrd = jrd.model_copy(update={"ports": {pm.container: pm.host for pm in task.ports}})
     else:
-        shim_status = shim_client.pull()
+        shim_status = await shim_client.pull()
         if (
             shim_status.state == "pending"
             and shim_status.result is not None
@@ -1600,8 +1602,8 @@ class _SubmitJobToRunnerResult:
     job_runtime_data: Optional[JobRuntimeData] = None
 
 
-@runner_ssh_tunnel
-def _submit_job_to_runner(
+@async_runner_ssh_tunnel
+async def _submit_job_to_runner(
     addresses: Mapping[int, client.LocalAddress],
     run: Run,
     job_model: JobModel,
@@ -1627,11 +1629,11 @@ def _submit_job_to_runner(
     else:
         instance_env = None
 
-    runner_client = client.RunnerClient.from_address(addresses[DSTACK_RUNNER_HTTP_PORT])
-    if runner_client.healthcheck() is None:
+    runner_client = client.AsyncRunnerClient.from_address(addresses[DSTACK_RUNNER_HTTP_PORT])
+    if await runner_client.healthcheck() is None:
         return _SubmitJobToRunnerResult(success=success_if_not_available)
 
-    runner_client.submit_job(
+    await runner_client.submit_job(
         run=run,
         job=job,
         cluster_info=cluster_info,
@@ -1644,15 +1646,15 @@ def _submit_job_to_runner(
     )
     for archive_id, archive in file_archives:
         logger.debug("%s: uploading file archive: %s", fmt(job_model), archive_id)
-        runner_client.upload_archive(archive_id, archive)
-    if code is None and not runner_client.is_code_upload_optional():
+        await runner_client.upload_archive(archive_id, archive)
+    if code is None and not await runner_client.is_code_upload_optional():
         # Old runner, we must call `/api/upload_code` to proceed
         code = b""
     if code is not None:
         logger.debug("%s: uploading code", fmt(job_model))
-        runner_client.upload_code(code)
+        await runner_client.upload_code(code)
     logger.debug("%s: starting job", fmt(job_model))
-    job_info = runner_client.run_job()
+    job_info = await runner_client.run_job()
     if job_info is not None:
         if jrd is not None:
             jrd = jrd.model_copy(
@@ -1670,16 +1672,17 @@ class _ProcessRunningResult:
     job_update_map: _JobUpdateMap = field(default_factory=_JobUpdateMap)
 
 
-@runner_ssh_tunnel
-def _process_running(
+@async_runner_ssh_tunnel
+async def _process_running(
     addresses: Mapping[int, client.LocalAddress],
     run_model: RunModel,
     job_model: JobModel,
 ) -> Union[_ProcessRunningResult, Literal[False]]:
-    runner_client = client.RunnerClient.from_address(addresses[DSTACK_RUNNER_HTTP_PORT])
+    runner_client = client.AsyncRunnerClient.from_address(addresses[DSTACK_RUNNER_HTTP_PORT])
     timestamp = job_model.runner_timestamp or 0
-    resp = runner_client.pull(timestamp)
-    logs_services.write_logs(
+    resp = await runner_client.pull(timestamp)
+    # Logs may be buffered and written later. If that write fails, they are not pulled again.
+    await logs_services.write_logs_async(
         project=run_model.project,
         run_name=run_model.run_name,
         job_submission_id=job_model.id,
@@ -1942,7 +1945,8 @@ async def _get_job_code(
     storage = get_default_storage()
     if storage is None:
         return None
-    blob = await run_async(
+    blob = await run_async_in(
+        ExecutorPool.STORAGE,
         storage.get_code,
         project.name,
         repo.name,
@@ -1977,7 +1981,8 @@ async def _get_job_file_archive(archive_id: uuid.UUID, user: UserModel) -> bytes
     storage = get_default_storage()
     if storage is None:
         return b""
-    blob = await run_async(
+    blob = await run_async_in(
+        ExecutorPool.STORAGE,
         storage.get_archive,
         str(archive_model.user_id),
         archive_model.blob_hash,
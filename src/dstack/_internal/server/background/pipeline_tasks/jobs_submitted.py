@@ -85,6 +85,7 @@ from dstack._internal.server.models import (
 from dstack._internal.server.services import events
 from dstack._internal.server.services.backends import get_project_backend_by_type_or_error
 from dstack._internal.server.services.docker import apply_server_docker_defaults
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.fleets import (
     can_create_new_cloud_instance_in_fleet,
     get_fleet_master_instance_provisioning_data,
@@ -141,7 +142,7 @@ from dstack._internal.server.services.runs.spec import (
 from dstack._internal.server.services.secrets import get_project_secrets_mapping
 from dstack._internal.server.services.volumes import volume_model_to_volume
 from dstack._internal.server.utils import tracing
-from dstack._internal.utils.common import get_current_datetime, get_or_error, run_async
+from dstack._internal.utils.common import get_current_datetime, get_or_error
 from dstack._internal.utils.interpolator import InterpolatorError
 from dstack._internal.utils.logging import get_logger
 
@@ -191,7 +192,7 @@ class JobSubmittedPipeline(Pipeline[JobSubmittedPipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -1908,7 +1909,8 @@ async def _process_volume_attachments(
                     continue
                 if volume.provisioning_data is None or not volume.provisioning_data.attachable:
                     continue
-                attachment_data = await run_async(
+                attachment_data = await run_async_in(
+                    ExecutorPool.CLOUD,
                     compute.attach_volume,
                     volume=volume,
                     provisioning_data=job_provisioning_data,
@@ -2483,7 +2485,8 @@ async def _provision_new_capacity(
             )
             if use_group_provisioning:
                 assert isinstance(compute, ComputeWithGroupProvisioningSupport)
-                compute_group_provisioning_data = await run_async(
+                compute_group_provisioning_data = await run_async_in(
+                    ExecutorPool.CLOUD,
                     compute.run_jobs,
                     run,
                     job_configurations,
@@ -2506,7 +2509,8 @@ async def _provision_new_capacity(
                         new_placement_group_models=new_placement_group_models,
                     ),
                 )
-            job_provisioning_data = await run_async(
+            job_provisioning_data = await run_async_in(
+                ExecutorPool.CLOUD,
                 compute.run_job,
                 run,
                 job,
@@ -50,6 +50,7 @@ from dstack._internal.server.models import (
 )
 from dstack._internal.server.services import backends as backends_services
 from dstack._internal.server.services import events
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.instances import (
     emit_instance_status_change_event,
     get_instance_ssh_private_keys,
@@ -74,7 +75,6 @@ from dstack._internal.server.services.volumes import (
     volume_model_to_volume,
 )
 from dstack._internal.server.utils import tracing
-from dstack._internal.utils import common
 from dstack._internal.utils.common import get_current_datetime, get_or_error
 from dstack._internal.utils.logging import get_logger
 
@@ -124,7 +124,7 @@ class JobTerminatingPipeline(Pipeline[JobTerminatingPipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -816,7 +816,8 @@ async def _stop_container(
     ssh_private_keys: tuple[str, Optional[str]],
 ) -> bool:
     if job_provisioning_data.dockerized:
-        return await common.run_async(
+        return await run_async_in(
+            ExecutorPool.RUNNER,
             _shim_submit_stop,
             ssh_private_keys,
             job_provisioning_data,
@@ -911,19 +912,22 @@ async def _detach_volume_from_job_instance(
     assert isinstance(compute, ComputeWithVolumeSupport)
     try:
         if job_model.volumes_detached_at is None:
-            await common.run_async(
+            await run_async_in(
+                ExecutorPool.CLOUD,
                 compute.detach_volume,
                 volume=volume,
                 provisioning_data=jpd,
                 force=False,
             )
-            detached = await common.run_async(
+            detached = await run_async_in(
+                ExecutorPool.CLOUD,
                 compute.is_volume_detached,
                 volume=volume,
                 provisioning_data=jpd,
             )
         else:
-            detached = await common.run_async(
+            detached = await run_async_in(
+                ExecutorPool.CLOUD,
                 compute.is_volume_detached,
                 volume=volume,
                 provisioning_data=jpd,
@@ -938,7 +942,8 @@ async def _detach_volume_from_job_instance(
                     volume_model.name,
                     instance_model.name,
                 )
-                await common.run_async(
+                await run_async_in(
+                    ExecutorPool.CLOUD,
                     compute.detach_volume,
                     volume=volume,
                     provisioning_data=jpd,
@@ -0,0 +1,170 @@
+import asyncio
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, Optional
+
+from sqlalchemy import func, select
+
+from dstack._internal.server import settings
+from dstack._internal.server.db import get_db, get_session_ctx, is_db_postgres
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+HintHandler = Callable[[str], None]
+
+
+class PipelineNotifier(ABC):
+    """
+    Delivers pipeline fetch hints to other server replicas.
+    """
+
+    def __init__(self) -> None:
+        self._hint_handler: Optional[HintHandler] = None
+
+    def set_hint_handler(self, hint_handler: HintHandler):
+        """
+        Sets the handler called with `Model.__name__` for hints received from other replicas.
+        """
+        self._hint_handler = hint_handler
+
+    @property
+    @abstractmethod
+    def cross_replica(self) -> bool:
+        """
+        Whether hints are delivered to other replicas so that they need not poll for new items.
+        """
+        pass
+
+    @abstractmethod
+    def notify(self, model_name: str):
+        pass
+
+    def start(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+    async def drain(self):
+        pass
+
+
+class LocalPipelineNotifier(PipelineNotifier):
+    """
+    Does not deliver hints outside of the process.
+    Used with SQLite that does not support multiple replicas
+    or when cross-replica notifications are disabled.
+    """
+
+    @property
+    def cross_replica(self) -> bool:
+        return False
+
+    def notify(self, model_name: str):
+        pass
+
+
+class PostgresPipelineNotifier(PipelineNotifier):
+    """
+    Delivers hints via Postgres LISTEN/NOTIFY.
+    Hints are coalesced and sent in the background so that `notify()` never blocks callers.
+    """
+
+    CHANNEL = "dstack_pipeline_hints"
+
+    def __init__(self, listen: bool = True, reconnect_delay: float = 5.0) -> None:
+        super().__init__()
+        self._listen_enabled = listen
+        self._reconnect_delay = reconnect_delay
+        self._replica_id = uuid.uuid4().hex
+        self._pending_model_names: set[str] = set()
+        self._pending_event = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def cross_replica(self) -> bool:
+        return True
+
+    def notify(self, model_name: str):
+        self._pending_model_names.add(model_name)
+        self._pending_event.set()
+
+    def start(self):
+        if len(self._tasks) > 0:
+            return
+        self._tasks.append(asyncio.create_task(self._send()))
+        if self._listen_enabled:
+            self._tasks.append(asyncio.create_task(self._listen()))
+
+    def shutdown(self):
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+
+    async def drain(self):
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _send(self):
+        while True:
+            await self._pending_event.wait()
+            self._pending_event.clear()
+            model_names = self._pending_model_names
+            self._pending_model_names = set()
+            try:
+                async with get_session_ctx() as session:
+                    for model_name in sorted(model_names):
+                        await session.execute(
+                            select(
+                                func.pg_notify(self.CHANNEL, f"{self._replica_id}:{model_name}")
+                            )
+                        )
+            except Exception:
+                logger.exception("Failed to send pipeline fetch hints %s", model_names)
+
+    async def _listen(self):
+        while True:
+            try:
+                await self._listen_connection()
+            except Exception:
+                logger.warning(
+                    "Failed to listen for pipeline fetch hints. Reconnecting in %ss",
+                    self._reconnect_delay,
+                    exc_info=True,
+                )
+            await asyncio.sleep(self._reconnect_delay)
+
+    async def _listen_connection(self):
+        async with get_db().engine.connect() as conn:
+            raw_conn = await conn.get_raw_connection()
+            driver_conn = raw_conn.driver_connection
+            assert driver_conn is not None
+            closed = asyncio.Event()
+            driver_conn.add_termination_listener(lambda _: closed.set())
+            await driver_conn.add_listener(self.CHANNEL, self._on_notification)
+            logger.debug("Listening for pipeline fetch hints")
+            try:
+                await closed.wait()
+            finally:
+                if not driver_conn.is_closed():
+                    await driver_conn.remove_listener(self.CHANNEL, self._on_notification)
+            logger.warning("Connection listening for pipeline fetch hints closed")
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str):
+        replica_id, _, model_name = payload.partition(":")
+        if replica_id == self._replica_id or model_name == "":
+            return
+        if self._hint_handler is not None:
+            self._hint_handler(model_name)
+
+
+def get_pipeline_notifier(listen: bool = True) -> PipelineNotifier:
+    """
+    Returns the notifier for the server DB.
+    Pass `listen=False` for replicas that only send hints and do not process items.
+    """
+    if settings.SERVER_PIPELINE_NOTIFICATIONS_ENABLED and is_db_postgres():
+        return PostgresPipelineNotifier(listen=listen)
+    return LocalPipelineNotifier()
@@ -30,11 +30,12 @@ from dstack._internal.server.models import (
     ProjectModel,
 )
 from dstack._internal.server.services import backends as backends_services
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.locking import get_locker
 from dstack._internal.server.services.pipelines import PipelineHinterProtocol
 from dstack._internal.server.services.placement import placement_group_model_to_placement_group
 from dstack._internal.server.utils import tracing
-from dstack._internal.utils.common import get_current_datetime, run_async
+from dstack._internal.utils.common import get_current_datetime
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -78,7 +79,7 @@ class PlacementGroupPipeline(Pipeline[PipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -259,7 +260,7 @@ async def _delete_placement_group(
     compute = backend.compute()
     assert isinstance(compute, ComputeWithPlacementGroupSupport)
     try:
-        await run_async(compute.delete_placement_group, placement_group)
+        await run_async_in(ExecutorPool.CLOUD, compute.delete_placement_group, placement_group)
     except PlacementGroupInUseError:
         logger.info(
             "Placement group %s is still in use. Skipping deletion for now.", placement_group.name
@@ -298,7 +298,7 @@ async def _should_retry_job(
     job has already provisioned, retry is limited by the time since the latest
     provisioned submission for that job.
     """
-    job_spec = get_job_spec(job_model)
+    job_spec = get_job_spec(job_model, readonly=True)
     if job_spec.retry is None:
         return None
 
@@ -355,7 +355,7 @@ async def _load_last_provisioned_job(
 
 
 def _is_retry_duration_exceeded(job_model: JobModel, current_duration: timedelta) -> bool:
-    job_spec = get_job_spec(job_model)
+    job_spec = get_job_spec(job_model, readonly=True)
     if job_spec.retry is None:
         return True
     return current_duration > timedelta(seconds=job_spec.retry.duration)
@@ -468,7 +468,7 @@ async def _build_retry_job_models(
 ) -> list[JobModel]:
     new_job_models: list[JobModel] = []
     for _, replica_jobs in replicas_to_retry:
-        job_spec = get_job_spec(replica_jobs[0])
+        job_spec = get_job_spec(replica_jobs[0], readonly=True)
         replica_group_name = job_spec.replica_group
         new_jobs = await get_jobs_from_run_spec(
             run_spec=context.run_spec,
@@ -510,7 +510,7 @@ async def _build_deployment_update_map(
 
         replica_group_name = None
         if run_spec.configuration.type == "service":
-            job_spec = get_job_spec(job_models[0])
+            job_spec = get_job_spec(job_models[0], readonly=True)
             replica_group_name = job_spec.replica_group
 
         new_job_specs = await get_job_specs_from_run_spec(
@@ -524,7 +524,7 @@ async def _build_deployment_update_map(
         )
         can_update_all_jobs = True
         for old_job_model, new_job_spec in zip(job_models, new_job_specs):
-            old_job_spec = get_job_spec(old_job_model)
+            old_job_spec = get_job_spec(old_job_model, readonly=True)
             if not job_spec_updatable_in_place(old_job_spec, new_job_spec):
                 can_update_all_jobs = False
                 break
@@ -724,7 +724,7 @@ def _build_removed_groups_cleanup_maps(
     for job in run_model.jobs:
         if job.status.is_finished():
             continue
-        job_spec = get_job_spec(job)
+        job_spec = get_job_spec(job, readonly=True)
         existing_group_names.add(job_spec.replica_group)
 
     new_group_names = {group.name for group in configuration.replica_groups}
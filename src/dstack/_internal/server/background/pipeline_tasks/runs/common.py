@@ -77,7 +77,7 @@ async def build_scale_up_job_models(
     for _, _, replica_num, replica_jobs in inactive_replicas:
         if scheduled_replicas == replicas_diff:
             break
-        job_spec = get_job_spec(replica_jobs[0])
+        job_spec = get_job_spec(replica_jobs[0], readonly=True)
         replica_group_name = job_spec.replica_group
         new_jobs = await get_jobs_from_run_spec(
             run_spec=run_spec,
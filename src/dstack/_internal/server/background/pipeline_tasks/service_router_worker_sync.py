@@ -86,7 +86,7 @@ class ServiceRouterWorkerSyncPipeline(Pipeline[ServiceRouterWorkerSyncPipelineIt
                 heartbeater=self.__heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
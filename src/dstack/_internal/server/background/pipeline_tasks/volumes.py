@@ -36,6 +36,7 @@ from dstack._internal.server.models import (
 )
 from dstack._internal.server.services import backends as backends_services
 from dstack._internal.server.services import events
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.locking import get_locker
 from dstack._internal.server.services.pipelines import PipelineHinterProtocol
 from dstack._internal.server.services.volumes import (
@@ -43,7 +44,7 @@ from dstack._internal.server.services.volumes import (
     volume_model_to_volume,
 )
 from dstack._internal.server.utils import tracing
-from dstack._internal.utils.common import get_current_datetime, run_async
+from dstack._internal.utils.common import get_current_datetime
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -93,7 +94,7 @@ class VolumePipeline(Pipeline[VolumePipelineItem]):
                 heartbeater=self._heartbeater,
                 pipeline_hinter=pipeline_hinter,
             )
-            for _ in range(self._workers_num)
+            for _ in range(self._max_workers_num)
         ]
 
     @property
@@ -330,13 +331,15 @@ async def _process_submitted_volume(volume_model: VolumeModel) -> _ProcessResult
     try:
         if volume.configuration.is_external:
             logger.info("Registering external volume %s", volume_model.name)
-            vpd = await run_async(
+            vpd = await run_async_in(
+                ExecutorPool.CLOUD,
                 compute.register_volume,
                 volume=volume,
             )
         else:
             logger.info("Provisioning new volume %s", volume_model.name)
-            vpd = await run_async(
+            vpd = await run_async_in(
+                ExecutorPool.CLOUD,
                 compute.create_volume,
                 volume=volume,
             )
@@ -399,7 +402,8 @@ async def _process_to_be_deleted_volume(volume_model: VolumeModel) -> _ProcessRe
     compute = backend.compute()
     assert isinstance(compute, ComputeWithVolumeSupport)
     try:
-        await run_async(
+        await run_async_in(
+            ExecutorPool.CLOUD,
             compute.delete_volume,
             volume=volume,
         )
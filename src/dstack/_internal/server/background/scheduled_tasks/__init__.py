@@ -16,6 +16,7 @@ from dstack._internal.server.background.scheduled_tasks.instance_healthchecks im
 )
 from dstack._internal.server.background.scheduled_tasks.metrics import (
     collect_metrics,
+    compact_metrics,
     delete_metrics,
 )
 from dstack._internal.server.background.scheduled_tasks.offers_catalog import (
@@ -46,6 +47,7 @@ def start_scheduled_tasks() -> AsyncIOScheduler:
     _scheduler.add_job(preload_offers_catalog, IntervalTrigger(minutes=10), max_instances=1)
     _scheduler.add_job(process_probes, IntervalTrigger(seconds=3, jitter=1))
     _scheduler.add_job(collect_metrics, IntervalTrigger(seconds=10), max_instances=1)
+    _scheduler.add_job(compact_metrics, IntervalTrigger(minutes=1), max_instances=1)
     _scheduler.add_job(delete_metrics, IntervalTrigger(minutes=5), max_instances=1)
     _scheduler.add_job(delete_events, IntervalTrigger(minutes=7), max_instances=1)
     _scheduler.add_job(process_gateways_connections, IntervalTrigger(seconds=15))
@@ -0,0 +1,87 @@
+import asyncio
+import math
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from dstack._internal.server.models import JobModel
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ResultT = TypeVar("ResultT")
+
+
+class JobsCollector(Generic[ResultT]):
+    """
+    Collects data from running jobs with bounded concurrency, e.g. metrics pulled from runners.
+
+    A collection round processes all given jobs unless it hits the deadline. Jobs are processed
+    in the order of their last collection attempt in this process, least recent first,
+    so jobs not processed in a round because of the deadline are the first ones in the next round
+    and every job is collected regardless of the number of running jobs.
+    """
+
+    def __init__(
+        self,
+        collect_job: Callable[[JobModel], Awaitable[Optional[ResultT]]],
+        save_results: Callable[[List[Tuple[JobModel, ResultT]]], Awaitable[None]],
+        concurrency: int,
+        deadline: float,
+        batch_size: int = 50,
+    ) -> None:
+        """
+        Args:
+            collect_job: returns the collected result or `None` if there is nothing to save
+            save_results: saves results of up to `batch_size` jobs
+            concurrency: the maximum number of jobs collected at the same time
+            deadline: seconds since the start of a round after which no new jobs are collected
+        """
+        self._collect_job = collect_job
+        self._save_results = save_results
+        self._concurrency = concurrency
+        self._deadline = deadline
+        self._batch_size = batch_size
+        self._last_attempted_at: Dict[uuid.UUID, float] = {}
+
+    async def collect(self, job_models: Sequence[JobModel]) -> None:
+        # Forget finished jobs
+        self._last_attempted_at = {
+            j.id: self._last_attempted_at[j.id]
+            for j in job_models
+            if j.id in self._last_attempted_at
+        }
+        queue = iter(
+            sorted(job_models, key=lambda j: self._last_attempted_at.get(j.id, -math.inf))
+        )
+        deadline_at = time.monotonic() + self._deadline
+        results: List[Tuple[JobModel, ResultT]] = []
+
+        async def worker():
+            nonlocal results
+            for job_model in queue:
+                now = time.monotonic()
+                if now >= deadline_at:
+                    return
+                self._last_attempted_at[job_model.id] = now
+                try:
+                    result = await self._collect_job(job_model)
+                except Exception:
+                    logger.exception("Failed to collect job %s", job_model.job_name)
+                    continue
+                if result is None:
+                    continue
+                results.append((job_model, result))
+                if len(results) >= self._batch_size:
+                    batch, results = results, []
+                    await self._save(batch)
+
+        await asyncio.gather(*(worker() for _ in range(min(self._concurrency, len(job_models)))))
+        if results:
+            await self._save(results)
+
+    async def _save(self, batch: List[Tuple[JobModel, ResultT]]) -> None:
+        try:
+            await self._save_results(batch)
+        except Exception:
+            logger.exception("Failed to save results of %d jobs", len(batch))
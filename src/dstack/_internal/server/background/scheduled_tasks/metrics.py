@@ -1,31 +1,52 @@
 import asyncio
+import itertools
 import json
+import uuid
 from collections.abc import Mapping
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
-from sqlalchemy import Delete, delete, select
+from sqlalchemy import ColumnElement, Delete, and_, delete, or_, select
 from sqlalchemy.orm import joinedload
 
 from dstack._internal.core.consts import DSTACK_RUNNER_HTTP_PORT
 from dstack._internal.core.models.runs import JobStatus
 from dstack._internal.server import settings
+from dstack._internal.server.background.scheduled_tasks.common import JobsCollector
 from dstack._internal.server.db import get_session_ctx
-from dstack._internal.server.models import InstanceModel, JobMetricsPoint, JobModel, ProjectModel
+from dstack._internal.server.models import (
+    InstanceModel,
+    JobMetricsBlock,
+    JobMetricsPoint,
+    JobMetricsRollup,
+    JobModel,
+    ProjectModel,
+)
 from dstack._internal.server.schemas.runner import MetricsResponse
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.instances import get_instance_ssh_private_keys
 from dstack._internal.server.services.jobs import get_job_provisioning_data, get_job_runtime_data
+from dstack._internal.server.services.metrics import add_job_metrics_points
+from dstack._internal.server.services.metrics_blocks import (
+    METRICS_BLOCK_DURATION_SECONDS,
+    MetricsPoint,
+    make_blocks,
+)
+from dstack._internal.server.services.metrics_rollups import ROLLUP_RESOLUTIONS
 from dstack._internal.server.services.runner import client
 from dstack._internal.server.services.runner.ssh import runner_ssh_tunnel
 from dstack._internal.server.utils import tracing
-from dstack._internal.utils.common import batched, get_current_datetime, get_or_error, run_async
+from dstack._internal.utils.common import get_current_datetime, get_or_error
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-MAX_JOBS_FETCHED = 100
-BATCH_SIZE = 10
 MIN_COLLECT_INTERVAL_SECONDS = 9
+# Jobs not collected within the deadline are collected first on the next run (every 10s)
+COLLECT_DEADLINE_SECONDS = 8
+COMPACT_DELAY_SECONDS = 60
+COMPACT_BATCH_SIZE = 100
+MAX_COMPACT_BATCHES = 20
 
 
 @tracing.instrument_scheduled_task
@@ -40,12 +61,10 @@ async def collect_metrics():
                 .load_only(ProjectModel.ssh_private_key)
             )
             .order_by(JobModel.last_processed_at.asc())
-            .limit(MAX_JOBS_FETCHED)
         )
         job_models = res.unique().scalars().all()
-
-    for batch in batched(job_models, BATCH_SIZE):
-        await _collect_jobs_metrics(batch)
+    job_models = await _filter_recently_collected_jobs(job_models)
+    await _jobs_collector.collect(job_models)
 
 
 @tracing.instrument_scheduled_task
@@ -57,24 +76,120 @@ async def delete_metrics():
     finished_timestamp_micro_cutoff = (
         now_timestamp_micro - settings.SERVER_METRICS_FINISHED_TTL_SECONDS * 1_000_000
     )
+    running_job_ids = select(JobModel.id).where(JobModel.status.in_([JobStatus.RUNNING]))
+    finished_job_ids = select(JobModel.id).where(
+        JobModel.status.in_(JobStatus.finished_statuses())
+    )
     await asyncio.gather(
         _execute_delete_statement(
             delete(JobMetricsPoint).where(
-                JobMetricsPoint.job_id.in_(
-                    select(JobModel.id).where(JobModel.status.in_([JobStatus.RUNNING]))
-                ),
+                JobMetricsPoint.job_id.in_(running_job_ids),
                 JobMetricsPoint.timestamp_micro < running_timestamp_micro_cutoff,
             )
         ),
         _execute_delete_statement(
             delete(JobMetricsPoint).where(
-                JobMetricsPoint.job_id.in_(
-                    select(JobModel.id).where(JobModel.status.in_(JobStatus.finished_statuses()))
-                ),
+                JobMetricsPoint.job_id.in_(finished_job_ids),
                 JobMetricsPoint.timestamp_micro < finished_timestamp_micro_cutoff,
             )
         ),
     )
+    # Blocks and rollups are small, so they are deleted in one transaction
+    await _execute_delete_statements(
+        delete(JobMetricsBlock).where(
+            JobMetricsBlock.job_id.in_(running_job_ids),
+            JobMetricsBlock.end_timestamp_micro < running_timestamp_micro_cutoff,
+        ),
+        delete(JobMetricsBlock).where(
+            JobMetricsBlock.job_id.in_(finished_job_ids),
+            JobMetricsBlock.end_timestamp_micro < finished_timestamp_micro_cutoff,
+        ),
+        delete(JobMetricsRollup).where(
+            JobMetricsRollup.job_id.not_in(finished_job_ids),
+            _rollups_ended_before(
+                {
+                    resolution: now_timestamp_micro
+                    - max(ttl_seconds, settings.SERVER_METRICS_RUNNING_TTL_SECONDS) * 1_000_000
+                    for resolution, ttl_seconds in ROLLUP_RESOLUTIONS.items()
+                }
+            ),
+        ),
+        delete(JobMetricsRollup).where(
+            JobMetricsRollup.job_id.in_(finished_job_ids),
+            _rollups_ended_before(
+                {resolution: finished_timestamp_micro_cutoff for resolution in ROLLUP_RESOLUTIONS}
+            ),
+        ),
+    )
+
+
+def _rollups_ended_before(cutoffs: Mapping[int, int]) -> ColumnElement[bool]:
+    """
+    Matches rollups whose bucket ended before the cutoff for the rollup resolution.
+    """
+    return or_(
+        *(
+            and_(
+                JobMetricsRollup.resolution == resolution,
+                JobMetricsRollup.start_timestamp_micro <= cutoff - resolution * 1_000_000,
+            )
+            for resolution, cutoff in cutoffs.items()
+        )
+    )
+
+
+@tracing.instrument_scheduled_task
+async def compact_metrics():
+    """
+    Moves points into `JobMetricsBlock` once their block time window is over.
+    """
+    block_duration_micro = METRICS_BLOCK_DURATION_SECONDS * 1_000_000
+    now_timestamp_micro = int(get_current_datetime().timestamp() * 1_000_000)
+    # Points are collected with a delay, so leave some time for the last points of the block
+    cutoff = now_timestamp_micro - COMPACT_DELAY_SECONDS * 1_000_000
+    cutoff -= cutoff % block_duration_micro
+    for _ in range(MAX_COMPACT_BATCHES):
+        async with get_session_ctx() as session:
+            res = await session.execute(
+                select(JobMetricsPoint.job_id)
+                .where(JobMetricsPoint.timestamp_micro < cutoff)
+                .distinct()
+                .limit(COMPACT_BATCH_SIZE)
+            )
+            job_ids = res.scalars().all()
+        if len(job_ids) == 0:
+            return
+        await _compact_jobs_metrics(job_ids, cutoff)
+        if len(job_ids) < COMPACT_BATCH_SIZE:
+            return
+
+
+async def _compact_jobs_metrics(job_ids: Sequence[uuid.UUID], cutoff: int) -> None:
+    async with get_session_ctx() as session:
+        res = await session.execute(
+            select(JobMetricsPoint)
+            .where(
+                JobMetricsPoint.job_id.in_(job_ids),
+                JobMetricsPoint.timestamp_micro < cutoff,
+            )
+            .order_by(JobMetricsPoint.job_id, JobMetricsPoint.timestamp_micro)
+        )
+        points = res.scalars().all()
+        res = await session.execute(
+            delete(JobMetricsPoint)
+            .where(
+                JobMetricsPoint.job_id.in_(job_ids),
+                JobMetricsPoint.timestamp_micro < cutoff,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if res.rowcount != len(points):
+            # Another server replica compacted the points or a late point was added meanwhile
+            await session.rollback()
+            return
+        for job_id, job_points in itertools.groupby(points, key=lambda p: p.job_id):
+            session.add_all(make_blocks(job_id, [MetricsPoint.from_model(p) for p in job_points]))
+        await session.commit()
 
 
 async def _execute_delete_statement(stmt: Delete) -> None:
@@ -83,32 +198,36 @@ async def _execute_delete_statement(stmt: Delete) -> None:
         await session.commit()
 
 
-async def _collect_jobs_metrics(job_models: List[JobModel]):
-    filtered_job_models = await _filter_recently_collected_jobs(job_models)
-    tasks = []
-    for job_model in filtered_job_models:
-        tasks.append(_collect_job_metrics(job_model))
-    points = await asyncio.gather(*tasks)
+async def _execute_delete_statements(*stmts: Delete) -> None:
+    async with get_session_ctx() as session:
+        for stmt in stmts:
+            await session.execute(stmt)
+        await session.commit()
+
+
+async def _save_metrics_points(results: List[Tuple[JobModel, JobMetricsPoint]]):
     async with get_session_ctx() as session:
-        for point in points:
-            if point is not None:
-                session.add(point)
+        await add_job_metrics_points(session, [point for _, point in results])
         await session.commit()
 
 
-async def _filter_recently_collected_jobs(job_models: List[JobModel]) -> List[JobModel]:
+async def _filter_recently_collected_jobs(job_models: Sequence[JobModel]) -> List[JobModel]:
     # Skip metrics collection if another replica collected it recently.
     # Two replicas can still collect metrics simultaneously – that's fine since
     # we'll just store some extra metric points in the db.
+    # Select running jobs with a subquery since there can be more job ids than
+    # the max number of bind parameters.
+    running_job_ids = select(JobModel.id).where(JobModel.status.in_([JobStatus.RUNNING]))
     async with get_session_ctx() as session:
         res = await session.execute(
-            select(JobMetricsPoint).where(
-                JobMetricsPoint.job_id.in_([j.id for j in job_models]),
+            select(JobMetricsPoint.job_id)
+            .where(
+                JobMetricsPoint.job_id.in_(running_job_ids),
                 JobMetricsPoint.timestamp_micro > _get_recently_collected_metric_cutoff(),
             )
+            .distinct()
         )
-        recent_points = res.scalars().all()
-        recent_job_ids = [p.job_id for p in recent_points]
+        recent_job_ids = set(res.scalars().all())
     return [j for j in job_models if j.id not in recent_job_ids]
 
 
@@ -120,12 +239,13 @@ def _get_recently_collected_metric_cutoff() -> int:
 
 async def _collect_job_metrics(job_model: JobModel) -> Optional[JobMetricsPoint]:
     ssh_private_keys = get_instance_ssh_private_keys(get_or_error(job_model.instance))
-    jpd = get_job_provisioning_data(job_model)
-    jrd = get_job_runtime_data(job_model)
+    jpd = get_job_provisioning_data(job_model, readonly=True)
+    jrd = get_job_runtime_data(job_model, readonly=True)
     if jpd is None:
         return None
     try:
-        res = await run_async(
+        res = await run_async_in(
+            ExecutorPool.RUNNER,
             _pull_runner_metrics,
             ssh_private_keys,
             jpd,
@@ -171,3 +291,11 @@ def _pull_runner_metrics(
 ) -> Optional[MetricsResponse]:
     runner_client = client.RunnerClient.from_address(addresses[DSTACK_RUNNER_HTTP_PORT])
     return runner_client.get_metrics()
+
+
+_jobs_collector = JobsCollector(
+    collect_job=_collect_job_metrics,
+    save_results=_save_metrics_points,
+    concurrency=settings.SERVER_METRICS_COLLECTION_CONCURRENCY,
+    deadline=COLLECT_DEADLINE_SECONDS,
+)
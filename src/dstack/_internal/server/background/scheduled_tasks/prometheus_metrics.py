@@ -1,6 +1,6 @@
 import uuid
 from collections.abc import Mapping
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
 
 import sqlalchemy.exc
@@ -9,6 +9,8 @@ from sqlalchemy.orm import joinedload
 
 from dstack._internal.core.consts import DSTACK_SHIM_HTTP_PORT
 from dstack._internal.core.models.runs import JobStatus
+from dstack._internal.server import settings
+from dstack._internal.server.background.scheduled_tasks.common import JobsCollector
 from dstack._internal.server.db import get_session_ctx
 from dstack._internal.server.models import (
     InstanceModel,
@@ -16,21 +18,21 @@ from dstack._internal.server.models import (
     JobPrometheusMetrics,
     ProjectModel,
 )
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.instances import get_instance_ssh_private_keys
 from dstack._internal.server.services.jobs import get_job_provisioning_data, get_job_runtime_data
 from dstack._internal.server.services.runner import client
 from dstack._internal.server.services.runner.ssh import runner_ssh_tunnel
 from dstack._internal.server.utils import tracing
-from dstack._internal.server.utils.common import gather_map_async
-from dstack._internal.utils.common import batched, get_current_datetime, get_or_error, run_async
+from dstack._internal.utils.common import get_current_datetime, get_or_error
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-MAX_JOBS_FETCHED = 100
-BATCH_SIZE = 10
 MIN_COLLECT_INTERVAL_SECONDS = 9
+# Jobs not collected within the deadline are collected first on the next run (every 10s)
+COLLECT_DEADLINE_SECONDS = 8
 # 10 minutes should be more than enough to scrape metrics, and, in any case,
 # 10 minutes old metrics has little to no value
 METRICS_TTL_SECONDS = 600
@@ -57,11 +59,9 @@ async def collect_prometheus_metrics():
                 .load_only(ProjectModel.ssh_private_key)
             )
             .order_by(JobModel.last_processed_at.asc())
-            .limit(MAX_JOBS_FETCHED)
         )
         job_models = res.unique().scalars().all()
-    for batch in batched(job_models, BATCH_SIZE):
-        await _collect_jobs_metrics(batch, now)
+    await _jobs_collector.collect(job_models)
 
 
 @tracing.instrument_scheduled_task
@@ -75,23 +75,16 @@ async def delete_prometheus_metrics():
         await session.commit()
 
 
-async def _collect_jobs_metrics(job_models: list[JobModel], collected_at: datetime):
-    results = await gather_map_async(job_models, _collect_job_metrics, return_exceptions=True)
+async def _save_jobs_metrics(results: list[tuple[JobModel, str]]):
+    collected_at = get_current_datetime()
     async with get_session_ctx() as session:
-        for job_model, result in results:
-            if result is None:
-                continue
-            if isinstance(result, BaseException):
-                logger.error(
-                    "Failed to collect job %s Prometheus metrics: %r", job_model.job_name, result
-                )
-                continue
+        for job_model, text in results:
             res = await session.execute(
                 update(JobPrometheusMetrics)
                 .where(JobPrometheusMetrics.job_id == job_model.id)
                 .values(
                     collected_at=collected_at,
-                    text=result,
+                    text=text,
                 )
                 .returning(JobPrometheusMetrics)
             )
@@ -100,7 +93,7 @@ async def _collect_jobs_metrics(job_models: list[JobModel], collected_at: dateti
                 metrics = JobPrometheusMetrics(
                     job_id=job_model.id,
                     collected_at=collected_at,
-                    text=result,
+                    text=text,
                 )
                 try:
                     async with session.begin_nested():
@@ -112,16 +105,17 @@ async def _collect_jobs_metrics(job_models: list[JobModel], collected_at: dateti
 
 
 async def _collect_job_metrics(job_model: JobModel) -> Optional[str]:
-    jpd = get_job_provisioning_data(job_model)
+    jpd = get_job_provisioning_data(job_model, readonly=True)
     if jpd is None:
         return None
     if not jpd.dockerized:
         # Container-based backend, no shim
         return None
     ssh_private_keys = get_instance_ssh_private_keys(get_or_error(job_model.instance))
-    jrd = get_job_runtime_data(job_model)
+    jrd = get_job_runtime_data(job_model, readonly=True)
     try:
-        res = await run_async(
+        res = await run_async_in(
+            ExecutorPool.RUNNER,
             _pull_job_metrics,
             ssh_private_keys,
             jpd,
@@ -151,3 +145,11 @@ def _pull_job_metrics(
 ) -> Optional[str]:
     shim_client = client.ShimClient.from_address(addresses[DSTACK_SHIM_HTTP_PORT])
     return shim_client.get_task_metrics(task_id)
+
+
+_jobs_collector = JobsCollector(
+    collect_job=_collect_job_metrics,
+    save_results=_save_jobs_metrics,
+    concurrency=settings.SERVER_METRICS_COLLECTION_CONCURRENCY,
+    deadline=COLLECT_DEADLINE_SECONDS,
+)
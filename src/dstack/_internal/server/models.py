@@ -1211,6 +1211,64 @@ class JobMetricsPoint(BaseModel):
     """`gpus_util_percent` stores a JSON-encoded list of metric values with length `len(gpus)`."""
 
 
+class JobMetricsBlock(BaseModel):
+    """
+    Job metrics points compacted into a block per `METRICS_BLOCK_DURATION_SECONDS`.
+    Recent points are stored as `JobMetricsPoint` until the block is compacted.
+    """
+
+    __tablename__ = "job_metrics_blocks"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUIDType(binary=False), primary_key=True, default=uuid.uuid4
+    )
+
+    job_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("jobs.id"), index=True)
+    job: Mapped["JobModel"] = relationship()
+
+    start_timestamp_micro: Mapped[int] = mapped_column(BigInteger)
+    """`start_timestamp_micro` is the timestamp of the first point in the block."""
+    end_timestamp_micro: Mapped[int] = mapped_column(BigInteger)
+    """`end_timestamp_micro` is the timestamp of the last point in the block."""
+    points_count: Mapped[int] = mapped_column(Integer)
+    gpus_count: Mapped[int] = mapped_column(Integer)
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    """`data` stores points encoded with `services.metrics_blocks.encode_points()`."""
+
+
+class JobMetricsRollup(BaseModel):
+    """
+    Aggregates of job metrics points over a time bucket of `resolution` seconds.
+    Updated as points are collected.
+    """
+
+    __tablename__ = "job_metrics_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "job_id",
+            "resolution",
+            "start_timestamp_micro",
+            name="uq_job_metrics_rollups_job_id_resolution_start_timestamp_micro",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUIDType(binary=False), primary_key=True, default=uuid.uuid4
+    )
+
+    job_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("jobs.id"), index=True)
+    job: Mapped["JobModel"] = relationship()
+
+    resolution: Mapped[int] = mapped_column(Integer)
+    """`resolution` is the bucket length in seconds."""
+    start_timestamp_micro: Mapped[int] = mapped_column(BigInteger)
+    points_count: Mapped[int] = mapped_column(Integer)
+    last_timestamp_micro: Mapped[int] = mapped_column(BigInteger)
+    last_cpu_usage_micro: Mapped[int] = mapped_column(BigInteger)
+    data: Mapped[str] = mapped_column(Text)
+    """`data` stores JSON-encoded aggregates, see `services.metrics_rollups.RollupData`."""
+
+
 class JobPrometheusMetrics(BaseModel):
     __tablename__ = "job_prometheus_metrics"
 
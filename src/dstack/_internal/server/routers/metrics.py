@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dstack._internal.core.errors import ResourceNotExistsError
@@ -12,6 +12,7 @@ from dstack._internal.server.models import ProjectModel, UserModel
 from dstack._internal.server.security.permissions import ProjectMember
 from dstack._internal.server.services import metrics
 from dstack._internal.server.services.jobs import get_run_job_model
+from dstack._internal.server.services.metrics_rollups import RollupAggregation
 from dstack._internal.server.utils.routers import (
     CustomJSONResponse,
     get_base_api_additional_responses,
@@ -37,6 +38,8 @@ async def get_job_metrics(
     limit: int = 1,
     after: Optional[datetime] = None,
     before: Optional[datetime] = None,
+    step: Optional[int] = Query(default=None, gt=0),
+    aggregation: RollupAggregation = "avg",
     session: AsyncSession = Depends(get_session),
     user_project: Tuple[UserModel, ProjectModel] = Depends(ProjectMember()),
 ):
@@ -48,6 +51,11 @@ async def get_job_metrics(
     By default, returns one latest sample. To control time window/number of samples, use
     `limit`, `after`, `before`.
 
+    To get downsampled metrics, set `step` in seconds, e.g. `60`, `600`, or `3600`.
+    Each sample then aggregates a `step` with `aggregation` (`avg`, `min`, or `max`), and
+    `limit` is the number of steps. `step` must be a multiple of 60 seconds,
+    otherwise raw samples are returned.
+
     Supported metrics (all optional):
     * `cpus_detected_num`
     * `cpu_usage_percent`
@@ -79,5 +87,7 @@ async def get_job_metrics(
             limit=limit,
             after=after,
             before=before,
+            step=step,
+            aggregation=aggregation,
         )
     )
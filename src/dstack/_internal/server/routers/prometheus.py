@@ -2,7 +2,7 @@ import os
 from typing import Annotated
 
 import prometheus_client
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,7 +10,7 @@ from dstack._internal.server import settings
 from dstack._internal.server.db import get_session
 from dstack._internal.server.security.permissions import OptionalServiceAccount
 from dstack._internal.server.services.prometheus import custom_metrics
-from dstack._internal.server.utils.routers import error_not_found
+from dstack._internal.server.utils.routers import CustomJSONResponse, error_not_found
 
 _auth = OptionalServiceAccount(os.getenv("DSTACK_PROMETHEUS_AUTH_TOKEN"))
 
@@ -33,3 +33,21 @@ async def get_prometheus_metrics(
     custom_metrics_ = await custom_metrics.get_metrics(session=session)
     client_metrics = prometheus_client.generate_latest().decode()
     return custom_metrics_ + client_metrics
+
+
+@router.get(
+    "/metrics/pipelines",
+    summary="Get background pipelines stats",
+    response_class=CustomJSONResponse,
+)
+async def get_pipelines_stats(request: Request):
+    """
+    Returns the current state and recent throughput and latency of each background pipeline
+    for debugging. The same stats are exported as `dstack_pipeline_*` Prometheus metrics.
+    """
+    if not settings.ENABLE_PROMETHEUS_METRICS:
+        raise error_not_found()
+    pipeline_manager = getattr(request.app.state, "pipeline_manager", None)
+    if pipeline_manager is None:
+        return CustomJSONResponse([])
+    return CustomJSONResponse(pipeline_manager.get_stats())
@@ -1,4 +1,5 @@
 import asyncio
+import hashlib
 import json
 import time
 from collections.abc import Iterable, Iterator
@@ -11,6 +12,7 @@ from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dstack._internal.core.backends.base.backend import Backend
+from dstack._internal.core.backends.base.compute import ComputeWithAllOffersCached
 from dstack._internal.core.backends.base.configurator import (
     Configurator,
     StoredBackendRecord,
@@ -40,8 +42,8 @@ from dstack._internal.core.models.instances import (
 from dstack._internal.core.models.runs import Requirements
 from dstack._internal.server import settings
 from dstack._internal.server.models import BackendModel, DecryptedString, ProjectModel
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.offers import merge_offer_iterables
-from dstack._internal.utils.common import run_async
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -115,10 +117,14 @@ async def validate_and_create_backend_model(
     # Configurators may mutate `config` while building the effective stored backend config,
     # so capture the user-intent payload before validation/create_backend runs.
     source_config, source_auth = serialize_source_backend_config(config)
-    await run_async(
-        configurator.validate_config, config, default_creds_enabled=settings.DEFAULT_CREDS_ENABLED
+    await run_async_in(
+        ExecutorPool.CLOUD,
+        configurator.validate_config,
+        config,
+        default_creds_enabled=settings.DEFAULT_CREDS_ENABLED,
     )
-    backend_record = await run_async(
+    backend_record = await run_async_in(
+        ExecutorPool.CLOUD,
         configurator.create_backend,
         project_name=project.name,
         config=config,
@@ -320,6 +326,9 @@ async def get_project_backends_with_models(project: ProjectModel) -> List[Backen
                         )
                 else:
                     backend, duration = result
+                    compute = backend.compute()
+                    if isinstance(compute, ComputeWithAllOffersCached):
+                        compute.set_offers_cache_key(_get_offers_cache_key(backend_model))
                     project_backends[backend_model.type] = (backend_model, backend)
                     initialized_results.append(f"{backend_model.type.value}={duration:.1f}s")
             logger.debug(
@@ -337,11 +346,27 @@ async def get_project_backends_with_models(project: ProjectModel) -> List[Backen
     return list(project_backends.values())
 
 
+def _get_offers_cache_key(backend_model: BackendModel) -> str:
+    """
+    Returns a fingerprint of the backend config and creds so that backends of different
+    projects configured with the same credentials share cached offers.
+    """
+    fingerprint = hashlib.sha256()
+    for part in (
+        backend_model.type.value,
+        backend_model.config,
+        backend_model.auth.get_plaintext_or_error(),
+    ):
+        fingerprint.update(part.encode())
+        fingerprint.update(b"\0")
+    return fingerprint.hexdigest()
+
+
 async def _get_backend_tracked(
     configurator: Configurator, backend_record: StoredBackendRecord
 ) -> Tuple[Backend, float]:
     t = time.time()
-    backend = await run_async(configurator.get_backend, backend_record)
+    backend = await run_async_in(ExecutorPool.CLOUD, configurator.get_backend, backend_record)
     return backend, time.time() - t
 
 
@@ -488,7 +513,14 @@ async def get_backend_offers(
 
     logger.debug("Requesting instance offers from backends: %s", [b.TYPE.value for b in backends])
     tasks = [
-        run_async(get_offers_tracked, backend, requirements, full_offers, unallocated_resources)
+        run_async_in(
+            ExecutorPool.CLOUD,
+            get_offers_tracked,
+            backend,
+            requirements,
+            full_offers,
+            unallocated_resources,
+        )
         for backend in backends
     ]
     offers_by_backend: list[Iterable[tuple[Backend, InstanceOfferWithAvailability]]] = []
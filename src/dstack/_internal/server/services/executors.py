@@ -0,0 +1,125 @@
+"""
+Thread pool executors that isolate blocking workloads of different kinds.
+
+A single shared executor lets a burst of slow calls of one kind, e.g. cloud API calls
+that provision instances, occupy all threads and delay unrelated work such as pulling
+job states from runners or writing job logs. Instead, each workload runs in its own pool
+sized with a `DSTACK_SERVER_EXECUTOR_*_MAX_WORKERS` setting. The `DEFAULT` pool is
+set as the event loop's default executor and runs everything submitted with
+`dstack._internal.utils.common.run_async()`.
+
+Pools are created on first use and export saturation and queue wait metrics labeled
+with the pool name.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import Callable, TypeVar
+
+from typing_extensions import ParamSpec
+
+from dstack._internal.server import settings
+from dstack._internal.server.services.prometheus.client_metrics import executor_metrics
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class ExecutorPool(str, Enum):
+    # Everything not assigned to a dedicated pool
+    DEFAULT = "default"
+    # Backend compute calls: provisioning, termination, volumes, gateways, etc.
+    CLOUD = "cloud"
+    # SSH tunnels and HTTP calls to shims and runners
+    RUNNER = "runner"
+    # Code and file archives uploads and downloads
+    STORAGE = "storage"
+    # Job and runner logs writes and reads
+    LOGS = "logs"
+
+    def get_max_workers(self) -> int:
+        return {
+            ExecutorPool.DEFAULT: settings.SERVER_EXECUTOR_MAX_WORKERS,
+            ExecutorPool.CLOUD: settings.SERVER_EXECUTOR_CLOUD_MAX_WORKERS,
+            ExecutorPool.RUNNER: settings.SERVER_EXECUTOR_RUNNER_MAX_WORKERS,
+            ExecutorPool.STORAGE: settings.SERVER_EXECUTOR_STORAGE_MAX_WORKERS,
+            ExecutorPool.LOGS: settings.SERVER_EXECUTOR_LOGS_MAX_WORKERS,
+        }[self]
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    A `ThreadPoolExecutor` that reports the number of queued and active tasks
+    and the time tasks wait for a free thread.
+    """
+
+    def __init__(self, pool: ExecutorPool, max_workers: int) -> None:
+        super().__init__(max_workers=max_workers, thread_name_prefix=f"dstack-{pool.value}")
+        self.pool = pool
+        executor_metrics.set_max_workers(pool.value, max_workers)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        executor_metrics.log_task_submitted(self.pool.value)
+        try:
+            future = super().submit(self._run, time.monotonic(), fn, *args, **kwargs)
+        except BaseException:
+            executor_metrics.log_task_dequeued(self.pool.value)
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _run(self, submitted_at: float, fn, /, *args, **kwargs):
+        started_at = time.monotonic()
+        executor_metrics.log_task_started(self.pool.value, started_at - submitted_at)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            executor_metrics.log_task_finished(self.pool.value, time.monotonic() - started_at)
+
+    def _on_done(self, future: Future) -> None:
+        # Only tasks that have not started can be cancelled
+        if future.cancelled():
+            executor_metrics.log_task_dequeued(self.pool.value)
+
+
+_executors: dict[ExecutorPool, InstrumentedThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(pool: ExecutorPool) -> InstrumentedThreadPoolExecutor:
+    with _executors_lock:
+        executor = _executors.get(pool)
+        if executor is None:
+            executor = InstrumentedThreadPoolExecutor(
+                pool=pool, max_workers=pool.get_max_workers()
+            )
+            _executors[pool] = executor
+        return executor
+
+
+def shutdown_executors() -> None:
+    """
+    Shuts down all pools without waiting for running tasks. Pools are re-created
+    if used afterwards.
+    """
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_async_in(
+    pool: ExecutorPool, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs
+) -> R:
+    """
+    Same as `dstack._internal.utils.common.run_async()` but runs `func` in `pool`.
+    """
+    ctx = contextvars.copy_context()
+    func_with_args = partial(ctx.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(pool), func_with_args)
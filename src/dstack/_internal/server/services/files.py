@@ -9,8 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from dstack._internal.core.errors import ServerClientError, ServerError
 from dstack._internal.core.models.files import FileArchive
 from dstack._internal.server.models import FileArchiveModel, UserModel
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.storage import get_default_storage
-from dstack._internal.utils.common import run_async
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -77,7 +77,9 @@ async def upload_archive(
     blob = await file.read()
     storage = get_default_storage()
     if storage is not None:
-        await run_async(storage.upload_archive, str(user.id), archive_hash, blob)
+        await run_async_in(
+            ExecutorPool.STORAGE, storage.upload_archive, str(user.id), archive_hash, blob
+        )
     archive_model = FileArchiveModel(
         user_id=user.id,
         blob_hash=archive_hash,
@@ -713,13 +713,33 @@ def _merge_per_window_stats(stats_per_gateway_replica: list[PerWindowStats]) ->
     for window in SERVICE_SCALING_WINDOWS:
         total_requests = 0
         total_time_of_all_requests = 0.0
+        streamed_requests = 0
+        total_ttft = 0.0
+        itl_weight = 0
+        total_inter_token_latency = 0.0
+        output_tokens_per_second = 0.0
+        queue_depth = 0.0
         for gateway_replica_stats in stats_per_gateway_replica:
             stat = gateway_replica_stats[window]
             total_requests += stat.requests
             total_time_of_all_requests += stat.requests * stat.request_time
+            if stat.ttft is not None:
+                streamed_requests += stat.streamed_requests
+                total_ttft += stat.streamed_requests * stat.ttft
+            if stat.inter_token_latency is not None:
+                itl_weight += stat.streamed_requests
+                total_inter_token_latency += stat.streamed_requests * stat.inter_token_latency
+            output_tokens_per_second += stat.output_tokens_per_second
+            # each gateway replica reports its own in-flight requests per service replica
+            queue_depth += stat.queue_depth
         merged[window] = Stat(
             requests=total_requests,
             request_time=(total_time_of_all_requests / total_requests if total_requests else 0.0),
+            streamed_requests=streamed_requests,
+            ttft=total_ttft / streamed_requests if streamed_requests else None,
+            inter_token_latency=(total_inter_token_latency / itl_weight if itl_weight else None),
+            output_tokens_per_second=output_tokens_per_second,
+            queue_depth=queue_depth,
         )
     return merged
 
@@ -61,7 +61,7 @@ from dstack._internal.server.services import events
 from dstack._internal.server.services.logging import fmt
 from dstack._internal.server.services.offers import generate_shared_offer
 from dstack._internal.server.services.projects import list_user_project_models
-from dstack._internal.server.services.runner.client import ShimClient
+from dstack._internal.server.services.runner.client import AsyncShimClient
 from dstack._internal.utils import common as common_utils
 from dstack._internal.utils.common import get_or_error
 from dstack._internal.utils.logging import get_logger
@@ -1005,11 +1005,13 @@ async def create_ssh_instance_model(
     return im
 
 
-def remove_dangling_tasks_from_instance(shim_client: ShimClient, instance: InstanceModel) -> None:
-    if not shim_client.is_api_v2_supported():
+async def remove_dangling_tasks_from_instance(
+    shim_client: AsyncShimClient, instance: InstanceModel
+) -> None:
+    if not await shim_client.is_api_v2_supported():
         return
     assigned_to_instance_job_ids = {str(j.id) for j in instance.jobs}
-    task_list_response = shim_client.list_tasks()
+    task_list_response = await shim_client.list_tasks()
     tasks: list[tuple[str, Optional[TaskStatus]]]
     if task_list_response.tasks is not None:
         tasks = [(t.id, t.status) for t in task_list_response.tasks]
@@ -1032,11 +1034,11 @@ def remove_dangling_tasks_from_instance(shim_client: ShimClient, instance: Insta
             task_status or "<unknown>",
         )
         if should_terminate:
-            shim_client.terminate_task(
+            await shim_client.terminate_task(
                 task_id=task_id,
                 reason=None,
                 message=None,
                 timeout=0,
             )
         if should_remove:
-            shim_client.remove_task(task_id=task_id)
+            await shim_client.remove_task(task_id=task_id)
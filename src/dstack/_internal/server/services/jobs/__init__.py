@@ -43,6 +43,7 @@ from dstack._internal.server.models import (
 )
 from dstack._internal.server.services import events
 from dstack._internal.server.services import volumes as volumes_services
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.ides import get_ide
 from dstack._internal.server.services.instances import (
     get_instance_ssh_private_keys,
@@ -55,7 +56,9 @@ from dstack._internal.server.services.jobs.configurators.dev import DevEnvironme
 from dstack._internal.server.services.jobs.configurators.service import ServiceJobConfigurator
 from dstack._internal.server.services.jobs.configurators.task import TaskJobConfigurator
 from dstack._internal.server.services.logging import fmt
+from dstack._internal.server.services.parsed_models import parse_json_model
 from dstack._internal.server.services.probes import probe_model_to_probe
+from dstack._internal.server.services.proxy.routing import invalidate_service_route_on_commit
 from dstack._internal.server.services.runner import client
 from dstack._internal.server.services.runner.ssh import runner_ssh_tunnel
 from dstack._internal.server.services.sshproxy import (
@@ -64,7 +67,6 @@ from dstack._internal.server.services.sshproxy import (
     build_proxied_job_upstream_id,
 )
 from dstack._internal.utils import common
-from dstack._internal.utils.common import run_async
 from dstack._internal.utils.interpolator import VariablesInterpolator
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.ssh import build_ssh_command, build_ssh_url_authority
@@ -127,6 +129,8 @@ def emit_job_status_change_event(
 ) -> None:
     if old_status == new_status:
         return
+    if JobStatus.RUNNING in (old_status, new_status):
+        invalidate_service_route_on_commit(session, job_model.run_id)
     events.emit(
         session,
         get_job_status_change_message(
@@ -276,16 +280,26 @@ def job_model_to_job_submission(
     )
 
 
-def get_job_provisioning_data(job_model: JobModel) -> Optional[JobProvisioningData]:
+def get_job_provisioning_data(
+    job_model: JobModel, readonly: bool = False
+) -> Optional[JobProvisioningData]:
+    """
+    Pass `readonly=True` to get a cached instance that must not be mutated.
+    """
     if job_model.job_provisioning_data is None:
         return None
-    return validate_json_extra_ignore(JobProvisioningData, job_model.job_provisioning_data)
+    return parse_json_model(
+        JobProvisioningData, job_model.job_provisioning_data, readonly=readonly
+    )
 
 
-def get_job_runtime_data(job_model: JobModel) -> Optional[JobRuntimeData]:
+def get_job_runtime_data(job_model: JobModel, readonly: bool = False) -> Optional[JobRuntimeData]:
+    """
+    Pass `readonly=True` to get a cached instance that must not be mutated.
+    """
     if job_model.job_runtime_data is None:
         return None
-    return validate_json_extra_ignore(JobRuntimeData, job_model.job_runtime_data)
+    return parse_json_model(JobRuntimeData, job_model.job_runtime_data, readonly=readonly)
 
 
 def _get_image_pull_progress(job_model: JobModel) -> Optional[ImagePullProgress]:
@@ -294,8 +308,11 @@ def _get_image_pull_progress(job_model: JobModel) -> Optional[ImagePullProgress]
     return validate_json_extra_ignore(ImagePullProgress, job_model.image_pull_progress)
 
 
-def get_job_spec(job_model: JobModel) -> JobSpec:
-    return validate_json_extra_ignore(JobSpec, job_model.job_spec_data)
+def get_job_spec(job_model: JobModel, readonly: bool = False) -> JobSpec:
+    """
+    Pass `readonly=True` to get a cached instance that must not be mutated.
+    """
+    return parse_json_model(JobSpec, job_model.job_spec_data, readonly=readonly)
 
 
 def job_spec_updatable_in_place(old_job_spec: JobSpec, new_job_spec: JobSpec) -> bool:
@@ -357,7 +374,9 @@ async def stop_runner(job_model: JobModel, instance_model: InstanceModel):
     if jpd is not None:
         jrd = get_job_runtime_data(job_model)
         try:
-            await run_async(_stop_runner, ssh_private_keys, jpd, jrd, job_model)
+            await run_async_in(
+                ExecutorPool.RUNNER, _stop_runner, ssh_private_keys, jpd, jrd, job_model
+            )
         except SSHError:
             logger.debug("%s: failed to stop runner", fmt(job_model))
 
@@ -8,6 +8,7 @@ from dstack._internal.server import settings
 from dstack._internal.server.models import ProjectModel
 from dstack._internal.server.schemas.logs import PollLogsRequest
 from dstack._internal.server.schemas.runner import LogEvent as RunnerLogEvent
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.logs import aws as aws_logs
 from dstack._internal.server.services.logs import fluentbit as fluentbit_logs
 from dstack._internal.server.services.logs import gcp as gcp_logs
@@ -16,14 +17,15 @@ from dstack._internal.server.services.logs.base import (
     LogStorageError,
     b64encode_raw_message,
 )
+from dstack._internal.server.services.logs.buffer import LogWriteBuffer
 from dstack._internal.server.services.logs.filelog import FileLogStorage
-from dstack._internal.utils.common import run_async
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
 _log_storage: Optional[LogStorage] = None
+_log_write_buffer: Optional[LogWriteBuffer] = None
 
 
 def get_log_storage() -> LogStorage:
@@ -105,10 +107,65 @@ def write_logs(
     )
 
 
+async def write_logs_async(
+    project: ProjectModel,
+    run_name: str,
+    job_submission_id: UUID,
+    runner_logs: List[RunnerLogEvent],
+    job_logs: List[RunnerLogEvent],
+) -> None:
+    """
+    Buffers logs to be written in the background if the write buffer is started.
+    Otherwise, writes logs right away.
+    """
+    if _log_write_buffer is not None:
+        await _log_write_buffer.write_logs(
+            project=project,
+            run_name=run_name,
+            job_submission_id=job_submission_id,
+            runner_logs=runner_logs,
+            job_logs=job_logs,
+        )
+        return
+    await run_async_in(
+        ExecutorPool.LOGS,
+        write_logs,
+        project=project,
+        run_name=run_name,
+        job_submission_id=job_submission_id,
+        runner_logs=runner_logs,
+        job_logs=job_logs,
+    )
+
+
+def start_log_write_buffer() -> None:
+    global _log_write_buffer
+    if _log_write_buffer is not None:
+        return
+    _log_write_buffer = LogWriteBuffer(
+        storage=get_log_storage(),
+        max_events=settings.SERVER_LOGS_WRITE_BUFFER_MAX_EVENTS,
+        flush_interval=settings.SERVER_LOGS_WRITE_BUFFER_FLUSH_INTERVAL,
+    )
+    _log_write_buffer.start()
+
+
+async def stop_log_write_buffer() -> None:
+    """
+    Writes buffered logs and stops the write buffer. Logs written afterwards are not buffered.
+    """
+    global _log_write_buffer
+    log_write_buffer = _log_write_buffer
+    if log_write_buffer is None:
+        return
+    _log_write_buffer = None
+    await log_write_buffer.close()
+
+
 async def poll_logs_async(project: ProjectModel, request: PollLogsRequest) -> JobSubmissionLogs:
     try:
-        job_submission_logs = await run_async(
-            get_log_storage().poll_logs, project=project, request=request
+        job_submission_logs = await run_async_in(
+            ExecutorPool.LOGS, get_log_storage().poll_logs, project=project, request=request
         )
     except LogStorageError as e:
         logger.error("Failed to poll logs from log storage: %s", repr(e))
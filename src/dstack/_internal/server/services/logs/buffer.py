@@ -0,0 +1,202 @@
+"""
+Write-behind buffer for job logs pulled from runners.
+
+Writing logs inline with processing running jobs makes job processing as slow as
+the log storage, e.g. CloudWatch or Fluent-bit network calls, and fails processing
+if the log storage is unavailable. Instead, logs are added to an in-memory buffer
+and written in the background. Logs of the same job are coalesced into one write,
+and logs of all jobs are written in one executor call per flush.
+
+The buffer is bounded by the number of events, including events being written.
+Writers wait for the buffer to free up when it is full. Failed writes are retried
+up to `LOG_WRITE_MAX_ATTEMPTS` times before events are dropped. Buffered logs are
+flushed on close.
+
+Buffered logs are not durable. The job's `runner_timestamp` advances as soon as logs
+are buffered, so the runner does not send them again. Logs are lost if they fail
+to be written `LOG_WRITE_MAX_ATTEMPTS` times, e.g. during a log storage outage, or if
+the server exits without flushing the buffer, e.g. on a crash or if the flush on close
+times out. Writing logs inline would avoid this at the cost of job processing throughput.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+from uuid import UUID
+
+from dstack._internal.server.models import ProjectModel
+from dstack._internal.server.schemas.runner import LogEvent as RunnerLogEvent
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
+from dstack._internal.server.services.logs.base import LogStorage
+from dstack._internal.server.services.prometheus.client_metrics import log_write_buffer_metrics
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+LOG_WRITE_MAX_ATTEMPTS = 3
+LOG_WRITE_BUFFER_CLOSE_TIMEOUT = 30
+
+
+@dataclass
+class _PendingWrite:
+    project: ProjectModel
+    run_name: str
+    job_submission_id: UUID
+    # When the oldest event was buffered
+    buffered_at: float
+    runner_logs: List[RunnerLogEvent] = field(default_factory=list)
+    job_logs: List[RunnerLogEvent] = field(default_factory=list)
+    failed_attempts: int = 0
+
+    @property
+    def events_count(self) -> int:
+        return len(self.runner_logs) + len(self.job_logs)
+
+
+class LogWriteBuffer:
+    def __init__(self, storage: LogStorage, max_events: int, flush_interval: float) -> None:
+        self._storage = storage
+        self._max_events = max_events
+        self._flush_interval = flush_interval
+        self._pending: dict[UUID, _PendingWrite] = {}
+        # Includes events being written so that slow writes do not let the buffer grow
+        self._events_count = 0
+        self._condition = asyncio.Condition()
+        self._flush_requested = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def write_logs(
+        self,
+        project: ProjectModel,
+        run_name: str,
+        job_submission_id: UUID,
+        runner_logs: List[RunnerLogEvent],
+        job_logs: List[RunnerLogEvent],
+    ) -> None:
+        """
+        Buffers logs for writing. Waits if the buffer is full.
+        """
+        events_count = len(runner_logs) + len(job_logs)
+        if events_count == 0:
+            return
+        async with self._condition:
+            if self._events_count >= self._max_events:
+                self._flush_requested.set()
+                await self._condition.wait_for(lambda: self._events_count < self._max_events)
+            pending = self._pending.get(job_submission_id)
+            if pending is None:
+                pending = _PendingWrite(
+                    project=project,
+                    run_name=run_name,
+                    job_submission_id=job_submission_id,
+                    buffered_at=time.monotonic(),
+                )
+                self._pending[job_submission_id] = pending
+            pending.runner_logs.extend(runner_logs)
+            pending.job_logs.extend(job_logs)
+            self._events_count += events_count
+            log_write_buffer_metrics.set_buffered_events(self._events_count)
+
+    async def flush(self) -> None:
+        """
+        Writes all buffered logs. Logs that failed to be written are buffered again
+        to be retried on the next flush.
+        """
+        async with self._condition:
+            batch = list(self._pending.values())
+            self._pending = {}
+        if len(batch) == 0:
+            return
+        failed = await run_async_in(ExecutorPool.LOGS, self._write_batch, batch)
+        async with self._condition:
+            for pending in failed:
+                # Copy the lists passed to the storage instead of extending them.
+                # Failed events go first as they were buffered earlier.
+                pending.runner_logs = list(pending.runner_logs)
+                pending.job_logs = list(pending.job_logs)
+                newer = self._pending.get(pending.job_submission_id)
+                if newer is not None:
+                    pending.runner_logs.extend(newer.runner_logs)
+                    pending.job_logs.extend(newer.job_logs)
+                self._pending[pending.job_submission_id] = pending
+            self._events_count -= sum(p.events_count for p in batch) - sum(
+                p.events_count for p in failed
+            )
+            log_write_buffer_metrics.set_buffered_events(self._events_count)
+            self._condition.notify_all()
+
+    async def close(self) -> None:
+        """
+        Stops the background flushing after writing buffered logs.
+        """
+        if self._task is None:
+            return
+        self._closing = True
+        self._flush_requested.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), LOG_WRITE_BUFFER_CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            logger.error(
+                "Failed to write %d buffered log events in %ds, dropping",
+                self._events_count,
+                LOG_WRITE_BUFFER_CLOSE_TIMEOUT,
+            )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            closing = self._closing
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Unexpected error when flushing logs")
+            if closing and len(self._pending) == 0:
+                return
+
+    def _write_batch(self, batch: List[_PendingWrite]) -> List[_PendingWrite]:
+        failed = []
+        for pending in batch:
+            try:
+                self._storage.write_logs(
+                    project=pending.project,
+                    run_name=pending.run_name,
+                    job_submission_id=pending.job_submission_id,
+                    runner_logs=pending.runner_logs,
+                    job_logs=pending.job_logs,
+                )
+            except Exception as e:
+                log_write_buffer_metrics.increment_write_failures()
+                pending.failed_attempts += 1
+                if pending.failed_attempts < LOG_WRITE_MAX_ATTEMPTS:
+                    logger.warning(
+                        "Failed to write logs of job %s, will retry: %r",
+                        pending.job_submission_id,
+                        e,
+                    )
+                    failed.append(pending)
+                else:
+                    logger.error(
+                        "Failed to write %d log events of job %s after %d attempts, dropping: %r",
+                        pending.events_count,
+                        pending.job_submission_id,
+                        pending.failed_attempts,
+                        e,
+                    )
+                    log_write_buffer_metrics.increment_dropped_events(pending.events_count)
+                continue
+            log_write_buffer_metrics.log_write(
+                lag_seconds=time.monotonic() - pending.buffered_at,
+                events_count=pending.events_count,
+            )
+        return failed
@@ -1,4 +1,3 @@
-import json
 from collections import defaultdict
 from collections.abc import Sequence
 from datetime import datetime, timezone
@@ -9,13 +8,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from dstack._internal.core.models.instances import Resources
 from dstack._internal.core.models.metrics import JobMetrics, Metric
-from dstack._internal.server.models import JobMetricsPoint, JobModel
+from dstack._internal.server.models import JobMetricsBlock, JobMetricsPoint, JobModel
 from dstack._internal.server.services.jobs import get_job_provisioning_data, get_job_runtime_data
+from dstack._internal.server.services.metrics_blocks import MetricsPoint, decode_points
+from dstack._internal.server.services.metrics_rollups import (
+    RollupAggregation,
+    get_aggregate_value,
+    get_rollup_resolution,
+    get_rollups,
+    merge_rollups,
+    update_rollups,
+)
 from dstack._internal.utils.common import get_or_error
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+_BLOCKS_PAGE_SIZE = 10
+
 
 async def get_job_metrics(
     session: AsyncSession,
@@ -23,6 +33,8 @@ async def get_job_metrics(
     after: Optional[datetime] = None,
     before: Optional[datetime] = None,
     limit: Optional[int] = None,
+    step: Optional[int] = None,
+    aggregation: RollupAggregation = "avg",
 ) -> JobMetrics:
     """
     Returns metrics ordered from the latest to the earliest.
@@ -31,29 +43,190 @@ async def get_job_metrics(
         * limit=100 — get the latest 100 points
         * after=<now - 1 hour> — get points for the last one hour
         * before=<earliest timestamp from the last batch>, limit=100 ­— paginate back in history
+
+    If `step` (seconds) is a multiple of a rollup resolution, returns one point per `step`
+    calculated from rollups with `aggregation`, with timestamps of the step start.
+    `limit` is then the number of steps. Otherwise, returns raw points.
     """
+    after_micro = _datetime_to_unix_time_micro(after) if after is not None else None
+    before_micro = _datetime_to_unix_time_micro(before) if before is not None else None
+    if step is not None:
+        resolution = get_rollup_resolution(step)
+        if resolution is not None:
+            return await _get_rollup_job_metrics(
+                session=session,
+                job_model=job_model,
+                resolution=resolution,
+                step=step,
+                aggregation=aggregation,
+                after_micro=after_micro,
+                before_micro=before_micro,
+                limit=limit,
+            )
+    # +1 for cpu_usage_percent
+    max_points = limit + 1 if limit is not None else None
     stmt = (
         select(JobMetricsPoint)
         .where(JobMetricsPoint.job_id == job_model.id)
         .order_by(JobMetricsPoint.timestamp_micro.desc())
     )
-    if after is not None:
+    if after_micro is not None:
         # we need +1 point for cpu_usage_percent, thus >=
-        stmt = stmt.where(JobMetricsPoint.timestamp_micro >= _datetime_to_unix_time_micro(after))
-    if before is not None:
-        stmt = stmt.where(JobMetricsPoint.timestamp_micro < _datetime_to_unix_time_micro(before))
-    if limit is not None:
-        # +1 for cpu_usage_percent
-        stmt = stmt.limit(limit + 1)
+        stmt = stmt.where(JobMetricsPoint.timestamp_micro >= after_micro)
+    if before_micro is not None:
+        stmt = stmt.where(JobMetricsPoint.timestamp_micro < before_micro)
+    if max_points is not None:
+        stmt = stmt.limit(max_points)
     res = await session.execute(stmt)
-    points = res.scalars().all()
+    points = [MetricsPoint.from_model(p) for p in res.scalars().all()]
+    if max_points is None or len(points) < max_points:
+        points.extend(
+            await _get_blocks_points(
+                session=session,
+                job_model=job_model,
+                after_micro=after_micro,
+                before_micro=before_micro,
+                max_points=max_points,
+            )
+        )
+        # Blocks normally precede non-compacted points but may overlap them if clocks are skewed
+        points.sort(key=lambda p: p.timestamp_micro, reverse=True)
+        if max_points is not None:
+            points = points[:max_points]
     # we need at least 2 points to calculate cpu_usage_percent
     if len(points) < 2:
         return JobMetrics(metrics=[])
     return _calculate_job_metrics(job_model, points)
 
 
-def _calculate_job_metrics(job_model: JobModel, points: Sequence[JobMetricsPoint]) -> JobMetrics:
+async def add_job_metrics_points(session: AsyncSession, points: Sequence[JobMetricsPoint]) -> None:
+    """
+    Adds collected points and updates the rollups. The caller is expected to commit.
+    """
+    session.add_all(points)
+    await update_rollups(session, points)
+
+
+async def _get_rollup_job_metrics(
+    session: AsyncSession,
+    job_model: JobModel,
+    resolution: int,
+    step: int,
+    aggregation: RollupAggregation,
+    after_micro: Optional[int],
+    before_micro: Optional[int],
+    limit: Optional[int],
+) -> JobMetrics:
+    rollups = await get_rollups(
+        session=session,
+        job_model=job_model,
+        resolution=resolution,
+        after_micro=after_micro,
+        before_micro=before_micro,
+        limit=limit * (step // resolution) if limit is not None else None,
+    )
+    buckets = merge_rollups(rollups, step)
+    if limit is not None:
+        buckets = buckets[:limit]
+    if len(buckets) == 0:
+        return JobMetrics(metrics=[])
+    timestamps = [_unix_time_micro_to_datetime(start) for start, _ in buckets]
+    metrics = [
+        Metric(
+            name=name,
+            timestamps=timestamps,
+            values=[get_aggregate_value(data.get(name), aggregation) for _, data in buckets],
+        )
+        for name in ("cpu_usage_percent", "memory_usage_bytes", "memory_working_set_bytes")
+    ]
+    cpus_detected_num, memory_total, gpu_memory_total = _get_job_resources_totals(job_model)
+    if cpus_detected_num is not None:
+        metrics.append(_make_constant_metric("cpus_detected_num", timestamps, cpus_detected_num))
+    if memory_total is not None:
+        metrics.append(_make_constant_metric("memory_total_bytes", timestamps, memory_total))
+    gpus_detected_nums = {
+        len(data["gpus_util_percent"]) if data.get("gpus_util_percent") is not None else None
+        for _, data in buckets
+    }
+    if len(gpus_detected_nums) != 1 or None in gpus_detected_nums:
+        logger.warning("gpus_detected_num mismatch, skipping GPU metrics")
+        return JobMetrics(metrics=metrics)
+    gpus_detected_num = gpus_detected_nums.pop()
+    metrics.append(_make_constant_metric("gpus_detected_num", timestamps, gpus_detected_num))
+    if gpu_memory_total is not None:
+        metrics.append(
+            _make_constant_metric("gpu_memory_total_bytes", timestamps, gpu_memory_total)
+        )
+    for index in range(gpus_detected_num):
+        metrics.append(
+            Metric(
+                name=f"gpu_memory_usage_bytes_gpu{index}",
+                timestamps=timestamps,
+                values=[
+                    get_aggregate_value(data["gpus_memory_usage_bytes"][index], aggregation)
+                    for _, data in buckets
+                ],
+            )
+        )
+    for index in range(gpus_detected_num):
+        metrics.append(
+            Metric(
+                name=f"gpu_util_percent_gpu{index}",
+                timestamps=timestamps,
+                values=[
+                    get_aggregate_value(data["gpus_util_percent"][index], aggregation)
+                    for _, data in buckets
+                ],
+            )
+        )
+    return JobMetrics(metrics=metrics)
+
+
+async def _get_blocks_points(
+    session: AsyncSession,
+    job_model: JobModel,
+    after_micro: Optional[int],
+    before_micro: Optional[int],
+    max_points: Optional[int],
+) -> list[MetricsPoint]:
+    """
+    Returns points from compacted blocks in the given time range, from the latest blocks.
+    Stops reading blocks once there are `max_points`.
+    """
+    stmt = (
+        select(JobMetricsBlock)
+        .where(JobMetricsBlock.job_id == job_model.id)
+        .order_by(JobMetricsBlock.end_timestamp_micro.desc())
+        .limit(_BLOCKS_PAGE_SIZE)
+    )
+    if after_micro is not None:
+        stmt = stmt.where(JobMetricsBlock.end_timestamp_micro >= after_micro)
+    if before_micro is not None:
+        stmt = stmt.where(JobMetricsBlock.start_timestamp_micro < before_micro)
+    points: list[MetricsPoint] = []
+    last_end_timestamp_micro: Optional[int] = None
+    while True:
+        page_stmt = stmt
+        if last_end_timestamp_micro is not None:
+            page_stmt = stmt.where(JobMetricsBlock.end_timestamp_micro < last_end_timestamp_micro)
+        res = await session.execute(page_stmt)
+        blocks = res.scalars().all()
+        for block in blocks:
+            points.extend(
+                p
+                for p in decode_points(block.data)
+                if (after_micro is None or p.timestamp_micro >= after_micro)
+                and (before_micro is None or p.timestamp_micro < before_micro)
+            )
+        if len(blocks) < _BLOCKS_PAGE_SIZE:
+            break
+        if max_points is not None and len(points) >= max_points:
+            break
+        last_end_timestamp_micro = blocks[-1].end_timestamp_micro
+    return points
+
+
+def _calculate_job_metrics(job_model: JobModel, points: Sequence[MetricsPoint]) -> JobMetrics:
     timestamps: list[datetime] = []
     cpu_usage_points: list[int] = []
     memory_usage_points: list[int] = []
@@ -61,22 +234,7 @@ def _calculate_job_metrics(job_model: JobModel, points: Sequence[JobMetricsPoint
     gpus_memory_usage_points: defaultdict[int, list[int]] = defaultdict(list)
     gpus_util_points: defaultdict[int, list[int]] = defaultdict(list)
 
-    cpus_detected_num: Optional[int] = None
-    memory_total: Optional[int] = None
-    gpu_memory_total: Optional[int] = None
-    resources: Optional[Resources] = None
-    jrd = get_job_runtime_data(job_model)
-    if jrd is not None and jrd.offer is not None:
-        resources = jrd.offer.instance.resources
-    else:
-        jpd = get_job_provisioning_data(job_model)
-        if jpd is not None:
-            resources = jpd.instance_type.resources
-    if resources is not None:
-        cpus_detected_num = resources.cpus
-        memory_total = resources.memory_mib * 1024 * 1024
-        if len(resources.gpus) > 0:
-            gpu_memory_total = resources.gpus[0].memory_mib * 1024 * 1024
+    cpus_detected_num, memory_total, gpu_memory_total = _get_job_resources_totals(job_model)
 
     gpus_detected_num: Optional[int] = None
     gpus_detected_num_mismatch: bool = False
@@ -85,8 +243,8 @@ def _calculate_job_metrics(job_model: JobModel, points: Sequence[JobMetricsPoint
         cpu_usage_points.append(_get_cpu_usage(point, prev_point))
         memory_usage_points.append(point.memory_usage_bytes)
         memory_working_set_points.append(point.memory_working_set_bytes)
-        gpus_memory_usage = json.loads(point.gpus_memory_usage_bytes)
-        gpus_util = json.loads(point.gpus_util_percent)
+        gpus_memory_usage = point.gpus_memory_usage_bytes
+        gpus_util = point.gpus_util_percent
         if gpus_detected_num is None:
             gpus_detected_num = len(gpus_memory_usage)
         if len(gpus_memory_usage) != gpus_detected_num or len(gpus_util) != gpus_detected_num:
@@ -149,6 +307,32 @@ def _calculate_job_metrics(job_model: JobModel, points: Sequence[JobMetricsPoint
     return JobMetrics(metrics=metrics)
 
 
+def _get_job_resources_totals(
+    job_model: JobModel,
+) -> tuple[Optional[int], Optional[int], Optional[int]]:
+    """
+    Returns:
+        the number of CPUs, memory in bytes, and memory of one GPU in bytes
+    """
+    cpus_detected_num: Optional[int] = None
+    memory_total: Optional[int] = None
+    gpu_memory_total: Optional[int] = None
+    resources: Optional[Resources] = None
+    jrd = get_job_runtime_data(job_model, readonly=True)
+    if jrd is not None and jrd.offer is not None:
+        resources = jrd.offer.instance.resources
+    else:
+        jpd = get_job_provisioning_data(job_model, readonly=True)
+        if jpd is not None:
+            resources = jpd.instance_type.resources
+    if resources is not None:
+        cpus_detected_num = resources.cpus
+        memory_total = resources.memory_mib * 1024 * 1024
+        if len(resources.gpus) > 0:
+            gpu_memory_total = resources.gpus[0].memory_mib * 1024 * 1024
+    return cpus_detected_num, memory_total, gpu_memory_total
+
+
 def _make_constant_metric(name: str, timestamps: list[datetime], value: float) -> Metric:
     return Metric(
         name=name,
@@ -157,7 +341,7 @@ def _make_constant_metric(name: str, timestamps: list[datetime], value: float) -
     )
 
 
-def _get_cpu_usage(last_point: JobMetricsPoint, prev_point: JobMetricsPoint) -> int:
+def _get_cpu_usage(last_point: MetricsPoint, prev_point: MetricsPoint) -> int:
     window = last_point.timestamp_micro - prev_point.timestamp_micro
     if window == 0:
         return 0
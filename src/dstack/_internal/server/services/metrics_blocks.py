@@ -0,0 +1,130 @@
+"""
+Compact encoding of job metrics points stored in `JobMetricsBlock`.
+
+A block holds points of one job with the same number of GPUs, ordered by timestamp.
+The data is a header followed by zlib-compressed little-endian int64 columns:
+timestamps and cumulative CPU usage as deltas, then memory usage, memory working set,
+and per-GPU memory usage and utilization, point by point.
+"""
+
+import json
+import struct
+import sys
+import uuid
+import zlib
+from array import array
+from itertools import accumulate
+from typing import List, NamedTuple, Sequence
+
+from dstack._internal.server.models import JobMetricsBlock, JobMetricsPoint
+
+METRICS_BLOCK_DURATION_SECONDS = 600
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BII")  # format version, points count, GPUs count
+
+
+class MetricsPoint(NamedTuple):
+    timestamp_micro: int
+    cpu_usage_micro: int
+    memory_usage_bytes: int
+    memory_working_set_bytes: int
+    gpus_memory_usage_bytes: List[int]
+    gpus_util_percent: List[int]
+
+    @staticmethod
+    def from_model(point: JobMetricsPoint) -> "MetricsPoint":
+        return MetricsPoint(
+            timestamp_micro=point.timestamp_micro,
+            cpu_usage_micro=point.cpu_usage_micro,
+            memory_usage_bytes=point.memory_usage_bytes,
+            memory_working_set_bytes=point.memory_working_set_bytes,
+            gpus_memory_usage_bytes=json.loads(point.gpus_memory_usage_bytes),
+            gpus_util_percent=json.loads(point.gpus_util_percent),
+        )
+
+
+def make_blocks(job_id: uuid.UUID, points: Sequence[MetricsPoint]) -> List[JobMetricsBlock]:
+    """
+    Splits `points` of a job ordered by timestamp into blocks
+    per `METRICS_BLOCK_DURATION_SECONDS` and the number of GPUs.
+    """
+    blocks = []
+    block_points: List[MetricsPoint] = []
+    block_key = None
+    for point in points:
+        key = (
+            point.timestamp_micro // (METRICS_BLOCK_DURATION_SECONDS * 1_000_000),
+            len(point.gpus_memory_usage_bytes),
+        )
+        if key != block_key and block_points:
+            blocks.append(_make_block(job_id, block_points))
+            block_points = []
+        block_key = key
+        block_points.append(point)
+    if block_points:
+        blocks.append(_make_block(job_id, block_points))
+    return blocks
+
+
+def encode_points(points: Sequence[MetricsPoint]) -> bytes:
+    """
+    Encodes points ordered by timestamp. All points must have the same number of GPUs.
+    """
+    columns = array("q")
+    columns.extend(_to_deltas([p.timestamp_micro for p in points]))
+    columns.extend(_to_deltas([p.cpu_usage_micro for p in points]))
+    columns.extend(p.memory_usage_bytes for p in points)
+    columns.extend(p.memory_working_set_bytes for p in points)
+    for point in points:
+        columns.extend(point.gpus_memory_usage_bytes)
+    for point in points:
+        columns.extend(point.gpus_util_percent)
+    if sys.byteorder == "big":
+        columns.byteswap()
+    gpus_count = len(points[0].gpus_memory_usage_bytes) if points else 0
+    header = _HEADER.pack(_FORMAT_VERSION, len(points), gpus_count)
+    return header + zlib.compress(columns.tobytes())
+
+
+def decode_points(data: bytes) -> List[MetricsPoint]:
+    version, count, gpus_count = _HEADER.unpack_from(data)
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported metrics block format version {version}")
+    columns = array("q")
+    columns.frombytes(zlib.decompress(data[_HEADER.size :]))
+    if sys.byteorder == "big":
+        columns.byteswap()
+    timestamps = list(accumulate(columns[:count]))
+    cpu_usage = list(accumulate(columns[count : 2 * count]))
+    memory_usage = columns[2 * count : 3 * count].tolist()
+    memory_working_set = columns[3 * count : 4 * count].tolist()
+    gpus_offset = 4 * count
+    gpus_memory_usage = columns[gpus_offset : gpus_offset + count * gpus_count].tolist()
+    gpus_offset += count * gpus_count
+    gpus_util = columns[gpus_offset : gpus_offset + count * gpus_count].tolist()
+    return [
+        MetricsPoint(
+            timestamp_micro=timestamps[i],
+            cpu_usage_micro=cpu_usage[i],
+            memory_usage_bytes=memory_usage[i],
+            memory_working_set_bytes=memory_working_set[i],
+            gpus_memory_usage_bytes=gpus_memory_usage[i * gpus_count : (i + 1) * gpus_count],
+            gpus_util_percent=gpus_util[i * gpus_count : (i + 1) * gpus_count],
+        )
+        for i in range(count)
+    ]
+
+
+def _make_block(job_id: uuid.UUID, points: Sequence[MetricsPoint]) -> JobMetricsBlock:
+    return JobMetricsBlock(
+        job_id=job_id,
+        start_timestamp_micro=points[0].timestamp_micro,
+        end_timestamp_micro=points[-1].timestamp_micro,
+        points_count=len(points),
+        gpus_count=len(points[0].gpus_memory_usage_bytes),
+        data=encode_points(points),
+    )
+
+
+def _to_deltas(values: List[int]) -> List[int]:
+    return values[:1] + [b - a for a, b in zip(values, values[1:])]
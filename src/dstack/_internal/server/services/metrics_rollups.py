@@ -0,0 +1,269 @@
+"""
+Job metrics rollups: min/max/sum/count of each metric over 1m, 10m, and 1h buckets,
+updated incrementally as points are collected.
+
+`JobMetricsRollup.data` is a JSON object that maps a metric name to `[min, max, sum, count]`.
+Metrics are `cpu_usage_percent`, `memory_usage_bytes`, `memory_working_set_bytes`, and
+`gpus_memory_usage_bytes` and `gpus_util_percent`, which are lists of aggregates per GPU.
+The GPU metrics are `null` if the number of GPUs changed within the bucket.
+"""
+
+import json
+import uuid
+from collections.abc import Sequence
+from typing import Any, Literal, Optional
+
+import sqlalchemy.exc
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dstack._internal.server.models import JobMetricsPoint, JobMetricsRollup, JobModel
+
+ROLLUP_RESOLUTIONS = {
+    60: 24 * 3600,
+    600: 7 * 24 * 3600,
+    3600: 30 * 24 * 3600,
+}
+"""
+Rollup bucket lengths in seconds mapped to how long the rollups are kept for jobs that
+are not finished. Rollups are never deleted before the points they cover, and rollups of
+finished jobs are kept as long as their points.
+"""
+
+RollupAggregation = Literal["avg", "min", "max"]
+
+_Aggregate = list  # [min, max, sum, count]
+
+
+class _Bucket:
+    __slots__ = ("rollup", "data")
+
+    def __init__(self, rollup: JobMetricsRollup) -> None:
+        self.rollup = rollup
+        self.data: dict[str, Any] = json.loads(rollup.data)
+
+
+async def update_rollups(session: AsyncSession, points: Sequence[JobMetricsPoint]) -> None:
+    """
+    Adds `points` to the rollups of their jobs. The caller is expected to commit.
+    """
+    if len(points) == 0:
+        return
+    points = sorted(points, key=lambda p: p.timestamp_micro)
+    job_ids = {p.job_id for p in points}
+    min_timestamp_micro = points[0].timestamp_micro
+    # The current bucket and the previous one, which has the last point before `points`
+    res = await session.execute(
+        select(JobMetricsRollup)
+        .where(
+            JobMetricsRollup.job_id.in_(job_ids),
+            or_(
+                *(
+                    and_(
+                        JobMetricsRollup.resolution == resolution,
+                        JobMetricsRollup.start_timestamp_micro
+                        >= _get_bucket_start(min_timestamp_micro, resolution)
+                        - resolution * 1_000_000,
+                    )
+                    for resolution in ROLLUP_RESOLUTIONS
+                )
+            ),
+        )
+        .order_by(JobMetricsRollup.start_timestamp_micro)
+        .with_for_update()
+    )
+    buckets: dict[tuple, _Bucket] = {}
+    last_buckets: dict[tuple, _Bucket] = {}
+    for rollup in res.scalars().all():
+        bucket = _Bucket(rollup)
+        buckets[(rollup.job_id, rollup.resolution, rollup.start_timestamp_micro)] = bucket
+        last_buckets[(rollup.job_id, rollup.resolution)] = bucket
+    changed: list[_Bucket] = []
+    for point in points:
+        for resolution in ROLLUP_RESOLUTIONS:
+            start = _get_bucket_start(point.timestamp_micro, resolution)
+            bucket = buckets.get((point.job_id, resolution, start))
+            last_bucket = last_buckets.get((point.job_id, resolution))
+            if bucket is None:
+                bucket = await _create_bucket(session, point.job_id, resolution, start)
+                if bucket is None:
+                    continue
+                buckets[(point.job_id, resolution, start)] = bucket
+            if last_bucket is None or last_bucket.rollup.start_timestamp_micro <= start:
+                last_buckets[(point.job_id, resolution)] = bucket
+            _add_point(bucket, point, last_bucket)
+            changed.append(bucket)
+    for bucket in changed:
+        bucket.rollup.data = json.dumps(bucket.data)
+
+
+async def get_rollups(
+    session: AsyncSession,
+    job_model: JobModel,
+    resolution: int,
+    after_micro: Optional[int],
+    before_micro: Optional[int],
+    limit: Optional[int],
+) -> Sequence[JobMetricsRollup]:
+    """
+    Returns rollups that overlap with the time range, ordered from the latest to the earliest.
+    """
+    stmt = (
+        select(JobMetricsRollup)
+        .where(
+            JobMetricsRollup.job_id == job_model.id,
+            JobMetricsRollup.resolution == resolution,
+        )
+        .order_by(JobMetricsRollup.start_timestamp_micro.desc())
+    )
+    if after_micro is not None:
+        stmt = stmt.where(
+            JobMetricsRollup.start_timestamp_micro > after_micro - resolution * 1_000_000
+        )
+    if before_micro is not None:
+        stmt = stmt.where(JobMetricsRollup.start_timestamp_micro < before_micro)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    res = await session.execute(stmt)
+    return res.scalars().all()
+
+
+def get_rollup_resolution(step: int) -> Optional[int]:
+    """
+    Returns the largest rollup resolution that `step` seconds is a multiple of.
+    """
+    for resolution in sorted(ROLLUP_RESOLUTIONS, reverse=True):
+        if step >= resolution and step % resolution == 0:
+            return resolution
+    return None
+
+
+def merge_rollups(
+    rollups: Sequence[JobMetricsRollup], step: int
+) -> list[tuple[int, dict[str, Any]]]:
+    """
+    Merges rollups ordered from the latest to the earliest into `step`-second buckets.
+
+    Returns:
+        a list of (bucket start timestamp, data) from the latest to the earliest bucket
+    """
+    merged: list[tuple[int, dict[str, Any]]] = []
+    for rollup in rollups:
+        start = _get_bucket_start(rollup.start_timestamp_micro, step)
+        data = json.loads(rollup.data)
+        if merged and merged[-1][0] == start:
+            _merge_data(merged[-1][1], data)
+        else:
+            merged.append((start, data))
+    return merged
+
+
+def get_aggregate_value(aggregate: Optional[_Aggregate], aggregation: RollupAggregation) -> Any:
+    if aggregate is None or aggregate[3] == 0:
+        return None
+    if aggregation == "min":
+        return aggregate[0]
+    if aggregation == "max":
+        return aggregate[1]
+    return round(aggregate[2] / aggregate[3])
+
+
+async def _create_bucket(
+    session: AsyncSession, job_id: uuid.UUID, resolution: int, start: int
+) -> Optional[_Bucket]:
+    rollup = JobMetricsRollup(
+        job_id=job_id,
+        resolution=resolution,
+        start_timestamp_micro=start,
+        points_count=0,
+        last_timestamp_micro=0,
+        last_cpu_usage_micro=0,
+        data=json.dumps({}),
+    )
+    try:
+        async with session.begin_nested():
+            session.add(rollup)
+    except sqlalchemy.exc.IntegrityError:
+        # Concurrent server replica created the bucket and collected the same job,
+        # the point is skipped in the rollups
+        return None
+    return _Bucket(rollup)
+
+
+def _add_point(bucket: _Bucket, point: JobMetricsPoint, last_bucket: Optional[_Bucket]) -> None:
+    rollup = bucket.rollup
+    data = bucket.data
+    if (
+        last_bucket is not None
+        and last_bucket.rollup.points_count > 0
+        and last_bucket.rollup.last_timestamp_micro < point.timestamp_micro
+    ):
+        window = point.timestamp_micro - last_bucket.rollup.last_timestamp_micro
+        cpu_usage = point.cpu_usage_micro - last_bucket.rollup.last_cpu_usage_micro
+        _add_value(data, "cpu_usage_percent", round(cpu_usage / window * 100))
+    _add_value(data, "memory_usage_bytes", point.memory_usage_bytes)
+    _add_value(data, "memory_working_set_bytes", point.memory_working_set_bytes)
+    gpus_memory_usage = json.loads(point.gpus_memory_usage_bytes)
+    gpus_util = json.loads(point.gpus_util_percent)
+    if len(gpus_memory_usage) != len(gpus_util):
+        data["gpus_memory_usage_bytes"] = data["gpus_util_percent"] = None
+    elif rollup.points_count == 0:
+        data["gpus_memory_usage_bytes"] = [[v, v, v, 1] for v in gpus_memory_usage]
+        data["gpus_util_percent"] = [[v, v, v, 1] for v in gpus_util]
+    elif data.get("gpus_memory_usage_bytes") is not None:
+        if len(data["gpus_memory_usage_bytes"]) != len(gpus_memory_usage):
+            data["gpus_memory_usage_bytes"] = data["gpus_util_percent"] = None
+        else:
+            for aggregate, value in zip(data["gpus_memory_usage_bytes"], gpus_memory_usage):
+                _add_to_aggregate(aggregate, value)
+            for aggregate, value in zip(data["gpus_util_percent"], gpus_util):
+                _add_to_aggregate(aggregate, value)
+    rollup.points_count += 1
+    if point.timestamp_micro >= rollup.last_timestamp_micro:
+        rollup.last_timestamp_micro = point.timestamp_micro
+        rollup.last_cpu_usage_micro = point.cpu_usage_micro
+
+
+def _add_value(data: dict[str, Any], name: str, value: int) -> None:
+    aggregate = data.get(name)
+    if aggregate is None:
+        data[name] = [value, value, value, 1]
+    else:
+        _add_to_aggregate(aggregate, value)
+
+
+def _add_to_aggregate(aggregate: _Aggregate, value: int) -> None:
+    aggregate[0] = min(aggregate[0], value)
+    aggregate[1] = max(aggregate[1], value)
+    aggregate[2] += value
+    aggregate[3] += 1
+
+
+def _merge_data(data: dict[str, Any], other: dict[str, Any]) -> None:
+    for name in ("cpu_usage_percent", "memory_usage_bytes", "memory_working_set_bytes"):
+        if other.get(name) is not None:
+            if data.get(name) is None:
+                data[name] = list(other[name])
+            else:
+                _merge_aggregates(data[name], other[name])
+    for name in ("gpus_memory_usage_bytes", "gpus_util_percent"):
+        if name not in other:
+            continue
+        if name not in data:
+            data[name] = other[name]
+        elif data[name] is None or other[name] is None or len(data[name]) != len(other[name]):
+            data[name] = None
+        else:
+            for aggregate, other_aggregate in zip(data[name], other[name]):
+                _merge_aggregates(aggregate, other_aggregate)
+
+
+def _merge_aggregates(aggregate: _Aggregate, other: _Aggregate) -> None:
+    aggregate[0] = min(aggregate[0], other[0])
+    aggregate[1] = max(aggregate[1], other[1])
+    aggregate[2] += other[2]
+    aggregate[3] += other[3]
+
+
+def _get_bucket_start(timestamp_micro: int, resolution: int) -> int:
+    return timestamp_micro - timestamp_micro % (resolution * 1_000_000)
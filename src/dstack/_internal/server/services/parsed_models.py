@@ -0,0 +1,123 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, TypeVar, Union
+
+from dstack._internal.core.models.common import validate_json_extra_ignore
+from dstack._internal.server import settings
+from dstack._internal.server.services.prometheus.client_metrics import (
+    parsed_models_cache_metrics,
+)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ParsedModelsCacheStats:
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class ParsedModelMutatedError(Exception):
+    pass
+
+
+class ParsedModelsCache:
+    """
+    A bounded LRU cache of models parsed from JSON, keyed by the model type and
+    a hash of the JSON content so that equal columns of different rows share one instance.
+
+    Cached instances are shared by all callers and must never be mutated.
+    Callers that modify the parsed model must parse it anew instead.
+    With `check_mutations=True`, the cache keeps a copy of each instance and raises
+    `ParsedModelMutatedError` on a hit if the instance differs from the copy.
+    It's meant for tests and debugging.
+    """
+
+    def __init__(self, max_size: int, check_mutations: bool = False) -> None:
+        self._max_size = max_size
+        self._check_mutations = check_mutations
+        # Values are (model, copy of the model if check_mutations else None)
+        self._models: OrderedDict[tuple[Any, bytes], tuple[Any, Any]] = OrderedDict()
+        # Getters may be called from threads via `run_async()`.
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, tp: type[T], data: Union[str, bytes]) -> T:
+        if self._max_size <= 0:
+            return validate_json_extra_ignore(tp, data)
+        if isinstance(data, str):
+            data = data.encode()
+        key = (tp, hashlib.blake2b(data, digest_size=16).digest())
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None:
+                self._models.move_to_end(key)
+                self._hits += 1
+        model_name = tp.__name__
+        if cached is not None:
+            parsed_models_cache_metrics.log_lookup(model_name, hit=True)
+            model, model_copy = cached
+            if model_copy is not None and model != model_copy:
+                raise ParsedModelMutatedError(f"Cached {model_name} instance was mutated")
+            return model
+        # Parse outside of the lock. Concurrent misses on the same key parse twice, which is fine.
+        model = validate_json_extra_ignore(tp, data)
+        evicted_types = []
+        with self._lock:
+            self._misses += 1
+            self._models[key] = (model, copy.deepcopy(model) if self._check_mutations else None)
+            self._models.move_to_end(key)
+            while len(self._models) > self._max_size:
+                (evicted_type, _), _ = self._models.popitem(last=False)
+                evicted_types.append(evicted_type)
+            self._evictions += len(evicted_types)
+        parsed_models_cache_metrics.log_lookup(model_name, hit=False)
+        for evicted_type in evicted_types:
+            parsed_models_cache_metrics.increment_evictions(evicted_type.__name__)
+        return model
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def get_stats(self) -> ParsedModelsCacheStats:
+        with self._lock:
+            return ParsedModelsCacheStats(
+                size=len(self._models),
+                max_size=self._max_size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+
+_cache: Optional[ParsedModelsCache] = None
+
+
+def get_parsed_models_cache() -> ParsedModelsCache:
+    global _cache
+    if _cache is None:
+        _cache = ParsedModelsCache(
+            max_size=settings.SERVER_PARSED_MODELS_CACHE_SIZE,
+            check_mutations=settings.SERVER_PARSED_MODELS_CACHE_CHECK_MUTATIONS,
+        )
+    return _cache
+
+
+def parse_json_model(tp: type[T], data: Union[str, bytes], readonly: bool = False) -> T:
+    """
+    Parses a model stored as JSON in a DB column, ignoring extra fields.
+    With `readonly=True`, returns a cached instance shared with other callers
+    that must not be mutated, see `ParsedModelsCache`. Otherwise, returns a new instance.
+    """
+    if not readonly:
+        return validate_json_extra_ignore(tp, data)
+    return get_parsed_models_cache().get(tp, data)
@@ -24,7 +24,7 @@ def get_pipeline_hinter(request: Request) -> PipelineHinterProtocol:
     Returns pipeline hinter that allows hinting replica's pipelines that there are new items for processing.
     This can reduce processing latency if the processing happens rarely.
     """
-    pipeline_manager = getattr(request.app.state, "pipeline_manager", None)
-    if pipeline_manager is None:
+    pipeline_hinter = getattr(request.app.state, "pipeline_hinter", None)
+    if pipeline_hinter is None:
         return _noop_pipeline_hinter
-    return pipeline_manager.hinter
+    return pipeline_hinter
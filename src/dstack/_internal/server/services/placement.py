@@ -20,8 +20,8 @@ from dstack._internal.core.models.placement import (
     PlacementStrategy,
 )
 from dstack._internal.server.models import FleetModel, PlacementGroupModel
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.instances import is_placeholder_instance
-from dstack._internal.utils.common import run_async
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -183,7 +183,8 @@ async def create_placement_group(
         placement_group.configuration.region,
     )
     try:
-        pgpd = await run_async(
+        pgpd = await run_async_in(
+            ExecutorPool.CLOUD,
             compute.create_placement_group,
             placement_group_model_to_placement_group(placement_group_model),
             master_instance_offer,
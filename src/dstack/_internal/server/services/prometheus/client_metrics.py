@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 
 class RunMetrics:
@@ -53,3 +53,278 @@ class RunMetrics:
 
 
 run_metrics = RunMetrics()
+
+
+_PIPELINE_DURATION_BUCKETS = [
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    float("inf"),
+]
+
+
+class PipelineMetrics:
+    """Wrapper class for background pipeline Prometheus metrics."""
+
+    def __init__(self):
+        self._fetch_batch_size = Histogram(
+            "dstack_pipeline_fetch_batch_size",
+            "Number of items fetched by a pipeline fetcher in one non-empty fetch",
+            buckets=[1, 2, 5, 10, 20, 50, 100, 200, 500, float("inf")],
+            labelnames=["pipeline"],
+        )
+        self._fetch_duration = Histogram(
+            "dstack_pipeline_fetch_duration_seconds",
+            "Time to fetch and lock a batch of pipeline items",
+            buckets=_PIPELINE_DURATION_BUCKETS,
+            labelnames=["pipeline"],
+        )
+        self._queue_wait_duration = Histogram(
+            "dstack_pipeline_queue_wait_duration_seconds",
+            "Time a fetched pipeline item waits in the queue before processing",
+            buckets=_PIPELINE_DURATION_BUCKETS,
+            labelnames=["pipeline"],
+        )
+        self._processing_duration = Histogram(
+            "dstack_pipeline_processing_duration_seconds",
+            "Time to process a pipeline item",
+            buckets=_PIPELINE_DURATION_BUCKETS,
+            labelnames=["pipeline"],
+        )
+        self._processed_items_total = Counter(
+            "dstack_pipeline_processed_items_total",
+            "Number of processed pipeline items",
+            labelnames=["pipeline"],
+        )
+        self._processing_errors_total = Counter(
+            "dstack_pipeline_processing_errors_total",
+            "Number of pipeline items processing of which raised an unexpected exception",
+            labelnames=["pipeline"],
+        )
+        self._active_workers = Gauge(
+            "dstack_pipeline_active_workers",
+            "Number of active pipeline workers",
+            labelnames=["pipeline"],
+        )
+        self._queue_size = Gauge(
+            "dstack_pipeline_queue_size",
+            "Number of fetched pipeline items waiting for processing",
+            labelnames=["pipeline"],
+        )
+        self._lock_token_mismatches_total = Counter(
+            "dstack_pipeline_lock_token_mismatches_total",
+            "Number of times a pipeline item could not be updated because its lock_token changed",
+            # stage is one of: processing, after_processing
+            labelnames=["table", "stage"],
+        )
+        self._lock_renewal_duration = Histogram(
+            "dstack_pipeline_lock_renewal_duration_seconds",
+            "Time to renew locks of pipeline items in one bulk update",
+            buckets=_PIPELINE_DURATION_BUCKETS,
+            labelnames=["table"],
+        )
+        self._lock_renewals_total = Counter(
+            "dstack_pipeline_lock_renewals_total",
+            "Number of pipeline item locks renewed",
+            labelnames=["table"],
+        )
+        self._lock_renewal_failures_total = Counter(
+            "dstack_pipeline_lock_renewal_failures_total",
+            "Number of pipeline item locks that failed to be renewed",
+            # reason is one of: expired, lock_token_changed, error
+            labelnames=["table", "reason"],
+        )
+
+    def log_fetch(self, pipeline: str, duration_seconds: float, batch_size: int):
+        self._fetch_duration.labels(pipeline=pipeline).observe(duration_seconds)
+        if batch_size > 0:
+            self._fetch_batch_size.labels(pipeline=pipeline).observe(batch_size)
+
+    def log_queue_wait(self, pipeline: str, duration_seconds: float):
+        self._queue_wait_duration.labels(pipeline=pipeline).observe(duration_seconds)
+
+    def log_processing(self, pipeline: str, duration_seconds: float, failed: bool):
+        self._processing_duration.labels(pipeline=pipeline).observe(duration_seconds)
+        self._processed_items_total.labels(pipeline=pipeline).inc()
+        if failed:
+            self._processing_errors_total.labels(pipeline=pipeline).inc()
+
+    def set_workers_state(self, pipeline: str, active_workers: int, queue_size: int):
+        self._active_workers.labels(pipeline=pipeline).set(active_workers)
+        self._queue_size.labels(pipeline=pipeline).set(queue_size)
+
+    def increment_lock_token_mismatches(self, table: str, stage: str):
+        self._lock_token_mismatches_total.labels(table=table, stage=stage).inc()
+
+    def log_lock_renewal(self, table: str, duration_seconds: float, renewed: int):
+        self._lock_renewal_duration.labels(table=table).observe(duration_seconds)
+        self._lock_renewals_total.labels(table=table).inc(renewed)
+
+    def increment_lock_renewal_failures(self, table: str, reason: str, count: int = 1):
+        self._lock_renewal_failures_total.labels(table=table, reason=reason).inc(count)
+
+
+pipeline_metrics = PipelineMetrics()
+
+
+class ParsedModelsCacheMetrics:
+    """Wrapper class for Prometheus metrics of the parsed models cache."""
+
+    def __init__(self):
+        self._lookups_total = Counter(
+            "dstack_parsed_models_cache_lookups_total",
+            "Number of parsed models cache lookups",
+            # result is one of: hit, miss
+            labelnames=["model", "result"],
+        )
+        self._evictions_total = Counter(
+            "dstack_parsed_models_cache_evictions_total",
+            "Number of models evicted from the parsed models cache",
+            labelnames=["model"],
+        )
+
+    def log_lookup(self, model: str, hit: bool):
+        self._lookups_total.labels(model=model, result="hit" if hit else "miss").inc()
+
+    def increment_evictions(self, model: str):
+        self._evictions_total.labels(model=model).inc()
+
+
+parsed_models_cache_metrics = ParsedModelsCacheMetrics()
+
+
+class ServiceConnectionMetrics:
+    """Wrapper class for Prometheus metrics of in-server proxy connections to service replicas."""
+
+    def __init__(self):
+        self._connections = Gauge(
+            "dstack_service_connections",
+            "Number of open or opening connections to service replicas",
+        )
+        self._open_duration = Histogram(
+            "dstack_service_connection_open_duration_seconds",
+            "Time to open a connection to a service replica",
+            buckets=_PIPELINE_DURATION_BUCKETS,
+        )
+        self._open_failures_total = Counter(
+            "dstack_service_connection_open_failures_total",
+            "Number of failed attempts to open a connection to a service replica",
+        )
+
+    def log_connection_open(self, duration_seconds: float, failed: bool):
+        self._open_duration.observe(duration_seconds)
+        if failed:
+            self._open_failures_total.inc()
+
+    def set_connections(self, count: int):
+        self._connections.set(count)
+
+
+service_connection_metrics = ServiceConnectionMetrics()
+
+
+class ExecutorMetrics:
+    """Wrapper class for Prometheus metrics of server thread pool executors."""
+
+    def __init__(self):
+        self._max_workers = Gauge(
+            "dstack_executor_max_workers",
+            "Max number of threads in a server executor pool",
+            labelnames=["pool"],
+        )
+        self._active_tasks = Gauge(
+            "dstack_executor_active_tasks",
+            "Number of tasks running in a server executor pool",
+            labelnames=["pool"],
+        )
+        self._queued_tasks = Gauge(
+            "dstack_executor_queued_tasks",
+            "Number of tasks waiting for a free thread in a server executor pool",
+            labelnames=["pool"],
+        )
+        self._queue_wait_duration = Histogram(
+            "dstack_executor_queue_wait_duration_seconds",
+            "Time a task waits for a free thread in a server executor pool",
+            buckets=_PIPELINE_DURATION_BUCKETS,
+            labelnames=["pool"],
+        )
+        self._task_duration = Histogram(
+            "dstack_executor_task_duration_seconds",
+            "Time to run a task in a server executor pool",
+            buckets=_PIPELINE_DURATION_BUCKETS,
+            labelnames=["pool"],
+        )
+
+    def set_max_workers(self, pool: str, max_workers: int):
+        self._max_workers.labels(pool=pool).set(max_workers)
+
+    def log_task_submitted(self, pool: str):
+        self._queued_tasks.labels(pool=pool).inc()
+
+    def log_task_dequeued(self, pool: str):
+        self._queued_tasks.labels(pool=pool).dec()
+
+    def log_task_started(self, pool: str, queue_wait_seconds: float):
+        self._queued_tasks.labels(pool=pool).dec()
+        self._active_tasks.labels(pool=pool).inc()
+        self._queue_wait_duration.labels(pool=pool).observe(queue_wait_seconds)
+
+    def log_task_finished(self, pool: str, duration_seconds: float):
+        self._active_tasks.labels(pool=pool).dec()
+        self._task_duration.labels(pool=pool).observe(duration_seconds)
+
+
+executor_metrics = ExecutorMetrics()
+
+
+class LogWriteBufferMetrics:
+    """Wrapper class for Prometheus metrics of the job logs write-behind buffer."""
+
+    def __init__(self):
+        self._buffered_events = Gauge(
+            "dstack_logs_buffered_events",
+            "Number of job log events buffered or being written to the log storage",
+        )
+        self._write_lag = Histogram(
+            "dstack_logs_write_lag_seconds",
+            "Time from buffering the oldest log event of a job to writing it to the log storage",
+            buckets=_PIPELINE_DURATION_BUCKETS,
+        )
+        self._written_events_total = Counter(
+            "dstack_logs_written_events_total",
+            "Number of job log events written to the log storage",
+        )
+        self._write_failures_total = Counter(
+            "dstack_logs_write_failures_total",
+            "Number of failed attempts to write job logs to the log storage",
+        )
+        self._dropped_events_total = Counter(
+            "dstack_logs_dropped_events_total",
+            "Number of job log events dropped after failed write attempts",
+        )
+
+    def set_buffered_events(self, count: int):
+        self._buffered_events.set(count)
+
+    def log_write(self, lag_seconds: float, events_count: int):
+        self._write_lag.observe(lag_seconds)
+        self._written_events_total.inc(events_count)
+
+    def increment_write_failures(self):
+        self._write_failures_total.inc()
+
+    def increment_dropped_events(self, count: int):
+        self._dropped_events_total.inc(count)
+
+
+log_write_buffer_metrics = LogWriteBufferMetrics()
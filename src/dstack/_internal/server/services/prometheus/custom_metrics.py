@@ -150,10 +150,10 @@ async def get_job_metrics(session: AsyncSession) -> Iterable[Metric]:
     metrics = _JobMetrics()
     now = get_current_datetime()
     for job in jobs:
-        jpd = get_job_provisioning_data(job)
+        jpd = get_job_provisioning_data(job, readonly=True)
         if jpd is None:
             continue
-        jrd = get_job_runtime_data(job)
+        jrd = get_job_runtime_data(job, readonly=True)
         resources = jpd.instance_type.resources
         price = jpd.price
         if jrd is not None and jrd.offer is not None:
@@ -161,7 +161,7 @@ async def get_job_metrics(session: AsyncSession) -> Iterable[Metric]:
             price = jrd.offer.price
         gpus = resources.gpus
         cpus = resources.cpus
-        run_spec = get_run_spec(job.run)
+        run_spec = get_run_spec(job.run, readonly=True)
         labels = {
             "dstack_project_name": job.project.name,
             "dstack_user_name": job.run.user.name,
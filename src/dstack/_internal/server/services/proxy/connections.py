@@ -0,0 +1,32 @@
+import asyncio
+
+from dstack._internal.proxy.lib.models import Project
+from dstack._internal.proxy.lib.services.service_connection import ServiceConnectionPool
+from dstack._internal.server.db import get_session_ctx
+from dstack._internal.server.services.proxy.repo import ServerProxyRepo
+
+
+async def check_service_connections(pool: ServiceConnectionPool) -> None:
+    """
+    Removes connections to replicas that are no longer running, reopens dead tunnels,
+    and opens connections to new replicas of in-server services ahead of first requests.
+    """
+    async with get_session_ctx() as session:
+        repo = ServerProxyRepo(session)
+        services = await repo.list_services()
+        projects: dict[str, Project] = {}
+        for service in services:
+            if service.project_name not in projects:
+                project = await repo.get_project(service.project_name)
+                if project is not None:
+                    projects[project.name] = project
+    await pool.check(
+        live_replica_ids={replica.id for service in services for replica in service.replicas}
+    )
+    await asyncio.gather(
+        *(
+            pool.prewarm(projects[service.project_name], service)
+            for service in services
+            if service.project_name in projects
+        )
+    )
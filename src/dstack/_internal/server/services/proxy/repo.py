@@ -1,7 +1,8 @@
-from typing import List, Optional
+import uuid
+from typing import List, Optional, Sequence
 
 import pydantic
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import contains_eager, joinedload
 
@@ -11,7 +12,6 @@ from dstack._internal.core.models.common import validate_json_extra_ignore
 from dstack._internal.core.models.configurations import ServiceConfiguration
 from dstack._internal.core.models.instances import SSHConnectionParams
 from dstack._internal.core.models.runs import (
-    JobProvisioningData,
     JobStatus,
     RunStatus,
     ServiceSpec,
@@ -31,6 +31,7 @@ from dstack._internal.proxy.lib.repo import BaseProxyRepo
 from dstack._internal.server.models import InstanceModel, JobModel, ProjectModel, RunModel
 from dstack._internal.server.services.instances import get_instance_remote_connection_info
 from dstack._internal.server.services.jobs import get_job_spec
+from dstack._internal.server.services.proxy.routing import get_service_routing_table
 from dstack._internal.server.services.runs import get_run_spec
 from dstack._internal.server.settings import DEFAULT_SERVICE_CLIENT_MAX_BODY_SIZE
 from dstack._internal.utils.common import get_or_error
@@ -48,17 +49,51 @@ class ServerProxyRepo(BaseProxyRepo):
         self.session = session
 
     async def get_service(self, project_name: str, run_name: str) -> Optional[Service]:
+        routing_table = get_service_routing_table()
+        service = routing_table.get(project_name, run_name)
+        if service is not None:
+            return service
+        generation = routing_table.generation
+        service = await self._load_service(project_name, run_name)
+        if service is not None:
+            routing_table.set(service, generation)
+        return service
+
+    async def list_services(self) -> List[Service]:
+        """
+        Returns all services with registered replicas that are served by the in-server proxy.
+        """
+        jobs = await self._load_registered_jobs()
+        run_id_to_jobs: dict[uuid.UUID, list[JobModel]] = {}
+        for job in jobs:
+            run_id_to_jobs.setdefault(job.run_id, []).append(job)
+        services = []
+        for run_jobs in run_id_to_jobs.values():
+            service = _jobs_to_service(run_jobs[0].project.name, run_jobs)
+            if service is not None:
+                services.append(service)
+        return services
+
+    async def _load_service(self, project_name: str, run_name: str) -> Optional[Service]:
+        jobs = await self._load_registered_jobs(
+            ProjectModel.name == project_name,
+            JobModel.run_name == run_name,
+        )
+        if not len(jobs):
+            return None
+        return _jobs_to_service(project_name, jobs)
+
+    async def _load_registered_jobs(self, *filters: ColumnElement[bool]) -> Sequence[JobModel]:
         res = await self.session.execute(
             select(JobModel)
             .join(JobModel.project)
             .join(JobModel.run)
             .where(
-                ProjectModel.name == project_name,
                 RunModel.gateway_id.is_(None),
-                JobModel.run_name == run_name,
                 JobModel.status == JobStatus.RUNNING,
                 JobModel.registered == True,
                 JobModel.job_num == 0,
+                *filters,
             )
             .options(
                 contains_eager(JobModel.run),
@@ -66,77 +101,7 @@ class ServerProxyRepo(BaseProxyRepo):
                 joinedload(JobModel.instance).joinedload(InstanceModel.project),
             )
         )
-        jobs = res.unique().scalars().all()
-        if not len(jobs):
-            return None
-        run = jobs[0].run
-        run_spec = get_run_spec(run)
-        if not isinstance(run_spec.configuration, ServiceConfiguration):
-            return None
-        router_group = next(
-            (g for g in run_spec.configuration.replica_groups if g.router is not None),
-            None,
-        )
-        has_router_replica = router_group is not None
-        replicas = []
-        for job in jobs:
-            jpd = validate_json_extra_ignore(
-                JobProvisioningData, get_or_error(job.job_provisioning_data)
-            )
-            assert jpd.hostname is not None
-            assert jpd.ssh_port is not None
-            instance = get_or_error(job.instance)
-            if not jpd.dockerized:
-                ssh_destination = f"{jpd.username}@{jpd.hostname}"
-                ssh_port = jpd.ssh_port
-                ssh_proxy = jpd.ssh_proxy
-                ssh_proxy_private_key = None
-            else:
-                ssh_destination = "root@localhost"
-                ssh_port = DSTACK_RUNNER_SSH_PORT
-                job_submission = jobs_services.job_model_to_job_submission(job)
-                jrd = job_submission.job_runtime_data
-                if jrd is not None and jrd.ports is not None:
-                    ssh_port = jrd.ports.get(ssh_port, ssh_port)
-                ssh_proxy = SSHConnectionParams(
-                    hostname=jpd.hostname,
-                    username=jpd.username,
-                    port=jpd.ssh_port,
-                )
-                ssh_proxy_private_key = None
-                if job.project_id != instance.project_id:
-                    ssh_proxy_private_key = instance.project.ssh_private_key
-            ssh_head_proxy: Optional[SSHConnectionParams] = None
-            ssh_head_proxy_private_key: Optional[str] = None
-            rci = get_instance_remote_connection_info(instance)
-            if rci is not None and rci.ssh_proxy is not None:
-                ssh_head_proxy = rci.ssh_proxy
-                ssh_head_proxy_private_key = get_or_error(rci.ssh_proxy_keys)[0].private
-            job_spec = get_job_spec(job)
-            replica = Replica(
-                id=job.id.hex,
-                app_port=get_service_port(job_spec, run_spec.configuration),
-                ssh_destination=ssh_destination,
-                ssh_port=ssh_port,
-                ssh_proxy=ssh_proxy,
-                ssh_proxy_private_key=ssh_proxy_private_key,
-                ssh_head_proxy=ssh_head_proxy,
-                ssh_head_proxy_private_key=ssh_head_proxy_private_key,
-                internal_ip=jpd.internal_ip,
-            )
-            replicas.append(replica)
-        return Service(
-            id=run.id.hex,
-            project_name=project_name,
-            run_name=run.run_name,
-            domain=None,
-            https=None,
-            auth=run_spec.configuration.auth,
-            client_max_body_size=DEFAULT_SERVICE_CLIENT_MAX_BODY_SIZE,
-            strip_prefix=run_spec.configuration.strip_prefix,
-            replicas=tuple(replicas),
-            has_router_replica=has_router_replica,
-        )
+        return res.unique().scalars().all()
 
     async def list_models(self, project_name: str) -> List[ChatModel]:
         res = await self.session.execute(
@@ -186,6 +151,74 @@ class ServerProxyRepo(BaseProxyRepo):
         )
 
 
+def _jobs_to_service(project_name: str, jobs: Sequence[JobModel]) -> Optional[Service]:
+    run = jobs[0].run
+    run_spec = get_run_spec(run, readonly=True)
+    if not isinstance(run_spec.configuration, ServiceConfiguration):
+        return None
+    router_group = next(
+        (g for g in run_spec.configuration.replica_groups if g.router is not None),
+        None,
+    )
+    has_router_replica = router_group is not None
+    replicas = []
+    for job in jobs:
+        jpd = get_or_error(jobs_services.get_job_provisioning_data(job, readonly=True))
+        assert jpd.hostname is not None
+        assert jpd.ssh_port is not None
+        instance = get_or_error(job.instance)
+        if not jpd.dockerized:
+            ssh_destination = f"{jpd.username}@{jpd.hostname}"
+            ssh_port = jpd.ssh_port
+            ssh_proxy = jpd.ssh_proxy
+            ssh_proxy_private_key = None
+        else:
+            ssh_destination = "root@localhost"
+            ssh_port = DSTACK_RUNNER_SSH_PORT
+            jrd = jobs_services.get_job_runtime_data(job, readonly=True)
+            if jrd is not None and jrd.ports is not None:
+                ssh_port = jrd.ports.get(ssh_port, ssh_port)
+            ssh_proxy = SSHConnectionParams(
+                hostname=jpd.hostname,
+                username=jpd.username,
+                port=jpd.ssh_port,
+            )
+            ssh_proxy_private_key = None
+            if job.project_id != instance.project_id:
+                ssh_proxy_private_key = instance.project.ssh_private_key
+        ssh_head_proxy: Optional[SSHConnectionParams] = None
+        ssh_head_proxy_private_key: Optional[str] = None
+        rci = get_instance_remote_connection_info(instance)
+        if rci is not None and rci.ssh_proxy is not None:
+            ssh_head_proxy = rci.ssh_proxy
+            ssh_head_proxy_private_key = get_or_error(rci.ssh_proxy_keys)[0].private
+        job_spec = get_job_spec(job, readonly=True)
+        replica = Replica(
+            id=job.id.hex,
+            app_port=get_service_port(job_spec, run_spec.configuration),
+            ssh_destination=ssh_destination,
+            ssh_port=ssh_port,
+            ssh_proxy=ssh_proxy,
+            ssh_proxy_private_key=ssh_proxy_private_key,
+            ssh_head_proxy=ssh_head_proxy,
+            ssh_head_proxy_private_key=ssh_head_proxy_private_key,
+            internal_ip=jpd.internal_ip,
+        )
+        replicas.append(replica)
+    return Service(
+        id=run.id.hex,
+        project_name=project_name,
+        run_name=run.run_name,
+        domain=None,
+        https=None,
+        auth=run_spec.configuration.auth,
+        client_max_body_size=DEFAULT_SERVICE_CLIENT_MAX_BODY_SIZE,
+        strip_prefix=run_spec.configuration.strip_prefix,
+        replicas=tuple(replicas),
+        has_router_replica=has_router_replica,
+    )
+
+
 def _model_options_to_format_spec(model: AnyModel) -> AnyModelFormat:
     if model.type == "chat":
         if model.format == "openai":
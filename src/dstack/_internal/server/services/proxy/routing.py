@@ -0,0 +1,120 @@
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from dstack._internal.proxy.lib.models import Service
+from dstack._internal.server import settings
+
+_SESSION_INFO_KEY = "dstack_invalidated_service_run_ids"
+
+
+class _Route:
+    def __init__(self, service: Service, expires_at: float) -> None:
+        self.service = service
+        self.expires_at = expires_at
+
+
+class ServiceRoutingTable:
+    """
+    An in-memory table of in-server services keyed by project and run name,
+    so that proxied requests can be routed without querying the DB.
+
+    Routes are added lazily when a service is first requested and are invalidated
+    when the run's jobs change status or registration, see
+    `invalidate_service_route_on_commit()`. Such changes made by other server replicas
+    are not observed, so routes also expire after a TTL.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._routes: dict[tuple[str, str], _Route] = {}
+        self._run_id_to_key: dict[str, tuple[str, str]] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        Incremented on every invalidation. Get it before loading a service from the DB
+        and pass to `set()` so that routes invalidated meanwhile are not stored.
+        """
+        return self._generation
+
+    def get(self, project_name: str, run_name: str) -> Optional[Service]:
+        key = (project_name, run_name)
+        route = self._routes.get(key)
+        if route is None:
+            return None
+        if route.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        return route.service
+
+    def set(self, service: Service, generation: int) -> None:
+        if self._ttl <= 0 or service.id is None or generation != self._generation:
+            return
+        key = (service.project_name, service.run_name)
+        self._remove(key)
+        self._routes[key] = _Route(service=service, expires_at=time.monotonic() + self._ttl)
+        self._run_id_to_key[service.id] = key
+
+    def invalidate(self, run_id: uuid.UUID) -> None:
+        self._generation += 1
+        key = self._run_id_to_key.get(run_id.hex)
+        if key is not None:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._routes.clear()
+        self._run_id_to_key.clear()
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        route = self._routes.pop(key, None)
+        if route is not None and route.service.id is not None:
+            self._run_id_to_key.pop(route.service.id, None)
+
+
+_routing_table: Optional[ServiceRoutingTable] = None
+
+
+def get_service_routing_table() -> ServiceRoutingTable:
+    global _routing_table
+    if _routing_table is None:
+        _routing_table = ServiceRoutingTable(ttl=settings.SERVER_PROXY_ROUTING_TABLE_TTL)
+    return _routing_table
+
+
+def invalidate_service_route_on_commit(session: AsyncSession, run_id: uuid.UUID) -> None:
+    """
+    Invalidates the route of the run's service once `session` commits.
+    Invalidating earlier would let concurrent proxied requests re-add the route
+    from not yet committed data.
+    """
+    sync_session = session.sync_session
+    run_ids = sync_session.info.get(_SESSION_INFO_KEY)
+    if run_ids is None:
+        run_ids = set()
+        sync_session.info[_SESSION_INFO_KEY] = run_ids
+        event.listen(sync_session, "after_commit", _invalidate_on_commit)
+        event.listen(sync_session, "after_rollback", _discard_on_rollback)
+    run_ids.add(run_id)
+
+
+def _invalidate_on_commit(session: Session) -> None:
+    run_ids = session.info.get(_SESSION_INFO_KEY)
+    if not run_ids:
+        return
+    routing_table = get_service_routing_table()
+    for run_id in run_ids:
+        routing_table.invalidate(run_id)
+    run_ids.clear()
+
+
+def _discard_on_rollback(session: Session) -> None:
+    run_ids = session.info.get(_SESSION_INFO_KEY)
+    if run_ids:
+        run_ids.clear()
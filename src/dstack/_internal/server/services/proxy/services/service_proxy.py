@@ -1,15 +1,18 @@
-from typing import AsyncGenerator, AsyncIterator, Optional
+from typing import AsyncGenerator, AsyncIterator, Callable, Optional
 
 import fastapi
 import httpx
 from fastapi import status
+from starlette.background import BackgroundTask
 from starlette.requests import ClientDisconnect
 
 from dstack._internal.core.models.routers import RouterType
 from dstack._internal.proxy.lib.const import ROUTER_WHITELISTED_PATHS
 from dstack._internal.proxy.lib.deps import ProxyAuthContext
 from dstack._internal.proxy.lib.errors import ProxyError
+from dstack._internal.proxy.lib.models import Replica
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
+from dstack._internal.proxy.lib.services.replica_balancer import ReplicaRequest
 from dstack._internal.proxy.lib.services.service_connection import (
     ServiceConnectionPool,
     get_service_replica_client,
@@ -49,7 +52,10 @@ async def proxy(
         if not _is_whitelisted_path(path_for_match, ROUTER_WHITELISTED_PATHS):
             raise ProxyError("Path is not allowed for this service", status.HTTP_403_FORBIDDEN)
 
-    client = await get_service_replica_client(service, repo, service_conn_pool)
+    replica: Optional[Replica] = None
+    if service.domain is None:
+        replica = service_conn_pool.balancer.choose(service.replicas)
+    client = await get_service_replica_client(service, repo, service_conn_pool, replica)
 
     try:
         upstream_request = await build_upstream_request(request, path, client)
@@ -61,20 +67,36 @@ async def proxy(
         )
         raise ProxyError("Client disconnected")
 
+    replica_request: Optional[ReplicaRequest] = None
+    if replica is not None:
+        replica_request = ReplicaRequest(service_conn_pool.balancer, replica.id)
     try:
         upstream_response = await client.send(upstream_request, stream=True)
     except httpx.RequestError as e:
         logger.debug(
             "Error requesting %s %s: %r", upstream_request.method, upstream_request.url, e
         )
+        if replica_request is not None:
+            replica_request.on_failure()
+            replica_request.end()
         if isinstance(e, httpx.TimeoutException):
             raise ProxyError("Timed out requesting upstream", status.HTTP_504_GATEWAY_TIMEOUT)
         raise ProxyError("Error requesting upstream", status.HTTP_502_BAD_GATEWAY)
-
+    except BaseException:
+        if replica_request is not None:
+            replica_request.end()
+        raise
+
+    on_stream_end = None
+    if replica_request is not None:
+        replica_request.on_response(upstream_response.status_code)
+        on_stream_end = replica_request.end
     return fastapi.responses.StreamingResponse(
-        stream_response(upstream_response),
+        stream_response(upstream_response, on_end=on_stream_end),
         status_code=upstream_response.status_code,
         headers=clean_response_headers(upstream_response.headers),
+        # Also ends the request if the stream is never iterated, e.g. on client disconnect
+        background=BackgroundTask(on_stream_end) if on_stream_end is not None else None,
     )
 
 
@@ -96,24 +118,36 @@ def clean_response_headers(headers: httpx.Headers) -> httpx.Headers:
     return headers
 
 
-async def stream_response(response: httpx.Response) -> AsyncGenerator[bytes, None]:
+async def stream_response(
+    response: httpx.Response, on_end: Optional[Callable[[], None]] = None
+) -> AsyncGenerator[bytes, None]:
+    """
+    Yields the response body. `on_end` is called once streaming is finished or aborted.
+    """
     try:
-        async for chunk in response.aiter_raw():
-            yield chunk
-    except httpx.RequestError as e:
-        logger.debug(
-            "Error streaming response %s %s: %r", response.request.method, response.request.url, e
-        )
+        try:
+            async for chunk in response.aiter_raw():
+                yield chunk
+        except httpx.RequestError as e:
+            logger.debug(
+                "Error streaming response %s %s: %r",
+                response.request.method,
+                response.request.url,
+                e,
+            )
 
-    try:
-        await response.aclose()
-    except httpx.RequestError as e:
-        logger.debug(
-            "Error closing response %s %s: %r",
-            response.request.method,
-            response.request.url,
-            e,
-        )
+        try:
+            await response.aclose()
+        except httpx.RequestError as e:
+            logger.debug(
+                "Error closing response %s %s: %r",
+                response.request.method,
+                response.request.url,
+                e,
+            )
+    finally:
+        if on_end is not None:
+            on_end()
 
 
 async def build_upstream_request(
@@ -28,8 +28,8 @@ from dstack._internal.server.models import (
     RepoModel,
     UserModel,
 )
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.storage import get_default_storage
-from dstack._internal.utils.common import run_async
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -304,7 +304,14 @@ async def upload_code(
             blob_hash=code_hash,
             blob=None,
         )
-        await run_async(storage.upload_code, project.name, repo.name, code.blob_hash, blob)
+        await run_async_in(
+            ExecutorPool.STORAGE,
+            storage.upload_code,
+            project.name,
+            repo.name,
+            code.blob_hash,
+            blob,
+        )
     try:
         async with session.begin_nested():
             session.add(code)
@@ -1,10 +1,15 @@
+import asyncio
+import time
 import urllib.parse
 import uuid
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from http import HTTPStatus
 from pathlib import Path
-from typing import BinaryIO, Dict, List, Literal, Optional, TypeVar, Union, overload
+from typing import Any, BinaryIO, Dict, List, Literal, Optional, TypeVar, Union, overload
 
+import httpx
 import packaging.version
 import requests
 import requests.exceptions
@@ -59,7 +64,11 @@ LocalAddress = Union[int, Path]
 """A local TCP port or a Unix domain socket path the client connects to."""
 
 
-class RunnerClient:
+class _BaseRunnerClient:
+    """
+    Version negotiation and request bodies shared by `RunnerClient` and `AsyncRunnerClient`.
+    """
+
     # `/api/upload_code` call is not required if there is no code
     _OPTIONAL_CODE_UPLOAD_MIN_VERSION = (0, 20, 17)
 
@@ -67,6 +76,62 @@ class RunnerClient:
     _version_tuple: Optional["_Version"]
     _negotiated: bool = False
 
+    def _set_version(self, healthcheck_response: HealthcheckResponse) -> None:
+        version_string = healthcheck_response.version
+        self._version_string = version_string
+        self._version_tuple = _parse_version(version_string)
+        self._negotiated = True
+
+    def _is_code_upload_optional(self) -> bool:
+        return (
+            self._version_tuple is None
+            or self._version_tuple >= self._OPTIONAL_CODE_UPLOAD_MIN_VERSION
+        )
+
+    @staticmethod
+    def _get_submit_body(
+        run: Run,
+        job: Job,
+        cluster_info: ClusterInfo,
+        secrets: Dict[str, str],
+        repo_credentials: Optional[RemoteRepoCreds],
+        instance_env: Optional[Union[Env, Dict[str, str]]],
+        router_env: Optional[Dict[str, str]],
+    ) -> SubmitBody:
+        # XXX: This is a quick-and-dirty hack to deliver InstanceModel-specific
+        # and Dynamo-router environment variables to the runner without runner
+        # API modification. Both layers are merged into a deep-copied job_spec
+        # so the shared spec object held by the caller is not mutated.
+        job_spec = job.job_spec
+        server_access = bool(getattr(run.run_spec.configuration, "dstack", False))
+        if instance_env is not None or router_env is not None or server_access:
+            merged_env: Dict[str, str] = {}
+            if instance_env is not None:
+                if isinstance(instance_env, Env):
+                    merged_env.update(instance_env.as_dict())
+                else:
+                    merged_env.update(instance_env)
+            merged_env.update(job_spec.env)
+            if router_env is not None:
+                merged_env.update(router_env)
+            if server_access:
+                merged_env.setdefault(DSTACK_PROJECT_ENV, run.project_name)
+            job_spec = job_spec.model_copy(deep=True)
+            job_spec.env = merged_env
+        quota = server_settings.SERVER_LOG_QUOTA_PER_JOB_HOUR
+        return SubmitBody(
+            run=run,
+            job_spec=job_spec,
+            job_submission=job.job_submissions[-1],
+            cluster_info=cluster_info,
+            secrets=secrets,
+            repo_credentials=repo_credentials,
+            log_quota_hour=quota if quota > 0 else None,
+            run_spec=run.run_spec,
+        )
+
+
+class RunnerClient(_BaseRunnerClient):
     def __init__(
         self,
         port: Optional[int] = None,
@@ -95,8 +160,9 @@ class RunnerClient:
         return self._version_tuple
 
     def is_code_upload_optional(self) -> bool:
-        version_tuple = self.get_version_tuple()
-        return version_tuple is None or version_tuple >= self._OPTIONAL_CODE_UPLOAD_MIN_VERSION
+        if not self._negotiated:
+            self._negotiate()
+        return self._is_code_upload_optional()
 
     def healthcheck(self) -> Optional[HealthcheckResponse]:
         try:
@@ -124,36 +190,14 @@ class RunnerClient:
         instance_env: Optional[Union[Env, Dict[str, str]]] = None,
         router_env: Optional[Dict[str, str]] = None,
     ):
-        # XXX: This is a quick-and-dirty hack to deliver InstanceModel-specific
-        # and Dynamo-router environment variables to the runner without runner
-        # API modification. Both layers are merged into a deep-copied job_spec
-        # so the shared spec object held by the caller is not mutated.
-        job_spec = job.job_spec
-        server_access = bool(getattr(run.run_spec.configuration, "dstack", False))
-        if instance_env is not None or router_env is not None or server_access:
-            merged_env: Dict[str, str] = {}
-            if instance_env is not None:
-                if isinstance(instance_env, Env):
-                    merged_env.update(instance_env.as_dict())
-                else:
-                    merged_env.update(instance_env)
-            merged_env.update(job_spec.env)
-            if router_env is not None:
-                merged_env.update(router_env)
-            if server_access:
-                merged_env.setdefault(DSTACK_PROJECT_ENV, run.project_name)
-            job_spec = job_spec.model_copy(deep=True)
-            job_spec.env = merged_env
-        quota = server_settings.SERVER_LOG_QUOTA_PER_JOB_HOUR
-        body = SubmitBody(
+        body = self._get_submit_body(
             run=run,
-            job_spec=job_spec,
-            job_submission=job.job_submissions[-1],
+            job=job,
             cluster_info=cluster_info,
             secrets=secrets,
             repo_credentials=repo_credentials,
-            log_quota_hour=quota if quota > 0 else None,
-            run_spec=run.run_spec,
+            instance_env=instance_env,
+            router_env=router_env,
         )
         resp = self._session.post(
             self._url("/api/submit"),
@@ -207,11 +251,7 @@ class RunnerClient:
     def _negotiate(self, healthcheck_response: Optional[HealthcheckResponse] = None) -> None:
         if healthcheck_response is None:
             healthcheck_response = self._healthcheck()
-        version_string = healthcheck_response.version
-        version_tuple = _parse_version(version_string)
-        self._version_string = version_string
-        self._version_tuple = version_tuple
-        self._negotiated = True
+        self._set_version(healthcheck_response)
 
 
 class ShimError(DstackError):
@@ -220,7 +260,8 @@ class ShimError(DstackError):
 
 class ShimHTTPError(ShimError):
     """
-    An HTTP error wrapper for `requests.exceptions.HTTPError`. Should be used as follows:
+    An HTTP error wrapper for `requests.exceptions.HTTPError` and `httpx.HTTPStatusError`.
+    Should be used as follows:
 
         try:
             <do something>
@@ -249,9 +290,9 @@ class ShimHTTPError(ShimError):
         return str(cause)
 
     @property
-    def _cause(self) -> Optional[requests.exceptions.HTTPError]:
+    def _cause(self) -> Optional[Union[requests.exceptions.HTTPError, httpx.HTTPStatusError]]:
         cause = self.__cause__
-        if isinstance(cause, requests.exceptions.HTTPError):
+        if isinstance(cause, (requests.exceptions.HTTPError, httpx.HTTPStatusError)):
             return cause
         return None
 
@@ -301,7 +342,11 @@ class ComponentList:
         self._items[name] = component_info
 
 
-class ShimClient:
+class _BaseShimClient:
+    """
+    Version negotiation and request bodies shared by `ShimClient` and `AsyncShimClient`.
+    """
+
     # API v2 (a.k.a. Future API) — `/api/tasks/[:id[/{terminate,remove}]]`
     # API v1 (a.k.a. Legacy API) — `/api/{submit,pull,stop}`
     _API_V2_MIN_SHIM_VERSION = (0, 18, 34)
@@ -323,6 +368,108 @@ class ShimClient:
     _api_version: int
     _negotiated: bool = False
 
+    def _set_version(self, healthcheck_response: HealthcheckResponse) -> None:
+        version_string = healthcheck_response.version
+        version_tuple = _parse_version(version_string)
+        if version_tuple is None or version_tuple >= self._API_V2_MIN_SHIM_VERSION:
+            api_version = 2
+        else:
+            api_version = 1
+        self._shim_version_string = version_string
+        self._shim_version_tuple = version_tuple
+        self._api_version = api_version
+        self._negotiated = True
+
+    def _is_supported_since(self, min_version: "_Version") -> bool:
+        return self._shim_version_tuple is None or self._shim_version_tuple >= min_version
+
+    def _get_restart_safe_task_statuses(self) -> list[TaskStatus]:
+        # TODO: Rework shim's DockerRunner.Run() so that it does not wait for container termination
+        # (this at least requires replacing .waitContainer() with periodic polling of container
+        # statuses and moving some cleanup defer calls to .Terminate() and/or .Remove()) and add
+        # TaskStatus.RUNNING to the list of restart-safe task statuses for supported shim versions.
+        return [TaskStatus.TERMINATED]
+
+    @staticmethod
+    def _get_task_submit_request(
+        task_id: "_TaskID",
+        name: str,
+        registry_username: str,
+        registry_password: str,
+        image_name: str,
+        container_user: str,
+        privileged: bool,
+        gpu: Optional[int],
+        cpu: Optional[float],
+        memory: Optional[Memory],
+        shm_size: Optional[Memory],
+        network_mode: NetworkMode,
+        volumes: list[Volume],
+        volume_mounts: list[VolumeMountPoint],
+        instance_mounts: list[InstanceMountPoint],
+        gpu_devices: list[GPUDevice],
+        host_ssh_user: str,
+        host_ssh_keys: list[str],
+        container_ssh_keys: list[str],
+        instance_id: str,
+    ) -> TaskSubmitRequest:
+        return TaskSubmitRequest(
+            id=str(task_id),
+            name=name,
+            registry_username=registry_username,
+            registry_password=registry_password,
+            image_name=image_name,
+            container_user=container_user,
+            privileged=privileged,
+            gpu=gpu if gpu is not None else -1,  # None = -1 = "all available" (0 means "0 GPU")
+            cpu=cpu if cpu is not None else 0,  # None = 0 = "all available"
+            memory=_memory_to_bytes(memory),  # None = 0 = "all available"
+            shm_size=_memory_to_bytes(shm_size),  # None = 0 = "use default value"
+            network_mode=network_mode,
+            volumes=[_volume_to_shim_volume_info(v, instance_id) for v in volumes],
+            volume_mounts=volume_mounts,
+            instance_mounts=instance_mounts,
+            gpu_devices=gpu_devices,
+            host_ssh_user=host_ssh_user,
+            host_ssh_keys=host_ssh_keys,
+            container_ssh_keys=container_ssh_keys,
+        )
+
+    @staticmethod
+    def _get_legacy_submit_body(
+        username: str,
+        password: str,
+        image_name: str,
+        privileged: bool,
+        container_name: str,
+        container_user: str,
+        shm_size: Optional[Memory],
+        public_keys: List[str],
+        ssh_user: str,
+        ssh_key: str,
+        mounts: List[VolumeMountPoint],
+        volumes: List[Volume],
+        instance_mounts: List[InstanceMountPoint],
+        instance_id: str,
+    ) -> LegacySubmitBody:
+        return LegacySubmitBody(
+            username=username,
+            password=password,
+            image_name=image_name,
+            privileged=privileged,
+            container_name=container_name,
+            container_user=container_user,
+            shm_size=int(shm_size * 1024**3) if shm_size else 0,
+            public_keys=public_keys,
+            ssh_user=ssh_user,
+            ssh_key=ssh_key,
+            mounts=mounts,
+            volumes=[_volume_to_shim_volume_info(v, instance_id) for v in volumes],
+            instance_mounts=instance_mounts,
+        )
+
+
+class ShimClient(_BaseShimClient):
     def __init__(
         self,
         port: Optional[int] = None,
@@ -360,34 +507,22 @@ class ShimClient:
     def is_instance_health_supported(self) -> bool:
         if not self._negotiated:
             self._negotiate()
-        return (
-            self._shim_version_tuple is None
-            or self._shim_version_tuple >= self._INSTANCE_HEALTH_MIN_SHIM_VERSION
-        )
+        return self._is_supported_since(self._INSTANCE_HEALTH_MIN_SHIM_VERSION)
 
     def is_instance_info_supported(self) -> bool:
         if not self._negotiated:
             self._negotiate()
-        return (
-            self._shim_version_tuple is None
-            or self._shim_version_tuple >= self._INSTANCE_INFO_MIN_SHIM_VERSION
-        )
+        return self._is_supported_since(self._INSTANCE_INFO_MIN_SHIM_VERSION)
 
     def are_components_supported(self) -> bool:
         if not self._negotiated:
             self._negotiate()
-        return (
-            self._shim_version_tuple is None
-            or self._shim_version_tuple >= self._COMPONENTS_MIN_SHIM_VERSION
-        )
+        return self._is_supported_since(self._COMPONENTS_MIN_SHIM_VERSION)
 
     def is_shutdown_supported(self) -> bool:
         if not self._negotiated:
             self._negotiate()
-        return (
-            self._shim_version_tuple is None
-            or self._shim_version_tuple >= self._SHUTDOWN_MIN_SHIM_VERSION
-        )
+        return self._is_supported_since(self._SHUTDOWN_MIN_SHIM_VERSION)
 
     @overload
     def healthcheck(self) -> Optional[HealthcheckResponse]: ...
@@ -514,26 +649,27 @@ class ShimClient:
     ) -> None:
         if not self.is_api_v2_supported():
             raise ShimAPIVersionError()
-        body = TaskSubmitRequest(
-            id=str(task_id),
+        body = self._get_task_submit_request(
+            task_id=task_id,
             name=name,
             registry_username=registry_username,
             registry_password=registry_password,
             image_name=image_name,
             container_user=container_user,
             privileged=privileged,
-            gpu=gpu if gpu is not None else -1,  # None = -1 = "all available" (0 means "0 GPU")
-            cpu=cpu if cpu is not None else 0,  # None = 0 = "all available"
-            memory=_memory_to_bytes(memory),  # None = 0 = "all available"
-            shm_size=_memory_to_bytes(shm_size),  # None = 0 = "use default value"
+            gpu=gpu,
+            cpu=cpu,
+            memory=memory,
+            shm_size=shm_size,
             network_mode=network_mode,
-            volumes=[_volume_to_shim_volume_info(v, instance_id) for v in volumes],
+            volumes=volumes,
             volume_mounts=volume_mounts,
             instance_mounts=instance_mounts,
             gpu_devices=gpu_devices,
             host_ssh_user=host_ssh_user,
             host_ssh_keys=host_ssh_keys,
             container_ssh_keys=container_ssh_keys,
+            instance_id=instance_id,
         )
         self._request("POST", "/api/tasks", body, raise_for_status=True)
 
@@ -582,20 +718,21 @@ class ShimClient:
         Returns `True` if submitted and `False` if the shim already has a job (`409 Conflict`).
         Other error statuses raise an exception.
         """
-        body = LegacySubmitBody(
+        body = self._get_legacy_submit_body(
             username=username,
             password=password,
             image_name=image_name,
             privileged=privileged,
             container_name=container_name,
             container_user=container_user,
-            shm_size=int(shm_size * 1024**3) if shm_size else 0,
+            shm_size=shm_size,
             public_keys=public_keys,
             ssh_user=ssh_user,
             ssh_key=ssh_key,
             mounts=mounts,
-            volumes=[_volume_to_shim_volume_info(v, instance_id) for v in volumes],
+            volumes=volumes,
             instance_mounts=instance_mounts,
+            instance_id=instance_id,
         )
         resp = self._request("POST", "/api/submit", body)
         if resp.status_code == HTTPStatus.CONFLICT:
@@ -659,23 +796,552 @@ class ShimClient:
     def _negotiate(self, healthcheck_response: Optional[requests.Response] = None) -> None:
         if healthcheck_response is None:
             healthcheck_response = self._request("GET", "/api/healthcheck", raise_for_status=True)
-        version_string = self._response(HealthcheckResponse, healthcheck_response).version
-        version_tuple = _parse_version(version_string)
-        if version_tuple is None or version_tuple >= self._API_V2_MIN_SHIM_VERSION:
-            api_version = 2
+        self._set_version(self._response(HealthcheckResponse, healthcheck_response))
+
+
+@dataclass
+class _PooledHTTPClient:
+    client: httpx.AsyncClient
+    in_use: int = 0
+    last_used_at: float = 0.0
+
+
+class AsyncHTTPClientPool:
+    """
+    Keep-alive HTTP clients to shim and runner, one per local address.
+
+    Requests to the same address reuse connections instead of connecting through
+    the SSH tunnel on every request. The addresses of reopened SSH connections change,
+    so clients that are not used for `idle_timeout` seconds are closed.
+    Must only be used from one event loop.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 60,
+        max_connections_per_address: int = 10,
+    ) -> None:
+        self._idle_timeout = idle_timeout
+        self._limits = httpx.Limits(
+            max_connections=max_connections_per_address,
+            max_keepalive_connections=max_connections_per_address,
+            keepalive_expiry=idle_timeout,
+        )
+        self._clients: dict[LocalAddress, _PooledHTTPClient] = {}
+
+    @asynccontextmanager
+    async def acquire(self, address: LocalAddress) -> AsyncGenerator[httpx.AsyncClient, None]:
+        pooled = self._clients.get(address)
+        if pooled is None:
+            pooled = _PooledHTTPClient(client=self._make_client(address))
+            self._clients[address] = pooled
+        pooled.in_use += 1
+        try:
+            yield pooled.client
+        finally:
+            pooled.in_use -= 1
+            pooled.last_used_at = time.monotonic()
+            await self._close_idle()
+
+    async def close(self, addresses: Iterable[LocalAddress]) -> None:
+        """
+        Closes clients to `addresses` that are not in use, e.g., before closing the tunnel.
+        """
+        for address in addresses:
+            pooled = self._clients.get(address)
+            if pooled is not None and pooled.in_use == 0:
+                del self._clients[address]
+                await pooled.client.aclose()
+
+    async def close_all(self) -> None:
+        clients = self._clients
+        self._clients = {}
+        for pooled in clients.values():
+            await pooled.client.aclose()
+
+    async def _close_idle(self) -> None:
+        now = time.monotonic()
+        idle_addresses = [
+            address
+            for address, pooled in self._clients.items()
+            if pooled.in_use == 0 and now - pooled.last_used_at > self._idle_timeout
+        ]
+        await self.close(idle_addresses)
+
+    def _make_client(self, address: LocalAddress) -> httpx.AsyncClient:
+        if isinstance(address, int):
+            transport = httpx.AsyncHTTPTransport(limits=self._limits)
+            base_url = f"http://localhost:{address}"
         else:
-            api_version = 1
-        self._shim_version_string = version_string
-        self._shim_version_tuple = version_tuple
-        self._api_version = api_version
-        self._negotiated = True
+            transport = httpx.AsyncHTTPTransport(uds=str(address), limits=self._limits)
+            base_url = "http://localhost"
+        return httpx.AsyncClient(transport=transport, base_url=base_url)
 
-    def _get_restart_safe_task_statuses(self) -> list[TaskStatus]:
-        # TODO: Rework shim's DockerRunner.Run() so that it does not wait for container termination
-        # (this at least requires replacing .waitContainer() with periodic polling of container
-        # statuses and moving some cleanup defer calls to .Terminate() and/or .Remove()) and add
-        # TaskStatus.RUNNING to the list of restart-safe task statuses for supported shim versions.
-        return [TaskStatus.TERMINATED]
+
+async_http_client_pool = AsyncHTTPClientPool()
+
+
+class _BaseAsyncClient:
+    def __init__(
+        self,
+        address: LocalAddress,
+        http_client_pool: Optional[AsyncHTTPClientPool] = None,
+    ) -> None:
+        self._address = address
+        self._http_client_pool = http_client_pool or async_http_client_pool
+
+    @classmethod
+    def from_address(cls, address: LocalAddress) -> Self:
+        """
+        Builds a client from a TCP port (`int`) or a Unix domain socket path (`Path`).
+        """
+        return cls(address)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        timeout: float,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Sends a request that must complete within `timeout` seconds, including the wait
+        for a pooled connection. Raises `httpx.TimeoutException` if the deadline is exceeded.
+        """
+        async with self._http_client_pool.acquire(self._address) as http_client:
+            try:
+                return await asyncio.wait_for(
+                    http_client.request(method, path, timeout=timeout, **kwargs),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError as e:
+                raise httpx.TimeoutException(
+                    f"{method} {path} did not complete within {timeout}s"
+                ) from e
+
+
+class AsyncRunnerClient(_BaseRunnerClient, _BaseAsyncClient):
+    """
+    An asyncio version of `RunnerClient` that sends requests over keep-alive
+    connections of `AsyncHTTPClientPool`. Request errors are raised as `httpx.HTTPError`.
+    """
+
+    async def get_version_string(self) -> str:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._version_string
+
+    async def get_version_tuple(self) -> Optional["_Version"]:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._version_tuple
+
+    async def is_code_upload_optional(self) -> bool:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._is_code_upload_optional()
+
+    async def healthcheck(self) -> Optional[HealthcheckResponse]:
+        try:
+            healthcheck_response = await self._healthcheck()
+        except httpx.HTTPError:
+            return None
+        if not self._negotiated:
+            self._set_version(healthcheck_response)
+        return healthcheck_response
+
+    async def get_metrics(self) -> Optional[MetricsResponse]:
+        resp = await self._send("GET", "/api/metrics", timeout=REQUEST_TIMEOUT)
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        return validate_extra_ignore(MetricsResponse, resp.json())
+
+    async def submit_job(
+        self,
+        run: Run,
+        job: Job,
+        cluster_info: ClusterInfo,
+        secrets: Dict[str, str],
+        repo_credentials: Optional[RemoteRepoCreds],
+        instance_env: Optional[Union[Env, Dict[str, str]]] = None,
+        router_env: Optional[Dict[str, str]] = None,
+    ):
+        body = self._get_submit_body(
+            run=run,
+            job=job,
+            cluster_info=cluster_info,
+            secrets=secrets,
+            repo_credentials=repo_credentials,
+            instance_env=instance_env,
+            router_env=router_env,
+        )
+        resp = await self._send(
+            "POST",
+            "/api/submit",
+            content=body.json_for_runner(),
+            headers={"Content-Type": "application/json"},
+            timeout=REQUEST_TIMEOUT,
+        )
+        resp.raise_for_status()
+
+    async def upload_archive(self, id: uuid.UUID, file: bytes):
+        resp = await self._send(
+            "POST",
+            "/api/upload_archive",
+            files={"archive": (str(id), file)},
+            timeout=UPLOAD_CODE_REQUEST_TIMEOUT,
+        )
+        resp.raise_for_status()
+
+    async def upload_code(self, file: bytes):
+        resp = await self._send(
+            "POST", "/api/upload_code", content=file, timeout=UPLOAD_CODE_REQUEST_TIMEOUT
+        )
+        resp.raise_for_status()
+
+    async def run_job(self) -> Optional[JobInfoResponse]:
+        resp = await self._send("POST", "/api/run", timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        if not _is_json_response(resp):
+            # Old runner or runner failed to get job info
+            return None
+        return validate_extra_ignore(JobInfoResponse, resp.json())
+
+    async def pull(self, timestamp: int) -> PullResponse:
+        resp = await self._send(
+            "GET", "/api/pull", params={"timestamp": timestamp}, timeout=REQUEST_TIMEOUT
+        )
+        resp.raise_for_status()
+        return validate_extra_ignore(PullResponse, resp.json())
+
+    async def stop(self):
+        resp = await self._send("POST", "/api/stop", timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+
+    async def _healthcheck(self) -> HealthcheckResponse:
+        resp = await self._send("GET", "/api/healthcheck", timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        return validate_extra_ignore(HealthcheckResponse, resp.json())
+
+    async def _negotiate(self) -> None:
+        self._set_version(await self._healthcheck())
+
+
+class AsyncShimClient(_BaseShimClient, _BaseAsyncClient):
+    """
+    An asyncio version of `ShimClient` that sends requests over keep-alive
+    connections of `AsyncHTTPClientPool`. Request errors are raised as `httpx.HTTPError`,
+    error statuses as `ShimHTTPError`.
+    """
+
+    # Methods shared by all API versions
+
+    async def get_version_string(self) -> str:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._shim_version_string
+
+    async def get_version_tuple(self) -> Optional["_Version"]:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._shim_version_tuple
+
+    async def is_api_v2_supported(self) -> bool:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._api_version == 2
+
+    async def is_instance_health_supported(self) -> bool:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._is_supported_since(self._INSTANCE_HEALTH_MIN_SHIM_VERSION)
+
+    async def is_instance_info_supported(self) -> bool:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._is_supported_since(self._INSTANCE_INFO_MIN_SHIM_VERSION)
+
+    async def are_components_supported(self) -> bool:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._is_supported_since(self._COMPONENTS_MIN_SHIM_VERSION)
+
+    async def is_shutdown_supported(self) -> bool:
+        if not self._negotiated:
+            await self._negotiate()
+        return self._is_supported_since(self._SHUTDOWN_MIN_SHIM_VERSION)
+
+    @overload
+    async def healthcheck(self) -> Optional[HealthcheckResponse]: ...
+
+    @overload
+    async def healthcheck(self, unmask_exceptions: Literal[True]) -> HealthcheckResponse: ...
+
+    async def healthcheck(self, unmask_exceptions: bool = False) -> Optional[HealthcheckResponse]:
+        try:
+            resp = await self._request("GET", "/api/healthcheck", raise_for_status=True)
+        except httpx.HTTPError:
+            if unmask_exceptions:
+                raise
+            return None
+        healthcheck_response = self._response(HealthcheckResponse, resp)
+        if not self._negotiated:
+            self._set_version(healthcheck_response)
+        return healthcheck_response
+
+    # API v2 methods
+
+    async def get_instance_health(self) -> Optional[InstanceHealthResponse]:
+        if not await self.is_instance_health_supported():
+            logger.debug("instance health is not supported: %s", self._shim_version_string)
+            return None
+        resp = await self._request("GET", "/api/instance/health")
+        if resp.status_code == HTTPStatus.NOT_FOUND:
+            logger.warning("instance health: %s", resp.text)
+            return None
+        self._raise_for_status(resp)
+        return self._response(InstanceHealthResponse, resp)
+
+    async def get_instance_info(self) -> Optional[InstanceInfoResponse]:
+        if not await self.is_instance_info_supported():
+            logger.debug("instance info is not supported: %s", self._shim_version_string)
+            return None
+        resp = await self._request("GET", "/api/instance/info")
+        if resp.status_code == HTTPStatus.NOT_FOUND:
+            # Old dev build of shim
+            logger.debug("instance info is not supported: %s", self._shim_version_string)
+            return None
+        self._raise_for_status(resp)
+        return self._response(InstanceInfoResponse, resp)
+
+    async def shutdown(self, *, force: bool) -> bool:
+        if not await self.is_shutdown_supported():
+            logger.debug("shim shutdown is not supported: %s", self._shim_version_string)
+            return False
+        body = ShutdownRequest(force=force)
+        resp = await self._request("POST", "/api/shutdown", body)
+        # TODO: Remove this check after 0.20.1 release, use _request(..., raise_for_status=True)
+        if resp.status_code == HTTPStatus.NOT_FOUND and self._shim_version_tuple is None:
+            # Old dev build of shim
+            logger.debug("shim shutdown is not supported: %s", self._shim_version_string)
+            return False
+        self._raise_for_status(resp)
+        return True
+
+    async def is_safe_to_restart(self) -> bool:
+        if not await self.is_api_v2_supported():
+            # old shim, `/api/shutdown` is not supported anyway
+            return False
+        task_list = await self.list_tasks()
+        if (tasks := task_list.tasks) is None:
+            # old shim, `/api/shutdown` is not supported anyway
+            return False
+        restart_safe_task_statuses = self._get_restart_safe_task_statuses()
+        return all(t.status in restart_safe_task_statuses for t in tasks)
+
+    async def get_components(self) -> Optional[ComponentList]:
+        if not await self.are_components_supported():
+            logger.debug("components are not supported: %s", self._shim_version_string)
+            return None
+        resp = await self._request("GET", "/api/components", raise_for_status=True)
+        return ComponentList.from_response(self._response(ComponentListResponse, resp))
+
+    async def install_runner(self, url: str) -> None:
+        body = ComponentInstallRequest(
+            name=ComponentName.RUNNER,
+            url=url,
+        )
+        await self._request("POST", "/api/components/install", body, raise_for_status=True)
+
+    async def install_shim(self, url: str) -> None:
+        body = ComponentInstallRequest(
+            name=ComponentName.SHIM,
+            url=url,
+        )
+        await self._request("POST", "/api/components/install", body, raise_for_status=True)
+
+    async def list_tasks(self) -> TaskListResponse:
+        if not await self.is_api_v2_supported():
+            raise ShimAPIVersionError()
+        resp = await self._request("GET", "/api/tasks", raise_for_status=True)
+        return self._response(TaskListResponse, resp)
+
+    async def get_task(self, task_id: "_TaskID") -> TaskInfoResponse:
+        if not await self.is_api_v2_supported():
+            raise ShimAPIVersionError()
+        resp = await self._request("GET", f"/api/tasks/{task_id}", raise_for_status=True)
+        return self._response(TaskInfoResponse, resp)
+
+    async def submit_task(
+        self,
+        task_id: "_TaskID",
+        name: str,
+        registry_username: str,
+        registry_password: str,
+        image_name: str,
+        container_user: str,
+        privileged: bool,
+        gpu: Optional[int],
+        cpu: Optional[float],
+        memory: Optional[Memory],
+        shm_size: Optional[Memory],
+        network_mode: NetworkMode,
+        volumes: list[Volume],
+        volume_mounts: list[VolumeMountPoint],
+        instance_mounts: list[InstanceMountPoint],
+        gpu_devices: list[GPUDevice],
+        host_ssh_user: str,
+        host_ssh_keys: list[str],
+        container_ssh_keys: list[str],
+        instance_id: str,
+    ) -> None:
+        if not await self.is_api_v2_supported():
+            raise ShimAPIVersionError()
+        body = self._get_task_submit_request(
+            task_id=task_id,
+            name=name,
+            registry_username=registry_username,
+            registry_password=registry_password,
+            image_name=image_name,
+            container_user=container_user,
+            privileged=privileged,
+            gpu=gpu,
+            cpu=cpu,
+            memory=memory,
+            shm_size=shm_size,
+            network_mode=network_mode,
+            volumes=volumes,
+            volume_mounts=volume_mounts,
+            instance_mounts=instance_mounts,
+            gpu_devices=gpu_devices,
+            host_ssh_user=host_ssh_user,
+            host_ssh_keys=host_ssh_keys,
+            container_ssh_keys=container_ssh_keys,
+            instance_id=instance_id,
+        )
+        await self._request("POST", "/api/tasks", body, raise_for_status=True)
+
+    async def terminate_task(
+        self,
+        task_id: "_TaskID",
+        reason: Optional[str] = None,
+        message: Optional[str] = None,
+        *,
+        timeout: int = 10,
+    ) -> None:
+        if not await self.is_api_v2_supported():
+            raise ShimAPIVersionError()
+        body = TaskTerminateRequest(
+            termination_reason=reason or "",
+            termination_message=message or "",
+            timeout=timeout,
+        )
+        await self._request("POST", f"/api/tasks/{task_id}/terminate", body, raise_for_status=True)
+
+    async def remove_task(self, task_id: "_TaskID") -> None:
+        if not await self.is_api_v2_supported():
+            raise ShimAPIVersionError()
+        await self._request("POST", f"/api/tasks/{task_id}/remove", raise_for_status=True)
+
+    # API v1 methods
+
+    async def submit(
+        self,
+        username: str,
+        password: str,
+        image_name: str,
+        privileged: bool,
+        container_name: str,
+        container_user: str,
+        shm_size: Optional[Memory],
+        public_keys: List[str],
+        ssh_user: str,
+        ssh_key: str,
+        mounts: List[VolumeMountPoint],
+        volumes: List[Volume],
+        instance_mounts: List[InstanceMountPoint],
+        instance_id: str,
+    ) -> bool:
+        """
+        Returns `True` if submitted and `False` if the shim already has a job (`409 Conflict`).
+        Other error statuses raise an exception.
+        """
+        body = self._get_legacy_submit_body(
+            username=username,
+            password=password,
+            image_name=image_name,
+            privileged=privileged,
+            container_name=container_name,
+            container_user=container_user,
+            shm_size=shm_size,
+            public_keys=public_keys,
+            ssh_user=ssh_user,
+            ssh_key=ssh_key,
+            mounts=mounts,
+            volumes=volumes,
+            instance_mounts=instance_mounts,
+            instance_id=instance_id,
+        )
+        resp = await self._request("POST", "/api/submit", body)
+        if resp.status_code == HTTPStatus.CONFLICT:
+            return False
+        self._raise_for_status(resp)
+        return True
+
+    async def stop(self, force: bool = False) -> None:
+        body = LegacyStopBody(force=force)
+        await self._request("POST", "/api/stop", body, raise_for_status=True)
+
+    async def pull(self) -> LegacyPullResponse:
+        resp = await self._request("GET", "/api/pull", raise_for_status=True)
+        return self._response(LegacyPullResponse, resp)
+
+    # Metrics
+
+    async def get_task_metrics(self, task_id: "_TaskID") -> Optional[str]:
+        resp = await self._request("GET", f"/metrics/tasks/{task_id}")
+        if resp.status_code == HTTPStatus.NOT_FOUND:
+            # Metrics exporter is not installed or old shim version
+            return None
+        if resp.status_code == HTTPStatus.BAD_GATEWAY:
+            # Metrics exporter is not available or returned an error
+            logger.info("failed to collect metrics for task %s: %s", task_id, resp.text)
+            return None
+        self._raise_for_status(resp)
+        return resp.text
+
+    # Private methods used for public methods implementations
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[CoreModel] = None,
+        *,
+        raise_for_status: bool = False,
+    ) -> httpx.Response:
+        json = body.model_dump() if body is not None else None
+        resp = await self._send(method, path, json=json, timeout=REQUEST_TIMEOUT)
+        if raise_for_status:
+            self._raise_for_status(resp)
+        return resp
+
+    _M = TypeVar("_M", bound=CoreModel)
+
+    def _response(self, model_cls: type[_M], response: httpx.Response) -> _M:
+        return validate_extra_ignore(model_cls, response.json())
+
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise ShimHTTPError() from e
+
+    async def _negotiate(self) -> None:
+        resp = await self._request("GET", "/api/healthcheck", raise_for_status=True)
+        self._set_version(self._response(HealthcheckResponse, resp))
 
 
 def _make_session_and_base_url(
@@ -752,7 +1418,7 @@ def _memory_to_bytes(memory: Optional[Memory]) -> int:
     return int(memory * 1024**3)
 
 
-def _is_json_response(response: requests.Response) -> bool:
+def _is_json_response(response: Union[requests.Response, httpx.Response]) -> bool:
     content_type = response.headers.get("content-type")
     if not content_type:
         return False
@@ -12,6 +12,7 @@ from dstack._internal.core.consts import DSTACK_RUNNER_HTTP_PORT, DSTACK_SHIM_HT
 from dstack._internal.core.errors import SSHError
 from dstack._internal.core.models.instances import SSHConnectionParams
 from dstack._internal.core.models.runs import JobProvisioningData, JobRuntimeData
+from dstack._internal.core.services.ssh.native_tunnel import NativeSSHTunnel, SSHTransportType
 from dstack._internal.core.services.ssh.tunnel import (
     SSH_DEFAULT_OPTIONS,
     IPSocket,
@@ -55,8 +56,8 @@ class InstanceConnectionKey:
         )
 
 
-# InstanceConnectionPool has sync interface because runner/shim clients and all the callers are sync.
-# TODO: Consider moving all of them to async for consistency with other pools/clients.
+# InstanceConnectionPool has sync interface because opening and checking connections blocks.
+# Async callers (`async_runner_ssh_tunnel`) run it in the default executor.
 class InstanceConnectionPool:
     """
     A pool of SSH connections to instances' host sshd (VM-based)
@@ -208,7 +209,12 @@ class InstanceConnection:
             conn_dir=self._effective_conn_dir,
             ports_to_forward=self._key.ports_to_forward,
         )
-        self._tunnel = SSHTunnel(
+        tunnel_class = (
+            NativeSSHTunnel
+            if settings.SERVER_SSH_TRANSPORT == SSHTransportType.NATIVE
+            else SSHTunnel
+        )
+        self._tunnel = tunnel_class(
             destination=f"{jpd.username}@{jpd.hostname}",
             port=jpd.ssh_port,
             identity=InstanceConnection._get_identity(ssh_private_key),
@@ -229,6 +235,9 @@ class InstanceConnection:
         )
 
     def open(self) -> None:
+        if isinstance(self._tunnel, NativeSSHTunnel):
+            self._tunnel.open()
+            return
         # A control socket left by a killed master or by a master that exited after
         # its tmp symlink was deleted prevents ssh from becoming a mux master
         # ("ControlSocket ... already exists, disabling multiplexing").
@@ -248,7 +257,11 @@ class InstanceConnection:
 
         Does not detect half-open TCP (ServerAliveInterval converts it into a clean exit)
         or mid-request deaths (handled by the callers' drop-on-error pattern).
+
+        With the native SSH transport, checks the in-process connection state, which is cheap.
         """
+        if isinstance(self._tunnel, NativeSSHTunnel):
+            return self._tunnel.check()
         if not self._control_socket_path.exists():
             return False
         now = time.monotonic()
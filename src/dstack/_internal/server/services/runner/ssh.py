@@ -1,14 +1,16 @@
 import functools
-from collections.abc import Mapping
+from collections.abc import Awaitable, Mapping
 from typing import Callable, Literal, Optional, TypeVar, Union
 
+import httpx
 import requests
 from typing_extensions import Concatenate, ParamSpec
 
 from dstack._internal.core.errors import DstackError, SSHError
 from dstack._internal.core.models.runs import JobProvisioningData, JobRuntimeData
 from dstack._internal.server import settings
-from dstack._internal.server.services.runner.client import LocalAddress
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
+from dstack._internal.server.services.runner.client import LocalAddress, async_http_client_pool
 from dstack._internal.server.services.runner.pool import (
     InstanceConnection,
     PrivateKeyOrPair,
@@ -102,3 +104,87 @@ def runner_ssh_tunnel(
         return False
 
     return wrapper
+
+
+# `httpx` errors meaning that the forwarded socket is not connected to shim or runner,
+# similar to `requests.ConnectionError`. `RemoteProtocolError` is what a keep-alive
+# connection returns after the SSH connection behind the forwarded socket died,
+# same as "Connection aborted" with `requests`.
+_ASYNC_CONNECTION_ERRORS = (httpx.NetworkError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+def async_runner_ssh_tunnel(
+    func: Callable[Concatenate[Mapping[int, LocalAddress], P], Awaitable[R]],
+) -> Callable[
+    Concatenate[PrivateKeyOrPair, JobProvisioningData, Optional[JobRuntimeData], P],
+    Awaitable[Union[Literal[False], R]],
+]:
+    """
+    An asyncio version of `runner_ssh_tunnel` for functions that use `AsyncShimClient` and
+    `AsyncRunnerClient`.
+
+    SSH connections are opened and checked in the default executor, but requests are sent
+    from the event loop over keep-alive connections of `async_http_client_pool`,
+    so in-flight requests do not hold executor threads. The errors are handled the same way:
+    connection errors re-open the SSH connection once, other request errors and
+    `DstackError` make the wrapper return `False`.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(
+        ssh_private_key: PrivateKeyOrPair,
+        job_provisioning_data: JobProvisioningData,
+        job_runtime_data: Optional[JobRuntimeData],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> Union[Literal[False], R]:
+        """
+        Returns:
+            is successful
+        """
+        if job_provisioning_data.hostname is None or job_provisioning_data.ssh_port is None:
+            return False
+
+        if not settings.SERVER_SSH_POOL_ENABLED or not job_provisioning_data.dockerized:
+            # See `runner_ssh_tunnel()` for why connections are not re-used in this case.
+            try:
+                conn = InstanceConnection(
+                    ssh_private_key=ssh_private_key,
+                    jpd=job_provisioning_data,
+                    jrd=job_runtime_data,
+                    ephemeral=True,
+                )
+                await run_async_in(ExecutorPool.RUNNER, conn.open)
+            except SSHError:
+                return False
+            addresses = conn.forwarded_paths()
+            try:
+                return await func(addresses, *args, **kwargs)
+            except (DstackError, httpx.HTTPError):
+                return False
+            finally:
+                await async_http_client_pool.close(addresses.values())
+                await run_async_in(ExecutorPool.RUNNER, conn.close)
+
+        for _ in range(2):
+            conn = await run_async_in(
+                ExecutorPool.RUNNER,
+                instance_connection_pool.get_or_open,
+                ssh_private_key=ssh_private_key,
+                jpd=job_provisioning_data,
+                jrd=job_runtime_data,
+            )
+            if conn is None:
+                return False  # couldn't establish at all
+            addresses = conn.forwarded_paths()
+            try:
+                return await func(addresses, *args, **kwargs)
+            except (SSHError, *_ASYNC_CONNECTION_ERRORS):
+                # dead ssh connection, re-open
+                await async_http_client_pool.close(addresses.values())
+                await run_async_in(ExecutorPool.RUNNER, instance_connection_pool.drop, conn.key)
+            except (DstackError, httpx.HTTPError):
+                return False  # reached runner, app-level fail; don't re-open ssh connection
+        return False
+
+    return wrapper
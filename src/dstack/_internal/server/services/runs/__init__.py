@@ -68,9 +68,11 @@ from dstack._internal.server.services.jobs import (
     remove_job_spec_sensitive_info,
 )
 from dstack._internal.server.services.locking import get_locker, string_to_lock_id
+from dstack._internal.server.services.parsed_models import parse_json_model
 from dstack._internal.server.services.pipelines import PipelineHinterProtocol
 from dstack._internal.server.services.plugins import apply_plugin_policies
 from dstack._internal.server.services.probes import is_probe_ready
+from dstack._internal.server.services.proxy.routing import invalidate_service_route_on_commit
 from dstack._internal.server.services.runs.plan import get_job_plans
 from dstack._internal.server.services.runs.service_router_worker_sync import (
     ensure_service_router_worker_sync_row,
@@ -152,8 +154,11 @@ def get_run_status_change_message(
     return msg
 
 
-def get_run_spec(run_model: RunModel) -> RunSpec:
-    return validate_json_extra_ignore(RunSpec, run_model.run_spec)
+def get_run_spec(run_model: RunModel, readonly: bool = False) -> RunSpec:
+    """
+    Pass `readonly=True` to get a cached instance that must not be mutated.
+    """
+    return parse_json_model(RunSpec, run_model.run_spec, readonly=readonly)
 
 
 def gateway_registration_failed(run_model: RunModel) -> bool:
@@ -688,6 +693,7 @@ async def apply_plan(
         )
     )
     await ensure_service_router_worker_sync_row(session, current_resource_model, run_spec)
+    invalidate_service_route_on_commit(session, current_resource.id)
     events.emit(
         session,
         (
@@ -6,7 +6,7 @@ from typing import Optional
 import dstack._internal.utils.common as common_utils
 from dstack._internal.core.models.configurations import DEFAULT_SCALING_WINDOW, ScalingSpec
 from dstack._internal.core.models.resources import Range
-from dstack._internal.proxy.gateway.schemas.stats import PerWindowStats
+from dstack._internal.proxy.gateway.schemas.stats import PerWindowStats, Stat
 
 
 class BaseServiceScaler(ABC):
@@ -53,7 +53,12 @@ class ManualScaler(BaseServiceScaler):
         return min(max(current_desired_count, self.min_replicas), self.max_replicas)
 
 
-class RPSAutoscaler(BaseServiceScaler):
+class MetricAutoscaler(BaseServiceScaler):
+    """
+    Scales replicas based on a metric aggregated over `window`, respecting
+    `min_replicas`, `max_replicas`, and the delays between scaling events.
+    """
+
     def __init__(
         self,
         min_replicas: int,
@@ -70,6 +75,10 @@ class RPSAutoscaler(BaseServiceScaler):
         self.scale_up_delay = scale_up_delay
         self.scale_down_delay = scale_down_delay
 
+    @abstractmethod
+    def _get_new_desired_count(self, current_desired_count: int, stat: Stat) -> int:
+        pass
+
     def get_desired_count(
         self,
         current_desired_count: int,
@@ -81,8 +90,7 @@ class RPSAutoscaler(BaseServiceScaler):
 
         now = common_utils.get_current_datetime()
 
-        rps = stats[self.window].requests / self.window
-        new_desired_count = math.ceil(rps / self.target)
+        new_desired_count = self._get_new_desired_count(current_desired_count, stats[self.window])
         # clip the desired count to the min and max values
         new_desired_count = min(max(new_desired_count, self.min_replicas), self.max_replicas)
 
@@ -108,6 +116,59 @@ class RPSAutoscaler(BaseServiceScaler):
         return new_desired_count
 
 
+class RPSAutoscaler(MetricAutoscaler):
+    """
+    Keeps requests per second per replica at `target`.
+    """
+
+    def _get_new_desired_count(self, current_desired_count: int, stat: Stat) -> int:
+        rps = stat.requests / self.window
+        return math.ceil(rps / self.target)
+
+
+class TokensPerSecondAutoscaler(MetricAutoscaler):
+    """
+    Keeps output tokens per second per replica at `target`.
+    """
+
+    def _get_new_desired_count(self, current_desired_count: int, stat: Stat) -> int:
+        return math.ceil(stat.output_tokens_per_second / self.target)
+
+
+class TTFTAutoscaler(MetricAutoscaler):
+    """
+    Keeps the average time to first token close to `target` seconds.
+
+    TTFT is not proportional to the load per replica as it includes a load-independent
+    prefill time, so replicas are changed in bounded steps: scaled up by at most half of
+    the current replicas if TTFT is above the dead band around `target`, and scaled down
+    by one replica if TTFT is below it.
+    """
+
+    # Relative deviation from `target` within which replicas are not changed
+    DEAD_BAND = 0.1
+    # Max relative increase of replicas in one scaling event
+    MAX_SCALE_UP_RATIO = 0.5
+
+    def _get_new_desired_count(self, current_desired_count: int, stat: Stat) -> int:
+        if current_desired_count == 0:
+            # TTFT is not measured without replicas, scale up if there are requests
+            return 1 if stat.requests > 0 else 0
+        if stat.ttft is None:
+            # no streamed responses to measure
+            if stat.requests == 0:
+                return 0
+            return current_desired_count
+        if stat.ttft > self.target * (1 + self.DEAD_BAND):
+            proportional = math.ceil(current_desired_count * stat.ttft / self.target)
+            max_step = max(1, math.ceil(current_desired_count * self.MAX_SCALE_UP_RATIO))
+            return min(proportional, current_desired_count + max_step)
+        if stat.ttft < self.target * (1 - self.DEAD_BAND):
+            # keep at least one replica while there are requests
+            return max(current_desired_count - 1, 1)
+        return current_desired_count
+
+
 def get_service_scaler(count: Range[int], scaling: Optional[ScalingSpec]) -> BaseServiceScaler:
     assert count.min is not None
     assert count.max is not None
@@ -116,14 +177,20 @@ def get_service_scaler(count: Range[int], scaling: Optional[ScalingSpec]) -> Bas
             min_replicas=count.min,
             max_replicas=count.max,
         )
-    if scaling.metric == "rps":
-        return RPSAutoscaler(
-            # replicas count validated by configuration model
-            min_replicas=count.min,
-            max_replicas=count.max,
-            target=scaling.target,
-            window=scaling.window if scaling.window is not None else DEFAULT_SCALING_WINDOW,
-            scale_up_delay=scaling.scale_up_delay,
-            scale_down_delay=scaling.scale_down_delay,
-        )
-    raise ValueError(f"No scaler found for scaling parameters {scaling}")
+    autoscaler_classes: dict[str, type[MetricAutoscaler]] = {
+        "rps": RPSAutoscaler,
+        "ttft": TTFTAutoscaler,
+        "tokens_per_second": TokensPerSecondAutoscaler,
+    }
+    autoscaler_class = autoscaler_classes.get(scaling.metric)
+    if autoscaler_class is None:
+        raise ValueError(f"No scaler found for scaling parameters {scaling}")
+    return autoscaler_class(
+        # replicas count validated by configuration model
+        min_replicas=count.min,
+        max_replicas=count.max,
+        target=scaling.target,
+        window=scaling.window if scaling.window is not None else DEFAULT_SCALING_WINDOW,
+        scale_up_delay=scaling.scale_up_delay,
+        scale_down_delay=scaling.scale_down_delay,
+    )
@@ -41,7 +41,7 @@ def get_container_ssh_credentials(
         head_key = FileContent(get_or_error(get_or_error(rci.ssh_proxy_keys)[0].private))
         hosts.append((head_proxy, head_key))
 
-    jpd = get_job_provisioning_data(job)
+    jpd = get_job_provisioning_data(job, readonly=True)
     assert jpd is not None
     assert jpd.hostname is not None
     assert jpd.ssh_port is not None
@@ -57,7 +57,7 @@ def get_container_ssh_credentials(
         instance_project_key = FileContent(instance.project.ssh_private_key)
         hosts.append((instance_proxy, instance_project_key))
         ssh_port = DSTACK_RUNNER_SSH_PORT
-        jrd = job_runtime_data or get_job_runtime_data(job)
+        jrd = job_runtime_data or get_job_runtime_data(job, readonly=True)
         if jrd is not None and jrd.ports is not None:
             ssh_port = jrd.ports.get(ssh_port, ssh_port)
         target_host = SSHConnectionParams(
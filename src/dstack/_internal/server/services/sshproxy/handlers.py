@@ -69,9 +69,9 @@ async def get_upstream_response(
         )
 
     username: Optional[str] = None
-    if (jrd := get_job_runtime_data(job)) is not None:
+    if (jrd := get_job_runtime_data(job, readonly=True)) is not None:
         username = jrd.username
-    if username is None and (job_spec_user := get_job_spec(job).user) is not None:
+    if username is None and (job_spec_user := get_job_spec(job, readonly=True).user) is not None:
         username = job_spec_user.username
     if username is not None:
         hosts[-1].user = username
@@ -82,7 +82,7 @@ async def get_upstream_response(
         .options(load_only(UserPublicKeyModel.key))
     )
     authorized_keys = {k.key for k in res.scalars().all()}
-    if (run_spec_key := get_run_spec(job.run).ssh_key_pub) is not None:
+    if (run_spec_key := get_run_spec(job.run, readonly=True).ssh_key_pub) is not None:
         authorized_keys.add(run_spec_key)
     if (user_key := job.run.user.ssh_public_key) is not None:
         authorized_keys.add(user_key)
@@ -38,6 +38,7 @@ from dstack._internal.server.models import (
 )
 from dstack._internal.server.services import backends as backends_services
 from dstack._internal.server.services import events
+from dstack._internal.server.services.executors import ExecutorPool, run_async_in
 from dstack._internal.server.services.instances import get_instance_provisioning_data
 from dstack._internal.server.services.locking import (
     get_locker,
@@ -526,7 +527,8 @@ async def _delete_volume(session: AsyncSession, project: ProjectModel, volume_mo
 
     compute = backend.compute()
     assert isinstance(compute, ComputeWithVolumeSupport)
-    await common.run_async(
+    await run_async_in(
+        ExecutorPool.CLOUD,
         compute.delete_volume,
         volume=volume,
     )
@@ -6,6 +6,7 @@ import os
 from enum import Enum
 from pathlib import Path
 
+from dstack._internal.core.services.ssh.native_tunnel import SSHTransportType
 from dstack._internal.server.utils.settings import parse_hostname_port
 from dstack._internal.utils.env import environ
 from dstack._internal.utils.logging import get_logger
@@ -74,6 +75,36 @@ SERVER_BACKGROUND_PROCESSING_DISABLED = (
 SERVER_BACKGROUND_PROCESSING_ENABLED = not SERVER_BACKGROUND_PROCESSING_DISABLED
 
 SERVER_EXECUTOR_MAX_WORKERS = int(os.getenv("DSTACK_SERVER_EXECUTOR_MAX_WORKERS", 128))
+# Blocking calls of different kinds run in separate thread pools
+# so that e.g. slow cloud API calls do not delay runner polling or log writes.
+SERVER_EXECUTOR_CLOUD_MAX_WORKERS = int(os.getenv("DSTACK_SERVER_EXECUTOR_CLOUD_MAX_WORKERS", 64))
+SERVER_EXECUTOR_RUNNER_MAX_WORKERS = int(
+    os.getenv("DSTACK_SERVER_EXECUTOR_RUNNER_MAX_WORKERS", 64)
+)
+SERVER_EXECUTOR_STORAGE_MAX_WORKERS = int(
+    os.getenv("DSTACK_SERVER_EXECUTOR_STORAGE_MAX_WORKERS", 16)
+)
+SERVER_EXECUTOR_LOGS_MAX_WORKERS = int(os.getenv("DSTACK_SERVER_EXECUTOR_LOGS_MAX_WORKERS", 16))
+
+# Background pipelines scale the number of workers between
+# their default number of workers multiplied by these factors depending on the backlog.
+SERVER_PIPELINE_MIN_WORKERS_FACTOR = float(
+    os.getenv("DSTACK_SERVER_PIPELINE_MIN_WORKERS_FACTOR", 0.2)
+)
+SERVER_PIPELINE_MAX_WORKERS_FACTOR = float(
+    os.getenv("DSTACK_SERVER_PIPELINE_MAX_WORKERS_FACTOR", 3)
+)
+# Deliver pipeline fetch hints to all server replicas via Postgres LISTEN/NOTIFY.
+SERVER_PIPELINE_NOTIFICATIONS_ENABLED = (
+    os.getenv("DSTACK_SERVER_PIPELINE_NOTIFICATIONS_ENABLED") is not None
+)
+
+# The max number of parsed run/job specs and job data models kept in memory.
+SERVER_PARSED_MODELS_CACHE_SIZE = int(os.getenv("DSTACK_SERVER_PARSED_MODELS_CACHE_SIZE", 10000))
+# Check that cached models are not mutated by callers. Meant for tests and debugging.
+SERVER_PARSED_MODELS_CACHE_CHECK_MUTATIONS = (
+    os.getenv("DSTACK_SERVER_PARSED_MODELS_CACHE_CHECK_MUTATIONS") is not None
+)
 
 MAX_OFFERS_TRIED = int(os.getenv("DSTACK_SERVER_MAX_OFFERS_TRIED", 25))
 MAX_PROBES_PER_JOB = int(os.getenv("DSTACK_SERVER_MAX_PROBES_PER_JOB", 10))
@@ -104,12 +135,23 @@ SERVER_ELASTICSEARCH_HOST = os.getenv("DSTACK_SERVER_ELASTICSEARCH_HOST")
 SERVER_ELASTICSEARCH_INDEX = os.getenv("DSTACK_SERVER_ELASTICSEARCH_INDEX", "dstack-logs")
 SERVER_ELASTICSEARCH_API_KEY = os.getenv("DSTACK_SERVER_ELASTICSEARCH_API_KEY")
 
+# Job logs pulled from runners are buffered and written to the log storage in the background.
+SERVER_LOGS_WRITE_BUFFER_MAX_EVENTS = environ.get_int(
+    "DSTACK_SERVER_LOGS_WRITE_BUFFER_MAX_EVENTS", default=100000
+)
+SERVER_LOGS_WRITE_BUFFER_FLUSH_INTERVAL = float(
+    os.getenv("DSTACK_SERVER_LOGS_WRITE_BUFFER_FLUSH_INTERVAL", 1)
+)
+
 SERVER_METRICS_RUNNING_TTL_SECONDS = environ.get_int(
     "DSTACK_SERVER_METRICS_RUNNING_TTL_SECONDS", default=3600
 )
 SERVER_METRICS_FINISHED_TTL_SECONDS = environ.get_int(
     "DSTACK_SERVER_METRICS_FINISHED_TTL_SECONDS", default=7 * 24 * 3600
 )
+SERVER_METRICS_COLLECTION_CONCURRENCY = environ.get_int(
+    "DSTACK_SERVER_METRICS_COLLECTION_CONCURRENCY", default=20
+)
 SERVER_INSTANCE_HEALTH_TTL_SECONDS = environ.get_int(
     "DSTACK_SERVER_INSTANCE_HEALTH_TTL_SECONDS", default=7 * 24 * 3600
 )
@@ -174,6 +216,10 @@ ACME_EAB_HMAC_KEY = os.getenv("DSTACK_ACME_EAB_HMAC_KEY")
 DEFAULT_SERVICE_CLIENT_MAX_BODY_SIZE = int(
     os.getenv("DSTACK_DEFAULT_SERVICE_CLIENT_MAX_BODY_SIZE", 64 * 1024 * 1024)
 )
+# How long the in-server proxy routes requests using in-memory service data.
+# Changes made by this replica take effect immediately, changes made by other replicas
+# take effect after this TTL.
+SERVER_PROXY_ROUTING_TABLE_TTL = float(os.getenv("DSTACK_SERVER_PROXY_ROUTING_TABLE_TTL", 5))
 
 SERVER_DEFAULT_DOCKER_REGISTRY = os.getenv("DSTACK_SERVER_DEFAULT_DOCKER_REGISTRY") or None
 SERVER_DEFAULT_DOCKER_REGISTRY_USERNAME = (
@@ -199,6 +245,9 @@ SERVER_LOG_QUOTA_PER_JOB_HOUR = int(
 SERVER_SSH_POOL_DISABLED = os.getenv("DSTACK_SERVER_SSH_POOL_DISABLED") is not None
 SERVER_SSH_POOL_ENABLED = not SERVER_SSH_POOL_DISABLED
 SERVER_SSH_CONNECT_TIMEOUT = int(os.getenv("DSTACK_SERVER_SSH_CONNECT_TIMEOUT", 3))
+SERVER_SSH_TRANSPORT = environ.get_enum(
+    "DSTACK_SERVER_SSH_TRANSPORT", SSHTransportType, default=SSHTransportType.OPENSSH
+)
 
 # Development settings
 
@@ -135,6 +135,7 @@ from dstack._internal.server.models import (
     VolumeModel,
 )
 from dstack._internal.server.services.jobs import get_job_specs_from_run_spec
+from dstack._internal.server.services.metrics import add_job_metrics_points
 from dstack._internal.server.services.permissions import (
     DefaultPermissions,
     get_default_permissions,
@@ -1310,7 +1311,7 @@ async def create_job_metrics_point(
         gpus_memory_usage_bytes=json.dumps(gpus_memory_usage_bytes),
         gpus_util_percent=json.dumps(gpus_util_percent),
     )
-    session.add(jmp)
+    await add_job_metrics_points(session, [jmp])
     await session.commit()
     return jmp
 
@@ -4,9 +4,11 @@ from sqlalchemy import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine
 from testcontainers.community.postgres import PostgresContainer
 
+from dstack._internal.core.backends.base.offers_cache import get_offers_cache
 from dstack._internal.server import settings
 from dstack._internal.server.db import Database, override_db
 from dstack._internal.server.models import BaseModel
+from dstack._internal.server.services.proxy.routing import get_service_routing_table
 
 SQLITE_URL = "sqlite+aiosqlite://"
 
@@ -95,6 +97,10 @@ async def test_db(request, sqlite_db, postgres_db):
         raise ValueError(f"Unknown db_type {db_type}")
     override_db(db)
     await _clear_tables(db)
+    # Routes are derived from DB rows, so drop them together with the rows.
+    get_service_routing_table().clear()
+    # Offers are shared by backends with the same config that tests create anew.
+    get_offers_cache().clear()
     yield db
 
 
@@ -16,11 +16,15 @@ class MetricsAPIClient(APIClientGroup):
         after: Optional[datetime] = None,
         before: Optional[datetime] = None,
         limit: Optional[int] = None,
+        step: Optional[int] = None,
+        aggregation: Optional[str] = None,
     ) -> JobMetrics:
         """
         Returns job metrics ordered from the latest sample to the earliest.
 
         Without `after`/`before`/`limit`, the server returns one latest sample.
+        With `step` (seconds), the server returns one sample per `step` aggregated
+        with `aggregation` (`avg`, `min`, or `max`).
         """
         params: Dict[str, Any] = {
             "replica_num": replica_num,
@@ -32,6 +36,10 @@ class MetricsAPIClient(APIClientGroup):
             params["before"] = before.isoformat()
         if limit is not None:
             params["limit"] = limit
+        if step is not None:
+            params["step"] = step
+        if aggregation is not None:
+            params["aggregation"] = aggregation
         resp = self._request(
             f"/api/project/{project_name}/metrics/job/{run_name}",
             method="GET",
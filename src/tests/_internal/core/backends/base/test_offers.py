@@ -2,8 +2,10 @@ import gpuhunt
 import pytest
 
 from dstack._internal.core.backends.base.offers import (
+    OffersTable,
     filter_offers_by_requirements,
     gpu_matches_gpu_spec,
+    requirements_to_query_filter,
 )
 from dstack._internal.core.models.backends.base import BackendType
 from dstack._internal.core.models.instances import (
@@ -13,7 +15,7 @@ from dstack._internal.core.models.instances import (
     InstanceType,
     Resources,
 )
-from dstack._internal.core.models.resources import GPUSpec, ResourcesSpec
+from dstack._internal.core.models.resources import CPUSpec, GPUSpec, ResourcesSpec
 from dstack._internal.core.models.runs import Requirements
 
 NVIDIA = gpuhunt.AcceleratorVendor.NVIDIA
@@ -152,3 +154,84 @@ class TestFilterOffersByRequirementsDiskSize:
         requirements = Requirements(resources=ResourcesSpec(disk="100GB..200GB"))
 
         assert list(filter_offers_by_requirements([offer], requirements)) == [offer]
+
+
+class TestOffersTable:
+    def make_offer(
+        self,
+        cpus: int = 8,
+        memory_gib: int = 64,
+        gpus: list[Gpu] = [],
+        spot: bool = False,
+        disk_gib: int = 100,
+        price: float = 1.0,
+        cpu_arch: gpuhunt.CPUArchitecture = gpuhunt.CPUArchitecture.X86,
+    ) -> InstanceOffer:
+        return InstanceOffer(
+            backend=BackendType.AWS,
+            instance=InstanceType(
+                name="test-instance",
+                resources=Resources(
+                    cpu_arch=cpu_arch,
+                    cpus=cpus,
+                    memory_mib=memory_gib * 1024,
+                    gpus=gpus,
+                    spot=spot,
+                    disk=Disk(size_mib=disk_gib * 1024),
+                ),
+            ),
+            region="us-east-1",
+            price=price,
+        )
+
+    @pytest.fixture
+    def offers(self) -> list[InstanceOffer]:
+        return [
+            self.make_offer(cpus=2, memory_gib=8, price=0.1),
+            self.make_offer(
+                cpus=4,
+                memory_gib=16,
+                price=0.2,
+                spot=True,
+                cpu_arch=gpuhunt.CPUArchitecture.ARM,
+            ),
+            self.make_offer(disk_gib=0, price=0.3),
+            self.make_offer(gpus=[make_gpu("T4", 16)], price=0.5),
+            self.make_offer(gpus=[make_gpu("L4", 24)] * 2, price=1.5, spot=True),
+            self.make_offer(gpus=[make_gpu("A100", 40)] * 4, price=8.0, disk_gib=500),
+            self.make_offer(gpus=[make_gpu("A100", 80)] * 8, cpus=96, memory_gib=1024, price=30),
+            self.make_offer(gpus=[make_gpu("H100", 80)] * 8, cpus=192, memory_gib=2048, price=50),
+            self.make_offer(gpus=[make_gpu("MI300X", 192, vendor=AMD)] * 8, price=40),
+        ]
+
+    @pytest.mark.parametrize(
+        "requirements",
+        [
+            Requirements(resources=ResourcesSpec()),
+            Requirements(resources=ResourcesSpec(gpu=GPUSpec(count="0.."))),
+            Requirements(resources=ResourcesSpec(gpu="A100")),
+            Requirements(resources=ResourcesSpec(gpu="a100:80GB:8")),
+            Requirements(resources=ResourcesSpec(gpu=GPUSpec(name=["l4", "H100"], count="0.."))),
+            Requirements(resources=ResourcesSpec(gpu="amd:1..")),
+            Requirements(resources=ResourcesSpec(gpu=GPUSpec(vendor=NVIDIA, count="1.."))),
+            Requirements(resources=ResourcesSpec(gpu="40GB..80GB")),
+            Requirements(resources=ResourcesSpec(gpu=GPUSpec(total_memory="300GB.."))),
+            Requirements(resources=ResourcesSpec(gpu=GPUSpec(compute_capability="8.0"))),
+            Requirements(resources=ResourcesSpec(cpu=CPUSpec.parse("arm:2.."), memory="8GB..")),
+            Requirements(resources=ResourcesSpec(cpu="4..8", memory="..64GB", disk="100GB..")),
+            Requirements(resources=ResourcesSpec(gpu=GPUSpec(count="0..")), spot=True),
+            Requirements(resources=ResourcesSpec(gpu="1.."), max_price=10),
+        ],
+    )
+    def test_matches_same_offers_as_catalog_filter(
+        self, offers: list[InstanceOffer], requirements: Requirements
+    ):
+        expected = list(filter_offers_by_requirements(offers, requirements))
+        table = OffersTable(offers)
+        assert table.filter(requirements_to_query_filter(requirements)) == expected
+
+    def test_does_not_check_disk_size_if_disabled(self, offers: list[InstanceOffer]):
+        table = OffersTable(offers)
+        q = requirements_to_query_filter(Requirements(resources=ResourcesSpec(disk="1TB..")))
+        assert table.filter(q) == [offers[2]]
+        assert table.filter(q, check_disk_size=False) == offers
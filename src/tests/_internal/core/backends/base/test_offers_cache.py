@@ -0,0 +1,119 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dstack._internal.core.backends.base.compute import ComputeWithAllOffersCached
+from dstack._internal.core.backends.base.offers_cache import OffersCache, get_offers_cache
+from dstack._internal.core.models.instances import InstanceOfferWithAvailability
+from dstack._internal.core.models.runs import Requirements
+
+
+class TestOffersCache:
+    def test_returns_cached_value(self):
+        cache = OffersCache(ttl=180, refresh_after=120)
+        fetch = MagicMock(return_value=["offer"])
+        assert cache.get("key", fetch) == ["offer"]
+        assert cache.get("key", fetch) == ["offer"]
+        assert cache.get("other-key", fetch) == ["offer"]
+        assert fetch.call_count == 2
+
+    def test_coalesces_concurrent_fetches(self):
+        cache = OffersCache(ttl=180, refresh_after=120)
+        fetch_started = threading.Event()
+        release_fetch = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            fetch_started.set()
+            release_fetch.wait(timeout=5)
+            return ["offer"]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(cache.get, "key", fetch)
+            fetch_started.wait(timeout=5)
+            others = [executor.submit(cache.get, "key", fetch) for _ in range(3)]
+            release_fetch.set()
+            results = [first.result(timeout=5)] + [f.result(timeout=5) for f in others]
+        assert results == [["offer"]] * 4
+        assert len(calls) == 1
+
+    def test_refreshes_stale_value_in_background(self):
+        cache = OffersCache(ttl=180, refresh_after=120)
+        refreshed = threading.Event()
+
+        def fetch_new():
+            refreshed.set()
+            return ["new-offer"]
+
+        with patch("time.monotonic", return_value=1000):
+            cache.get("key", lambda: ["old-offer"])
+        with patch("time.monotonic", return_value=1130):
+            assert cache.get("key", fetch_new) == ["old-offer"]
+            assert refreshed.wait(timeout=5)
+        with patch("time.monotonic", return_value=1131):
+            for _ in range(50):
+                if cache.get("key", fetch_new) == ["new-offer"]:
+                    break
+                time.sleep(0.01)
+            assert cache.get("key", fetch_new) == ["new-offer"]
+
+    def test_fetches_expired_value(self):
+        cache = OffersCache(ttl=180, refresh_after=120)
+        with patch("time.monotonic", return_value=1000):
+            cache.get("key", lambda: ["old-offer"])
+        with patch("time.monotonic", return_value=1180):
+            assert cache.get("key", lambda: ["new-offer"]) == ["new-offer"]
+
+    def test_does_not_cache_errors(self):
+        cache = OffersCache(ttl=180, refresh_after=120)
+        with pytest.raises(RuntimeError):
+            cache.get("key", MagicMock(side_effect=RuntimeError("rate limited")))
+        assert cache.get("key", lambda: ["offer"]) == ["offer"]
+
+    def test_evicts_oldest_entries(self):
+        cache = OffersCache(ttl=180, refresh_after=120, maxsize=2)
+        with patch("time.monotonic", return_value=1000):
+            cache.get("first", lambda: ["first"])
+        with patch("time.monotonic", return_value=1001):
+            cache.get("second", lambda: ["second"])
+            cache.get("third", lambda: ["third"])
+            assert cache.get("second", lambda: ["new"]) == ["second"]
+            assert cache.get("first", lambda: ["new"]) == ["new"]
+
+
+class _Compute(ComputeWithAllOffersCached):
+    def __init__(self, offers: List[InstanceOfferWithAvailability]) -> None:
+        super().__init__()
+        self.offers = offers
+        self.get_all_offers_calls = 0
+
+    def get_all_offers_with_availability(
+        self, unallocated_resources: bool
+    ) -> List[InstanceOfferWithAvailability]:
+        self.get_all_offers_calls += 1
+        return self.offers
+
+
+class TestComputeWithAllOffersCached:
+    @pytest.fixture(autouse=True)
+    def clear_offers_cache(self):
+        get_offers_cache().clear()
+        yield
+        get_offers_cache().clear()
+
+    def test_computes_with_same_key_share_offers(self):
+        first = _Compute([])
+        second = _Compute([])
+        third = _Compute([])
+        first.set_offers_cache_key("fingerprint")
+        second.set_offers_cache_key("fingerprint")
+        for compute in (first, second, third):
+            list(compute.get_offers(Requirements(resources={}), False, False))
+        assert first.get_all_offers_calls == 1
+        assert second.get_all_offers_calls == 0
+        assert third.get_all_offers_calls == 1
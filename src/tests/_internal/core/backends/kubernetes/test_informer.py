@@ -0,0 +1,156 @@
+from decimal import Decimal
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from kubernetes.client import (
+    V1Container,
+    V1ContainerStatus,
+    V1ListMeta,
+    V1Node,
+    V1NodeList,
+    V1ObjectMeta,
+    V1Pod,
+    V1PodList,
+    V1PodSpec,
+    V1PodStatus,
+    V1ResourceRequirements,
+)
+
+from dstack._internal.core.backends.kubernetes.informer import ClusterInformer
+from dstack._internal.core.backends.kubernetes.resources import KubernetesResources, PodPhase
+
+
+def _pod(
+    name: str,
+    node_name: Optional[str],
+    phase: str,
+    cpu: str = "1",
+    started: bool = False,
+) -> V1Pod:
+    return V1Pod(
+        metadata=V1ObjectMeta(name=name, namespace="default"),
+        spec=V1PodSpec(
+            node_name=node_name,
+            containers=[
+                V1Container(name="main", resources=V1ResourceRequirements(requests={"cpu": cpu}))
+            ],
+        ),
+        status=V1PodStatus(
+            phase=phase,
+            container_statuses=(
+                [
+                    V1ContainerStatus(
+                        name="main", image="", image_id="", ready=False, restart_count=0
+                    )
+                ]
+                if started
+                else None
+            ),
+        ),
+    )
+
+
+class _FakeWatch:
+    events: list[dict] = []
+
+    def __init__(self) -> None:
+        self.resource_version = None
+
+    def stream(self, method, **kwargs):
+        for event in self.events:
+            self.resource_version = "2"
+            yield event
+
+    def stop(self) -> None:
+        pass
+
+
+@pytest.fixture
+def api_mock():
+    with patch("dstack._internal.core.backends.kubernetes.informer.CoreV1Api") as api_cls_mock:
+        api = api_cls_mock.return_value
+        api.list_node.return_value = V1NodeList(
+            metadata=V1ListMeta(resource_version="1"),
+            items=[V1Node(metadata=V1ObjectMeta(name="node-1"))],
+        )
+        api.list_pod_for_all_namespaces.return_value = V1PodList(
+            metadata=V1ListMeta(resource_version="1"),
+            items=[
+                _pod("running", "node-1", "Running", cpu="1"),
+                _pod("pending", None, "Pending", cpu="2"),
+                _pod("succeeded", "node-1", "Succeeded", cpu="4"),
+            ],
+        )
+        yield api
+
+
+def _sync(informer: ClusterInformer, pod_events: list[dict]) -> list[str]:
+    """
+    Lists and watches once synchronously instead of in background threads.
+    Returns the resource versions to resume watches from.
+    """
+    resource_versions = []
+    for reflector, events in ((informer._nodes, []), (informer._pods, pod_events)):
+        reflector._thread = MagicMock()
+        resource_version = reflector._list()
+        with (
+            patch("dstack._internal.core.backends.kubernetes.informer.Watch", _FakeWatch),
+            patch.object(_FakeWatch, "events", events),
+        ):
+            resource_versions.append(reflector._watch(resource_version))
+    return resource_versions
+
+
+class TestClusterInformer:
+    def test_returns_listed_nodes(self, api_mock: MagicMock):
+        informer = ClusterInformer(api_client=MagicMock(), name="test")
+        assert _sync(informer, []) == ["1", "1"]
+        nodes = informer.get_nodes()
+        assert nodes is not None
+        assert [node.metadata.name for node in nodes] == ["node-1"]
+
+    def test_updates_allocated_resources_incrementally(self, api_mock: MagicMock):
+        informer = ClusterInformer(api_client=MagicMock(), name="test")
+        resource_versions = _sync(
+            informer,
+            [
+                {"type": "MODIFIED", "object": _pod("pending", "node-2", "Pending", cpu="2")},
+                {"type": "ADDED", "object": _pod("new", "node-1", "Running", cpu="8")},
+                {"type": "MODIFIED", "object": _pod("running", "node-1", "Failed", cpu="1")},
+                {"type": "DELETED", "object": _pod("new", "node-1", "Running", cpu="8")},
+                {"type": "ADDED", "object": _pod("other", "node-1", "Running", cpu="500m")},
+            ],
+        )
+        assert resource_versions == ["1", "2"]
+        assert informer.get_nodes_allocated_resources() == {
+            "node-1": KubernetesResources(cpu=Decimal("0.5")),
+            "node-2": KubernetesResources(cpu=Decimal("2")),
+        }
+
+    def test_wait_for_pod(self, api_mock: MagicMock):
+        informer = ClusterInformer(api_client=MagicMock(), name="test")
+        _sync(
+            informer,
+            [{"type": "MODIFIED", "object": _pod("pending", "node-1", "Pending", started=True)}],
+        )
+        result = informer.wait_for_pod(
+            "default", "pending", lambda pod: pod.has_container_statuses, timeout=0
+        )
+        assert result is not None
+        is_started, pod_state = result
+        assert is_started
+        assert pod_state is not None
+        assert pod_state.phase == PodPhase.PENDING
+        assert informer.wait_for_pod("default", "missing", lambda pod: True, timeout=0) == (
+            False,
+            None,
+        )
+
+    def test_returns_none_if_listing_failed(self, api_mock: MagicMock):
+        informer = ClusterInformer(api_client=MagicMock(), name="test")
+        informer._pods._thread = MagicMock()
+        with patch("dstack._internal.core.backends.kubernetes.informer.time.sleep"):
+            informer._pods._on_error(Exception("Forbidden"), retry_interval=0)
+        assert informer.get_nodes_allocated_resources() is None
+        assert informer.wait_for_pod("default", "running", lambda pod: True, timeout=0) is None
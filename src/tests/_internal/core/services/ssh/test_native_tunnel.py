@@ -0,0 +1,319 @@
+import asyncio
+import io
+import socket
+import socketserver
+import threading
+import time
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import Mock
+
+import paramiko
+import pytest
+
+from dstack._internal.core.errors import SSHKeyError
+from dstack._internal.core.models.instances import SSHConnectionParams
+from dstack._internal.core.services.ssh import native_tunnel
+from dstack._internal.core.services.ssh.native_tunnel import NativeSSHTunnel
+from dstack._internal.core.services.ssh.tunnel import IPSocket, SocketPair, UnixSocket
+from dstack._internal.utils.path import FileContent
+
+
+def _private_key_str(key: paramiko.PKey) -> str:
+    buf = io.StringIO()
+    key.write_private_key(buf)
+    return buf.getvalue()
+
+
+class _EchoHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while data := self.request.recv(4096):
+            self.request.sendall(data)
+
+
+class _SSHServer(paramiko.ServerInterface):
+    def __init__(self, authorized_key: paramiko.PKey) -> None:
+        self.authorized_key = authorized_key
+        self.direct_tcpip_destinations: dict[int, tuple[str, int]] = {}
+
+    def get_allowed_auths(self, username: str) -> str:
+        return "publickey"
+
+    def check_auth_publickey(self, username: str, key: paramiko.PKey) -> int:
+        if key == self.authorized_key:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind: str, chanid: int) -> int:
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_direct_tcpip_request(self, chanid, origin, destination) -> int:
+        self.direct_tcpip_destinations[chanid] = destination
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_exec_request(self, channel: paramiko.Channel, command: bytes) -> bool:
+        def run() -> None:
+            # Reply after the server accepts the request
+            time.sleep(0.1)
+            channel.sendall(command.upper())
+            channel.send_exit_status(0)
+            channel.close()
+
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+
+class _SSHD:
+    """
+    A minimal SSH server that forwards direct-tcpip channels and runs commands by echoing them.
+    Channels to `ECHO_PORT` are forwarded to the echo server.
+    """
+
+    ECHO_PORT = 10999
+
+    def __init__(self, authorized_key: paramiko.PKey) -> None:
+        self.host_key = paramiko.RSAKey.generate(1024)
+        self.authorized_key = authorized_key
+        self.connections_count = 0
+        self.transports: list[paramiko.Transport] = []
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.port = self._sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                client, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections_count += 1
+            transport = paramiko.Transport(client)
+            self.transports.append(transport)
+            transport.add_server_key(self.host_key)
+            server = _SSHServer(self.authorized_key)
+            transport.start_server(server=server)
+            threading.Thread(
+                target=self._accept_channels, args=(transport, server), daemon=True
+            ).start()
+
+    def _accept_channels(self, transport: paramiko.Transport, server: _SSHServer) -> None:
+        while transport.is_active():
+            channel = transport.accept(timeout=0.5)
+            if channel is None:
+                continue
+            destination = server.direct_tcpip_destinations.get(channel.get_id())
+            if destination is None:
+                continue
+            host, port = destination
+            if port == self.ECHO_PORT:
+                port = self.echo_port
+            sock = socket.create_connection((host, port))
+            threading.Thread(target=_copy, args=(channel, sock), daemon=True).start()
+            threading.Thread(target=_copy, args=(sock, channel), daemon=True).start()
+
+    echo_port: int = 0
+
+    def close(self) -> None:
+        self._sock.close()
+        for transport in self.transports:
+            transport.close()
+
+
+def _copy(src, dst) -> None:
+    try:
+        while data := src.recv(4096):
+            dst.sendall(data)
+    except OSError:
+        pass
+    dst.close()
+
+
+@pytest.fixture
+def client_key() -> paramiko.PKey:
+    return paramiko.RSAKey.generate(1024)
+
+
+@pytest.fixture
+def sshd(client_key: paramiko.PKey) -> Generator[_SSHD, None, None]:
+    echo_server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _EchoHandler)
+    echo_server.daemon_threads = True
+    threading.Thread(target=echo_server.serve_forever, daemon=True).start()
+    server = _SSHD(client_key)
+    server.echo_port = echo_server.server_address[1]
+    yield server
+    server.close()
+    echo_server.shutdown()
+    echo_server.server_close()
+
+
+def _make_tunnel(sshd: _SSHD, key: paramiko.PKey, socket_path: Path, **kwargs) -> NativeSSHTunnel:
+    return NativeSSHTunnel(
+        destination="root@127.0.0.1",
+        port=sshd.port,
+        identity=FileContent(_private_key_str(key)),
+        forwarded_sockets=[
+            SocketPair(
+                local=UnixSocket(socket_path), remote=IPSocket("localhost", _SSHD.ECHO_PORT)
+            )
+        ],
+        **kwargs,
+    )
+
+
+def _echo_over_unix_socket(path: Path, data: bytes) -> bytes:
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.settimeout(5)
+        sock.connect(str(path))
+        sock.sendall(data)
+        return sock.recv(4096)
+
+
+class TestNativeSSHTunnel:
+    def test_forwards_unix_socket(self, sshd: _SSHD, client_key: paramiko.PKey, tmp_path: Path):
+        tunnel = _make_tunnel(sshd, client_key, tmp_path / "app.sock")
+        with tunnel:
+            assert tunnel.check()
+            assert _echo_over_unix_socket(tmp_path / "app.sock", b"hello") == b"hello"
+            assert _echo_over_unix_socket(tmp_path / "app.sock", b"again") == b"again"
+        assert not tunnel.check()
+        assert not (tmp_path / "app.sock").exists()
+
+    def test_forwards_data_larger_than_send_window(
+        self, sshd: _SSHD, client_key: paramiko.PKey, tmp_path: Path
+    ):
+        data = bytes(range(256)) * (32 * 1024 * 1024 // 256)
+        received = bytearray()
+        with _make_tunnel(sshd, client_key, tmp_path / "app.sock"):
+            with socket.socket(socket.AF_UNIX) as sock:
+                sock.settimeout(5)
+                sock.connect(str(tmp_path / "app.sock"))
+                sender = threading.Thread(target=sock.sendall, args=(data,))
+                sender.start()
+                # Let the echo server stall so that the remote window is exhausted
+                time.sleep(0.5)
+                while len(received) < len(data):
+                    chunk = sock.recv(64 * 1024)
+                    assert chunk
+                    received += chunk
+                sender.join(timeout=5)
+        assert received == data
+
+    def test_tunnels_share_connection(
+        self, sshd: _SSHD, client_key: paramiko.PKey, tmp_path: Path
+    ):
+        tunnel1 = _make_tunnel(sshd, client_key, tmp_path / "1.sock")
+        tunnel2 = _make_tunnel(sshd, client_key, tmp_path / "2.sock")
+        with tunnel1, tunnel2:
+            assert _echo_over_unix_socket(tmp_path / "1.sock", b"one") == b"one"
+            assert _echo_over_unix_socket(tmp_path / "2.sock", b"two") == b"two"
+            assert sshd.connections_count == 1
+            tunnel1.close()
+            assert tunnel2.check()
+            assert _echo_over_unix_socket(tmp_path / "2.sock", b"two") == b"two"
+
+    def test_connects_through_proxy(self, sshd: _SSHD, client_key: paramiko.PKey, tmp_path: Path):
+        tunnel = _make_tunnel(
+            sshd,
+            client_key,
+            tmp_path / "app.sock",
+            ssh_proxies=[
+                (SSHConnectionParams(hostname="127.0.0.1", username="root", port=sshd.port), None)
+            ],
+        )
+        with tunnel:
+            assert _echo_over_unix_socket(tmp_path / "app.sock", b"hello") == b"hello"
+        # The proxy connection and the connection through the proxy
+        assert sshd.connections_count == 2
+
+    def test_check_fails_if_connection_is_lost(
+        self, sshd: _SSHD, client_key: paramiko.PKey, tmp_path: Path
+    ):
+        tunnel = _make_tunnel(sshd, client_key, tmp_path / "app.sock")
+        with tunnel:
+            for transport in sshd.transports:
+                transport.close()
+            tunnel._connection._transports[-1].join(timeout=5)  # pyright: ignore[reportOptionalMemberAccess]
+            assert not tunnel.check()
+            tunnel.open()
+            assert tunnel.check()
+            assert _echo_over_unix_socket(tmp_path / "app.sock", b"hello") == b"hello"
+
+    @pytest.mark.asyncio
+    async def test_aexec(self, sshd: _SSHD, client_key: paramiko.PKey, tmp_path: Path):
+        async with _make_tunnel(sshd, client_key, tmp_path / "app.sock") as tunnel:
+            assert await tunnel.acheck()
+            assert await tunnel.aexec("echo") == "ECHO"
+
+    def test_raises_key_error_if_key_not_authorized(self, sshd: _SSHD, tmp_path: Path):
+        tunnel = _make_tunnel(sshd, paramiko.RSAKey.generate(1024), tmp_path / "app.sock")
+        with pytest.raises(SSHKeyError):
+            tunnel.open()
+        assert not tunnel.check()
+
+
+class _FakeTransport:
+    def __init__(self) -> None:
+        self.active = True
+        self.closed = False
+        self.keepalives = 0
+
+    def is_active(self) -> bool:
+        return self.active
+
+    def global_request(self, kind: str, wait: bool) -> None:
+        self.keepalives += 1
+        # Stop after the first reply
+        self.active = False
+
+    def close(self) -> None:
+        self.closed = True
+        self.active = False
+
+
+class TestKeepalive:
+    @pytest.mark.asyncio
+    async def test_does_not_count_executor_queue_time(self, monkeypatch: pytest.MonkeyPatch):
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(native_tunnel, "_executor", executor)
+        release = threading.Event()
+        executor.submit(release.wait)
+        transport = _FakeTransport()
+        keepalive = asyncio.create_task(
+            native_tunnel._keepalive(Mock(), transport, interval=0.05, count_max=2)  # type: ignore[arg-type]
+        )
+        try:
+            # The keepalive waits in the queue longer than `interval * count_max`
+            await asyncio.sleep(0.5)
+            assert not keepalive.done()
+        finally:
+            release.set()
+        await asyncio.wait_for(keepalive, 5)
+        assert transport.keepalives == 1
+        assert not transport.closed
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_closes_transport_if_no_reply(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(native_tunnel, "_executor", ThreadPoolExecutor(max_workers=1))
+        transport = _FakeTransport()
+        unblock = threading.Event()
+
+        def global_request(kind: str, wait: bool) -> None:
+            unblock.wait(5)
+
+        transport.global_request = global_request  # type: ignore[method-assign]
+        transport_close = transport.close
+
+        def close() -> None:
+            transport_close()
+            unblock.set()
+
+        transport.close = close  # type: ignore[method-assign]
+        await asyncio.wait_for(
+            native_tunnel._keepalive(Mock(), transport, interval=0.05, count_max=2),  # type: ignore[arg-type]
+            5,
+        )
+        assert transport.closed
@@ -13,13 +13,16 @@ def system_mocks() -> Generator[Mocks, None, None]:
     with (
         patch(f"{nginx}.sudo") as sudo,
         patch(f"{nginx}.Nginx.reload") as reload_nginx,
+        patch(f"{nginx}.Nginx.validate") as validate_nginx,
         patch(f"{nginx}.Nginx.run_certbot") as run_certbot,
         patch(f"{connection}.ServiceConnection.open") as open_conn,
         patch(f"{connection}.ServiceConnection.close") as close_conn,
     ):
         sudo.return_value = []
+        validate_nginx.return_value = None
         yield Mocks(
             reload_nginx=reload_nginx,
+            validate_nginx=validate_nginx,
             run_certbot=run_certbot,
             open_conn=open_conn,
             close_conn=close_conn,
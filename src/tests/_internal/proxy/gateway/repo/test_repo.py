@@ -35,3 +35,98 @@ async def test_persist_repo(tmp_path: Path) -> None:
     assert await repo.list_entrypoints() == [entrypoint_1]
     assert set(await repo.list_services()) == {srv_1, srv_2}
     assert await repo.list_models("proj-1") == [model_1]
+
+
+@pytest.mark.asyncio
+async def test_replays_journal_with_deletions(tmp_path: Path) -> None:
+    file = tmp_path / "state-v2.json"
+    repo = GatewayProxyRepo.load(file)
+    await repo.set_project(make_project("proj-1"))
+    await repo.set_service(make_service("proj-1", "run-1"))
+    await repo.set_service(make_service("proj-1", "run-2"))
+    await repo.set_model(make_model("proj-1", "model-1", run_name="run-1"))
+    await repo.delete_service("proj-1", "run-1")
+    await repo.delete_models_by_run("proj-1", "run-1")
+    expected_services = await repo.list_services()
+    repo.close()
+    assert not file.exists()
+    assert (tmp_path / "state-v2.json.journal").exists()
+
+    repo = GatewayProxyRepo.load(file)
+    assert await repo.list_services() == expected_services
+    assert [s.run_name for s in expected_services] == ["run-2"]
+    assert await repo.list_models("proj-1") == []
+    # replayed journal is compacted into a snapshot on load
+    assert file.exists()
+    assert not (tmp_path / "state-v2.json.journal").exists()
+
+
+@pytest.mark.asyncio
+async def test_compacts_journal(tmp_path: Path) -> None:
+    file = tmp_path / "state-v2.json"
+    journal_file = tmp_path / "state-v2.json.journal"
+    repo = GatewayProxyRepo.load(file, journal_compaction_min_size=0)
+    await repo.set_project(make_project("proj-1"))
+    # the first record is larger than the empty snapshot
+    assert file.exists()
+    assert not journal_file.exists()
+    for i in range(10):
+        await repo.set_service(make_service("proj-1", f"run-{i}"))
+    assert file.stat().st_size > 0
+    expected_services = await repo.list_services()
+    repo.close()
+
+    repo = GatewayProxyRepo.load(file)
+    assert set(await repo.list_services()) == set(expected_services)
+    assert len(expected_services) == 10
+
+
+@pytest.mark.asyncio
+async def test_skips_incomplete_journal_record(tmp_path: Path) -> None:
+    file = tmp_path / "state-v2.json"
+    repo = GatewayProxyRepo.load(file)
+    await repo.set_project(make_project("proj-1"))
+    repo.close()
+    with open(tmp_path / "state-v2.json.journal", "a") as f:
+        f.write('{"op": "set_project", "proj')
+
+    repo = GatewayProxyRepo.load(file)
+    assert await repo.get_project("proj-1") == make_project("proj-1")
+
+
+@pytest.mark.asyncio
+async def test_indexes_services_by_domain_and_models_by_run() -> None:
+    repo = GatewayProxyRepo()
+    srv_1 = make_service("proj-1", "run-1", domain="run-1.gtw.test")
+    srv_2 = make_service("proj-2", "run-2", domain="run-2.gtw.test")
+    model_1 = make_model("proj-1", "model-1", run_name="run-1")
+    model_2 = make_model("proj-1", "model-2", run_name="run-2")
+    await repo.set_service(srv_1)
+    await repo.set_service(srv_2)
+    await repo.set_model(model_1)
+    await repo.set_model(model_2)
+    assert await repo.get_service_by_domain("run-1.gtw.test") == srv_1
+    assert await repo.get_service_by_domain("run-2.gtw.test") == srv_2
+    assert await repo.list_models_by_run("proj-1", "run-1") == [model_1]
+    assert await repo.list_models_by_run("proj-1", "run-2") == [model_2]
+
+    srv_1_new_domain = make_service("proj-1", "run-1", domain="new.gtw.test")
+    await repo.set_service(srv_1_new_domain)
+    await repo.delete_service("proj-2", "run-2")
+    await repo.delete_models_by_run("proj-1", "run-1")
+    assert await repo.get_service_by_domain("run-1.gtw.test") is None
+    assert await repo.get_service_by_domain("run-2.gtw.test") is None
+    assert await repo.get_service_by_domain("new.gtw.test") == srv_1_new_domain
+    assert await repo.list_models_by_run("proj-1", "run-1") == []
+    assert await repo.list_models_by_run("proj-1", "run-2") == [model_2]
+
+
+@pytest.mark.asyncio
+async def test_mutations_do_not_change_previous_snapshot() -> None:
+    repo = GatewayProxyRepo()
+    await repo.set_service(make_service("proj-1", "run-1", domain="run-1.gtw.test"))
+    snapshot = repo._snapshot
+    await repo.set_service(make_service("proj-1", "run-2", domain="run-2.gtw.test"))
+    await repo.delete_service("proj-1", "run-1")
+    assert list(snapshot.state.services["proj-1"]) == ["run-1"]
+    assert list(snapshot.services_by_domain) == ["run-1.gtw.test"]
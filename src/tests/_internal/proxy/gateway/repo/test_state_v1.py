@@ -457,6 +457,7 @@ async def test_not_migrates_if_migrated_before(tmp_path: Path) -> None:
 
     repo = GatewayProxyRepo.load(v2_file)
     await repo.set_project(make_project("test-proj"))
+    repo.save()
     state_v2_after_write_operation = v2_file.read_text()
     assert state_v2_after_write_operation != state_v2_after_initial_migration
 
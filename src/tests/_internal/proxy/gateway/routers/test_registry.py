@@ -1,3 +1,4 @@
+import asyncio
 import re
 import uuid
 from datetime import datetime
@@ -206,7 +207,7 @@ class TestRegisterService:
         assert (tmp_path / "443-test-run.gtw.test.conf").exists()
         assert system_mocks.reload_nginx.call_count == 1
 
-    @freeze_time(datetime(2024, 12, 12, 0, 30))
+    @freeze_time(datetime(2024, 12, 12, 0, 30), real_asyncio=True)
     async def test_register_with_model(self, tmp_path: Path, system_mocks: Mocks) -> None:
         repo = GatewayProxyRepo()
         client = make_client(tmp_path, repo=repo)
@@ -329,6 +330,33 @@ class TestRegisterReplica:
         assert system_mocks.reload_nginx.call_count == 3
         assert system_mocks.open_conn.call_count == 2
 
+    async def test_register_concurrently_with_one_reload(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        app = make_app(repo=GatewayProxyRepo(), nginx=Nginx(conf_dir=tmp_path, batch_window=0.5))
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/")
+        resp = await client.post(
+            "/api/registry/test-proj/services/register",
+            json=register_service_payload(run_name="test-run", domain="test-run.gtw.test"),
+        )
+        assert resp.status_code == 200
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/api/registry/test-proj/services/test-run/replicas/register",
+                    json=register_replica_payload(job_id=f"replica-{i}"),
+                )
+                for i in range(10)
+            )
+        )
+        assert [resp.status_code for resp in responses] == [200] * 10
+        conf = (tmp_path / "443-test-run.gtw.test.conf").read_text()
+        for i in range(10):
+            assert f"# replica replica-{i}" in conf
+        # One reload for the service and one for all replicas
+        assert system_mocks.reload_nginx.call_count == 2
+        assert system_mocks.open_conn.call_count == 10
+
     async def test_register_no_service_error(self, tmp_path: Path, system_mocks: Mocks) -> None:
         client = make_client(tmp_path)
         resp = await client.post(
@@ -0,0 +1,85 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from dstack._internal.proxy.gateway.services.nginx import Nginx
+from dstack._internal.proxy.gateway.testing.common import Mocks
+from dstack._internal.proxy.lib.errors import UnexpectedProxyError
+
+
+@pytest.mark.asyncio
+class TestConfigBatching:
+    async def test_applies_concurrent_changes_with_one_reload(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        nginx = Nginx(conf_dir=tmp_path)
+        await asyncio.gather(*(nginx.write_conf(f"conf {i}", f"{i}.conf") for i in range(10)))
+        assert [(tmp_path / f"{i}.conf").read_text() for i in range(10)] == [
+            f"conf {i}" for i in range(10)
+        ]
+        assert system_mocks.validate_nginx.call_count == 1
+        assert system_mocks.reload_nginx.call_count == 1
+        assert nginx.reload_stats.reloads == 1
+
+    async def test_skips_reload_if_nothing_changed(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        nginx = Nginx(conf_dir=tmp_path)
+        await nginx.write_conf("conf", "a.conf")
+        await nginx.write_conf("conf", "a.conf")
+        assert system_mocks.reload_nginx.call_count == 1
+
+    async def test_rolls_back_only_invalid_confs(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        (tmp_path / "invalid.conf").write_text("old conf")
+        system_mocks.validate_nginx.side_effect = [
+            f'nginx: [emerg] unknown directive "oops" in {tmp_path / "invalid.conf"}:1',
+            None,
+        ]
+        nginx = Nginx(conf_dir=tmp_path)
+        results = await asyncio.gather(
+            nginx.write_conf("conf", "valid.conf"),
+            nginx.write_conf("oops", "invalid.conf"),
+            return_exceptions=True,
+        )
+        assert results[0] is None
+        assert isinstance(results[1], UnexpectedProxyError)
+        assert (tmp_path / "valid.conf").read_text() == "conf"
+        assert (tmp_path / "invalid.conf").read_text() == "old conf"
+        assert system_mocks.validate_nginx.call_count == 2
+        assert system_mocks.reload_nginx.call_count == 1
+        assert nginx.reload_stats.rejected_confs == 1
+
+    async def test_rolls_back_all_confs_if_error_not_attributed(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        system_mocks.validate_nginx.return_value = "nginx: [emerg] something is wrong"
+        nginx = Nginx(conf_dir=tmp_path)
+        results = await asyncio.gather(
+            nginx.write_conf("conf", "a.conf"),
+            nginx.write_conf("conf", "b.conf"),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, UnexpectedProxyError) for r in results)
+        assert list(tmp_path.iterdir()) == []
+        assert system_mocks.reload_nginx.call_count == 0
+
+    async def test_fails_waiters_if_flush_cancelled(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        nginx = Nginx(conf_dir=tmp_path, batch_window=10)
+        write = asyncio.create_task(nginx.write_conf("conf", "a.conf"))
+        await asyncio.sleep(0)
+        pending_batch = nginx._pending_batch
+        assert pending_batch is not None and pending_batch.flush_task is not None
+        pending_batch.flush_task.cancel()
+        with pytest.raises(UnexpectedProxyError):
+            await asyncio.wait_for(write, 5)
+        assert nginx._pending_batch is None
+        assert system_mocks.reload_nginx.call_count == 0
+        # Later changes are applied in a new batch
+        nginx._batch_window = 0
+        await nginx.write_conf("conf", "a.conf")
+        assert (tmp_path / "a.conf").read_text() == "conf"
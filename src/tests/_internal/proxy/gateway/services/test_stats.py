@@ -168,3 +168,57 @@ async def test_collect_stats_after_log_update(tmp_path: Path) -> None:
         f.flush()
         result = await collector.collect()
         assert result == both_chunks_stats
+
+
+@pytest.mark.asyncio
+async def test_collect_stats_as_windows_slide(tmp_path: Path) -> None:
+    access_log_path = tmp_path / "dstack.access.log"
+    access_log_path.write_text(
+        dedent(
+            """
+            2024-12-06T12:04:59+00:00 srv.gtw.test 200 0.100 1
+            2024-12-06T12:09:00+00:00 srv.gtw.test 200 0.200 1
+            2024-12-06T12:09:30+00:00 srv.gtw.test 200 0.300 1
+            """
+        ).lstrip()
+    )
+    collector = StatsCollector(access_log_path)
+    with freeze_time(datetime(2024, 12, 6, 12, 9, 30, tzinfo=timezone.utc)):
+        assert await collector.collect() == {
+            "srv.gtw.test": {
+                30: Stat(requests=2, request_time=0.25),
+                60: Stat(requests=2, request_time=0.25),
+                300: Stat(requests=3, request_time=0.2),
+            },
+        }
+    with freeze_time(datetime(2024, 12, 6, 12, 10, 0, 500000, tzinfo=timezone.utc)):
+        assert await collector.collect() == {
+            "srv.gtw.test": {
+                30: Stat(requests=0, request_time=0.0),
+                60: Stat(requests=1, request_time=0.3),
+                300: Stat(requests=2, request_time=0.25),
+            },
+        }
+    with freeze_time(datetime(2024, 12, 6, 12, 20, tzinfo=timezone.utc)):
+        assert await collector.collect() == {}
+
+
+@pytest.mark.asyncio
+@freeze_time(datetime(2024, 12, 6, 12, 10, tzinfo=timezone.utc))
+async def test_collect_stats_waits_for_complete_lines(tmp_path: Path) -> None:
+    access_log_path = tmp_path / "dstack.access.log"
+    collector = StatsCollector(access_log_path)
+    with open(access_log_path, "w") as f:
+        f.write("2024-12-06T12:09:45+02:00 srv.gtw.test 200 0.100 1\n")
+        f.write("2024-12-06T12:09:50+00:00 srv.gtw.test 200 0.")
+        f.flush()
+        assert await collector.collect() == {}
+        f.write("300 1\n")
+        f.flush()
+        assert await collector.collect() == {
+            "srv.gtw.test": {
+                30: Stat(requests=1, request_time=0.3),
+                60: Stat(requests=1, request_time=0.3),
+                300: Stat(requests=1, request_time=0.3),
+            },
+        }
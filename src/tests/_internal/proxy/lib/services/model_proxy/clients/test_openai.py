@@ -0,0 +1,53 @@
+import httpx
+import pytest
+
+from dstack._internal.proxy.lib.errors import ProxyError
+from dstack._internal.proxy.lib.schemas.model_proxy import ChatCompletionsRequest, ChatMessage
+from dstack._internal.proxy.lib.services.model_proxy.clients.openai import OpenAIChatCompletions
+
+UPSTREAM_STREAM = (
+    b'data: {"id":"1","choices":[{"index":0,"delta":{"content":"Hi"}}],"unknown":1}\n\n'
+    b": keep-alive\n\n"
+    b'data: {"id":"1","choices":[{"index":0,"delta":{"content":"!"}}]}\n\n'
+    b"data: [DONE]\n\n"
+)
+
+
+def make_request(stream: bool) -> ChatCompletionsRequest:
+    return ChatCompletionsRequest(
+        model="test-model",
+        messages=[ChatMessage(role="user", content="Hi")],
+        stream=stream,
+    )
+
+
+def make_client(handler) -> OpenAIChatCompletions:
+    http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://upstream"
+    )
+    return OpenAIChatCompletions(http_client=http_client, prefix="/v1")
+
+
+@pytest.mark.asyncio
+class TestOpenAIChatCompletionsPassThrough:
+    async def test_forwards_stream_as_is(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/v1/chat/completions"
+            return httpx.Response(200, content=UPSTREAM_STREAM)
+
+        client = make_client(handler)
+        data = b"".join([chunk async for chunk in client.stream_raw(make_request(stream=True))])
+        assert data == UPSTREAM_STREAM
+
+    async def test_forwards_response_as_is(self) -> None:
+        body = b'{"id":"1","choices":[],"unknown":1}'
+        client = make_client(lambda request: httpx.Response(200, content=body))
+        assert await client.generate_raw(make_request(stream=False)) == body
+
+    async def test_raises_upstream_error_before_streaming(self) -> None:
+        client = make_client(lambda request: httpx.Response(422, content=b"Bad request"))
+        stream = client.stream_raw(make_request(stream=True))
+        with pytest.raises(ProxyError) as exc_info:
+            await stream.__anext__()
+        assert exc_info.value.status_code == 422
+        assert exc_info.value.detail == "Bad request"
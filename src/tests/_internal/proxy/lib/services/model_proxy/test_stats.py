@@ -0,0 +1,101 @@
+from typing import AsyncIterator
+from unittest.mock import patch
+
+import pytest
+
+from dstack._internal.proxy.lib.services.model_proxy.stats import ModelProxyStats
+
+
+class Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock(1000.0)
+    with patch("dstack._internal.proxy.lib.services.model_proxy.stats._now", clock):
+        yield clock
+
+
+async def sse_stream(clock: Clock, chunks: list[tuple[float, bytes]]) -> AsyncIterator[bytes]:
+    for delay, data in chunks:
+        clock.now += delay
+        yield data
+
+
+@pytest.mark.asyncio
+class TestModelProxyStats:
+    async def test_measures_streamed_tokens(self, clock: Clock) -> None:
+        stats = ModelProxyStats()
+        tracker = stats.track("proj", "run", replicas=2)
+        chunks = [
+            (0.5, b'data: {"choices":[{"delta":{"content":"a"}}]}\n\n'),
+            # event split between chunks
+            (0.1, b'data: {"choices":[{"delta":'),
+            (0.0, b'{"content":"b"}}]}\n\ndata: {"choices":[{"delta":{"content":"c"}}]}\n\n'),
+            (0.1, b"data: [DONE]\n\n"),
+        ]
+        data = [chunk async for chunk in tracker.observe_stream(sse_stream(clock, chunks))]
+        assert data == [chunk for _, chunk in chunks]
+        stat = stats.get("proj", "run")[60]
+        assert stat.streamed_requests == 1
+        assert stat.ttft == 0.5
+        assert stat.inter_token_latency == 0.05  # 0.1s for 3 tokens
+        assert stat.output_tokens_per_second == round(3 / 60, 3)
+        # one request in flight for 0.7s on 2 replicas
+        assert stat.queue_depth == round(0.7 / 60 / 2, 3)
+
+    async def test_ignores_data_inside_payloads(self, clock: Clock) -> None:
+        stats = ModelProxyStats()
+        tracker = stats.track("proj", "run", replicas=1)
+        chunks = [
+            (0.1, b'data: {"choices":[{"delta":{"content":"data: x"}}]}\n\n'),
+            (0.1, b'data: {"choices":[{"delta":{"content":"data:"}}]}\n\ndata: [DONE]\n\n'),
+        ]
+        async for _ in tracker.observe_stream(sse_stream(clock, chunks)):
+            pass
+        stat = stats.get("proj", "run")[30]
+        assert stat.output_tokens_per_second == round(2 / 30, 3)
+
+    async def test_uses_usage_if_reported(self, clock: Clock) -> None:
+        stats = ModelProxyStats()
+        tracker = stats.track("proj", "run", replicas=1)
+        chunks = [
+            (0.2, b'data: {"choices":[{"delta":{"content":"ab"}}]}\n\n'),
+            (0.2, b'data: {"choices":[],"usage":{"completion_tokens":5}}\n\n'),
+            (0.0, b"data: [DONE]\n\n"),
+        ]
+        async for _ in tracker.observe_stream(sse_stream(clock, chunks)):
+            pass
+        stat = stats.get("proj", "run")[30]
+        assert stat.output_tokens_per_second == round(5 / 30, 3)
+        assert stat.ttft == 0.2
+
+    async def test_counts_non_streamed_response_tokens(self, clock: Clock) -> None:
+        stats = ModelProxyStats()
+        tracker = stats.track("proj", "run", replicas=1)
+        clock.now += 2
+        tracker.finish_response(b'{"choices":[],"usage":{"completion_tokens":30}}')
+        stat = stats.get("proj", "run")[30]
+        assert stat.output_tokens_per_second == 1.0
+        assert stat.streamed_requests == 0
+        assert stat.ttft is None
+        assert stat.queue_depth == round(2 / 30, 3)
+
+    async def test_forgets_idle_services(self, clock: Clock) -> None:
+        stats = ModelProxyStats()
+        stats.track("proj", "run", replicas=1).finish_response(None)
+        assert stats.get("proj", "run") is not None
+        clock.now += 301
+        assert stats.get("proj", "run") is None
+
+    async def test_prunes_idle_services_without_reads(self, clock: Clock) -> None:
+        stats = ModelProxyStats()
+        stats.track("proj", "old-run", replicas=1).finish_response(None)
+        clock.now += 301
+        stats.track("proj", "new-run", replicas=1).finish_response(None)
+        assert list(stats._stats) == [("proj", "new-run")]
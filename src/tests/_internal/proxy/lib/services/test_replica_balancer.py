@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+import pytest
+
+from dstack._internal.proxy.lib.models import Replica
+from dstack._internal.proxy.lib.services.replica_balancer import (
+    EWMALatencyReplicaBalancer,
+    LeastRequestsReplicaBalancer,
+    PowerOfTwoReplicaBalancer,
+    RandomReplicaBalancer,
+    ReplicaRequest,
+)
+
+
+def make_replica(replica_id: str) -> Replica:
+    return Replica(
+        id=replica_id,
+        app_port=8000,
+        ssh_destination="ubuntu@10.0.0.1",
+        ssh_port=22,
+    )
+
+
+REPLICAS = (make_replica("a"), make_replica("b"), make_replica("c"))
+
+
+class TestLeastRequestsReplicaBalancer:
+    def test_chooses_replica_with_fewest_in_flight_requests(self):
+        balancer = LeastRequestsReplicaBalancer()
+        balancer.on_request_start("a")
+        balancer.on_request_start("a")
+        balancer.on_request_start("b")
+        balancer.on_request_start("c")
+        balancer.on_request_end("c")
+        assert balancer.choose(REPLICAS).id == "c"
+
+
+class TestPowerOfTwoReplicaBalancer:
+    def test_chooses_less_loaded_of_two(self):
+        balancer = PowerOfTwoReplicaBalancer()
+        balancer.on_request_start("a")
+        with patch("random.sample", return_value=[REPLICAS[0], REPLICAS[1]]):
+            assert balancer.choose(REPLICAS).id == "b"
+
+    def test_never_chooses_most_loaded_of_three(self):
+        balancer = PowerOfTwoReplicaBalancer()
+        for _ in range(5):
+            balancer.on_request_start("c")
+        assert {balancer.choose(REPLICAS).id for _ in range(100)} <= {"a", "b"}
+
+
+class TestEWMALatencyReplicaBalancer:
+    def test_tries_replicas_without_samples_first(self):
+        balancer = EWMALatencyReplicaBalancer()
+        balancer.on_response("a", 0.1)
+        balancer.on_response("b", 0.1)
+        assert balancer.choose(REPLICAS).id == "c"
+
+    def test_chooses_replica_with_lowest_expected_latency(self):
+        balancer = EWMALatencyReplicaBalancer()
+        balancer.on_response("a", 1.0)
+        balancer.on_response("b", 0.2)
+        balancer.on_response("c", 0.3)
+        assert balancer.choose(REPLICAS).id == "b"
+        # b: 0.2 * 2 = 0.4 > c: 0.3
+        balancer.on_request_start("b")
+        assert balancer.choose(REPLICAS).id == "c"
+
+    def test_averages_latency(self):
+        balancer = EWMALatencyReplicaBalancer()
+        balancer.on_response("a", 1.0)
+        balancer.on_response("a", 2.0)
+        assert balancer.get_stats("a").ewma_latency == pytest.approx(1.3)
+
+
+class TestReplicaEjection:
+    def test_ejects_replica_after_consecutive_failures(self):
+        balancer = RandomReplicaBalancer(max_failures=2, ejection_time=10)
+        with patch("time.monotonic", return_value=100):
+            balancer.on_failure("a")
+            assert {balancer.choose(REPLICAS[:2]).id for _ in range(50)} == {"a", "b"}
+            balancer.on_failure("a")
+            assert {balancer.choose(REPLICAS[:2]).id for _ in range(50)} == {"b"}
+        with patch("time.monotonic", return_value=110):
+            assert {balancer.choose(REPLICAS[:2]).id for _ in range(50)} == {"a", "b"}
+
+    def test_successful_response_resets_failures(self):
+        balancer = RandomReplicaBalancer(max_failures=2, ejection_time=10)
+        balancer.on_failure("a")
+        balancer.on_response("a", 0.1)
+        balancer.on_failure("a")
+        assert not balancer.get_stats("a").is_ejected(0)
+
+    def test_ignores_ejection_if_all_replicas_ejected(self):
+        balancer = RandomReplicaBalancer(max_failures=1, ejection_time=10)
+        balancer.on_failure("a")
+        assert balancer.choose(REPLICAS[:1]).id == "a"
+
+
+class TestReplicaRequest:
+    def test_tracks_in_flight_request(self):
+        balancer = RandomReplicaBalancer()
+        request = ReplicaRequest(balancer, "a")
+        assert balancer.get_stats("a").in_flight == 1
+        request.on_response(200)
+        assert balancer.get_stats("a").ewma_latency is not None
+        request.end()
+        request.end()
+        assert balancer.get_stats("a").in_flight == 0
+
+    def test_counts_gateway_errors_as_failures(self):
+        balancer = RandomReplicaBalancer()
+        ReplicaRequest(balancer, "a").on_response(503)
+        ReplicaRequest(balancer, "a").on_response(500)
+        stats = balancer.get_stats("a")
+        assert stats.consecutive_failures == 0
+        assert stats.ewma_latency is not None
+        ReplicaRequest(balancer, "a").on_response(502)
+        assert stats.consecutive_failures == 1
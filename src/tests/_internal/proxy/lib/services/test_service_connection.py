@@ -0,0 +1,150 @@
+import asyncio
+import time
+from typing import Generator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from dstack._internal.proxy.gateway.repo.repo import GatewayProxyRepo
+from dstack._internal.proxy.lib.models import Replica
+from dstack._internal.proxy.lib.services.service_connection import (
+    ServiceConnectionPool,
+    get_service_replica_client,
+)
+from dstack._internal.proxy.lib.testing.common import make_project, make_service
+
+
+@pytest.mark.asyncio
+class TestDomainClients:
+    async def test_reuses_client_per_domain(self) -> None:
+        pool = ServiceConnectionPool()
+        repo = GatewayProxyRepo()
+        service = make_service("test-proj", "test-run", domain="test-run.gtw.test")
+        other_service = make_service("test-proj", "other-run", domain="other-run.gtw.test")
+        client = await get_service_replica_client(service, repo, pool)
+        assert await get_service_replica_client(service, repo, pool) is client
+        other_client = await get_service_replica_client(other_service, repo, pool)
+        assert other_client is not client
+        assert client.headers["Host"] == "test-run.gtw.test"
+        assert other_client.headers["Host"] == "other-run.gtw.test"
+        await pool.remove_all()
+
+    async def test_closes_removed_client(self) -> None:
+        pool = ServiceConnectionPool()
+        client = pool.get_or_add_domain_client("test-run.gtw.test")
+        await pool.remove_domain_client("test-run.gtw.test")
+        assert client.is_closed
+        assert pool.get_or_add_domain_client("test-run.gtw.test") is not client
+        await pool.remove_all()
+        assert pool.domain_clients == {}
+
+
+@pytest.fixture
+def tunnel_mock() -> Generator[MagicMock, None, None]:
+    with patch("dstack._internal.proxy.lib.services.service_connection.SSHTunnel") as cls_mock:
+        tunnel = cls_mock.return_value
+        tunnel.aopen = AsyncMock()
+        tunnel.aclose = AsyncMock()
+        tunnel.acheck = AsyncMock(return_value=True)
+        yield tunnel
+
+
+def _make_replica(replica_id: str) -> Replica:
+    return Replica(
+        id=replica_id,
+        app_port=80,
+        ssh_destination="ubuntu@server",
+        ssh_port=22,
+        ssh_proxy=None,
+    )
+
+
+@pytest.mark.asyncio
+class TestConnectionsCheck:
+    async def test_prewarm_opens_missing_connections(self, tunnel_mock: MagicMock) -> None:
+        pool = ServiceConnectionPool()
+        project = make_project("test-proj")
+        service = make_service("test-proj", "test-run").model_copy(
+            update={"replicas": (_make_replica("replica-1"), _make_replica("replica-2"))}
+        )
+        connection = await pool.get_or_add(project, service, service.replicas[0])
+        await pool.prewarm(project, service)
+        assert set(pool.connections) == {"replica-1", "replica-2"}
+        assert pool.connections["replica-1"] is connection
+        assert tunnel_mock.aopen.await_count == 2
+        await pool.remove_all()
+
+    async def test_prewarm_tolerates_open_failures(self, tunnel_mock: MagicMock) -> None:
+        tunnel_mock.aopen.side_effect = RuntimeError("ssh failed")
+        pool = ServiceConnectionPool()
+        await pool.prewarm(make_project("test-proj"), make_service("test-proj", "test-run"))
+        assert pool.connections == {}
+
+    async def test_prewarm_backs_off_after_open_failures(self, tunnel_mock: MagicMock) -> None:
+        tunnel_mock.aopen.side_effect = RuntimeError("ssh failed")
+        pool = ServiceConnectionPool()
+        project = make_project("test-proj")
+        service = make_service("test-proj", "test-run")
+        await pool.prewarm(project, service)
+        await pool.prewarm(project, service)
+        assert tunnel_mock.aopen.await_count == 1
+        with patch(
+            "dstack._internal.proxy.lib.services.service_connection.time.monotonic",
+            return_value=time.monotonic() + 3600,
+        ):
+            await pool.prewarm(project, service)
+        assert tunnel_mock.aopen.await_count == 2
+
+    async def test_prewarm_bounds_concurrent_opens(self, tunnel_mock: MagicMock) -> None:
+        in_flight = 0
+        max_in_flight = 0
+
+        async def aopen() -> None:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        tunnel_mock.aopen.side_effect = aopen
+        project = make_project("test-proj")
+        service = make_service("test-proj", "test-run").model_copy(
+            update={"replicas": tuple(_make_replica(f"replica-{i}") for i in range(10))}
+        )
+        with patch(
+            "dstack._internal.proxy.lib.services.service_connection.CONNECTIONS_CHECK_CONCURRENCY",
+            3,
+        ):
+            pool = ServiceConnectionPool()
+        await pool.prewarm(project, service)
+        assert len(pool.connections) == 10
+        assert max_in_flight == 3
+        await pool.remove_all()
+
+    async def test_check_removes_stale_connections(self, tunnel_mock: MagicMock) -> None:
+        pool = ServiceConnectionPool()
+        project = make_project("test-proj")
+        service = make_service("test-proj", "test-run").model_copy(
+            update={"replicas": (_make_replica("replica-1"), _make_replica("replica-2"))}
+        )
+        await pool.prewarm(project, service)
+        pool.balancer.on_request_start("replica-2")
+        await pool.check(live_replica_ids={"replica-1"})
+        assert set(pool.connections) == {"replica-1"}
+        assert pool.balancer.get_stats("replica-2").in_flight == 0
+        tunnel_mock.aclose.assert_awaited_once()
+        await pool.remove_all()
+
+    async def test_check_reopens_dead_connections(self, tunnel_mock: MagicMock) -> None:
+        metrics = MagicMock()
+        pool = ServiceConnectionPool(metrics=metrics)
+        service = make_service("test-proj", "test-run")
+        connection = await pool.get_or_add(make_project("test-proj"), service, service.replicas[0])
+        metrics.set_connections.assert_called_with(1)
+        assert metrics.log_connection_open.call_count == 1
+        tunnel_mock.acheck.return_value = False
+        await pool.check()
+        assert pool.connections[service.replicas[0].id] is connection
+        assert tunnel_mock.aopen.await_count == 2
+        assert metrics.log_connection_open.call_count == 2
+        await pool.remove_all()
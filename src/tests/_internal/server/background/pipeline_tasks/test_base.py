@@ -1,13 +1,25 @@
+import asyncio
 import uuid
+from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
-from unittest.mock import patch
+from typing import Optional
+from unittest.mock import Mock, patch
 
 import pytest
 from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from dstack._internal.server.background.pipeline_tasks.base import Heartbeater, PipelineItem
-from dstack._internal.server.models import PlacementGroupModel
+from dstack._internal.server.background.pipeline_tasks.base import (
+    _WORKERS_SCALE_DOWN_CHECKS,
+    Fetcher,
+    Heartbeater,
+    HeartbeatService,
+    Pipeline,
+    PipelineItem,
+    Worker,
+    get_desired_workers_num,
+)
+from dstack._internal.server.models import PlacementGroupModel, ProjectModel
 from dstack._internal.server.testing.common import (
     create_fleet,
     create_placement_group,
@@ -33,14 +45,17 @@ async def _create_locked_placement_group(
     session: AsyncSession,
     now: datetime,
     lock_expires_in: timedelta,
+    name: str = "test-pg",
+    project: Optional[ProjectModel] = None,
 ) -> PlacementGroupModel:
-    project = await create_project(session)
+    if project is None:
+        project = await create_project(session)
     fleet = await create_fleet(session=session, project=project)
     placement_group = await create_placement_group(
         session=session,
         project=project,
         fleet=fleet,
-        name="test-pg",
+        name=name,
     )
     placement_group.lock_token = uuid.uuid4()
     placement_group.lock_expires_at = now + lock_expires_in
@@ -181,3 +196,257 @@ class TestHeartbeater:
         await session.refresh(placement_group)
         assert placement_group.lock_token == new_lock_token
         assert placement_group.lock_expires_at == original_lock_expires_at
+
+
+class TestHeartbeatService:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_heartbeat_renews_items_of_multiple_heartbeaters(
+        self,
+        test_db,
+        session: AsyncSession,
+        now: datetime,
+    ):
+        heartbeaters = [
+            Heartbeater[PipelineItem](
+                model_type=PlacementGroupModel,
+                lock_timeout=timedelta(seconds=30),
+                heartbeat_trigger=timedelta(seconds=5),
+            )
+            for _ in range(2)
+        ]
+        heartbeat_service = HeartbeatService()
+        project = await create_project(session)
+        placement_groups = []
+        for i, heartbeater in enumerate(heartbeaters):
+            heartbeat_service.register_heartbeater(heartbeater)
+            placement_group = await _create_locked_placement_group(
+                session=session,
+                now=now,
+                lock_expires_in=timedelta(seconds=2),
+                name=f"test-pg-{i}",
+                project=project,
+            )
+            await heartbeater.track(_placement_group_to_pipeline_item(placement_group))
+            placement_groups.append(placement_group)
+
+        with (
+            patch(
+                "dstack._internal.server.background.pipeline_tasks.base.get_current_datetime",
+                return_value=now,
+            ),
+            patch(
+                "dstack._internal.server.background.pipeline_tasks.base._SQLITE_LOCK_RENEWAL_CHUNK_SIZE",
+                1,
+            ),
+        ):
+            await heartbeat_service.heartbeat()
+
+        expected_lock_expires_at = now + timedelta(seconds=30)
+        for heartbeater, placement_group in zip(heartbeaters, placement_groups):
+            assert heartbeater._items[placement_group.id].lock_expires_at == (
+                expected_lock_expires_at
+            )
+            await session.refresh(placement_group)
+            assert placement_group.lock_expires_at == expected_lock_expires_at
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_heartbeat_untracks_only_items_with_changed_lock_token(
+        self,
+        test_db,
+        session: AsyncSession,
+        heartbeater: Heartbeater[PipelineItem],
+        now: datetime,
+    ):
+        heartbeat_service = HeartbeatService()
+        heartbeat_service.register_heartbeater(heartbeater)
+        project = await create_project(session)
+        placement_group_kept = await _create_locked_placement_group(
+            session=session,
+            now=now,
+            lock_expires_in=timedelta(seconds=2),
+            name="test-pg-kept",
+            project=project,
+        )
+        placement_group_lost = await _create_locked_placement_group(
+            session=session,
+            now=now,
+            lock_expires_in=timedelta(seconds=2),
+            name="test-pg-lost",
+            project=project,
+        )
+        await heartbeater.track(_placement_group_to_pipeline_item(placement_group_kept))
+        await heartbeater.track(_placement_group_to_pipeline_item(placement_group_lost))
+        await session.execute(
+            update(PlacementGroupModel)
+            .where(PlacementGroupModel.id == placement_group_lost.id)
+            .values(lock_token=uuid.uuid4())
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+        with patch(
+            "dstack._internal.server.background.pipeline_tasks.base.get_current_datetime",
+            return_value=now,
+        ):
+            await heartbeat_service.heartbeat()
+
+        assert placement_group_kept.id in heartbeater._items
+        assert placement_group_lost.id not in heartbeater._items
+
+
+class TestGetDesiredWorkersNum:
+    @pytest.mark.parametrize(
+        "active,busy,queue_size,processing_time,expected",
+        [
+            pytest.param(10, 10, 40, 0.5, 25, id="scales-up-to-drain-backlog"),
+            pytest.param(10, 10, 1000, 0.5, 30, id="scales-up-to-max"),
+            pytest.param(10, 10, 1, 0.01, 11, id="saturated-grows-by-at-least-one"),
+            pytest.param(10, 10, 5, None, 20, id="saturated-without-stats-doubles"),
+            pytest.param(10, 0, 0, 0.5, 5, id="idle-scales-down-gradually"),
+            pytest.param(10, 0, 0, None, 5, id="idle-without-stats-scales-down-gradually"),
+            pytest.param(3, 0, 0, 0.5, 2, id="idle-scales-down-to-min"),
+            pytest.param(10, 8, 0, 0.01, 8, id="keeps-busy-workers"),
+            pytest.param(10, 5, 3, 0.5, 7, id="scales-down-to-backlog-gradually"),
+        ],
+    )
+    def test_returns_desired_workers_num(
+        self,
+        active: int,
+        busy: int,
+        queue_size: int,
+        processing_time: Optional[float],
+        expected: int,
+    ):
+        assert (
+            get_desired_workers_num(
+                active_workers_num=active,
+                busy_workers_num=busy,
+                queue_size=queue_size,
+                processing_time=processing_time,
+                min_workers_num=2,
+                max_workers_num=30,
+                target_drain_time=1.0,
+            )
+            == expected
+        )
+
+
+class _DummyFetcher(Fetcher[PipelineItem]):
+    async def fetch(self, limit: int) -> list[PipelineItem]:
+        return []
+
+
+class _DummyWorker(Worker[PipelineItem]):
+    async def process(self, item: PipelineItem):
+        await asyncio.sleep(0)
+
+
+class _DummyPipeline(Pipeline[PipelineItem]):
+    def __init__(self, min_workers_num: int = 1, max_workers_num: int = 8) -> None:
+        super().__init__(
+            workers_num=4,
+            queue_lower_limit_factor=0.5,
+            queue_upper_limit_factor=2.0,
+            min_processing_interval=timedelta(seconds=5),
+            lock_timeout=timedelta(seconds=30),
+            heartbeat_trigger=timedelta(seconds=5),
+            min_workers_num=min_workers_num,
+            max_workers_num=max_workers_num,
+        )
+        self.__heartbeater = Heartbeater[PipelineItem](
+            model_type=PlacementGroupModel,
+            lock_timeout=self._lock_timeout,
+            heartbeat_trigger=self._heartbeat_trigger,
+        )
+        self.__fetcher = _DummyFetcher(
+            queue=self._queue,
+            queue_desired_minsize=self._queue_desired_minsize,
+            min_processing_interval=self._min_processing_interval,
+            lock_timeout=self._lock_timeout,
+            heartbeater=self.__heartbeater,
+        )
+        self.__workers = [
+            _DummyWorker(
+                queue=self._queue,
+                heartbeater=self.__heartbeater,
+                pipeline_hinter=Mock(),
+            )
+            for _ in range(self._max_workers_num)
+        ]
+
+    @property
+    def hint_fetch_model_name(self) -> str:
+        return PlacementGroupModel.__name__
+
+    @property
+    def _heartbeater(self) -> Heartbeater[PipelineItem]:
+        return self.__heartbeater
+
+    @property
+    def _fetcher(self) -> Fetcher[PipelineItem]:
+        return self.__fetcher
+
+    @property
+    def _workers(self) -> Sequence[Worker[PipelineItem]]:
+        return self.__workers
+
+
+class TestPipelineWorkersScaling:
+    @pytest.mark.asyncio
+    async def test_scales_workers_and_queue_limits(self):
+        pipeline = _DummyPipeline()
+        pipeline._set_active_workers_num(4)
+        try:
+            assert pipeline.active_workers_num == 4
+            assert pipeline._fetcher._queue_limit == 8
+            pipeline._set_active_workers_num(8)
+            assert pipeline.active_workers_num == 8
+            assert pipeline._fetcher._queue_limit == 16
+            await asyncio.sleep(0)
+            pipeline._set_active_workers_num(1)
+            assert pipeline.active_workers_num == 1
+            assert pipeline._fetcher._queue_limit == 2
+            assert pipeline._fetcher._queue_desired_minsize == 1
+        finally:
+            pipeline.shutdown()
+            await pipeline.drain()
+
+    @pytest.mark.asyncio
+    async def test_scales_down_idle_workers_after_several_checks(self):
+        pipeline = _DummyPipeline()
+        pipeline._set_active_workers_num(4)
+        try:
+            await asyncio.sleep(0)
+            for _ in range(_WORKERS_SCALE_DOWN_CHECKS - 1):
+                pipeline._autoscale_workers_once()
+            assert pipeline.active_workers_num == 4
+            pipeline._autoscale_workers_once()
+            assert pipeline.active_workers_num == 2
+        finally:
+            pipeline.shutdown()
+            await pipeline.drain()
+
+    @pytest.mark.asyncio
+    async def test_exports_workers_state_when_scaling_disabled(self):
+        pipeline = _DummyPipeline(min_workers_num=4, max_workers_num=4)
+        pipeline._set_active_workers_num(4)
+        try:
+            await asyncio.sleep(0)
+            with (
+                patch(
+                    "dstack._internal.server.background.pipeline_tasks.base.pipeline_metrics"
+                ) as pipeline_metrics,
+                patch.object(pipeline, "_autoscale_workers_once") as autoscale_workers_once,
+            ):
+                pipeline._manage_workers_once()
+            pipeline_metrics.set_workers_state.assert_called_once_with(
+                pipeline=pipeline._stats.pipeline_name,
+                active_workers=4,
+                queue_size=0,
+            )
+            autoscale_workers_once.assert_not_called()
+        finally:
+            pipeline.shutdown()
+            await pipeline.drain()
@@ -1,11 +1,11 @@
 import datetime as dt
 import logging
 from typing import Optional
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
+import httpx
 import pytest
 import pytest_asyncio
-import requests
 from gpuhunt import AcceleratorVendor
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -38,7 +38,7 @@ from dstack._internal.server.schemas.runner import (
     InstanceInfoResponse,
     TaskListResponse,
 )
-from dstack._internal.server.services.runner.client import ComponentList, ShimClient
+from dstack._internal.server.services.runner.client import AsyncShimClient, ComponentList
 from dstack._internal.server.testing.common import (
     create_fleet,
     create_instance,
@@ -82,7 +82,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=True)),
+            AsyncMock(return_value=InstanceCheck(reachable=True)),
         )
         await process_instance(session, worker, instance)
 
@@ -110,7 +110,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=False, message="Shim problem")),
+            AsyncMock(return_value=InstanceCheck(reachable=False, message="Shim problem")),
         )
         await process_instance(session, worker, instance)
 
@@ -149,7 +149,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=True)),
+            AsyncMock(return_value=InstanceCheck(reachable=True)),
         )
         await process_instance(session, worker, instance)
 
@@ -189,7 +189,7 @@ class TestCheckInstance:
         )
         await session.commit()
 
-        check_instance_inner_mock = Mock(
+        check_instance_inner_mock = AsyncMock(
             return_value=InstanceCheck(
                 reachable=True,
                 gpu_driver=GpuDriverInfo(vendor=AcceleratorVendor.NVIDIA, version="570.86.15"),
@@ -223,7 +223,7 @@ class TestCheckInstance:
         )
         await session.commit()
 
-        check_instance_inner_mock = Mock(return_value=InstanceCheck(reachable=True))
+        check_instance_inner_mock = AsyncMock(return_value=InstanceCheck(reachable=True))
         monkeypatch.setattr(instances_check, "_check_instance_inner", check_instance_inner_mock)
         await process_instance(session, worker, instance)
 
@@ -247,7 +247,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=False, message="SSH connection fail")),
+            AsyncMock(return_value=InstanceCheck(reachable=False, message="SSH connection fail")),
         )
         await process_instance(session, worker, instance)
 
@@ -279,7 +279,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=False, message="SSH connection fail")),
+            AsyncMock(return_value=InstanceCheck(reachable=False, message="SSH connection fail")),
         )
         await process_instance(session, worker, instance)
 
@@ -308,7 +308,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=True)),
+            AsyncMock(return_value=InstanceCheck(reachable=True)),
         )
         await process_instance(session, worker, instance)
 
@@ -337,7 +337,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=False, message="Not ok")),
+            AsyncMock(return_value=InstanceCheck(reachable=False, message="Not ok")),
         )
         await process_instance(session, worker, instance)
 
@@ -390,7 +390,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=True)),
+            AsyncMock(return_value=InstanceCheck(reachable=True)),
         )
         await process_instance(session, worker, instance)
 
@@ -423,7 +423,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=False)),
+            AsyncMock(return_value=InstanceCheck(reachable=False)),
         )
         await process_instance(session, worker, instance)
 
@@ -461,7 +461,7 @@ class TestCheckInstance:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(
+            AsyncMock(
                 return_value=InstanceCheck(
                     reachable=True,
                     health_response=health_response,
@@ -517,7 +517,7 @@ class TestProcessIdleTimeout:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=True)),
+            AsyncMock(return_value=InstanceCheck(reachable=True)),
         )
 
         await process_instance(session, worker, instance)
@@ -616,7 +616,7 @@ class BaseTestMaybeInstallComponents:
         monkeypatch: pytest.MonkeyPatch,
         component_list: ComponentList,
     ) -> Mock:
-        mock = Mock(spec_set=ShimClient)
+        mock = Mock(spec_set=AsyncShimClient)
         mock.healthcheck.return_value = HealthcheckResponse(
             service="dstack-shim",
             version=self.EXPECTED_VERSION,
@@ -627,7 +627,7 @@ class BaseTestMaybeInstallComponents:
         mock.list_tasks.return_value = TaskListResponse(tasks=[])
         mock.is_safe_to_restart.return_value = False
         monkeypatch.setattr(
-            "dstack._internal.server.services.runner.client.ShimClient.from_address",
+            "dstack._internal.server.services.runner.client.AsyncShimClient.from_address",
             Mock(return_value=mock),
         )
         return mock
@@ -669,7 +669,7 @@ class TestMaybeInstallRunner(BaseTestMaybeInstallComponents):
     ):
         get_dstack_runner_version_mock.return_value = None
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.install_runner.assert_not_called()
@@ -683,7 +683,7 @@ class TestMaybeInstallRunner(BaseTestMaybeInstallComponents):
     ):
         shim_client_mock.get_components.return_value.runner.version = self.EXPECTED_VERSION
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         assert "expected runner version already installed" in debug_task_log.text
         shim_client_mock.get_components.assert_called_once()
@@ -702,7 +702,7 @@ class TestMaybeInstallRunner(BaseTestMaybeInstallComponents):
         shim_client_mock.get_components.return_value.runner.version = ""
         shim_client_mock.get_components.return_value.runner.status = status
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         assert f"installing runner (no version) -> {self.EXPECTED_VERSION}" in debug_task_log.text
         get_dstack_runner_download_url_mock.assert_called_once_with(
@@ -726,7 +726,7 @@ class TestMaybeInstallRunner(BaseTestMaybeInstallComponents):
     ):
         shim_client_mock.get_components.return_value.runner.version = installed_version
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         assert (
             f"installing runner {installed_version} -> {self.EXPECTED_VERSION}"
@@ -751,7 +751,7 @@ class TestMaybeInstallRunner(BaseTestMaybeInstallComponents):
         shim_client_mock.get_components.return_value.runner.version = "dev"
         shim_client_mock.get_components.return_value.runner.status = ComponentStatus.INSTALLING
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         assert "runner is already being installed" in debug_task_log.text
         shim_client_mock.get_components.assert_called_once()
@@ -794,7 +794,7 @@ class TestMaybeInstallShim(BaseTestMaybeInstallComponents):
     ):
         get_dstack_shim_version_mock.return_value = None
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.install_shim.assert_not_called()
@@ -808,7 +808,7 @@ class TestMaybeInstallShim(BaseTestMaybeInstallComponents):
     ):
         shim_client_mock.get_components.return_value.shim.version = self.EXPECTED_VERSION
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         assert "expected shim version already installed" in debug_task_log.text
         shim_client_mock.get_components.assert_called_once()
@@ -827,7 +827,7 @@ class TestMaybeInstallShim(BaseTestMaybeInstallComponents):
         shim_client_mock.get_components.return_value.shim.version = ""
         shim_client_mock.get_components.return_value.shim.status = status
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         assert f"installing shim (no version) -> {self.EXPECTED_VERSION}" in debug_task_log.text
         get_dstack_shim_download_url_mock.assert_called_once_with(
@@ -851,7 +851,7 @@ class TestMaybeInstallShim(BaseTestMaybeInstallComponents):
     ):
         shim_client_mock.get_components.return_value.shim.version = installed_version
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         assert (
             f"installing shim {installed_version} -> {self.EXPECTED_VERSION}"
@@ -876,7 +876,7 @@ class TestMaybeInstallShim(BaseTestMaybeInstallComponents):
         shim_client_mock.get_components.return_value.shim.version = "dev"
         shim_client_mock.get_components.return_value.shim.status = ComponentStatus.INSTALLING
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         assert "shim is already being installed" in debug_task_log.text
         shim_client_mock.get_components.assert_called_once()
@@ -906,13 +906,13 @@ class TestMaybeRestartShim(BaseTestMaybeInstallComponents):
 
     @pytest.fixture
     def maybe_install_runner_mock(self, monkeypatch: pytest.MonkeyPatch) -> Mock:
-        mock = Mock(return_value=False)
+        mock = AsyncMock(return_value=False)
         monkeypatch.setattr(instances_check, "_maybe_install_runner", mock)
         return mock
 
     @pytest.fixture
     def maybe_install_shim_mock(self, monkeypatch: pytest.MonkeyPatch) -> Mock:
-        mock = Mock(return_value=False)
+        mock = AsyncMock(return_value=False)
         monkeypatch.setattr(instances_check, "_maybe_install_shim", mock)
         return mock
 
@@ -920,7 +920,7 @@ class TestMaybeRestartShim(BaseTestMaybeInstallComponents):
         shim_client_mock.get_version_string.return_value = self.EXPECTED_VERSION
         shim_client_mock.is_safe_to_restart.return_value = True
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.shutdown.assert_not_called()
@@ -932,7 +932,7 @@ class TestMaybeRestartShim(BaseTestMaybeInstallComponents):
         shim_client_mock.get_version_string.return_value = "outdated"
         shim_client_mock.is_safe_to_restart.return_value = True
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.shutdown.assert_not_called()
@@ -943,7 +943,7 @@ class TestMaybeRestartShim(BaseTestMaybeInstallComponents):
         shim_client_mock.get_version_string.return_value = "outdated"
         shim_client_mock.is_safe_to_restart.return_value = True
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.shutdown.assert_called_once_with(force=False)
@@ -954,7 +954,7 @@ class TestMaybeRestartShim(BaseTestMaybeInstallComponents):
         shim_client_mock.get_version_string.return_value = "outdated"
         shim_client_mock.is_safe_to_restart.return_value = False
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.shutdown.assert_not_called()
@@ -972,7 +972,7 @@ class TestMaybeRestartShim(BaseTestMaybeInstallComponents):
         assert runner_info is not None
         runner_info.status = ComponentStatus.INSTALLING
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.shutdown.assert_not_called()
@@ -990,7 +990,7 @@ class TestMaybeRestartShim(BaseTestMaybeInstallComponents):
         assert shim_info is not None
         shim_info.status = ComponentStatus.INSTALLING
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.shutdown.assert_not_called()
@@ -1006,7 +1006,7 @@ class TestMaybeRestartShim(BaseTestMaybeInstallComponents):
         shim_client_mock.is_safe_to_restart.return_value = True
         maybe_install_runner_mock.return_value = True
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.shutdown.assert_not_called()
@@ -1022,7 +1022,7 @@ class TestMaybeRestartShim(BaseTestMaybeInstallComponents):
         shim_client_mock.is_safe_to_restart.return_value = True
         maybe_install_shim_mock.return_value = True
 
-        instances_check._maybe_install_components(instance, shim_client_mock)
+        await instances_check._maybe_install_components(instance, shim_client_mock)
 
         shim_client_mock.get_components.assert_called_once()
         shim_client_mock.shutdown.assert_not_called()
@@ -1101,7 +1101,7 @@ class TestGetGpuDriver(BaseTestMaybeInstallComponents):
             gpu_vendor="nvidia", gpu_driver_version="570.86.15"
         )
 
-        gpu_driver = instances_check._get_gpu_driver(instance, shim_client_mock)
+        gpu_driver = await instances_check._get_gpu_driver(instance, shim_client_mock)
 
         assert gpu_driver == GpuDriverInfo(vendor=AcceleratorVendor.NVIDIA, version="570.86.15")
 
@@ -1113,7 +1113,7 @@ class TestGetGpuDriver(BaseTestMaybeInstallComponents):
     ):
         shim_client_mock.get_instance_info.return_value = InstanceInfoResponse()
 
-        assert instances_check._get_gpu_driver(instance, shim_client_mock) is None
+        assert await instances_check._get_gpu_driver(instance, shim_client_mock) is None
 
     async def test_returns_none_on_request_error(
         self,
@@ -1121,9 +1121,9 @@ class TestGetGpuDriver(BaseTestMaybeInstallComponents):
         instance: InstanceModel,
         shim_client_mock: Mock,
     ):
-        shim_client_mock.get_instance_info.side_effect = requests.RequestException("boom")
+        shim_client_mock.get_instance_info.side_effect = httpx.RequestError("boom")
 
-        assert instances_check._get_gpu_driver(instance, shim_client_mock) is None
+        assert await instances_check._get_gpu_driver(instance, shim_client_mock) is None
 
     async def test_returns_none_on_unknown_gpu_vendor(
         self,
@@ -1135,4 +1135,4 @@ class TestGetGpuDriver(BaseTestMaybeInstallComponents):
             gpu_vendor="quantumx", gpu_driver_version="1.2.3"
         )
 
-        assert instances_check._get_gpu_driver(instance, shim_client_mock) is None
+        assert await instances_check._get_gpu_driver(instance, shim_client_mock) is None
@@ -1,6 +1,6 @@
 import datetime as dt
 import uuid
-from unittest.mock import Mock
+from unittest.mock import AsyncMock
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -316,7 +316,7 @@ class TestInstanceWorker:
         monkeypatch.setattr(
             instances_check,
             "_check_instance_inner",
-            Mock(return_value=InstanceCheck(reachable=True)),
+            AsyncMock(return_value=InstanceCheck(reachable=True)),
         )
         await process_instance(session, worker, instance)
 
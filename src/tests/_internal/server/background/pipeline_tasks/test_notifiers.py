@@ -0,0 +1,86 @@
+from unittest.mock import Mock
+
+import pytest
+
+from dstack._internal.server.background.pipeline_tasks import PipelineHinter
+from dstack._internal.server.background.pipeline_tasks.notifiers import (
+    LocalPipelineNotifier,
+    PostgresPipelineNotifier,
+    get_pipeline_notifier,
+)
+
+
+def _get_pipeline_mock(model_name: str) -> Mock:
+    pipeline = Mock()
+    pipeline.hint_fetch_model_name = model_name
+    return pipeline
+
+
+class TestPipelineHinter:
+    def test_hints_local_pipelines_and_notifies_other_replicas(self):
+        notifier = Mock()
+        hinter = PipelineHinter(notifier=notifier)
+        pipeline = _get_pipeline_mock("JobModel")
+        hinter.register_pipeline(pipeline)
+
+        hinter.hint_fetch("JobModel")
+
+        pipeline.hint_fetch.assert_called_once()
+        notifier.notify.assert_called_once_with("JobModel")
+
+    def test_hints_local_pipelines_on_notifications(self):
+        notifier = PostgresPipelineNotifier()
+        hinter = PipelineHinter(notifier=notifier)
+        job_pipeline = _get_pipeline_mock("JobModel")
+        run_pipeline = _get_pipeline_mock("RunModel")
+        hinter.register_pipeline(job_pipeline)
+        hinter.register_pipeline(run_pipeline)
+
+        notifier._on_notification(Mock(), 1, notifier.CHANNEL, "other-replica:JobModel")
+
+        job_pipeline.hint_fetch.assert_called_once()
+        run_pipeline.hint_fetch.assert_not_called()
+
+
+class TestPostgresPipelineNotifier:
+    def test_ignores_own_notifications(self):
+        notifier = PostgresPipelineNotifier()
+        hint_handler = Mock()
+        notifier.set_hint_handler(hint_handler)
+
+        notifier._on_notification(Mock(), 1, notifier.CHANNEL, f"{notifier._replica_id}:JobModel")
+        notifier._on_notification(Mock(), 1, notifier.CHANNEL, "malformed")
+        hint_handler.assert_not_called()
+
+        notifier._on_notification(Mock(), 1, notifier.CHANNEL, "other-replica:JobModel")
+        hint_handler.assert_called_once_with("JobModel")
+
+    def test_coalesces_pending_hints(self):
+        notifier = PostgresPipelineNotifier()
+        notifier.notify("JobModel")
+        notifier.notify("JobModel")
+        notifier.notify("RunModel")
+        assert notifier._pending_model_names == {"JobModel", "RunModel"}
+        assert notifier._pending_event.is_set()
+
+
+class TestGetPipelineNotifier:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite"], indirect=True)
+    async def test_returns_local_notifier_on_sqlite(
+        self, test_db, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(
+            "dstack._internal.server.settings.SERVER_PIPELINE_NOTIFICATIONS_ENABLED", True
+        )
+        assert isinstance(get_pipeline_notifier(), LocalPipelineNotifier)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["postgres"], indirect=True)
+    async def test_returns_postgres_notifier_if_enabled(
+        self, test_db, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(
+            "dstack._internal.server.settings.SERVER_PIPELINE_NOTIFICATIONS_ENABLED", True
+        )
+        assert isinstance(get_pipeline_notifier(), PostgresPipelineNotifier)
@@ -72,7 +72,7 @@ from dstack._internal.server.schemas.runner import (
 )
 from dstack._internal.server.services.jobs import server_connection
 from dstack._internal.server.services.jobs.server_connection import job_server_connections_pool
-from dstack._internal.server.services.runner.client import RunnerClient, ShimClient
+from dstack._internal.server.services.runner.client import AsyncRunnerClient, AsyncShimClient
 from dstack._internal.server.services.runs.replicas import RouterEnvStatus
 from dstack._internal.server.services.volumes import volume_model_to_volume
 from dstack._internal.server.testing.common import (
@@ -135,11 +135,11 @@ def ssh_tunnel_mock(monkeypatch: pytest.MonkeyPatch) -> Mock:
 
 @pytest.fixture
 def shim_client_mock(monkeypatch: pytest.MonkeyPatch) -> Mock:
-    mock = Mock(spec_set=ShimClient)
+    mock = Mock(spec_set=AsyncShimClient)
     mock.healthcheck.return_value = HealthcheckResponse(service="dstack-shim", version="latest")
     mock.get_task.return_value.image_pull_progress = None
     monkeypatch.setattr(
-        "dstack._internal.server.services.runner.client.ShimClient.from_address",
+        "dstack._internal.server.services.runner.client.AsyncShimClient.from_address",
         Mock(return_value=mock),
     )
     return mock
@@ -147,12 +147,12 @@ def shim_client_mock(monkeypatch: pytest.MonkeyPatch) -> Mock:
 
 @pytest.fixture
 def runner_client_mock(monkeypatch: pytest.MonkeyPatch) -> Mock:
-    mock = Mock(spec_set=RunnerClient)
+    mock = Mock(spec_set=AsyncRunnerClient)
     mock.healthcheck.return_value = HealthcheckResponse(
         service="dstack-runner", version="0.0.1.dev2"
     )
     monkeypatch.setattr(
-        "dstack._internal.server.services.runner.client.RunnerClient.from_address",
+        "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
         Mock(return_value=mock),
     )
     return mock
@@ -498,7 +498,8 @@ class TestJobRunningWorker:
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
             patch(
                 "dstack._internal.server.background.pipeline_tasks.jobs_running._get_job_file_archives",
@@ -577,10 +578,10 @@ class TestJobRunningWorker:
 
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
-            patch.object(RunnerClient, "_healthcheck") as healthcheck_mock,
-            patch.object(RunnerClient, "submit_job") as submit_job_mock,
-            patch.object(RunnerClient, "upload_code") as upload_code_mock,
-            patch.object(RunnerClient, "run_job") as run_job_mock,
+            patch.object(AsyncRunnerClient, "_healthcheck") as healthcheck_mock,
+            patch.object(AsyncRunnerClient, "submit_job") as submit_job_mock,
+            patch.object(AsyncRunnerClient, "upload_code") as upload_code_mock,
+            patch.object(AsyncRunnerClient, "run_job") as run_job_mock,
         ):
             healthcheck_mock.return_value = HealthcheckResponse(
                 service="dstack-runner", version=runner_version
@@ -1126,8 +1127,8 @@ class TestJobRunningWorker:
         try:
             with (
                 patch("dstack._internal.server.services.runner.pool.SSHTunnel"),
-                patch.object(RunnerClient, "_healthcheck") as healthcheck_mock,
-                patch.object(RunnerClient, "submit_job") as submit_job_mock,
+                patch.object(AsyncRunnerClient, "_healthcheck") as healthcheck_mock,
+                patch.object(AsyncRunnerClient, "submit_job") as submit_job_mock,
             ):
                 healthcheck_mock.return_value = HealthcheckResponse(
                     service="dstack-runner", version="0.0.1.dev2"
@@ -1366,9 +1367,9 @@ class TestJobRunningWorker:
             "dstack._internal.server.services.runner.pool.SSHTunnel",
             Mock(return_value=MagicMock()),
         )
-        shim_client_mock = Mock()
+        shim_client_mock = AsyncMock()
         monkeypatch.setattr(
-            "dstack._internal.server.services.runner.client.ShimClient.from_address",
+            "dstack._internal.server.services.runner.client.AsyncShimClient.from_address",
             Mock(return_value=shim_client_mock),
         )
         shim_client_mock.healthcheck.return_value = HealthcheckResponse(
@@ -1441,7 +1442,8 @@ class TestJobRunningWorker:
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel"),
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
         ):
             runner_client_mock = runner_client_cls.return_value
@@ -1540,7 +1542,8 @@ class TestJobRunningWorker:
             patch.object(server_settings, "SERVER_DIR_PATH", tmp_path),
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
         ):
             runner_client_mock = runner_client_cls.return_value
@@ -1563,7 +1566,8 @@ class TestJobRunningWorker:
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
         ):
             runner_client_mock = runner_client_cls.return_value
@@ -1733,7 +1737,8 @@ class TestJobRunningWorker:
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
         ):
             runner_client_mock = runner_client_cls.return_value
@@ -1845,7 +1850,8 @@ class TestJobRunningWorker:
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
         ):
             runner_client_mock = runner_client_cls.return_value
@@ -1934,7 +1940,8 @@ class TestJobRunningWorker:
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
         ):
             runner_client_mock = runner_client_cls.return_value
@@ -2025,7 +2032,8 @@ class TestJobRunningWorker:
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
         ):
             runner_client_mock = runner_client_cls.return_value
@@ -2109,7 +2117,8 @@ class TestJobRunningWorker:
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
         ):
             runner_client_mock = runner_client_cls.return_value
@@ -2206,7 +2215,8 @@ class TestJobRunningWorker:
         with (
             patch("dstack._internal.server.services.runner.pool.SSHTunnel") as ssh_tunnel_cls,
             patch(
-                "dstack._internal.server.services.runner.client.RunnerClient.from_address"
+                "dstack._internal.server.services.runner.client.AsyncRunnerClient.from_address",
+                return_value=Mock(spec_set=AsyncRunnerClient),
             ) as runner_client_cls,
         ):
             runner_client_mock = runner_client_cls.return_value
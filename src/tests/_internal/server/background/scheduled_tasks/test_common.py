@@ -0,0 +1,84 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from dstack._internal.server.background.scheduled_tasks.common import JobsCollector
+
+
+def _make_jobs(count: int) -> list:
+    return [SimpleNamespace(id=uuid.uuid4(), job_name=f"job-{i}") for i in range(count)]
+
+
+class TestJobsCollector:
+    @pytest.mark.asyncio
+    async def test_collects_all_jobs_with_bounded_concurrency(self):
+        jobs = _make_jobs(25)
+        running = 0
+        max_running = 0
+        saved: List[List[Tuple[object, str]]] = []
+
+        async def collect_job(job) -> Optional[str]:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0)
+            running -= 1
+            if job is jobs[0]:
+                return None
+            if job is jobs[1]:
+                raise RuntimeError("unreachable")
+            return job.job_name
+
+        async def save_results(results):
+            saved.append(results)
+
+        collector = JobsCollector(
+            collect_job=collect_job,
+            save_results=save_results,
+            concurrency=4,
+            deadline=60,
+            batch_size=10,
+        )
+        await collector.collect(jobs)
+        assert max_running == 4
+        assert [len(batch) for batch in saved] == [10, 10, 3]
+        assert sorted(name for batch in saved for _, name in batch) == sorted(
+            job.job_name for job in jobs[2:]
+        )
+
+    @pytest.mark.asyncio
+    async def test_collects_least_recently_attempted_jobs_first(self):
+        jobs = _make_jobs(4)
+        collected = []
+        now = 0.0
+
+        async def collect_job(job) -> Optional[str]:
+            nonlocal now
+            collected.append(job)
+            now += 1
+            return None
+
+        async def save_results(results):
+            pass
+
+        collector = JobsCollector(
+            collect_job=collect_job,
+            save_results=save_results,
+            concurrency=1,
+            deadline=2,
+        )
+        # Each collection takes 1s, so only two jobs fit before the deadline
+        with patch("dstack._internal.server.background.scheduled_tasks.common.time") as time_mock:
+            time_mock.monotonic.side_effect = lambda: now
+            await collector.collect(jobs)
+            assert collected == jobs[:2]
+            collected.clear()
+            await collector.collect(jobs)
+            assert collected == jobs[2:]
+            collected.clear()
+            await collector.collect(list(reversed(jobs)))
+            assert collected == jobs[:2]
@@ -1,5 +1,5 @@
-from datetime import datetime, timezone
-from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from freezegun import freeze_time
@@ -12,10 +12,12 @@ from dstack._internal.core.models.users import GlobalRole, ProjectRole
 from dstack._internal.server import settings
 from dstack._internal.server.background.scheduled_tasks.metrics import (
     collect_metrics,
+    compact_metrics,
     delete_metrics,
 )
-from dstack._internal.server.models import JobMetricsPoint
+from dstack._internal.server.models import JobMetricsBlock, JobMetricsPoint, JobMetricsRollup
 from dstack._internal.server.schemas.runner import GPUMetrics, MetricsResponse
+from dstack._internal.server.services.metrics import get_job_metrics
 from dstack._internal.server.services.projects import add_project_member
 from dstack._internal.server.testing.common import (
     create_instance,
@@ -27,6 +29,7 @@ from dstack._internal.server.testing.common import (
     create_user,
     get_job_provisioning_data,
 )
+from dstack._internal.utils.common import get_current_datetime
 
 pytestmark = pytest.mark.usefixtures("image_config_mock")
 
@@ -89,6 +92,91 @@ class TestCollectMetrics:
         metrics_point = res.scalar_one()
         assert metrics_point.job_id == job.id
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_skips_recently_collected_jobs(self, test_db, session: AsyncSession):
+        user = await create_user(session=session)
+        project = await create_project(session=session, owner=user)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        instance = await create_instance(
+            session=session, project=project, status=InstanceStatus.BUSY
+        )
+        collected_job = await create_job(
+            session=session,
+            run=run,
+            status=JobStatus.RUNNING,
+            job_provisioning_data=get_job_provisioning_data(),
+            instance_assigned=True,
+            instance=instance,
+        )
+        await create_job_metrics_point(
+            session=session,
+            job_model=collected_job,
+            timestamp=get_current_datetime() - timedelta(seconds=1),
+        )
+        with (
+            patch("dstack._internal.server.services.runner.pool.SSHTunnel"),
+            patch(
+                "dstack._internal.server.background.scheduled_tasks.metrics._jobs_collector"
+            ) as jobs_collector_mock,
+        ):
+            jobs_collector_mock.collect = AsyncMock()
+            await collect_metrics()
+        jobs_collector_mock.collect.assert_awaited_once_with([])
+
+
+class TestCompactMetrics:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_compacts_points_of_past_blocks(self, test_db, session: AsyncSession):
+        user = await create_user(session=session)
+        project = await create_project(session=session, owner=user)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        job = await create_job(session=session, run=run, status=JobStatus.RUNNING)
+        start = datetime(2023, 1, 2, 3, 0, 0, tzinfo=timezone.utc)
+        for i in range(70):
+            await create_job_metrics_point(
+                session=session,
+                job_model=job,
+                timestamp=start + timedelta(seconds=10 * i),
+                cpu_usage_micro=1_000_000 * i,
+                memory_usage_bytes=1024 * (i % 7),
+                gpus_memory_usage_bytes=[100 * i, 200],
+                gpus_util_percent=[i % 100, 50],
+            )
+        metrics_before = await get_job_metrics(session, job)
+        latest_before = await get_job_metrics(session, job, limit=3)
+        with patch(
+            "dstack._internal.server.background.scheduled_tasks.metrics.get_current_datetime",
+            return_value=start + timedelta(minutes=12),
+        ):
+            await compact_metrics()
+        res = await session.execute(select(JobMetricsBlock))
+        blocks = res.scalars().all()
+        assert len(blocks) == 1
+        assert blocks[0].points_count == 60
+        assert blocks[0].gpus_count == 2
+        res = await session.execute(select(JobMetricsPoint))
+        assert len(res.scalars().all()) == 10
+        assert await get_job_metrics(session, job) == metrics_before
+        assert await get_job_metrics(session, job, limit=3) == latest_before
+        assert await get_job_metrics(
+            session, job, after=start + timedelta(minutes=5), before=start + timedelta(minutes=11)
+        ) == _get_expected_metrics_in_range(
+            metrics_before, start + timedelta(minutes=5), start + timedelta(minutes=11)
+        )
+
+
+def _get_expected_metrics_in_range(metrics, after, before):
+    indexes = [i for i, ts in enumerate(metrics.metrics[0].timestamps) if after < ts < before]
+    result = metrics.model_copy(deep=True)
+    for metric in result.metrics:
+        metric.timestamps = [metric.timestamps[i] for i in indexes]
+        metric.values = [metric.values[i] for i in indexes]
+    return result
+
 
 class TestDeleteMetrics:
     @pytest.mark.asyncio
@@ -186,3 +274,36 @@ class TestDeleteMetrics:
         points = res.scalars().all()
         assert len(points) == 1
         assert points[0].id == last_metric.id
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_keeps_rollups_of_finished_job_as_long_as_points(
+        self, test_db, session: AsyncSession
+    ):
+        user = await create_user(session=session)
+        project = await create_project(session=session, owner=user)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        job = await create_job(session=session, run=run, status=JobStatus.DONE)
+        now = get_current_datetime().replace(second=0, microsecond=0)
+        # Older than the 1m rollups TTL but within the finished jobs TTL
+        recent_ts = now - timedelta(days=2)
+        for seconds in [10, 20, 30]:
+            await create_job_metrics_point(
+                session=session, job_model=job, timestamp=recent_ts + timedelta(seconds=seconds)
+            )
+        await create_job_metrics_point(
+            session=session, job_model=job, timestamp=now - timedelta(days=8)
+        )
+        with patch.multiple(
+            settings,
+            SERVER_METRICS_RUNNING_TTL_SECONDS=3600,
+            SERVER_METRICS_FINISHED_TTL_SECONDS=7 * 24 * 3600,
+        ):
+            await delete_metrics()
+        res = await session.execute(
+            select(JobMetricsRollup.start_timestamp_micro).where(JobMetricsRollup.resolution == 60)
+        )
+        assert res.scalars().all() == [int(recent_ts.timestamp() * 1_000_000)]
+        metrics = await get_job_metrics(session, job, step=60)
+        assert metrics.metrics[0].timestamps == [recent_ts]
@@ -9,6 +9,7 @@ import pytest
 from dstack._internal.server.main import app
 from dstack._internal.server.services import encryption as encryption  # import for side-effect
 from dstack._internal.server.services import logs as logs_services
+from dstack._internal.server.services import parsed_models as parsed_models_services
 from dstack._internal.server.services.docker import ImageConfig, ImageConfigObject
 from dstack._internal.server.services.logs.filelog import FileLogStorage
 from dstack._internal.server.testing.conf import (  # noqa: F401
@@ -46,6 +47,16 @@ def _warm_up_route_schemas() -> None:
 _warm_up_route_schemas()
 
 
+@pytest.fixture(autouse=True)
+def parsed_models_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> parsed_models_services.ParsedModelsCache:
+    # A fresh cache for every test that fails tests mutating cached models
+    cache = parsed_models_services.ParsedModelsCache(max_size=1000, check_mutations=True)
+    monkeypatch.setattr(parsed_models_services, "_cache", cache)
+    return cache
+
+
 @pytest.fixture
 def client():
     transport = httpx.ASGITransport(app=app)
@@ -17,6 +17,8 @@ from dstack._internal.core.models.runs import (
     RunStatus,
 )
 from dstack._internal.core.models.users import GlobalRole, ProjectRole
+from dstack._internal.server.background.pipeline_tasks import PipelineManager
+from dstack._internal.server.main import app
 from dstack._internal.server.models import JobModel, ProjectModel, RunModel, UserModel
 from dstack._internal.server.services.projects import add_project_member
 from dstack._internal.server.testing.common import (
@@ -357,6 +359,35 @@ class TestGetPrometheusMetrics:
         assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("enable_metrics")
+class TestGetPipelinesStats:
+    async def test_returns_empty_list_if_background_processing_disabled(self, client: AsyncClient):
+        response = await client.get("/metrics/pipelines")
+        assert response.status_code == 200
+        assert response.json() == []
+
+    async def test_returns_stats_of_each_pipeline(
+        self, monkeypatch: pytest.MonkeyPatch, client: AsyncClient
+    ):
+        pipeline_manager = PipelineManager()
+        monkeypatch.setattr(app.state, "pipeline_manager", pipeline_manager, raising=False)
+        response = await client.get("/metrics/pipelines")
+        assert response.status_code == 200
+        stats = {s["pipeline"]: s for s in response.json()}
+        assert "JobRunningPipeline" in stats
+        assert stats["JobRunningPipeline"]["active_workers"] == 0
+        assert stats["JobRunningPipeline"]["processed_items_total"] == 0
+        assert stats["JobRunningPipeline"]["processing_time"] is None
+
+    async def test_returns_404_if_not_enabled(
+        self, monkeypatch: pytest.MonkeyPatch, client: AsyncClient
+    ):
+        monkeypatch.setattr("dstack._internal.server.settings.ENABLE_PROMETHEUS_METRICS", False)
+        response = await client.get("/metrics/pipelines")
+        assert response.status_code == 404
+
+
 async def _create_project(session: AsyncSession, name: str, user: UserModel) -> ProjectModel:
     project = await create_project(session=session, owner=user, name=name)
     await add_project_member(
@@ -45,6 +45,26 @@ class TestMergePerWindowStats:
             assert result[window].requests == 0
             assert result[window].request_time == 0.0
 
+    def test_weights_ttft_and_itl_separately(self):
+        stats_a = {
+            w: Stat(requests=10, request_time=1.0, streamed_requests=10, ttft=0.2)
+            for w in SERVICE_SCALING_WINDOWS
+        }
+        stats_b = {
+            w: Stat(
+                requests=30,
+                request_time=1.0,
+                streamed_requests=30,
+                ttft=0.4,
+                inter_token_latency=0.05,
+            )
+            for w in SERVICE_SCALING_WINDOWS
+        }
+        result = _merge_per_window_stats([stats_a, stats_b])
+        for window in SERVICE_SCALING_WINDOWS:
+            assert result[window].ttft == pytest.approx(0.35)  # (10*0.2 + 30*0.4) / 40
+            assert result[window].inter_token_latency == pytest.approx(0.05)
+
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
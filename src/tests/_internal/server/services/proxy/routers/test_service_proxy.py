@@ -152,6 +152,24 @@ async def test_proxy_status_codes(mock_replica_client_httpbin, code: int) -> Non
     assert resp.status_code == code
 
 
+@pytest.mark.asyncio
+async def test_proxy_records_replica_stats(mock_replica_client_httpbin) -> None:
+    repo = ProxyTestRepo()
+    await repo.set_project(make_project("test-proj"))
+    service = make_service("test-proj", "httpbin")
+    await repo.set_service(service)
+    app, client = make_app_client(repo)
+    balancer = (await app.state.proxy_dependency_injector.get_service_connection_pool()).balancer
+    resp = await client.get("http://test-host/proxy/services/test-proj/httpbin/get")
+    assert resp.status_code == 200
+    resp = await client.get("http://test-host/proxy/services/test-proj/httpbin/status/503")
+    assert resp.status_code == 503
+    stats = balancer.get_stats(service.replicas[0].id)
+    assert stats.in_flight == 0
+    assert stats.ewma_latency is not None
+    assert stats.consecutive_failures == 1
+
+
 @pytest.mark.asyncio
 async def test_proxy_not_leaks_cookies(mock_replica_client_httpbin) -> None:
     repo = ProxyTestRepo()
@@ -0,0 +1,143 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dstack._internal.core.models.configurations import ServiceConfiguration
+from dstack._internal.core.models.runs import JobStatus, JobTerminationReason, RunStatus
+from dstack._internal.proxy.lib.testing.common import make_service
+from dstack._internal.server.services.jobs import switch_job_status
+from dstack._internal.server.services.proxy.repo import ServerProxyRepo
+from dstack._internal.server.services.proxy.routing import (
+    ServiceRoutingTable,
+    get_service_routing_table,
+    invalidate_service_route_on_commit,
+)
+from dstack._internal.server.testing.common import (
+    create_instance,
+    create_job,
+    create_project,
+    create_repo,
+    create_run,
+    create_user,
+    get_job_provisioning_data,
+    get_run_spec,
+)
+
+
+def _make_service(run_id: uuid.UUID, run_name: str = "test-run"):
+    return make_service("test-proj", run_name, run_id=run_id.hex)
+
+
+class TestServiceRoutingTable:
+    def test_returns_stored_service(self):
+        table = ServiceRoutingTable(ttl=10)
+        service = _make_service(uuid.uuid4())
+        table.set(service, table.generation)
+        assert table.get("test-proj", "test-run") is service
+        assert table.get("test-proj", "other-run") is None
+
+    def test_invalidates_by_run_id(self):
+        table = ServiceRoutingTable(ttl=10)
+        run_id = uuid.uuid4()
+        other_run_id = uuid.uuid4()
+        table.set(_make_service(run_id), table.generation)
+        table.set(_make_service(other_run_id, "other-run"), table.generation)
+        table.invalidate(run_id)
+        assert table.get("test-proj", "test-run") is None
+        assert table.get("test-proj", "other-run") is not None
+
+    def test_does_not_store_service_loaded_before_invalidation(self):
+        table = ServiceRoutingTable(ttl=10)
+        run_id = uuid.uuid4()
+        generation = table.generation
+        table.invalidate(run_id)
+        table.set(_make_service(run_id), generation)
+        assert table.get("test-proj", "test-run") is None
+
+    def test_expires_after_ttl(self):
+        table = ServiceRoutingTable(ttl=10)
+        with patch("time.monotonic", return_value=100):
+            table.set(_make_service(uuid.uuid4()), table.generation)
+        with patch("time.monotonic", return_value=109):
+            assert table.get("test-proj", "test-run") is not None
+        with patch("time.monotonic", return_value=110):
+            assert table.get("test-proj", "test-run") is None
+
+    def test_does_not_store_if_disabled(self):
+        table = ServiceRoutingTable(ttl=0)
+        table.set(_make_service(uuid.uuid4()), table.generation)
+        assert table.get("test-proj", "test-run") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+@pytest.mark.usefixtures("test_db", "image_config_mock")
+class TestServerProxyRepoRouting:
+    async def _create_service_job(self, session: AsyncSession):
+        project = await create_project(session=session, name="test-proj")
+        user = await create_user(session=session)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(
+            session=session,
+            project=project,
+            repo=repo,
+            user=user,
+            status=RunStatus.RUNNING,
+            run_spec=get_run_spec(
+                run_name="test-run",
+                repo_id=repo.name,
+                configuration=ServiceConfiguration(port=80, image="ubuntu"),
+            ),
+        )
+        instance = await create_instance(session=session, project=project)
+        job = await create_job(
+            session=session,
+            run=run,
+            status=JobStatus.RUNNING,
+            job_provisioning_data=get_job_provisioning_data(),
+            instance=instance,
+            registered=True,
+            ready=True,
+        )
+        return run, job
+
+    async def test_routes_without_querying_db(self, session: AsyncSession):
+        run, job = await self._create_service_job(session)
+        service = await ServerProxyRepo(session).get_service("test-proj", "test-run")
+        assert service is not None
+        assert service.id == run.id.hex
+        assert [r.id for r in service.replicas] == [job.id.hex]
+        with patch.object(ServerProxyRepo, "_load_service") as load_service_mock:
+            cached = await ServerProxyRepo(session).get_service("test-proj", "test-run")
+            load_service_mock.assert_not_called()
+        assert cached is service
+
+    async def test_invalidates_route_when_job_status_changes(self, session: AsyncSession):
+        _, job = await self._create_service_job(session)
+        assert await ServerProxyRepo(session).get_service("test-proj", "test-run") is not None
+        job.termination_reason = JobTerminationReason.TERMINATED_BY_USER
+        switch_job_status(session, job, JobStatus.TERMINATING)
+        # Not invalidated until committed
+        assert get_service_routing_table().get("test-proj", "test-run") is not None
+        await session.commit()
+        assert get_service_routing_table().get("test-proj", "test-run") is None
+        assert await ServerProxyRepo(session).get_service("test-proj", "test-run") is None
+
+    async def test_discards_invalidation_on_rollback(self, session: AsyncSession):
+        run, _ = await self._create_service_job(session)
+        assert await ServerProxyRepo(session).get_service("test-proj", "test-run") is not None
+        invalidate_service_route_on_commit(session, run.id)
+        await session.rollback()
+        await session.commit()
+        assert get_service_routing_table().get("test-proj", "test-run") is not None
+
+    async def test_lists_services_with_registered_replicas(self, session: AsyncSession):
+        run, job = await self._create_service_job(session)
+        services = await ServerProxyRepo(session).list_services()
+        assert [s.id for s in services] == [run.id.hex]
+        assert [r.id for r in services[0].replicas] == [job.id.hex]
+        job.registered = False
+        await session.commit()
+        assert await ServerProxyRepo(session).list_services() == []
@@ -1,9 +1,14 @@
+import asyncio
+import json
 import uuid
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Optional
 
+import httpx
 import pytest
+import pytest_asyncio
 import requests_mock
 from gpuhunt import AcceleratorVendor
 
@@ -30,7 +35,10 @@ from dstack._internal.server.schemas.runner import (
     TaskInfoResponse,
     TaskStatus,
 )
+from dstack._internal.server.services.runner import client as client_module
 from dstack._internal.server.services.runner.client import (
+    AsyncHTTPClientPool,
+    AsyncShimClient,
     RunnerClient,
     ShimClient,
     ShimHTTPError,
@@ -664,3 +672,125 @@ class TestShimClientGetInstanceInfo(BaseShimClientTest):
         assert client.get_instance_info() is None
         # An unknown shim version is assumed to support the endpoint, so it is requested
         self.assert_request(adapter, 1, "GET", "/api/instance/info")
+
+
+class _UnixHTTPServer:
+    """
+    A minimal keep-alive HTTP server on a Unix socket that replies with `routes`
+    and counts accepted connections.
+    """
+
+    def __init__(self, routes: dict[str, tuple[int, Optional[dict]]]) -> None:
+        self.routes = routes
+        self.connections_count = 0
+        self.paths: list[str] = []
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections_count += 1
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                request_line, *header_lines = head.decode().split("\r\n")
+                path = request_line.split(" ")[1].split("?")[0]
+                self.paths.append(path)
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    if name.lower() == "content-length":
+                        await reader.readexactly(int(value))
+                status, body = self.routes.get(path, (404, None))
+                if status == 0:
+                    continue  # never respond
+                content = b"" if body is None else json.dumps(body).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} STATUS\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n".encode()
+                    + content
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.mark.asyncio
+class TestAsyncShimClient:
+    @pytest_asyncio.fixture
+    async def server(self, tmp_path: Path) -> AsyncGenerator[tuple[_UnixHTTPServer, Path], None]:
+        http_server = _UnixHTTPServer(
+            routes={
+                "/api/healthcheck": (200, {"service": "dstack-shim", "version": "0.20.30"}),
+                "/api/tasks": (200, {"tasks": []}),
+                "/api/tasks/fail/remove": (500, {"error": "boom"}),
+                "/api/tasks/hang/remove": (0, None),
+            }
+        )
+        path = tmp_path / "shim.sock"
+        server = await asyncio.start_unix_server(http_server.handle, path=str(path))
+        yield http_server, path
+        server.close()
+
+    @pytest_asyncio.fixture
+    async def pool(self) -> AsyncGenerator[AsyncHTTPClientPool, None]:
+        pool = AsyncHTTPClientPool()
+        yield pool
+        await pool.close_all()
+
+    async def test_reuses_connection(
+        self, server: tuple[_UnixHTTPServer, Path], pool: AsyncHTTPClientPool
+    ):
+        http_server, path = server
+        client = AsyncShimClient(path, http_client_pool=pool)
+        healthcheck = await client.healthcheck()
+        assert healthcheck is not None
+        assert healthcheck.version == "0.20.30"
+        assert await client.is_instance_info_supported()
+        assert (await client.list_tasks()).tasks == []
+        # Another client to the same address reuses the pooled connection
+        another_client = AsyncShimClient(path, http_client_pool=pool)
+        assert (await another_client.list_tasks()).tasks == []
+        assert http_server.paths == [
+            "/api/healthcheck",
+            "/api/tasks",
+            "/api/healthcheck",
+            "/api/tasks",
+        ]
+        assert http_server.connections_count == 1
+
+    async def test_raises_shim_http_error(
+        self, server: tuple[_UnixHTTPServer, Path], pool: AsyncHTTPClientPool
+    ):
+        _, path = server
+        client = AsyncShimClient(path, http_client_pool=pool)
+        with pytest.raises(ShimHTTPError) as exc_info:
+            await client.remove_task("fail")
+        assert exc_info.value.status_code == 500
+
+    async def test_raises_timeout_if_deadline_exceeded(
+        self,
+        server: tuple[_UnixHTTPServer, Path],
+        pool: AsyncHTTPClientPool,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        _, path = server
+        client = AsyncShimClient(path, http_client_pool=pool)
+        await client.healthcheck()
+        monkeypatch.setattr(client_module, "REQUEST_TIMEOUT", 0.1)
+        with pytest.raises(httpx.TimeoutException):
+            await client.remove_task("hang")
+
+    async def test_healthcheck_returns_none_if_not_reachable(
+        self, tmp_path: Path, pool: AsyncHTTPClientPool
+    ):
+        client = AsyncShimClient(tmp_path / "missing.sock", http_client_pool=pool)
+        assert await client.healthcheck() is None
+        with pytest.raises(httpx.ConnectError):
+            await client.healthcheck(unmask_exceptions=True)
+
+    async def test_closes_idle_clients(self, server: tuple[_UnixHTTPServer, Path]):
+        http_server, path = server
+        pool = AsyncHTTPClientPool(idle_timeout=0)
+        client = AsyncShimClient(path, http_client_pool=pool)
+        await client.healthcheck()
+        await client.list_tasks()
+        assert http_server.connections_count == 2
+        await pool.close_all()
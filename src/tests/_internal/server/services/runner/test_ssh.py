@@ -0,0 +1,67 @@
+from collections.abc import Generator, Mapping
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+
+from dstack._internal.server import settings
+from dstack._internal.server.services.runner.client import LocalAddress
+from dstack._internal.server.services.runner.ssh import async_runner_ssh_tunnel
+from dstack._internal.server.testing.common import get_job_provisioning_data
+
+
+@pytest.fixture
+def connection_pool() -> Generator[Mock, None, None]:
+    with (
+        patch.object(settings, "SERVER_SSH_POOL_ENABLED", True),
+        patch("dstack._internal.server.services.runner.ssh.instance_connection_pool") as pool_mock,
+        patch(
+            "dstack._internal.server.services.runner.ssh.async_http_client_pool.close",
+            new_callable=AsyncMock,
+        ),
+    ):
+        pool_mock.get_or_open.return_value.forwarded_paths.return_value = {}
+        yield pool_mock
+
+
+class TestAsyncRunnerSSHTunnel:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error",
+        [
+            httpx.ConnectError("Connection refused"),
+            httpx.RemoteProtocolError("Server disconnected without sending a response."),
+        ],
+    )
+    async def test_reopens_connection_on_connection_error(
+        self, connection_pool: Mock, error: Exception
+    ):
+        func = AsyncMock(side_effect=[error, "ok"])
+
+        @async_runner_ssh_tunnel
+        async def call(addresses: Mapping[int, LocalAddress]) -> str:
+            return await func(addresses)
+
+        result = await call("key", get_job_provisioning_data(dockerized=True), None)
+        assert result == "ok"
+        assert func.await_count == 2
+        connection_pool.drop.assert_called_once_with(connection_pool.get_or_open.return_value.key)
+
+    @pytest.mark.asyncio
+    async def test_does_not_reopen_connection_on_http_error(self, connection_pool: Mock):
+        request = httpx.Request("GET", "http://runner/api/healthcheck")
+        func = AsyncMock(
+            side_effect=httpx.HTTPStatusError(
+                "Internal Server Error",
+                request=request,
+                response=httpx.Response(500, request=request),
+            )
+        )
+
+        @async_runner_ssh_tunnel
+        async def call(addresses: Mapping[int, LocalAddress]) -> str:
+            return await func(addresses)
+
+        assert await call("key", get_job_provisioning_data(dockerized=True), None) is False
+        assert func.await_count == 1
+        connection_pool.drop.assert_not_called()
@@ -1,11 +1,17 @@
 import datetime
+from typing import Optional
 from unittest.mock import patch
 
 import pytest
 
 from dstack._internal.core.models.configurations import DEFAULT_SCALING_WINDOW
 from dstack._internal.proxy.gateway.schemas.stats import PerWindowStats, Stat
-from dstack._internal.server.services.services.autoscalers import BaseServiceScaler, RPSAutoscaler
+from dstack._internal.server.services.services.autoscalers import (
+    BaseServiceScaler,
+    RPSAutoscaler,
+    TokensPerSecondAutoscaler,
+    TTFTAutoscaler,
+)
 
 
 @pytest.fixture
@@ -168,3 +174,98 @@ class TestRPSAutoscaler:
         assert (
             scaler.get_desired_count(1, stats, time - datetime.timedelta(seconds=3600)) == expected
         )
+
+
+def make_token_scaler(scaler_class, target: float) -> BaseServiceScaler:
+    return scaler_class(
+        min_replicas=0,
+        max_replicas=5,
+        target=target,
+        window=DEFAULT_SCALING_WINDOW,
+        scale_up_delay=5 * 60,
+        scale_down_delay=10 * 60,
+    )
+
+
+def token_stats(
+    requests: int = 100, ttft: Optional[float] = None, output_tokens_per_second: float = 0.0
+) -> PerWindowStats:
+    return {
+        DEFAULT_SCALING_WINDOW: Stat(
+            requests=requests,
+            request_time=1.0,
+            streamed_requests=requests if ttft is not None else 0,
+            ttft=ttft,
+            output_tokens_per_second=output_tokens_per_second,
+        )
+    }
+
+
+class TestTTFTAutoscaler:
+    @pytest.mark.parametrize(
+        "current,ttft,expected",
+        [
+            (2, 0.7, 3),  # above the target, proportional
+            (2, 1.0, 3),  # twice the target, capped step
+            (3, 0.6, 4),
+            (2, 0.53, 2),  # within the dead band
+            (2, 0.47, 2),
+            (4, 0.2, 3),  # below the target, one replica down
+            (1, 0.2, 1),  # at least one replica while there are requests
+            (4, 100.0, 5),  # replicas limit
+        ],
+    )
+    def test_scales_in_bounded_steps(
+        self, current: int, ttft: float, expected: int, time: datetime.datetime
+    ) -> None:
+        scaler = make_token_scaler(TTFTAutoscaler, target=0.5)
+        last_scaled_at = time - datetime.timedelta(seconds=3600)
+        assert (
+            scaler.get_desired_count(current, token_stats(ttft=ttft), last_scaled_at) == expected
+        )
+
+    @pytest.mark.parametrize(
+        "ttft_floor,current,expected_counts",
+        [
+            (0.8, 1, [2, 3, 5, 5]),  # the target is unreachable
+            (0.3, 5, [4, 3, 2, 1, 1]),  # the target is never reached
+        ],
+    )
+    def test_scales_gradually_with_constant_ttft_floor(
+        self,
+        ttft_floor: float,
+        current: int,
+        expected_counts: list[int],
+        time: datetime.datetime,
+    ) -> None:
+        scaler = make_token_scaler(TTFTAutoscaler, target=0.5)
+        last_scaled_at = time - datetime.timedelta(seconds=3600)
+        counts = []
+        for _ in expected_counts:
+            current = scaler.get_desired_count(
+                current, token_stats(ttft=ttft_floor), last_scaled_at
+            )
+            counts.append(current)
+        assert counts == expected_counts
+
+    def test_keeps_replicas_if_ttft_not_measured(self, time: datetime.datetime) -> None:
+        scaler = make_token_scaler(TTFTAutoscaler, target=0.5)
+        last_scaled_at = time - datetime.timedelta(seconds=3600)
+        assert scaler.get_desired_count(3, token_stats(ttft=None), last_scaled_at) == 3
+
+    def test_scales_from_and_to_zero(self, time: datetime.datetime) -> None:
+        scaler = make_token_scaler(TTFTAutoscaler, target=0.5)
+        last_scaled_at = time - datetime.timedelta(seconds=3600)
+        assert scaler.get_desired_count(0, token_stats(requests=5), last_scaled_at) == 1
+        assert scaler.get_desired_count(2, token_stats(requests=0), last_scaled_at) == 0
+
+
+class TestTokensPerSecondAutoscaler:
+    @pytest.mark.parametrize("tps,expected", [(0, 0), (100, 1), (250, 3), (10000, 5)])
+    def test_scales_by_tokens_per_second(
+        self, tps: float, expected: int, time: datetime.datetime
+    ) -> None:
+        scaler = make_token_scaler(TokensPerSecondAutoscaler, target=100)
+        last_scaled_at = time - datetime.timedelta(seconds=3600)
+        stats = token_stats(output_tokens_per_second=tps)
+        assert scaler.get_desired_count(1, stats, last_scaled_at) == expected
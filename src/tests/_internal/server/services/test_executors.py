@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from collections.abc import Generator
+from concurrent.futures import Future
+from typing import Optional
+
+import pytest
+from prometheus_client import REGISTRY
+
+from dstack._internal.server.services.executors import (
+    ExecutorPool,
+    InstrumentedThreadPoolExecutor,
+    run_async_in,
+    shutdown_executors,
+)
+
+
+def _get_metric(name: str, pool: ExecutorPool) -> float:
+    value: Optional[float] = REGISTRY.get_sample_value(name, {"pool": pool.value})
+    return value or 0
+
+
+@pytest.fixture(autouse=True)
+def executors() -> Generator[None, None, None]:
+    yield
+    shutdown_executors()
+
+
+class TestRunAsyncIn:
+    @pytest.mark.asyncio
+    async def test_runs_in_pool_thread(self):
+        thread_name = await run_async_in(
+            ExecutorPool.CLOUD, lambda: threading.current_thread().name
+        )
+        assert thread_name.startswith("dstack-cloud")
+        thread_name = await run_async_in(
+            ExecutorPool.LOGS, lambda: threading.current_thread().name
+        )
+        assert thread_name.startswith("dstack-logs")
+
+    @pytest.mark.asyncio
+    async def test_slow_pool_does_not_block_other_pools(self):
+        release = threading.Event()
+        slow_tasks = [
+            asyncio.create_task(run_async_in(ExecutorPool.STORAGE, release.wait))
+            for _ in range(32)
+        ]
+        try:
+            assert await asyncio.wait_for(run_async_in(ExecutorPool.RUNNER, lambda: 1), 5) == 1
+        finally:
+            release.set()
+            await asyncio.gather(*slow_tasks)
+
+
+class TestInstrumentedThreadPoolExecutor:
+    def test_reports_queued_and_active_tasks(self):
+        pool = ExecutorPool.STORAGE
+        queue_waits_before = _get_metric("dstack_executor_queue_wait_duration_seconds_count", pool)
+        executor = InstrumentedThreadPoolExecutor(pool=pool, max_workers=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait()
+
+        try:
+            running = executor.submit(block)
+            started.wait(5)
+            queued: Future = executor.submit(lambda: None)
+            assert _get_metric("dstack_executor_max_workers", pool) == 1
+            assert _get_metric("dstack_executor_active_tasks", pool) == 1
+            assert _get_metric("dstack_executor_queued_tasks", pool) == 1
+            assert queued.cancel()
+            assert _get_metric("dstack_executor_queued_tasks", pool) == 0
+        finally:
+            release.set()
+            executor.shutdown(wait=True)
+        assert running.done()
+        assert _get_metric("dstack_executor_active_tasks", pool) == 0
+        assert (
+            _get_metric("dstack_executor_queue_wait_duration_seconds_count", pool)
+            == queue_waits_before + 1
+        )
@@ -25,7 +25,7 @@ from dstack._internal.core.models.profiles import (
 from dstack._internal.core.models.runs import JobStatus
 from dstack._internal.server.models import InstanceModel
 from dstack._internal.server.schemas.runner import TaskListItem, TaskListResponse, TaskStatus
-from dstack._internal.server.services.runner.client import ShimClient
+from dstack._internal.server.services.runner.client import AsyncShimClient
 from dstack._internal.server.testing.common import (
     create_export,
     create_fleet,
@@ -399,7 +399,7 @@ class TestRemoveDanglingTasks:
         )
         dangling_task_id_1 = "fe138b77-d0b1-49d3-8c9f-2dfe78ece727"
         dangling_task_id_2 = "8b016a75-41de-44f1-91ff-c9b63d2caa1d"
-        shim_client_mock = Mock(spec_set=ShimClient)
+        shim_client_mock = Mock(spec_set=AsyncShimClient)
         shim_client_mock.is_api_v2_supported.return_value = True
         shim_client_mock.list_tasks.return_value = TaskListResponse(
             tasks=[
@@ -410,7 +410,7 @@ class TestRemoveDanglingTasks:
         )
         await session.refresh(instance, attribute_names=["jobs"])
 
-        instances_services.remove_dangling_tasks_from_instance(shim_client_mock, instance)
+        await instances_services.remove_dangling_tasks_from_instance(shim_client_mock, instance)
 
         await session.refresh(instance)
         assert instance.status == InstanceStatus.BUSY
@@ -451,14 +451,14 @@ class TestRemoveDanglingTasks:
         )
         dangling_task_id_1 = "fe138b77-d0b1-49d3-8c9f-2dfe78ece727"
         dangling_task_id_2 = "8b016a75-41de-44f1-91ff-c9b63d2caa1d"
-        shim_client_mock = Mock(spec_set=ShimClient)
+        shim_client_mock = Mock(spec_set=AsyncShimClient)
         shim_client_mock.is_api_v2_supported.return_value = True
         shim_client_mock.list_tasks.return_value = TaskListResponse(
             ids=[str(job.id), dangling_task_id_1, dangling_task_id_2]
         )
         await session.refresh(instance, attribute_names=["jobs"])
 
-        instances_services.remove_dangling_tasks_from_instance(shim_client_mock, instance)
+        await instances_services.remove_dangling_tasks_from_instance(shim_client_mock, instance)
 
         await session.refresh(instance)
         assert instance.status == InstanceStatus.BUSY
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -19,7 +20,8 @@ from dstack._internal.server.schemas.runner import LogEvent as RunnerLogEvent
 from dstack._internal.server.services.logs.aws import (
     CloudWatchLogStorage,
 )
-from dstack._internal.server.services.logs.base import LogStorageError
+from dstack._internal.server.services.logs.base import LogStorage, LogStorageError
+from dstack._internal.server.services.logs.buffer import LOG_WRITE_MAX_ATTEMPTS, LogWriteBuffer
 from dstack._internal.server.services.logs.filelog import FileLogStorage
 from dstack._internal.server.testing.common import create_project
 
@@ -2112,3 +2114,93 @@ class TestFileLogStorageReadLinesReversed:
         # Pass the small chunk_size directly
         lines = list(FileLogStorage._read_lines_reversed(file, chunk_size=10))
         assert lines == [(content, 0)]
+
+
+class TestLogWriteBuffer:
+    JOB_1 = UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e")
+    JOB_2 = UUID("2b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e")
+
+    @pytest.fixture
+    def storage(self) -> Mock:
+        return Mock(spec_set=LogStorage)
+
+    @staticmethod
+    def _event(message: bytes) -> RunnerLogEvent:
+        return RunnerLogEvent(timestamp=1696586513234, message=message)
+
+    async def _write(self, buffer: LogWriteBuffer, job_submission_id: UUID, *messages: bytes):
+        await buffer.write_logs(
+            project=Mock(),
+            run_name="test-run",
+            job_submission_id=job_submission_id,
+            runner_logs=[],
+            job_logs=[self._event(m) for m in messages],
+        )
+
+    @staticmethod
+    def _written_messages(storage: Mock) -> list[tuple[UUID, list[bytes]]]:
+        return [
+            (c.kwargs["job_submission_id"], [e.message for e in c.kwargs["job_logs"]])
+            for c in storage.write_logs.call_args_list
+        ]
+
+    @pytest.mark.asyncio
+    async def test_coalesces_writes_of_same_job(self, storage: Mock):
+        buffer = LogWriteBuffer(storage=storage, max_events=100, flush_interval=60)
+        await self._write(buffer, self.JOB_1, b"a")
+        await self._write(buffer, self.JOB_2, b"x")
+        await self._write(buffer, self.JOB_1, b"b", b"c")
+        storage.write_logs.assert_not_called()
+        await buffer.flush()
+        assert self._written_messages(storage) == [
+            (self.JOB_1, [b"a", b"b", b"c"]),
+            (self.JOB_2, [b"x"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_retries_failed_writes_in_order(self, storage: Mock):
+        storage.write_logs.side_effect = [LogStorageError("unavailable"), None]
+        buffer = LogWriteBuffer(storage=storage, max_events=100, flush_interval=60)
+        await self._write(buffer, self.JOB_1, b"a")
+        await buffer.flush()
+        await self._write(buffer, self.JOB_1, b"b")
+        await buffer.flush()
+        assert self._written_messages(storage) == [
+            (self.JOB_1, [b"a"]),
+            (self.JOB_1, [b"a", b"b"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_drops_logs_after_max_attempts(self, storage: Mock):
+        storage.write_logs.side_effect = LogStorageError("unavailable")
+        buffer = LogWriteBuffer(storage=storage, max_events=1, flush_interval=60)
+        await self._write(buffer, self.JOB_1, b"a")
+        for _ in range(LOG_WRITE_MAX_ATTEMPTS + 1):
+            await buffer.flush()
+        assert storage.write_logs.call_count == LOG_WRITE_MAX_ATTEMPTS
+        # The buffer is not full anymore
+        await asyncio.wait_for(self._write(buffer, self.JOB_1, b"b"), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_flush_if_full(self, storage: Mock):
+        buffer = LogWriteBuffer(storage=storage, max_events=2, flush_interval=60)
+        await self._write(buffer, self.JOB_1, b"a", b"b")
+        write = asyncio.create_task(self._write(buffer, self.JOB_2, b"x"))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert not write.done()
+        await buffer.flush()
+        await asyncio.wait_for(write, timeout=1)
+        await buffer.flush()
+        assert self._written_messages(storage) == [
+            (self.JOB_1, [b"a", b"b"]),
+            (self.JOB_2, [b"x"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_close(self, storage: Mock):
+        buffer = LogWriteBuffer(storage=storage, max_events=100, flush_interval=60)
+        buffer.start()
+        await self._write(buffer, self.JOB_1, b"a")
+        await asyncio.wait_for(buffer.close(), timeout=5)
+        assert self._written_messages(storage) == [(self.JOB_1, [b"a"])]
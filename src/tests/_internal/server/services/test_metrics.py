@@ -165,3 +165,100 @@ class TestGetMetrics:
             Metric(name="gpu_util_percent_gpu0", timestamps=ts, values=gpu0_util),
             Metric(name="gpu_util_percent_gpu1", timestamps=ts, values=gpu1_util),
         ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+@pytest.mark.usefixtures("test_db", "image_config_mock")
+class TestGetRollupMetrics:
+    start_ts = datetime(2023, 1, 2, 3, 0, 0, tzinfo=timezone.utc)
+
+    @pytest.mark.parametrize(
+        ["params", "ts", "cpu", "mem", "gpu0_util"],
+        [
+            pytest.param(
+                {"step": 60},
+                [start_ts + timedelta(minutes=2), start_ts + timedelta(minutes=1), start_ts],
+                [50, 50, 50],
+                [700, 400, 100],
+                [70, 40, 10],
+                id="step-60-avg",
+            ),
+            pytest.param(
+                {"step": 60, "aggregation": "max"},
+                [start_ts + timedelta(minutes=2), start_ts + timedelta(minutes=1), start_ts],
+                [50, 50, 50],
+                [800, 500, 200],
+                [80, 50, 20],
+                id="step-60-max",
+            ),
+            pytest.param(
+                {"step": 60, "aggregation": "min", "limit": 1},
+                [start_ts + timedelta(minutes=2)],
+                [50],
+                [600],
+                [60],
+                id="step-60-min-limit-1",
+            ),
+            pytest.param(
+                {"step": 120},
+                [start_ts + timedelta(minutes=2), start_ts],
+                [50, 50],
+                [700, 250],
+                [70, 25],
+                id="step-120-avg",
+            ),
+            pytest.param(
+                {"step": 60, "after": start_ts + timedelta(seconds=70)},
+                [start_ts + timedelta(minutes=2), start_ts + timedelta(minutes=1)],
+                [50, 50],
+                [700, 400],
+                [70, 40],
+                id="step-60-after",
+            ),
+        ],
+    )
+    async def test_get_rollup_metrics(
+        self,
+        session: AsyncSession,
+        params: dict,
+        ts: list[datetime],
+        cpu: list[int],
+        mem: list[int],
+        gpu0_util: list[int],
+    ):
+        user = await create_user(session=session)
+        project = await create_project(session=session, owner=user)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        jpd = get_job_provisioning_data(
+            cpu_count=64, memory_gib=128, gpu_count=2, gpu_memory_gib=32
+        )
+        job = await create_job(session=session, run=run, job_provisioning_data=jpd)
+        for i in range(9):
+            await create_job_metrics_point(
+                session=session,
+                job_model=job,
+                timestamp=self.start_ts + timedelta(seconds=20 * i),
+                cpu_usage_micro=10_000_000 * i,
+                memory_usage_bytes=100 * i,
+                memory_working_set_bytes=100 * i,
+                gpus_memory_usage_bytes=[1024, 1024],
+                gpus_util_percent=[10 * i, 50],
+            )
+
+        metrics = await get_job_metrics(session, job, **params)
+
+        assert metrics.metrics == [
+            Metric(name="cpu_usage_percent", timestamps=ts, values=cpu),
+            Metric(name="memory_usage_bytes", timestamps=ts, values=mem),
+            Metric(name="memory_working_set_bytes", timestamps=ts, values=mem),
+            Metric(name="cpus_detected_num", timestamps=ts, values=[64] * len(ts)),
+            Metric(name="memory_total_bytes", timestamps=ts, values=[137438953472] * len(ts)),
+            Metric(name="gpus_detected_num", timestamps=ts, values=[2] * len(ts)),
+            Metric(name="gpu_memory_total_bytes", timestamps=ts, values=[34359738368] * len(ts)),
+            Metric(name="gpu_memory_usage_bytes_gpu0", timestamps=ts, values=[1024] * len(ts)),
+            Metric(name="gpu_memory_usage_bytes_gpu1", timestamps=ts, values=[1024] * len(ts)),
+            Metric(name="gpu_util_percent_gpu0", timestamps=ts, values=gpu0_util),
+            Metric(name="gpu_util_percent_gpu1", timestamps=ts, values=[50] * len(ts)),
+        ]
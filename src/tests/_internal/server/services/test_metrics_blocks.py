@@ -0,0 +1,54 @@
+import uuid
+
+from dstack._internal.server.services.metrics_blocks import (
+    MetricsPoint,
+    decode_points,
+    encode_points,
+    make_blocks,
+)
+
+
+def _make_point(timestamp_micro: int, gpus_count: int = 2) -> MetricsPoint:
+    return MetricsPoint(
+        timestamp_micro=timestamp_micro,
+        cpu_usage_micro=timestamp_micro // 2,
+        memory_usage_bytes=2**40 + timestamp_micro % 1000,
+        memory_working_set_bytes=2**30,
+        gpus_memory_usage_bytes=[2**33 + i for i in range(gpus_count)],
+        gpus_util_percent=[(timestamp_micro + i) % 100 for i in range(gpus_count)],
+    )
+
+
+class TestEncodePoints:
+    def test_decodes_encoded_points(self):
+        points = [_make_point(1_700_000_000_000_000 + i * 10_000_123) for i in range(60)]
+        assert decode_points(encode_points(points)) == points
+
+    def test_decodes_points_without_gpus(self):
+        points = [_make_point(10_000_000 * i, gpus_count=0) for i in range(3)]
+        assert decode_points(encode_points(points)) == points
+
+    def test_encoded_points_are_compact(self):
+        points = [_make_point(1_700_000_000_000_000 + i * 10_000_000) for i in range(60)]
+        assert len(encode_points(points)) < 60 * 8 * 8 / 2
+
+
+class TestMakeBlocks:
+    def test_splits_points_by_time_window_and_gpus_count(self):
+        job_id = uuid.uuid4()
+        points = [
+            _make_point(590_000_000),
+            _make_point(600_000_000),
+            _make_point(610_000_000),
+            _make_point(620_000_000, gpus_count=1),
+            _make_point(630_000_000, gpus_count=1),
+        ]
+        blocks = make_blocks(job_id, points)
+        assert [(b.start_timestamp_micro, b.end_timestamp_micro) for b in blocks] == [
+            (590_000_000, 590_000_000),
+            (600_000_000, 610_000_000),
+            (620_000_000, 630_000_000),
+        ]
+        assert [b.gpus_count for b in blocks] == [2, 2, 1]
+        assert all(b.job_id == job_id for b in blocks)
+        assert [p for b in blocks for p in decode_points(b.data)] == points
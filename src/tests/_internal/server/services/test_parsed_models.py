@@ -0,0 +1,71 @@
+import pytest
+
+from dstack._internal.core.models.runs import JobRuntimeData
+from dstack._internal.server.services.parsed_models import (
+    ParsedModelMutatedError,
+    ParsedModelsCache,
+)
+from dstack._internal.server.testing.common import get_job_runtime_data
+
+
+class TestParsedModelsCache:
+    def test_returns_shared_instance_for_same_content(self):
+        cache = ParsedModelsCache(max_size=10)
+        data = get_job_runtime_data(network_mode="host").model_dump_json()
+        first = cache.get(JobRuntimeData, data)
+        second = cache.get(JobRuntimeData, data.encode())
+        assert first is second
+        assert first == get_job_runtime_data(network_mode="host")
+        stats = cache.get_stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.size == 1
+
+    def test_parses_different_content_separately(self):
+        cache = ParsedModelsCache(max_size=10)
+        host = cache.get(
+            JobRuntimeData, get_job_runtime_data(network_mode="host").model_dump_json()
+        )
+        bridge = cache.get(
+            JobRuntimeData, get_job_runtime_data(network_mode="bridge").model_dump_json()
+        )
+        assert host is not bridge
+        assert host.network_mode == "host"
+        assert bridge.network_mode == "bridge"
+        assert cache.get_stats().misses == 2
+
+    def test_evicts_least_recently_used(self):
+        cache = ParsedModelsCache(max_size=2)
+        host_data = get_job_runtime_data(network_mode="host").model_dump_json()
+        bridge_data = get_job_runtime_data(network_mode="bridge").model_dump_json()
+        volumes_data = get_job_runtime_data(
+            network_mode="host", volume_names=["vol"]
+        ).model_dump_json()
+        host = cache.get(JobRuntimeData, host_data)
+        cache.get(JobRuntimeData, bridge_data)
+        assert cache.get(JobRuntimeData, host_data) is host
+        cache.get(JobRuntimeData, volumes_data)
+        stats = cache.get_stats()
+        assert stats.size == 2
+        assert stats.evictions == 1
+        # host_data was used more recently than bridge_data, so bridge_data is evicted
+        assert cache.get(JobRuntimeData, host_data) is host
+        assert cache.get_stats().misses == 3
+        cache.get(JobRuntimeData, bridge_data)
+        assert cache.get_stats().misses == 4
+
+    def test_does_not_cache_if_disabled(self):
+        cache = ParsedModelsCache(max_size=0)
+        data = get_job_runtime_data(network_mode="host").model_dump_json()
+        assert cache.get(JobRuntimeData, data) is not cache.get(JobRuntimeData, data)
+        assert cache.get_stats().size == 0
+
+    def test_detects_mutations_if_enabled(self):
+        cache = ParsedModelsCache(max_size=10, check_mutations=True)
+        data = get_job_runtime_data(network_mode="host", volume_names=["vol"]).model_dump_json()
+        model = cache.get(JobRuntimeData, data)
+        assert cache.get(JobRuntimeData, data) is model
+        assert model.volume_names is not None
+        model.volume_names.append("other")
+        with pytest.raises(ParsedModelMutatedError):
+            cache.get(JobRuntimeData, data)